@@ -3,6 +3,10 @@ ASGI config for ai_erp project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Produktiv sollte das Projekt über ASGI laufen (z.B. ``uvicorn ai_erp.asgi:application``),
+damit die asynchronen Chat-Streams (``apps.ai_engine.views.chat_stream``) keinen
+Worker-Thread pro offener Verbindung belegen.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -10,8 +10,11 @@ Für die vollständige Liste der Einstellungen und ihrer Werte, siehe
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+from core.db import database_settings
+
 # Pfade innerhalb des Projekts bauen wie folgt: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -51,9 +54,12 @@ INSTALLED_APPS = [
     'apps.sales',
     'apps.inventory',
     'apps.finance',
+    'apps.dashboard',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.MetricsMiddleware',  # Zuerst: misst die gesamte Verarbeitung
+    'core.middleware.QueryInspectionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -61,6 +67,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.AuditMiddleware',
 ]
 
 ROOT_URLCONF = 'ai_erp.urls'
@@ -82,28 +89,36 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'ai_erp.wsgi.application'
 
+# ASGI für asynchrone Views (Chat-Streaming per Server-Sent Events)
+ASGI_APPLICATION = 'ai_erp.asgi.application'
+
 
 # Datenbank
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-# Datenbank
-# PostgreSQL Konfiguration (Produktion)
-# Vorerst SQLite für initiales Setup - vor Deployment auf PostgreSQL wechseln
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-    # Produktions-PostgreSQL-Konfiguration (einkommentieren wenn bereit):
-    # 'default': {
-    #     'ENGINE': 'django.db.backends.postgresql',
-    #     'NAME': os.getenv('DB_NAME', 'ai_erp'),
-    #     'USER': os.getenv('DB_USER', 'postgres'),
-    #     'PASSWORD': os.getenv('DB_PASSWORD'),
-    #     'HOST': os.getenv('DB_HOST', 'localhost'),
-    #     'PORT': os.getenv('DB_PORT', '5432'),
-    # }
-}
+# Aus Umgebungsvariablen (core.db.database_settings): ohne Angaben SQLite (db.sqlite3),
+# im Betrieb PostgreSQL mit DB_ENGINE=postgresql, DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT.
+# Verbindungen: DB_POOL_MAX_SIZE > 0 = psycopg-Pool, sonst persistent (DB_CONN_MAX_AGE, Health-Check).
+# Lese-Replicas: DB_REPLICAS (PostgreSQL 'host[:port]', SQLite Dateipfade) -> Aliase replica1, replica2, ...
+DATABASES = database_settings(BASE_DIR)
+
+# Schreiben und Lesen auf 'default'; nur Auswertungen in core.db.read_replica() lesen von Replicas
+DATABASE_ROUTERS = ['core.db.PrimaryReplicaRouter']
+
+
+# Cache
+# Gemeinsamer Cache aller Prozesse (Berechtigungen, Kennzahlen, @cached_service aus core.cache).
+# CACHE_URL: 'redis://host:6379/0' (Betrieb, auch Redis-kompatible Server), 'file:///pfad' oder leer = locmem.
+# Hinweis: locmem gilt nur je Prozess; Invalidierungen erreichen andere Worker dann nicht.
+CACHE_URL = os.getenv('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://', 'unix://')):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+elif CACHE_URL.startswith('file://'):
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': CACHE_URL[len('file://'):],
+    }}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
 
 
 # Passwort-Validierung
@@ -150,11 +165,87 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'  # Für Produktion collectstatic
 
 # Mediendateien (Benutzer-Uploads)
 MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_ROOT = os.getenv('MEDIA_ROOT', str(BASE_DIR / 'media'))
 
 # Custom User Model (KRITISCH: Muss vor der ersten Migration gesetzt werden)
 AUTH_USER_MODEL = 'users.User'
 
+# Anmeldung wie ModelBackend; Berechtigungen je Benutzer gecacht (apps.users.services.get_permission_set)
+AUTHENTICATION_BACKENDS = ['apps.users.backends.CachedPermissionBackend']
+
+# Ziel von @login_required (bisher einzige Anmeldeseite: Admin-Login)
+LOGIN_URL = 'admin:login'
+
+# Änderungsprotokoll (core.audit)
+# Abgeleitete Tabellen, die nicht protokolliert werden (werden aus protokollierten Daten berechnet)
+AUDIT_EXCLUDED_MODELS = [
+    'finance.AccountBalance',
+    'inventory.StockItem',  # Bestand ergibt sich aus dem Bewegungsprotokoll
+    'dashboard.KpiFigure',
+]
+# Felder, deren Werte im Protokoll maskiert werden
+AUDIT_REDACTED_FIELDS = ['password']
+
+# Forderungskonten für die Kennzahl "Offene Forderungen" (SKR03: 1400, SKR04: 1200)
+FINANCE_RECEIVABLE_ACCOUNTS = ['1400']
+
+# Verzeichnis der ISO-20022-Schemata (pain.001.001.03.xsd, pain.008.001.02.xsd, nicht im
+# Repository) für die optionale Validierung der SEPA-Dateien (apps.finance.sepa, validate=True)
+SEPA_XSD_DIR = os.getenv('SEPA_XSD_DIR', '')
+
+# Prüfung von USt-IdNrn. (apps.finance.services, core.adapters.vies)
+# Für Tests/Entwicklung ohne Netzwerk: 'core.adapters.vies.StubViesAdapter'
+VIES_ADAPTER = os.getenv('VIES_ADAPTER', 'core.adapters.vies.ViesAdapter')
+VIES_ADAPTER_OPTIONS = (
+    {'requester_vat_id': os.getenv('VIES_REQUESTER_VAT_ID', '')}
+    if VIES_ADAPTER.endswith('.ViesAdapter') else {}
+)
+# Gültigkeitsdauer einer Prüfung in Tagen; danach prüft `manage.py reverify_vat_ids` erneut
+VAT_ID_CHECK_TTL_DAYS = int(os.getenv('VAT_ID_CHECK_TTL_DAYS', '30'))
+
+# PDF-Erzeugung (core.adapters.pdf); WeasyPrint per `pip install -r requirements-pdf.txt`,
+# ohne WeasyPrint: 'core.adapters.pdf.TextPdfRenderer'
+PDF_RENDERER = os.getenv('PDF_RENDERER', 'core.adapters.pdf.WeasyPrintRenderer')
+PDF_RENDERER_OPTIONS = {}
+
+# Lokale Task-Queue (core.tasks); Worker: `python manage.py run_tasks`
+# Eager: Tasks laufen sofort im aufrufenden Prozess (Tests/Entwicklung ohne Worker)
+TASKS_ALWAYS_EAGER = os.getenv('TASKS_ALWAYS_EAGER', 'False') == 'True'
+# Worker erneuern laufende Aufträge in diesem Abstand (Sekunden)
+TASKS_HEARTBEAT_INTERVAL = int(os.getenv('TASKS_HEARTBEAT_INTERVAL', '30'))
+# Aufträge ohne Heartbeat seit so vielen Sekunden gelten als abgebrochen und werden erneut eingereiht
+TASKS_STALE_AFTER = int(os.getenv('TASKS_STALE_AFTER', '300'))
+
+# Laufzeit-Metriken (core.metrics), Abruf unter /metrics/
+# Scraper authentifizieren sich mit `Authorization: Bearer <METRICS_TOKEN>`
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Abfrage-Prüfung (core.queries)
+# Ab so vielen gleichen Abfrageformen je Request/Service wird ein N+1-Muster geloggt
+QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '5'))
+# Budget-Überschreitungen (@query_budget) als Fehler statt Warnung; Tests setzen das in ai_erp.settings_test
+QUERY_BUDGET_STRICT = os.getenv('QUERY_BUDGET_STRICT', 'False') == 'True'
+# Maximale Abfragen je Request (None = nur N+1-Erkennung)
+REQUEST_QUERY_BUDGET = int(os.environ['REQUEST_QUERY_BUDGET']) if os.getenv('REQUEST_QUERY_BUDGET') else None
+
+# AI-Provider für den Connector `core.utils.ai_client`
+# Schlüssel = Provider-Name, Werte = Felder von `core.utils.ai_client.ProviderConfig`
+AI_PROVIDERS = {
+    'openai': {
+        'base_url': os.getenv('OPENAI_BASE_URL', 'https://api.openai.com'),
+        'api_key': os.getenv('OPENAI_API_KEY', ''),
+        'rate_per_second': float(os.getenv('OPENAI_RATE_PER_SECOND', '5')),
+        'burst': int(os.getenv('OPENAI_BURST', '10')),
+    },
+}
+
+# Lokaler Retrieval-Index der AI Engine (apps.ai_engine.retrieval)
+# Neuaufbau: `python manage.py build_rag_index`; Änderungen an Datensätzen werden inkrementell übernommen
+RAG_INDEX_DIR = os.getenv('RAG_INDEX_DIR', str(BASE_DIR / 'var' / 'rag'))
+RAG_KNOWLEDGE_DIRS = [BASE_DIR / '.agent' / 'knowledge']
+# Optional: Import-Pfad eines lokalen Embedders (texts -> Matrix), benötigt NumPy
+RAG_EMBEDDER = os.getenv('RAG_EMBEDDER', '')
+
 # Standard Primary Key Feldtyp
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
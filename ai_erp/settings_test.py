@@ -0,0 +1,10 @@
+"""
+Django-Einstellungen für die Tests (pytest.ini: DJANGO_SETTINGS_MODULE).
+
+Übernimmt `ai_erp.settings` und schaltet nur die für Tests strengeren Prüfungen ein.
+"""
+
+from ai_erp.settings import *  # noqa: F401,F403
+
+# Überschrittene Abfrage-Budgets (@query_budget) lassen den Test fehlschlagen
+QUERY_BUDGET_STRICT = True
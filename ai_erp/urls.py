@@ -16,7 +16,7 @@ Inkludieren einer anderen URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from core.views import dashboard_view
+from core.views import dashboard_view, metrics_view, notifications_read_view, notifications_view
 
 urlpatterns = [
     # Admin Interface
@@ -24,8 +24,20 @@ urlpatterns = [
     
     # Dashboard (Root)
     path('', dashboard_view, name='dashboard'),
+
+    # Notification Center (HTMX-Partial im Header)
+    path('notifications/', notifications_view, name='notifications'),
+    path('notifications/read/', notifications_read_view, name='notifications_read'),
+
+    # Laufzeit-Metriken (Prometheus)
+    path('metrics/', metrics_view, name='metrics'),
     
     # AI Engine (Chat)
     path('ai/', include('apps.ai_engine.urls')),
+
+    # Listen (Keyset-Pagination, core.listing)
+    path('sales/', include('apps.sales.urls')),
+    path('finance/', include('apps.finance.urls')),
+    path('inventory/', include('apps.inventory.urls')),
 ]
 
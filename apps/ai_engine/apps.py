@@ -1,6 +1,20 @@
 from django.apps import AppConfig
+from django.utils.module_loading import autodiscover_modules
 
 
 class AiEngineConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.ai_engine'
+
+    def ready(self) -> None:
+        # Tool Discovery: services.py aller Apps laden, damit @register_tool greift,
+        # und den Intent-Router einmalig beim Start kompilieren.
+        autodiscover_modules('services')
+
+        from apps.ai_engine.services import get_router
+        get_router()
+
+        # Retrieval-Index: gespeicherte/gelöschte Datensätze der mit
+        # @retrieval_source angemeldeten Models ins Änderungsprotokoll schreiben
+        from apps.ai_engine.retrieval import connect_signals
+        connect_signals()
@@ -0,0 +1,68 @@
+"""
+Benchmark für den Retrieval-Index der AI Engine.
+
+Baut einen synthetischen Index (Zipf-verteiltes Vokabular, wie in natürlicher
+Sprache) im Speicher auf und misst die Antwortzeit von Top-k-Suchen sowie
+inkrementeller Änderungen. Der Index auf der Platte bleibt unverändert.
+
+Aufruf:
+    python manage.py benchmark_rag_index --chunks 1000000 --queries 500
+"""
+
+import random
+import statistics
+import time
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.ai_engine.retrieval import Document, SearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Misst die Suchzeit des Retrieval-Index (p50/p95) für viele Chunks.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--chunks', type=int, default=1_000_000, help='Anzahl Chunks')
+        parser.add_argument('--words', type=int, default=40, help='Wörter je Chunk')
+        parser.add_argument('--vocabulary', type=int, default=50_000, help='Größe des Vokabulars')
+        parser.add_argument('--queries', type=int, default=500, help='Anzahl Suchanfragen')
+        parser.add_argument('--k', type=int, default=10, help='Treffer je Suche')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        rng = random.Random(options['seed'])
+        vocabulary = [f'wort{number}' for number in range(options['vocabulary'])]
+        weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def text(words: int) -> str:
+            return ' '.join(rng.choices(vocabulary, cum_weights=weights, k=words))
+
+        started = time.perf_counter()
+        index = SearchIndex.build(
+            Document(f'bench:{number}', f'Chunk {number}', text(options['words']))
+            for number in range(options['chunks'])
+        )
+        build_seconds = time.perf_counter() - started
+
+        queries = [text(rng.randint(2, 5)) for _ in range(options['queries'])]
+        durations = []
+        for query in queries:
+            started = time.perf_counter()
+            results = index.search(query, options['k'])
+            durations.append((time.perf_counter() - started) * 1000)
+            if not results:
+                raise CommandError(f"Keine Treffer für '{query}'.")
+
+        started = time.perf_counter()
+        for number in range(1_000):
+            index.add(Document(f'bench:{rng.randrange(options["chunks"])}', f'Neu {number}', text(options['words'])))
+        update_ms = (time.perf_counter() - started) * 1000 / 1_000
+
+        durations.sort()
+        self.stdout.write(f"Chunks:          {len(index):,} ({len(index.postings):,} Terme)")
+        self.stdout.write(f"Aufbau:          {build_seconds:.1f} s")
+        self.stdout.write(f"Suche p50:       {statistics.median(durations):.2f} ms")
+        self.stdout.write(f"Suche p95:       {durations[int(len(durations) * 0.95) - 1]:.2f} ms")
+        self.stdout.write(f"Änderung:        {update_ms:.2f} ms je Chunk")
+        self.stdout.write(self.style.SUCCESS(f"Suche max:       {durations[-1]:.2f} ms"))
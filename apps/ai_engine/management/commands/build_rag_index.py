@@ -0,0 +1,29 @@
+"""
+Baut den Retrieval-Index der AI Engine neu auf.
+
+Indiziert die Wissensdokumente und alle mit `@retrieval_source` angemeldeten
+Models. Zwischen zwei Läufen übernimmt der Index Änderungen inkrementell aus
+dem Änderungsprotokoll; ein regelmäßiger Neuaufbau (z.B. nächtlich)
+berücksichtigt zusätzlich Bulk-Operationen und räumt gelöschte Einträge auf.
+
+Aufruf:
+    python manage.py build_rag_index
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.ai_engine.retrieval import build_index
+
+
+class Command(BaseCommand):
+    help = 'Baut den lokalen Retrieval-Index (BM25, optional Vektoren) neu auf.'
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        index = build_index()
+        seconds = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(index)} Chunks, {len(index.postings)} Terme in {seconds:.2f} s indiziert."
+        ))
@@ -0,0 +1,253 @@
+"""
+Gesprächsgedächtnis (Conversation Memory) der AI Engine.
+
+Je Session werden die letzten `MEMORY_TURNS` Nachrichten in einem
+Ringpuffer fester Größe gehalten. Ältere Nachrichten werden beim Verdrängen
+zu einer kompakten Zusammenfassung gefaltet (eine Kurzzeile je Anfrage,
+höchstens `SUMMARY_LINES`). Der Prompt-Kontext ist auf `CONTEXT_CHARS`
+Zeichen begrenzt.
+
+Der Aufwand je neuer Nachricht (Laden, Anhängen, Speichern) hängt damit nur
+von der Puffergröße ab, nicht von der Länge des Gesprächs. Gespeichert wird
+ein gepacktes Binärformat im Cache, damit die Chat-Views zustandslos über
+mehrere Worker bleiben. Laden, Anhängen und Speichern laufen unter einer
+Sperre je Session (`cache.add`), damit parallele Requests derselben Session
+keine Nachrichten überschreiben.
+"""
+
+import struct
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+from django.core.cache import cache
+
+
+# Anzahl Nachrichten im Ringpuffer je Session
+MEMORY_TURNS = 20
+
+# Maximale Länge einer gespeicherten Nachricht (Zeichen)
+MAX_TURN_CHARS = 1000
+
+# Anzahl Zeilen der Zusammenfassung älterer Nachrichten
+SUMMARY_LINES = 10
+
+# Länge einer Zusammenfassungszeile (Zeichen)
+SUMMARY_LINE_CHARS = 120
+
+# Obergrenze des Prompt-Kontexts (Zeichen)
+CONTEXT_CHARS = 4000
+
+# Lebensdauer eines Gesprächs ohne neue Nachricht (Sekunden)
+MEMORY_TIMEOUT = 24 * 60 * 60
+
+# Maximale Haltedauer der Sperre je Session, danach verfällt sie (Sekunden)
+LOCK_TIMEOUT = 5
+POLL_INTERVAL = 0.01
+
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct('<BHHIB')   # Version, Kapazität, Anzahl, gefaltete Nachrichten, Zusammenfassungszeilen
+_TURN = struct.Struct('<BIHB')      # Rolle, Zeitstempel, Textlänge (Bytes), Tool-Länge (Bytes)
+_LINE = struct.Struct('<H')         # Länge einer Zusammenfassungszeile (Bytes)
+
+
+class Turn:
+    """Eine Nachricht im Gesprächsverlauf."""
+
+    __slots__ = ('role', 'text', 'tool', 'at')
+
+    USER = 0
+    ASSISTANT = 1
+
+    def __init__(self, role: int, text: str, tool: str = '', at: Optional[int] = None) -> None:
+        self.role = role
+        self.text = text[:MAX_TURN_CHARS]
+        self.tool = tool
+        self.at = int(time.time()) if at is None else at
+
+    def __repr__(self) -> str:
+        return f"Turn({'user' if self.role == self.USER else 'assistant'}, {self.text[:30]!r})"
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = ' '.join(text.split())
+    return text if len(text) <= limit else text[:limit - 1] + '…'
+
+
+class ConversationMemory:
+    """
+    Ringpuffer der letzten Nachrichten plus Zusammenfassung der älteren.
+
+    `append` und `context` arbeiten in O(Kapazität), unabhängig davon, wie
+    viele Nachrichten das Gespräch insgesamt hat.
+    """
+
+    __slots__ = ('capacity', '_turns', '_start', '_size', 'summary', 'folded')
+
+    def __init__(self, capacity: int = MEMORY_TURNS) -> None:
+        self.capacity = capacity
+        self._turns: List[Optional[Turn]] = [None] * capacity
+        self._start = 0
+        self._size = 0
+        self.summary: deque = deque(maxlen=SUMMARY_LINES)
+        self.folded = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, turn: Turn) -> None:
+        """Hängt eine Nachricht an; bei vollem Puffer wird die älteste gefaltet."""
+        if self._size < self.capacity:
+            self._turns[(self._start + self._size) % self.capacity] = turn
+            self._size += 1
+            return
+        self._fold(self._turns[self._start])
+        self._turns[self._start] = turn
+        self._start = (self._start + 1) % self.capacity
+
+    def _fold(self, turn: Turn) -> None:
+        """Übernimmt eine verdrängte Nachricht in die Zusammenfassung (eine Zeile je Anfrage)."""
+        self.folded += 1
+        if turn.role == Turn.USER:
+            self.summary.append(_shorten(f"Nutzer: {turn.text}", SUMMARY_LINE_CHARS))
+        elif turn.tool and self.summary and '→' not in self.summary[-1]:
+            self.summary[-1] = _shorten(f"{self.summary[-1]} → {turn.tool}", SUMMARY_LINE_CHARS + 40)
+
+    def turns(self) -> List[Turn]:
+        """Nachrichten im Puffer, älteste zuerst."""
+        return [self._turns[(self._start + index) % self.capacity] for index in range(self._size)]
+
+    def context(self, max_chars: int = CONTEXT_CHARS) -> str:
+        """
+        Baut den Prompt-Kontext: Zusammenfassung und die neuesten Nachrichten, die in das Limit passen.
+
+        Args:
+            max_chars: Obergrenze in Zeichen
+
+        Returns:
+            str: Kontext in chronologischer Reihenfolge
+        """
+        header = ''
+        if self.summary:
+            header = f"Bisheriger Verlauf ({self.folded} ältere Nachrichten):\n" + '\n'.join(self.summary) + '\n'
+            header = header[:max_chars // 2]
+        budget = max_chars - len(header)
+        lines: List[str] = []
+        for turn in reversed(self.turns()):
+            speaker = 'Nutzer' if turn.role == Turn.USER else 'Assistent'
+            line = f"{speaker}: {turn.text}"
+            if len(line) + 1 > budget:
+                break
+            lines.append(line)
+            budget -= len(line) + 1
+        return header + '\n'.join(reversed(lines))
+
+    def to_bytes(self) -> bytes:
+        """Serialisiert den Speicher in ein kompaktes Binärformat."""
+        parts = [_HEADER.pack(_FORMAT_VERSION, self.capacity, self._size, self.folded, len(self.summary))]
+        for turn in self.turns():
+            text = turn.text.encode()
+            tool = turn.tool.encode()[:255]
+            parts.append(_TURN.pack(turn.role, turn.at, len(text), len(tool)))
+            parts.append(text)
+            parts.append(tool)
+        for line in self.summary:
+            encoded = line.encode()
+            parts.append(_LINE.pack(len(encoded)))
+            parts.append(encoded)
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, capacity: int = MEMORY_TURNS) -> 'ConversationMemory':
+        """
+        Liest einen mit `to_bytes` gespeicherten Speicher.
+
+        Bei geänderter Kapazität bleiben die neuesten Nachrichten erhalten;
+        unbekannte Formate ergeben einen leeren Speicher.
+        """
+        memory = cls(capacity)
+        if not data or data[0] != _FORMAT_VERSION:
+            return memory
+        _, _, count, folded, summary_lines = _HEADER.unpack_from(data)
+        offset = _HEADER.size
+        for _ in range(count):
+            role, at, text_length, tool_length = _TURN.unpack_from(data, offset)
+            offset += _TURN.size
+            text = data[offset:offset + text_length].decode()
+            offset += text_length
+            tool = data[offset:offset + tool_length].decode()
+            offset += tool_length
+            memory.append(Turn(role, text, tool, at))
+        summary = []
+        for _ in range(summary_lines):
+            (length,) = _LINE.unpack_from(data, offset)
+            offset += _LINE.size
+            summary.append(data[offset:offset + length].decode())
+            offset += length
+        # Beim Laden Verdrängtes liegt zeitlich nach der gespeicherten Zusammenfassung
+        memory.summary = deque(summary + list(memory.summary), maxlen=SUMMARY_LINES)
+        memory.folded += folded
+        return memory
+
+
+def _cache_key(session_key: str) -> str:
+    return f'ai_engine:memory:{session_key}'
+
+
+def load_memory(session_key: str) -> ConversationMemory:
+    """
+    Lädt das Gesprächsgedächtnis einer Session (leer, wenn keines existiert).
+
+    Args:
+        session_key: Session-Schlüssel des Benutzers
+
+    Returns:
+        ConversationMemory: Gedächtnis der Session
+    """
+    return ConversationMemory.from_bytes(cache.get(_cache_key(session_key)) or b'')
+
+
+def remember(session_key: str, turns: Iterable[Turn]) -> ConversationMemory:
+    """
+    Hängt Nachrichten an das Gedächtnis einer Session an und speichert es.
+
+    Wartet auf andere Requests derselben Session (höchstens `LOCK_TIMEOUT`).
+
+    Args:
+        session_key: Session-Schlüssel des Benutzers
+        turns: Neue Nachrichten (z.B. Anfrage und Antwort)
+
+    Returns:
+        ConversationMemory: Aktualisiertes Gedächtnis
+    """
+    lock_key = f'{_cache_key(session_key)}:lock'
+    # Die Sperre verfällt nach LOCK_TIMEOUT: ein abgebrochener Worker blockiert die Session nicht dauerhaft
+    while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        time.sleep(POLL_INTERVAL)
+    try:
+        memory = load_memory(session_key)
+        for turn in turns:
+            memory.append(turn)
+        cache.set(_cache_key(session_key), memory.to_bytes(), MEMORY_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+    return memory
+
+
+def get_prompt_context(session_key: str, max_chars: int = CONTEXT_CHARS) -> str:
+    """
+    Liefert den begrenzten Gesprächskontext einer Session für Prompts.
+
+    Args:
+        session_key: Session-Schlüssel des Benutzers
+        max_chars: Obergrenze in Zeichen
+
+    Returns:
+        str: Zusammenfassung und neueste Nachrichten
+    """
+    return load_memory(session_key).context(max_chars)
+
+
+def forget(session_key: str) -> None:
+    """Löscht das Gesprächsgedächtnis einer Session (z.B. 'Neues Gespräch')."""
+    cache.delete(_cache_key(session_key))
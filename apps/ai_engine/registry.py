@@ -0,0 +1,145 @@
+"""
+Tool Registry für die AI Engine.
+
+Apps markieren ihre Service-Funktionen mit `@register_tool`, damit die AI Engine
+sie zur Laufzeit entdecken kann, ohne sie direkt zu importieren (Registry-Pattern,
+siehe `.agent/rules/ai-architecture-layers.md`).
+
+Beispiel (in `apps/sales/services.py`):
+
+    from apps.ai_engine.registry import register_tool
+
+    @register_tool(
+        name='create_invoice_draft',
+        description='Erstellt einen Rechnungsentwurf.',
+        keywords=['rechnung'],
+        template='sales/partials/chat_message_ai.html',
+    )
+    def create_invoice_draft(user) -> dict:
+        ...
+"""
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Tool:
+    """
+    Beschreibung eines AI-aufrufbaren Tools.
+
+    Attributes:
+        name: Eindeutiger Tool-Name
+        description: Beschreibung für die KI (entspricht dem System Prompt des Tools)
+        func: Aufzurufende Service-Funktion, erhält den User als erstes Argument
+        keywords: Literale Schlüsselwörter für das Intent-Routing (case-insensitive)
+        patterns: Reguläre Ausdrücke für das Intent-Routing (ohne erfassende Gruppen)
+        permission: Erforderliche Berechtigung (z.B. 'sales.add_invoice') oder None
+        template: HTMX-Partial, mit dem das Ergebnis im Chat gerendert wird
+        priority: Höhere Priorität gewinnt bei Treffern an derselben Position
+    """
+
+    name: str
+    description: str
+    func: Callable
+    keywords: tuple = ()
+    patterns: tuple = ()
+    permission: Optional[str] = None
+    template: Optional[str] = None
+    priority: int = 0
+
+
+_registry: Dict[str, Tool] = {}
+_listeners: List[Callable[[], None]] = []
+
+
+def _validate_pattern(name: str, pattern: str) -> None:
+    """
+    Prüft ein Routing-Pattern, bevor es in den gemeinsamen Ausdruck des Routers eingeht.
+
+    Der `IntentRouter` verbindet alle Patterns zu einem Ausdruck mit einer
+    benannten Gruppe je Tool. Eigene Gruppen würden dort mit dessen Gruppen
+    kollidieren (Namen, Nummern für Rückverweise); Inline-Flags wie `(?i)` sind
+    nur am Anfang eines Ausdrucks erlaubt.
+    """
+    try:
+        compiled = re.compile(f'(?:{pattern})')
+    except re.error as exc:
+        raise ValueError(f"Tool '{name}': ungültiges Pattern {pattern!r} ({exc}).") from None
+    if compiled.groups:
+        raise ValueError(
+            f"Tool '{name}': Pattern {pattern!r} enthält erfassende Gruppen; '(?:...)' verwenden."
+        )
+
+
+def register_tool(
+    name: str,
+    description: str,
+    keywords: Optional[List[str]] = None,
+    patterns: Optional[List[str]] = None,
+    permission: Optional[str] = None,
+    template: Optional[str] = None,
+    priority: int = 0,
+) -> Callable:
+    """
+    Decorator, um eine Funktion als AI-aufrufbares Tool zu registrieren.
+
+    Args:
+        name: Eindeutiger Tool-Name
+        description: Beschreibung für die KI
+        keywords: Schlüsselwörter, die dieses Tool auslösen
+        patterns: Reguläre Ausdrücke, die dieses Tool auslösen (Gruppen nur als `(?:...)`)
+        permission: Erforderliche Berechtigung für die Ausführung
+        template: Template für die Darstellung des Ergebnisses im Chat
+        priority: Priorität bei mehrdeutigen Treffern
+
+    Returns:
+        Callable: Decorator, der die Funktion unverändert zurückgibt
+
+    Raises:
+        ValueError: Wenn ein anderes Tool bereits unter diesem Namen registriert ist
+                    oder ein Pattern ungültig ist bzw. erfassende Gruppen enthält
+    """
+    for pattern in patterns or ():
+        _validate_pattern(name, pattern)
+
+    def decorator(func: Callable) -> Callable:
+        existing = _registry.get(name)
+        if existing is not None and existing.func.__qualname__ != func.__qualname__:
+            raise ValueError(f"Tool '{name}' ist bereits registriert.")
+
+        _registry[name] = Tool(
+            name=name,
+            description=description,
+            func=func,
+            keywords=tuple(keywords or ()),
+            patterns=tuple(patterns or ()),
+            permission=permission,
+            template=template,
+            priority=priority,
+        )
+        for listener in _listeners:
+            listener()
+        return func
+
+    return decorator
+
+
+def get_tool(name: str) -> Optional[Tool]:
+    """Gibt das registrierte Tool mit diesem Namen zurück (oder None)."""
+    return _registry.get(name)
+
+
+def get_tools() -> List[Tool]:
+    """Gibt alle registrierten Tools in Registrierungsreihenfolge zurück."""
+    return list(_registry.values())
+
+
+def on_registry_change(listener: Callable[[], None]) -> None:
+    """
+    Registriert einen Callback, der bei jeder Änderung der Registry aufgerufen wird.
+
+    Wird vom Intent-Router genutzt, um seinen kompilierten Automaten zu verwerfen.
+    """
+    _listeners.append(listener)
@@ -0,0 +1,683 @@
+"""
+Lokaler Retrieval-Index (RAG) der AI Engine.
+
+Indiziert die Wissensdokumente (`settings.RAG_KNOWLEDGE_DIRS`, z.B.
+`.agent/knowledge/`) und ERP-Datensätze, die Apps mit `@retrieval_source`
+anmelden (analog zu `@register_tool`). Es wird weder eine externe
+Vektordatenbank noch Netzwerk benötigt.
+
+Aufbau:
+- Invertierter BM25-Index im Prozess. Je Term sind die Postings nach ihrem
+  BM25-Beitrag (Impact) absteigend sortiert. Eine Suche liest je Term
+  höchstens `CANDIDATES_PER_TERM` Einträge. Die Antwortzeit hängt damit
+  nicht von der Indexgröße ab (exakt für seltene Terme, Näherung für sehr
+  häufige).
+- Optional dichte Vektoren (`settings.RAG_EMBEDDER`, benötigt NumPy) in einer
+  memory-mapped `.npy`-Datei. Damit werden die BM25-Kandidaten neu
+  gewichtet.
+- Persistenz in `settings.RAG_INDEX_DIR`:
+  - `index.pickle` ist der Snapshot (`manage.py build_rag_index`).
+  - `delta.jsonl` ist das Änderungsprotokoll. Gespeicherte und gelöschte
+    Datensätze werden nach dem Commit angehängt und von jedem Prozess vor
+    der Suche nachgeladen (inkrementell, auch über mehrere Worker).
+    Jeder Neuaufbau beginnt ein neues Protokoll; das alte wird nach dem
+    Speichern des Snapshots gelöscht.
+"""
+
+import bisect
+import heapq
+import json
+import math
+import os
+import pickle
+import re
+import threading
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import islice
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+from core.metrics import timed
+
+
+# BM25-Parameter
+K1 = 1.2
+B = 0.75
+
+# Gelesene Postings je Suchterm (höchste Impacts zuerst)
+CANDIDATES_PER_TERM = 2000
+
+# Zielgröße eines Wissens-Chunks (Zeichen)
+CHUNK_CHARS = 800
+
+# Gespeicherter Textausschnitt je Chunk (Zeichen)
+SNIPPET_CHARS = 300
+
+# Kandidaten je Treffer, die mit dichten Vektoren neu gewichtet werden
+RERANK_FACTOR = 10
+
+# Anteil der Vektor-Ähnlichkeit am Gesamtscore
+DENSE_WEIGHT = 0.3
+
+# Batchgröße für den Embedder
+EMBED_BATCH_SIZE = 256
+
+SNAPSHOT_FILE = 'index.pickle'
+VECTORS_FILE = 'vectors.npy'
+DELTA_FILE = 'delta.jsonl'
+ROTATED_DELTA_FILE = 'delta.jsonl.old'
+
+_SNAPSHOT_VERSION = 2
+
+_TOKEN = re.compile(r'\w+')
+STOPWORDS = frozenset(
+    'der die das den dem des ein eine einer eines einem einen und oder aber '
+    'in im ist sind war wird werden zu zum zur mit von vom für auf an am als '
+    'bei nach aus bis nicht auch es sie er wie so dass the and of to for'.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Zerlegt Text in Suchterme (klein geschrieben, ohne Stoppwörter).
+
+    Args:
+        text: Beliebiger Text
+
+    Returns:
+        List[str]: Terme in Reihenfolge des Auftretens
+    """
+    return [token for token in _TOKEN.findall(text.lower()) if len(token) > 1 and token not in STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Document:
+    """Ein indizierbarer Chunk (Schlüssel z.B. 'product:12' oder 'knowledge:gobd.md#3')."""
+
+    key: str
+    title: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SearchResult:
+    """Treffer einer Suche."""
+
+    key: str
+    title: str
+    snippet: str
+    score: float
+
+
+def _impact(tf: int, length: int, average_length: float) -> float:
+    return tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / average_length))
+
+
+class SearchIndex:
+    """
+    BM25-Index mit impact-sortierten Postings.
+
+    Je Term: Dokument-IDs (`array('I')`) und negierte Impacts (`array('f')`,
+    aufsteigend, d.h. höchster Beitrag zuerst). Gelöschte Dokumente bleiben
+    bis zum nächsten Neuaufbau in den Postings und werden bei der Suche
+    übersprungen.
+    """
+
+    def __init__(self) -> None:
+        self.keys: List[Optional[str]] = []     # Dokument-ID → Schlüssel (None = gelöscht)
+        self.titles: List[str] = []
+        self.snippets: List[str] = []
+        self.lengths = array('I')
+        self.doc_ids: Dict[str, int] = {}       # Schlüssel → aktuelle Dokument-ID
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.total_length = 0
+        self.vectors = None                      # np.memmap (Zeile = Dokument-ID) oder None
+        self.extra_vectors: Dict[int, object] = {}
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    @property
+    def average_length(self) -> float:
+        return self.total_length / len(self.doc_ids) if self.doc_ids else 1.0
+
+    def _append_document(self, document: Document, length: int) -> int:
+        doc_id = len(self.keys)
+        self.keys.append(document.key)
+        self.titles.append(document.title)
+        self.snippets.append(' '.join(document.text.split())[:SNIPPET_CHARS])
+        self.lengths.append(length)
+        self.doc_ids[document.key] = doc_id
+        self.total_length += length
+        return doc_id
+
+    @classmethod
+    def build(cls, documents: Iterable[Document]) -> 'SearchIndex':
+        """
+        Baut einen Index in zwei Durchläufen (Terme sammeln, dann je Term nach Impact sortieren).
+
+        Args:
+            documents: Alle Chunks
+
+        Returns:
+            SearchIndex: Neuer Index
+        """
+        index = cls()
+        term_ids: Dict[str, array] = {}
+        term_tfs: Dict[str, array] = {}
+        for document in documents:
+            if document.key in index.doc_ids:
+                index.remove(document.key)
+            counts = Counter(tokenize(f'{document.title} {document.text}'))
+            doc_id = index._append_document(document, sum(counts.values()))
+            for term, tf in counts.items():
+                ids = term_ids.get(term)
+                if ids is None:
+                    ids = term_ids[term] = array('I')
+                    term_tfs[term] = array('H')
+                ids.append(doc_id)
+                term_tfs[term].append(min(tf, 65535))
+
+        average_length = index.average_length
+        lengths = index.lengths
+        while term_ids:
+            term, ids = term_ids.popitem()
+            tfs = term_tfs.pop(term)
+            impacts = [-_impact(tf, lengths[doc_id], average_length) for doc_id, tf in zip(ids, tfs)]
+            order = sorted(range(len(ids)), key=impacts.__getitem__)
+            index.postings[term] = (
+                array('I', (ids[position] for position in order)),
+                array('f', (impacts[position] for position in order)),
+            )
+        return index
+
+    def add(self, document: Document) -> None:
+        """Fügt einen Chunk hinzu oder ersetzt ihn (gleicher Schlüssel)."""
+        if document.key in self.doc_ids:
+            self.remove(document.key)
+        counts = Counter(tokenize(f'{document.title} {document.text}'))
+        length = sum(counts.values())
+        doc_id = self._append_document(document, length)
+        average_length = self.average_length
+        for term, tf in counts.items():
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = (array('I'), array('f'))
+            ids, impacts = posting
+            negative_impact = -_impact(tf, length, average_length)
+            position = bisect.bisect_right(impacts, negative_impact)
+            ids.insert(position, doc_id)
+            impacts.insert(position, negative_impact)
+
+    def remove(self, key: str) -> None:
+        """Entfernt einen Chunk (falls vorhanden)."""
+        doc_id = self.doc_ids.pop(key, None)
+        if doc_id is None:
+            return
+        self.keys[doc_id] = None
+        self.total_length -= self.lengths[doc_id]
+        self.extra_vectors.pop(doc_id, None)
+
+    def remove_prefix(self, prefix: str) -> None:
+        """Entfernt alle Chunks, deren Schlüssel mit `prefix` beginnt (z.B. alle Chunks eines Dokuments)."""
+        for key in [key for key in self.doc_ids if key.startswith(prefix)]:
+            self.remove(key)
+
+    def score(self, query: str) -> Dict[int, float]:
+        """BM25-Scores der Kandidaten je Dokument-ID."""
+        total = max(len(self.doc_ids), 1)
+        keys = self.keys
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            posting = self.postings.get(term)
+            if posting is None:
+                continue
+            ids, impacts = posting
+            document_frequency = len(ids)
+            idf = math.log(1 + (total - document_frequency + 0.5) / (document_frequency + 0.5))
+            for doc_id, negative_impact in zip(islice(ids, CANDIDATES_PER_TERM), islice(impacts, CANDIDATES_PER_TERM)):
+                if keys[doc_id] is not None:
+                    scores[doc_id] = scores.get(doc_id, 0.0) - negative_impact * idf
+        return scores
+
+    def search(self, query: str, k: int = 5, prefix: Optional[str] = None,
+               embedder: Optional[Callable] = None) -> List[SearchResult]:
+        """
+        Sucht die `k` besten Chunks.
+
+        Args:
+            query: Suchtext
+            k: Anzahl Treffer
+            prefix: Nur Schlüssel mit diesem Präfix (z.B. 'product:')
+            embedder: Embedder für die Neugewichtung mit dichten Vektoren
+
+        Returns:
+            List[SearchResult]: Beste Treffer zuerst
+        """
+        scores = self.score(query)
+        candidates = scores.items()
+        if prefix:
+            candidates = [(doc_id, score) for doc_id, score in candidates if self.keys[doc_id].startswith(prefix)]
+        use_dense = embedder is not None and self.vectors is not None
+        top = heapq.nlargest(k * RERANK_FACTOR if use_dense else k, candidates, key=lambda item: item[1])
+        if use_dense and top:
+            top = self._rerank(query, top, embedder)[:k]
+        return [
+            SearchResult(self.keys[doc_id], self.titles[doc_id], self.snippets[doc_id], round(score, 4))
+            for doc_id, score in top
+        ]
+
+    def _vector(self, doc_id: int):
+        if doc_id in self.extra_vectors:
+            return self.extra_vectors[doc_id]
+        if doc_id < len(self.vectors):
+            return self.vectors[doc_id]
+        return None
+
+    def _rerank(self, query: str, top: List[Tuple[int, float]], embedder: Callable) -> List[Tuple[int, float]]:
+        query_vector = _normalize(embedder([query]))[0]
+        best = top[0][1] or 1.0
+        reranked = []
+        for doc_id, score in top:
+            vector = self._vector(doc_id)
+            similarity = float(vector @ query_vector) if vector is not None else 0.0
+            reranked.append((doc_id, (1 - DENSE_WEIGHT) * score / best + DENSE_WEIGHT * similarity))
+        reranked.sort(key=lambda item: item[1], reverse=True)
+        return reranked
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state['vectors'] = None
+        state['extra_vectors'] = {}
+        return state
+
+
+# --- Quellen ----------------------------------------------------------------
+
+@dataclass(frozen=True)
+class RetrievalSource:
+    """Model, dessen Datensätze indiziert werden."""
+
+    model_label: str
+    prefix: str
+    to_text: Callable[[object], Tuple[str, str]]
+
+    def document(self, instance) -> Document:
+        title, text = self.to_text(instance)
+        return Document(f'{self.prefix}:{instance.pk}', title, text)
+
+    def documents(self) -> Iterator[Document]:
+        from django.apps import apps
+
+        model = apps.get_model(self.model_label)
+        for instance in model._default_manager.order_by('pk').iterator(chunk_size=2000):
+            yield self.document(instance)
+
+
+_sources: Dict[str, RetrievalSource] = {}
+
+
+def retrieval_source(model_label: str, prefix: str) -> Callable:
+    """
+    Decorator: meldet ein Model für den Retrieval-Index an.
+
+    Die dekorierte Funktion liefert (Titel, Text) eines Datensatzes. Speichern
+    und Löschen über das ORM aktualisieren den Index automatisch; Bulk-
+    Operationen (`bulk_create`, `update`) erst beim nächsten Neuaufbau.
+
+    Beispiel:
+        @retrieval_source('inventory.Product', prefix='product')
+        def product_search_text(product: Product) -> Tuple[str, str]:
+            return str(product), f"Artikel {product.sku}: {product.name}"
+    """
+    def decorator(func: Callable) -> Callable:
+        _sources[model_label] = RetrievalSource(model_label, prefix, func)
+        return func
+    return decorator
+
+
+def get_sources() -> List[RetrievalSource]:
+    """Alle angemeldeten Quellen."""
+    return list(_sources.values())
+
+
+def chunk_markdown(name: str, text: str) -> Iterator[Document]:
+    """
+    Teilt ein Markdown-Dokument an Überschriften und Absätzen in Chunks von etwa `CHUNK_CHARS`.
+
+    Args:
+        name: Dateiname (Teil des Schlüssels)
+        text: Markdown-Inhalt
+
+    Returns:
+        Iterator[Document]: Chunks mit Schlüssel 'knowledge:<name>#<n>'
+    """
+    title = name
+    heading = ''
+    buffer: List[str] = []
+    number = 0
+
+    def flush() -> Optional[Document]:
+        nonlocal number
+        body = '\n\n'.join(buffer).strip()
+        buffer.clear()
+        if not body:
+            return None
+        number += 1
+        label = f'{title} – {heading}' if heading and heading != title else title
+        return Document(f'knowledge:{name}#{number}', label, body)
+
+    for block in re.split(r'\n\s*\n', text):
+        block = block.strip()
+        if block.startswith('#'):
+            document = flush()
+            if document:
+                yield document
+            heading = block.splitlines()[0].lstrip('#').strip()
+            if block.startswith('# '):
+                title = heading
+            block = '\n'.join(block.splitlines()[1:]).strip()
+        if block:
+            if buffer and sum(len(part) for part in buffer) + len(block) > CHUNK_CHARS:
+                document = flush()
+                if document:
+                    yield document
+            buffer.append(block)
+    document = flush()
+    if document:
+        yield document
+
+
+def knowledge_documents() -> Iterator[Document]:
+    """Chunks aller Markdown-Dateien in `settings.RAG_KNOWLEDGE_DIRS`."""
+    for directory in getattr(settings, 'RAG_KNOWLEDGE_DIRS', []):
+        for path in sorted(Path(directory).glob('**/*.md')):
+            yield from chunk_markdown(path.name, path.read_text(encoding='utf-8'))
+
+
+def all_documents() -> Iterator[Document]:
+    """Wissensdokumente und alle Datensätze der angemeldeten Quellen."""
+    yield from knowledge_documents()
+    for source in get_sources():
+        yield from source.documents()
+
+
+# --- Persistenz und Änderungsprotokoll ----------------------------------------
+
+def _index_dir() -> Path:
+    return Path(settings.RAG_INDEX_DIR)
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Optional[Callable]:
+    """
+    Liefert den konfigurierten Embedder (`settings.RAG_EMBEDDER`) oder None.
+
+    Der Embedder ist ein Callable `texts -> Matrix (n, Dimensionen)`, z.B. ein
+    lokal geladenes Sentence-Transformer-Modell.
+
+    Raises:
+        ImproperlyConfigured: Embedder konfiguriert, aber NumPy nicht installiert
+    """
+    path = getattr(settings, 'RAG_EMBEDDER', '')
+    if not path:
+        return None
+    try:
+        import numpy  # noqa: F401
+    except ImportError as exc:
+        raise ImproperlyConfigured('RAG_EMBEDDER benötigt NumPy (pip install numpy).') from exc
+    return import_string(path)
+
+
+def _normalize(matrix):
+    import numpy as np
+
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def _write_vectors(index: SearchIndex, documents: List[Document], path: Path, embedder: Callable) -> None:
+    """Berechnet die Vektoren aller Chunks (Zeile = Dokument-ID; ersetzte Chunks bleiben Null)."""
+    import numpy as np
+
+    vectors = None
+    for start in range(0, len(documents), EMBED_BATCH_SIZE):
+        batch = documents[start:start + EMBED_BATCH_SIZE]
+        embedded = _normalize(embedder([f'{document.title}\n{document.text}' for document in batch]))
+        if vectors is None:
+            vectors = np.lib.format.open_memmap(
+                path, mode='w+', dtype=np.float32, shape=(len(index.keys), embedded.shape[1]),
+            )
+        for document, vector in zip(batch, embedded):
+            vectors[index.doc_ids[document.key]] = vector
+    vectors.flush()
+
+
+def build_index(documents: Optional[Iterable[Document]] = None) -> SearchIndex:
+    """
+    Baut den Index neu auf und speichert Snapshot und Vektoren in `settings.RAG_INDEX_DIR`.
+
+    Vor dem Lesen der Daten wird das Änderungsprotokoll rotiert: Alle Einträge
+    des alten Protokolls sind bereits committet und im Neuaufbau enthalten.
+    Der Snapshot verweist auf das neue Protokoll (Inode, ab Anfang); das alte
+    wird gelöscht, sobald der Snapshot gespeichert ist. Einträge, die während
+    des Aufbaus im neuen Protokoll landen, werden nach dem Laden erneut
+    angewendet, was idempotent ist.
+
+    Args:
+        documents: Chunks (Standard: Wissensdokumente und alle Quellen)
+
+    Returns:
+        SearchIndex: Neuer Index
+    """
+    directory = _index_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    delta_path = directory / DELTA_FILE
+    rotated_path = directory / ROTATED_DELTA_FILE
+    if delta_path.exists():
+        os.replace(delta_path, rotated_path)
+    delta_path.touch()
+    delta_inode = delta_path.stat().st_ino
+
+    documents = all_documents() if documents is None else documents
+    embedder = get_embedder()
+    if embedder:
+        documents = list(documents)
+    index = SearchIndex.build(documents)
+
+    if embedder and index.keys:
+        temporary = directory / f'{VECTORS_FILE}.tmp.npy'
+        _write_vectors(index, documents, temporary, embedder)
+        os.replace(temporary, directory / VECTORS_FILE)
+
+    temporary = directory / f'{SNAPSHOT_FILE}.tmp'
+    with open(temporary, 'wb') as file:
+        pickle.dump({'version': _SNAPSHOT_VERSION, 'index': index, 'delta_inode': delta_inode, 'delta_offset': 0},
+                    file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, directory / SNAPSHOT_FILE)
+    rotated_path.unlink(missing_ok=True)
+    return index
+
+
+def record_change(key: str, document: Optional[Document] = None) -> None:
+    """
+    Hängt eine Änderung an das Änderungsprotokoll an (ohne Dokument: Löschung).
+
+    Args:
+        key: Schlüssel des Chunks
+        document: Neuer Inhalt
+    """
+    entry = {'key': key}
+    if document is not None:
+        entry.update(title=document.title, text=document.text)
+    directory = _index_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    # Eine Zeile je Änderung im Append-Modus: parallele Prozesse schreiben nicht ineinander
+    with open(directory / DELTA_FILE, 'a', encoding='utf-8') as file:
+        file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+
+
+class _LoadedIndex:
+    """Index des Prozesses mit Stand des Snapshots und des Änderungsprotokolls."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.index = SearchIndex()
+        self.snapshot_mtime: Optional[float] = None
+        self.delta_inode: Optional[int] = None    # None = das aktuelle Protokoll ab Anfang
+        self.delta_offset = 0
+
+    def refresh(self) -> SearchIndex:
+        """Lädt einen neuen Snapshot und wendet neue Einträge des Änderungsprotokolls an."""
+        directory = _index_dir()
+        try:
+            mtime = (directory / SNAPSHOT_FILE).stat().st_mtime
+        except FileNotFoundError:
+            mtime = None
+        if mtime != self.snapshot_mtime:
+            self._load_snapshot(directory, mtime)
+        self._apply_deltas(directory)
+        return self.index
+
+    def _load_snapshot(self, directory: Path, mtime: Optional[float]) -> None:
+        index, delta_inode, delta_offset = SearchIndex(), None, 0
+        if mtime is not None:
+            with open(directory / SNAPSHOT_FILE, 'rb') as file:
+                snapshot = pickle.load(file)
+            if snapshot.get('version') == _SNAPSHOT_VERSION:
+                index, delta_inode, delta_offset = snapshot['index'], snapshot['delta_inode'], snapshot['delta_offset']
+            if get_embedder() and (directory / VECTORS_FILE).exists():
+                import numpy as np
+
+                index.vectors = np.load(directory / VECTORS_FILE, mmap_mode='r')
+        self.index, self.snapshot_mtime = index, mtime
+        self.delta_inode, self.delta_offset = delta_inode, delta_offset
+
+    def _apply_deltas(self, directory: Path) -> None:
+        try:
+            stat = (directory / DELTA_FILE).stat()
+        except FileNotFoundError:
+            return
+        if self.delta_inode is None:
+            self.delta_inode = stat.st_ino
+        elif stat.st_ino != self.delta_inode:
+            # Ein Neuaufbau hat das Protokoll rotiert: Rest des alten, dann das neue von Anfang an.
+            # Ist das alte schon gelöscht, liegt ein neuer Snapshot vor und wird beim nächsten Aufruf geladen.
+            rotated = directory / ROTATED_DELTA_FILE
+            try:
+                if rotated.stat().st_ino == self.delta_inode:
+                    self._read_deltas(rotated)
+            except FileNotFoundError:
+                pass
+            self.delta_inode, self.delta_offset = stat.st_ino, 0
+        if stat.st_size > self.delta_offset:
+            self._read_deltas(directory / DELTA_FILE)
+
+    def _read_deltas(self, path: Path) -> None:
+        with open(path, 'rb') as file:
+            file.seek(self.delta_offset)
+            data = file.read()
+        # Nur vollständige Zeilen (ein Schreiber kann gerade anhängen)
+        complete = data[:data.rfind(b'\n') + 1]
+        self.delta_offset += len(complete)
+        embedder = get_embedder() if self.index.vectors is not None else None
+        for line in complete.splitlines():
+            entry = json.loads(line)
+            if 'text' not in entry:
+                self.index.remove(entry['key'])
+                continue
+            document = Document(entry['key'], entry['title'], entry['text'])
+            self.index.add(document)
+            if embedder:
+                vector = _normalize(embedder([f'{document.title}\n{document.text}']))[0]
+                self.index.extra_vectors[self.index.doc_ids[document.key]] = vector
+
+
+_loaded = _LoadedIndex()
+
+
+def get_index() -> SearchIndex:
+    """Aktueller Index des Prozesses (Snapshot plus Änderungsprotokoll)."""
+    with _loaded.lock:
+        return _loaded.refresh()
+
+
+@timed(name='ai_engine.retrieval.search')
+def search(query: str, k: int = 5, prefix: Optional[str] = None) -> List[SearchResult]:
+    """
+    Sucht in Wissensdokumenten und ERP-Datensätzen.
+
+    Args:
+        query: Suchtext
+        k: Anzahl Treffer
+        prefix: Nur bestimmte Quellen, z.B. 'knowledge:' oder 'product:'
+
+    Returns:
+        List[SearchResult]: Beste Treffer zuerst
+    """
+    with _loaded.lock:
+        index = _loaded.refresh()
+        return index.search(query, k, prefix, get_embedder())
+
+
+def get_retrieval_context(query: str, k: int = 5, max_chars: int = 3000) -> str:
+    """
+    Liefert die besten Treffer als Prompt-Kontext.
+
+    Args:
+        query: Suchtext (z.B. die Nachricht des Nutzers)
+        k: Anzahl Treffer
+        max_chars: Obergrenze in Zeichen
+
+    Returns:
+        str: Ein Absatz je Treffer mit Titel und Ausschnitt
+    """
+    parts = []
+    remaining = max_chars
+    for result in search(query, k):
+        part = f"[{result.title}]\n{result.snippet}"
+        if len(part) > remaining:
+            break
+        parts.append(part)
+        remaining -= len(part) + 2
+    return '\n\n'.join(parts)
+
+
+# --- Signale ------------------------------------------------------------------
+
+def _on_save(sender, instance, **kwargs) -> None:
+    from django.db import transaction
+
+    source = _sources.get(sender._meta.label)
+    if source is not None:
+        document = source.document(instance)
+        transaction.on_commit(lambda: record_change(document.key, document), robust=True)
+
+
+def _on_delete(sender, instance, **kwargs) -> None:
+    from django.db import transaction
+
+    source = _sources.get(sender._meta.label)
+    if source is not None:
+        key = f'{source.prefix}:{instance.pk}'
+        transaction.on_commit(lambda: record_change(key), robust=True)
+
+
+def connect_signals() -> None:
+    """Verbindet `post_save`/`post_delete` der angemeldeten Models (einmalig in `AiEngineConfig.ready`)."""
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    for source in get_sources():
+        model = apps.get_model(source.model_label)
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'rag_save_{source.model_label}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'rag_delete_{source.model_label}')
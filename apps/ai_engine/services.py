@@ -3,15 +3,268 @@ Service Layer für die AI Engine App.
 
 Dieses Modul wird die zentrale KI-Logik enthalten, einschließlich:
 - System Prompt Management
-- Conversation History (Memory)
+- Conversation History (Memory, siehe `apps.ai_engine.memory`)
 - Tool Registry und Discovery
-- Context Retrieval (RAG)
+- Context Retrieval (RAG, siehe `apps.ai_engine.retrieval`)
 
 Alle AI Business-Logik muss hier implementiert werden.
 """
 
-# Placeholder für zukünftige AI Service-Funktionen
-# Beispiel:
-# def register_tool(func):
-#     """Decorator, um eine Funktion als AI-aufrufbares Tool zu registrieren."""
-#     pass
+import logging
+import re
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import close_old_connections
+
+from apps.ai_engine.registry import Tool, get_tool, get_tools, on_registry_change
+
+
+# Anzahl gecachter Routing-Entscheidungen (häufige Prompts, z.B. Quick Actions)
+ROUTE_CACHE_SIZE = 1024
+
+# Gleichzeitig ausgeführte Chat-Tools je Prozess (weitere warten in der Queue des Pools)
+TOOL_RUN_WORKERS = 8
+# So lange (Sekunden) wartet ein Tool-Ergebnis im Cache auf die Auslieferung per Stream
+TOOL_RUN_TIMEOUT = 300
+
+_TOOL_RUN_KEY = 'ai_engine:tool_run:{}'
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+class IntentRouter:
+    """
+    Ordnet Chat-Nachrichten registrierten Tools zu.
+
+    Alle Keywords und Patterns der Tools werden einmalig zu einem einzigen
+    regulären Ausdruck mit einer benannten Gruppe pro Tool kompiliert.
+    Eine Nachricht wird so in einem Durchlauf geprüft, unabhängig von der
+    Anzahl registrierter Tools. Es gewinnt der am weitesten links stehende
+    Treffer; bei gleicher Position das Tool mit höherer Priorität.
+    """
+
+    def __init__(self, tools: List[Tool]) -> None:
+        self._group_to_tool = {}
+        alternatives = []
+
+        ordered = sorted(enumerate(tools), key=lambda entry: (-entry[1].priority, entry[0]))
+        for index, (_, tool) in enumerate(ordered):
+            parts = [re.escape(keyword.casefold()) for keyword in tool.keywords]
+            parts.extend(tool.patterns)
+            if not parts:
+                continue
+            group = f't{index}'
+            self._group_to_tool[group] = tool.name
+            alternatives.append(f"(?P<{group}>{'|'.join(parts)})")
+
+        self._pattern = (
+            re.compile('|'.join(alternatives), re.IGNORECASE) if alternatives else None
+        )
+
+    def match(self, normalized_message: str) -> Optional[str]:
+        """
+        Ermittelt das passende Tool für eine normalisierte Nachricht.
+
+        Args:
+            normalized_message: Nachricht nach `normalize_message`
+
+        Returns:
+            Optional[str]: Name des Tools oder None
+        """
+        if self._pattern is None:
+            return None
+        found = self._pattern.search(normalized_message)
+        return self._group_to_tool[found.lastgroup] if found else None
+
+
+_router: Optional[IntentRouter] = None
+_router_lock = threading.Lock()
+
+
+def _invalidate_router() -> None:
+    """Verwirft Automat und Routing-Cache, wenn sich die Tool Registry ändert."""
+    global _router
+    with _router_lock:
+        _router = None
+        _route_cached.cache_clear()
+
+
+def get_router() -> IntentRouter:
+    """
+    Gibt den kompilierten Intent-Router zurück (wird beim ersten Aufruf gebaut).
+
+    Returns:
+        IntentRouter: Router über alle aktuell registrierten Tools
+    """
+    global _router
+    router = _router
+    if router is None:
+        with _router_lock:
+            if _router is None:
+                _router = IntentRouter(get_tools())
+            router = _router
+    return router
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalisiert eine Nachricht für Routing und Cache-Schlüssel.
+
+    Args:
+        message: Rohe User-Nachricht
+
+    Returns:
+        str: Getrimmte, kleingeschriebene Nachricht mit einfachen Leerzeichen
+    """
+    return _WHITESPACE.sub(' ', message.strip()).casefold()
+
+
+@lru_cache(maxsize=ROUTE_CACHE_SIZE)
+def _route_cached(normalized_message: str) -> Optional[str]:
+    return get_router().match(normalized_message)
+
+
+def route_message(message: str) -> Optional[Tool]:
+    """
+    Ermittelt das Tool, das eine Chat-Nachricht bearbeiten soll.
+
+    Wiederholte Nachrichten (z.B. Dashboard Quick Actions) werden aus einem
+    LRU-Cache beantwortet, ohne den Automaten erneut zu durchlaufen.
+
+    Args:
+        message: Rohe User-Nachricht
+
+    Returns:
+        Optional[Tool]: Passendes Tool oder None, wenn keine Absicht erkannt wurde
+    """
+    name = _route_cached(normalize_message(message))
+    return get_tool(name) if name else None
+
+
+def check_tool_permission(tool: Tool, user) -> None:
+    """
+    Prüft, ob der Benutzer das Tool ausführen darf.
+
+    Raises:
+        PermissionError: Wenn dem Benutzer die erforderliche Berechtigung fehlt
+    """
+    if tool.permission and not user.has_perm(tool.permission):
+        raise PermissionError("Benutzer nicht berechtigt")
+
+
+def execute_tool(tool: Tool, user, **kwargs) -> dict:
+    """
+    Führt ein Tool nach Berechtigungsprüfung aus.
+
+    Args:
+        tool: Auszuführendes Tool
+        user: Aufrufender Benutzer
+        **kwargs: Weitere Argumente für die Service-Funktion
+
+    Returns:
+        dict: Antwort im Frontend-Protokoll ('message', 'component', 'data')
+
+    Raises:
+        PermissionError: Wenn dem Benutzer die erforderliche Berechtigung fehlt
+    """
+    check_tool_permission(tool, user)
+    return tool.func(user, **kwargs)
+
+
+@dataclass(frozen=True)
+class ToolRun:
+    """
+    Stand einer im Hintergrund gestarteten Tool-Ausführung (Cache-Eintrag).
+
+    Attributes:
+        tool: Name des Tools
+        finished: Ausführung beendet (erfolgreich oder fehlgeschlagen)
+        result: Antwort im Frontend-Protokoll; None, solange das Tool läuft oder wenn es fehlgeschlagen ist
+    """
+
+    tool: str
+    finished: bool = False
+    result: Optional[dict] = None
+
+
+_tool_executor = ThreadPoolExecutor(max_workers=TOOL_RUN_WORKERS, thread_name_prefix='chat-tool')
+
+
+def start_tool_run(tool: Tool, user) -> str:
+    """
+    Prüft die Berechtigung und startet das Tool im Hintergrund.
+
+    Die Ausführung läuft in einem begrenzten Threadpool, nicht im Request.
+    Das Ergebnis liegt danach bis zu `TOOL_RUN_TIMEOUT` Sekunden im Cache und
+    wird mit `take_tool_run` genau einmal abgeholt. Mit einem gemeinsamen
+    Cache (`CACHE_URL`, z.B. Redis) kann es auch ein anderer Worker-Prozess
+    ausliefern.
+
+    Args:
+        tool: Auszuführendes Tool
+        user: Aufrufender Benutzer
+
+    Returns:
+        str: Kennung der Ausführung für `take_tool_run`
+
+    Raises:
+        PermissionError: Wenn dem Benutzer die erforderliche Berechtigung fehlt
+    """
+    check_tool_permission(tool, user)
+    run_id = uuid.uuid4().hex
+    # Vor dem Start eintragen: ein schnelles Tool überschreibt den Eintrag sonst nicht
+    cache.set(_TOOL_RUN_KEY.format(run_id), ToolRun(tool.name), TOOL_RUN_TIMEOUT)
+    _tool_executor.submit(_run_tool, run_id, tool, user)
+    return run_id
+
+
+def _run_tool(run_id: str, tool: Tool, user) -> None:
+    """Führt das Tool im Threadpool aus und legt das Ergebnis im Cache ab."""
+    result = None
+    try:
+        result = tool.func(user)
+    except Exception:
+        logger.exception("Tool '%s' fehlgeschlagen", tool.name)
+    finally:
+        # Threads des Pools überleben den Request: Verbindungen wie am Request-Ende behandeln
+        close_old_connections()
+    cache.set(_TOOL_RUN_KEY.format(run_id), ToolRun(tool.name, True, result), TOOL_RUN_TIMEOUT)
+
+
+def take_tool_run(run_id: str) -> Optional[ToolRun]:
+    """
+    Holt das Ergebnis einer Tool-Ausführung ab (höchstens einmal).
+
+    Args:
+        run_id: Kennung aus `start_tool_run`
+
+    Returns:
+        Optional[ToolRun]: Die beendete Ausführung oder None, solange das Tool läuft
+
+    Raises:
+        LookupError: Wenn die Ausführung unbekannt, abgelaufen oder bereits abgeholt ist
+    """
+    key = _TOOL_RUN_KEY.format(run_id)
+    run = cache.get(key)
+    if run is not None and not run.finished:
+        return None
+    # Nur wer den Eintrag löscht, liefert aus (parallele Verbindungen mit demselben Token)
+    if run is None or not cache.delete(key):
+        raise LookupError(f"Tool-Ausführung {run_id} ist nicht (mehr) vorhanden.")
+    return run
+
+
+def route_cache_info() -> Tuple[int, int, int, int]:
+    """Gibt die Statistik des Routing-Caches zurück (hits, misses, maxsize, currsize)."""
+    return tuple(_route_cached.cache_info())
+
+
+on_registry_change(_invalidate_router)
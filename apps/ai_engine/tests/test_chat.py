@@ -0,0 +1,228 @@
+"""
+Tests des Chat-Streams: Tool-Start im POST, Stream-Token, SSE-Framing, einmalige Auslieferung.
+"""
+
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import Permission
+from django.core import signing
+from django.core.cache import cache
+from django.urls import reverse
+
+from apps.ai_engine import registry, services, views
+from apps.ai_engine.registry import register_tool
+from apps.ai_engine.views import _sse_event
+from apps.users.tests.factories import UserFactory
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cache.clear()
+    calls.clear()
+
+
+@pytest.fixture
+def tools():
+    """Registriert Test-Tools und entfernt sie danach wieder aus Registry und Router."""
+    added = []
+
+    def add(name, func, template='ai_engine/partials/tool_echo.html', **options):
+        register_tool(name, f'Test-Tool {name}', keywords=[name], template=template, **options)(func)
+        added.append(name)
+
+    yield add
+    for name in added:
+        registry._registry.pop(name)
+    services._invalidate_router()
+
+
+@pytest.fixture
+def echo(tools, settings, tmp_path):
+    """Tool 'echo'; das Template liegt in einem temporären Template-Verzeichnis."""
+    template = tmp_path / 'ai_engine' / 'partials' / 'tool_echo.html'
+    template.parent.mkdir(parents=True)
+    template.write_text('<p>{{ message }}</p>\n<p>{{ greeting }}</p>', encoding='utf-8')
+    settings.TEMPLATES = [{**settings.TEMPLATES[0], 'DIRS': [tmp_path, *settings.TEMPLATES[0]['DIRS']]}]
+
+    def run_echo(user):
+        calls.append(user.pk)
+        return {'message': 'Hallo', 'data': {'greeting': f'für {user.email}'}}
+
+    tools('echo', run_echo)
+
+
+@pytest.fixture
+def user_client(client):
+    user = UserFactory(email='anna@example.de')
+    client.force_login(user)
+    return client
+
+
+def post(client, message):
+    return client.post(reverse('ai_engine:chat'), {'message': message})
+
+
+def stream_token(response) -> str:
+    """Token aus der `sse-connect`-URL des Platzhalters."""
+    html = response.content.decode()
+    url = html.split('sse-connect="', 1)[1].split('"', 1)[0].replace('&amp;', '&')
+    return parse_qs(urlsplit(url).query)['token'][0]
+
+
+def read_stream(client, token) -> str:
+    response = client.get(reverse('ai_engine:chat_stream'), {'token': token})
+    assert response.status_code == 200
+    assert response['Content-Type'] == 'text/event-stream'
+    return async_to_sync(collect)(response.streaming_content)
+
+
+async def collect(chunks) -> str:
+    return b''.join([chunk async for chunk in chunks]).decode()
+
+
+def wait_for_calls(count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while len(calls) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+
+def test_post_starts_tool_and_stream_only_delivers(echo, user_client):
+    response = post(user_client, 'Echo bitte')
+
+    token = stream_token(response)
+    # Das Tool läuft bereits, bevor der Browser den Stream öffnet
+    wait_for_calls(1)
+    assert len(calls) == 1
+
+    body = read_stream(user_client, token)
+
+    assert len(calls) == 1
+    assert body == (
+        ': verbunden\n\n'
+        'event: chunk\n'
+        'data: <p>Hallo</p>\n'
+        'data: <p>für anna@example.de</p>\n'
+        '\n'
+        'event: done\n'
+        'data: \n'
+        '\n'
+    )
+
+
+def test_stream_waits_for_slow_tool(tools, user_client):
+    release = threading.Event()
+
+    def slow(user):
+        release.wait(5)
+        return {'message': 'Fertig'}
+
+    tools('langsam', slow, template='ai_engine/partials/chat_message_error.html')
+    token = stream_token(post(user_client, 'langsam'))
+    threading.Timer(0.2, release.set).start()
+
+    body = read_stream(user_client, token)
+
+    assert body.startswith(': verbunden\n\nevent: chunk\n')
+    assert 'Fertig' in body
+    assert body.endswith('event: done\ndata: \n\n')
+
+
+def test_stream_token_is_delivered_once(echo, user_client):
+    token = stream_token(post(user_client, 'echo'))
+    read_stream(user_client, token)
+
+    replay = read_stream(user_client, token)
+
+    assert len(calls) == 1
+    assert 'Die Antwort ist nicht mehr verfügbar.' in replay
+    assert replay.endswith('event: done\ndata: \n\n')
+
+
+def test_failing_tool_is_reported_as_chat_message(tools, user_client, caplog):
+    def broken(user):
+        raise RuntimeError('kaputt')
+
+    tools('kaputt', broken)
+
+    body = read_stream(user_client, stream_token(post(user_client, 'kaputt')))
+
+    assert 'Bei der Ausführung ist ein Fehler aufgetreten.' in body
+    assert "Tool 'kaputt' fehlgeschlagen" in caplog.text
+
+
+def test_missing_permission_is_answered_without_starting_the_tool(tools, user_client):
+    tools('geheim', lambda user: calls.append(user.pk), permission='sales.add_customer')
+
+    response = post(user_client, 'geheim')
+
+    assert 'Dafür fehlt Ihnen die Berechtigung.' in response.content.decode()
+    assert 'sse-connect' not in response.content.decode()
+    assert calls == []
+
+
+def test_permitted_user_starts_tool(tools, client):
+    tools('erlaubt', lambda user: calls.append(user.pk) or {'message': 'ok'}, permission='sales.add_customer')
+    user = UserFactory()
+    user.user_permissions.add(Permission.objects.get(content_type__app_label='sales', codename='add_customer'))
+    client.force_login(user)
+
+    assert 'sse-connect' in post(client, 'erlaubt').content.decode()
+    wait_for_calls(1)
+    assert calls == [user.pk]
+
+
+def test_unknown_message_gets_no_stream(user_client):
+    response = post(user_client, 'blablub')
+
+    assert 'Das habe ich nicht verstanden.' in response.content.decode()
+    assert 'sse-connect' not in response.content.decode()
+
+
+def test_tampered_token_is_rejected(echo, user_client):
+    token = stream_token(post(user_client, 'echo'))
+    payload, signature = token.rsplit(':', 1)
+
+    response = user_client.get(reverse('ai_engine:chat_stream'), {'token': f'{payload}:{signature[::-1]}'})
+
+    assert response.status_code == 400
+    assert 'Ungültiges oder abgelaufenes Stream-Token.' in response.content.decode()
+
+
+def test_expired_token_is_rejected(echo, user_client, monkeypatch):
+    issued = time.time() - views.STREAM_TOKEN_MAX_AGE - 1
+    monkeypatch.setattr(signing.TimestampSigner, 'timestamp', lambda self: signing.b62_encode(int(issued)))
+    token = stream_token(post(user_client, 'echo'))
+    monkeypatch.undo()
+
+    response = user_client.get(reverse('ai_engine:chat_stream'), {'token': token})
+
+    assert response.status_code == 400
+
+
+def test_token_from_other_salt_is_rejected(user_client):
+    token = signing.dumps({'run': 'x', 'message': 'echo', 'session': None}, salt='anderer-zweck')
+
+    assert user_client.get(reverse('ai_engine:chat_stream'), {'token': token}).status_code == 400
+
+
+def test_stream_rejects_post(user_client):
+    assert user_client.post(reverse('ai_engine:chat_stream')).status_code == 405
+
+
+@pytest.mark.parametrize('data, expected', [
+    ('', 'event: done\ndata: \n\n'),
+    ('eine Zeile', 'event: chunk\ndata: eine Zeile\n\n'),
+    ('<p>a</p>\n<p>b</p>\n', 'event: chunk\ndata: <p>a</p>\ndata: <p>b</p>\n\n'),
+])
+def test_sse_event_framing(data, expected):
+    event = 'done' if not data else 'chunk'
+
+    assert _sse_event(event, data) == expected
@@ -0,0 +1,106 @@
+"""
+Tests des Gesprächsgedächtnisses: Ringpuffer, Binärformat, parallele Requests einer Session.
+"""
+
+import threading
+import time
+
+import pytest
+from django.core.cache import cache
+
+from apps.ai_engine import memory as memory_module
+from apps.ai_engine.memory import ConversationMemory, Turn, forget, load_memory, remember
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cache.clear()
+
+
+def conversation(count: int, capacity: int) -> ConversationMemory:
+    memory = ConversationMemory(capacity)
+    for number in range(count):
+        memory.append(Turn(Turn.USER if number % 2 == 0 else Turn.ASSISTANT, f'Nachricht {number}', at=number))
+    return memory
+
+
+def test_ring_buffer_wraps_around_and_folds_oldest():
+    memory = conversation(7, capacity=3)
+
+    assert [turn.text for turn in memory.turns()] == ['Nachricht 4', 'Nachricht 5', 'Nachricht 6']
+    assert memory.folded == 4
+    # Nur Anfragen des Nutzers ergeben eine Zeile der Zusammenfassung
+    assert list(memory.summary) == ['Nutzer: Nachricht 0', 'Nutzer: Nachricht 2']
+
+
+def test_tool_call_is_appended_to_summary_line():
+    memory = ConversationMemory(1)
+    memory.append(Turn(Turn.USER, 'Zeige offene Rechnungen'))
+    memory.append(Turn(Turn.ASSISTANT, '3 offene Rechnungen', tool='list_invoices'))
+    memory.append(Turn(Turn.USER, 'Danke'))
+
+    assert list(memory.summary) == ['Nutzer: Zeige offene Rechnungen → list_invoices']
+
+
+def test_pack_unpack_round_trip():
+    memory = conversation(5, capacity=3)
+    memory.append(Turn(Turn.ASSISTANT, 'Bestätigt: Größe ändern', tool='update_product', at=99))
+
+    restored = ConversationMemory.from_bytes(memory.to_bytes(), capacity=3)
+
+    assert [(t.role, t.text, t.tool, t.at) for t in restored.turns()] == [
+        (t.role, t.text, t.tool, t.at) for t in memory.turns()
+    ]
+    assert list(restored.summary) == list(memory.summary)
+    assert restored.folded == memory.folded
+    assert restored.context() == memory.context()
+
+
+def test_unpack_with_smaller_capacity_keeps_newest():
+    restored = ConversationMemory.from_bytes(conversation(4, capacity=4).to_bytes(), capacity=2)
+
+    assert [turn.text for turn in restored.turns()] == ['Nachricht 2', 'Nachricht 3']
+    assert restored.folded == 2
+    assert list(restored.summary) == ['Nutzer: Nachricht 0']
+
+
+@pytest.mark.parametrize('data', [b'', b'\x09unbekannt'])
+def test_unknown_format_gives_empty_memory(data):
+    assert len(ConversationMemory.from_bytes(data)) == 0
+
+
+def test_context_keeps_newest_turns_within_limit():
+    memory = conversation(6, capacity=10)
+
+    assert memory.context(max_chars=45) == 'Nutzer: Nachricht 4\nAssistent: Nachricht 5'
+
+
+def test_remember_and_forget():
+    remember('s1', [Turn(Turn.USER, 'Hallo'), Turn(Turn.ASSISTANT, 'Guten Tag')])
+    remember('s1', [Turn(Turn.USER, 'Umsatz?')])
+
+    assert [turn.text for turn in load_memory('s1').turns()] == ['Hallo', 'Guten Tag', 'Umsatz?']
+    forget('s1')
+    assert len(load_memory('s1')) == 0
+
+
+def test_parallel_requests_of_a_session_lose_no_turns(monkeypatch):
+    load = memory_module.load_memory
+
+    def slow_load(session_key):
+        # Zeitfenster zwischen Laden und Speichern vergrößern
+        loaded = load(session_key)
+        time.sleep(0.02)
+        return loaded
+
+    monkeypatch.setattr(memory_module, 'load_memory', slow_load)
+    threads = [
+        threading.Thread(target=remember, args=('s1', [Turn(Turn.USER, f'Anfrage {number}')]))
+        for number in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(turn.text for turn in load('s1').turns()) == [f'Anfrage {number}' for number in range(8)]
@@ -0,0 +1,145 @@
+"""
+Tests des Retrieval-Index: BM25-Ranking, Markdown-Chunks, Änderungsprotokoll.
+"""
+
+import pytest
+
+from apps.ai_engine import retrieval
+from apps.ai_engine.retrieval import (
+    CHUNK_CHARS, DELTA_FILE, ROTATED_DELTA_FILE, Document, SearchIndex, build_index, chunk_markdown,
+    record_change,
+)
+
+
+@pytest.fixture(autouse=True)
+def index_dir(settings, tmp_path):
+    settings.RAG_INDEX_DIR = str(tmp_path)
+    return tmp_path
+
+
+def keys(results):
+    return [result.key for result in results]
+
+
+def test_bm25_prefers_higher_term_frequency_and_shorter_documents():
+    index = SearchIndex.build([
+        Document('doc:once', 'Notiz', 'Skonto bei Zahlung'),
+        Document('doc:twice', 'Notiz', 'Skonto Skonto bei Zahlung'),
+        Document('doc:long', 'Notiz', 'Skonto bei Zahlung innerhalb von vierzehn Tagen laut Vertrag'),
+        Document('doc:other', 'Notiz', 'Mahnung'),
+    ])
+
+    assert keys(index.search('skonto', k=3)) == ['doc:twice', 'doc:once', 'doc:long']
+
+
+def test_bm25_weights_rare_terms_higher():
+    index = SearchIndex.build([
+        Document('doc:common', 'Rechnung', 'Rechnung'),
+        Document('doc:rare', 'Gutschrift', 'Gutschrift'),
+        Document('doc:a', 'Rechnung', 'Rechnung Kunde'),
+        Document('doc:b', 'Rechnung', 'Rechnung Lieferant'),
+    ])
+
+    assert keys(index.search('rechnung gutschrift', k=1)) == ['doc:rare']
+
+
+def test_search_filters_prefix_and_skips_removed_documents():
+    index = SearchIndex.build([
+        Document('product:1', 'Schraube M4', 'Schraube verzinkt'),
+        Document('customer:1', 'Schrauben Müller', 'Schrauben Großhandel'),
+        Document('product:2', 'Schraube M6', 'Schraube Edelstahl'),
+    ])
+    index.remove('product:1')
+
+    assert keys(index.search('schraube', prefix='product:')) == ['product:2']
+    assert len(index) == 2
+
+
+def test_add_replaces_document_with_same_key():
+    index = SearchIndex.build([Document('product:1', 'Dübel', 'Dübel 8 mm')])
+
+    index.add(Document('product:1', 'Winkel', 'Winkel verzinkt'))
+
+    assert index.search('dübel') == []
+    assert keys(index.search('winkel')) == ['product:1']
+
+
+def test_chunk_markdown_uses_title_and_headings():
+    text = '# GoBD\n\nEinleitung.\n\n## Aufbewahrung\n\nZehn Jahre.\n\n## Unveränderbarkeit\n\nKeine Änderungen.'
+
+    chunks = list(chunk_markdown('gobd.md', text))
+
+    assert [(chunk.key, chunk.title, chunk.text) for chunk in chunks] == [
+        ('knowledge:gobd.md#1', 'GoBD', 'Einleitung.'),
+        ('knowledge:gobd.md#2', 'GoBD – Aufbewahrung', 'Zehn Jahre.'),
+        ('knowledge:gobd.md#3', 'GoBD – Unveränderbarkeit', 'Keine Änderungen.'),
+    ]
+
+
+def test_chunk_markdown_splits_long_sections_at_paragraphs():
+    paragraph = 'x' * (CHUNK_CHARS // 2 + 1)
+
+    chunks = list(chunk_markdown('lang.md', '\n\n'.join([paragraph] * 3)))
+
+    assert [chunk.key for chunk in chunks] == ['knowledge:lang.md#1', 'knowledge:lang.md#2', 'knowledge:lang.md#3']
+    assert all(chunk.title == 'lang.md' and chunk.text == paragraph for chunk in chunks)
+
+
+def test_deltas_are_replayed_on_top_of_snapshot():
+    build_index([Document('product:1', 'Hammer', 'Hammer 500 g'), Document('product:2', 'Zange', 'Zange')])
+    reader = retrieval._LoadedIndex()
+
+    record_change('product:3', Document('product:3', 'Hammer', 'Hammer 1000 g'))
+    record_change('product:1')
+
+    assert keys(reader.refresh().search('hammer')) == ['product:3']
+    # Nur neue Einträge werden gelesen
+    record_change('product:2')
+    assert keys(reader.refresh().search('zange')) == []
+    assert len(reader.index) == 1
+
+
+def test_incomplete_line_is_applied_once_complete(index_dir):
+    build_index([])
+    reader = retrieval._LoadedIndex()
+    with open(index_dir / DELTA_FILE, 'a', encoding='utf-8') as file:
+        file.write('{"key": "product:1", "title": "Säge", ')
+
+    assert reader.refresh().search('säge') == []
+
+    with open(index_dir / DELTA_FILE, 'a', encoding='utf-8') as file:
+        file.write('"text": "Säge"}\n')
+    assert keys(reader.refresh().search('säge')) == ['product:1']
+
+
+def test_build_index_compacts_delta_log(index_dir):
+    build_index([])
+    for number in range(3):
+        record_change(f'product:{number}', Document(f'product:{number}', 'Feile', 'Feile'))
+
+    build_index([Document('product:0', 'Feile', 'Feile')])
+
+    assert (index_dir / DELTA_FILE).stat().st_size == 0
+    assert not (index_dir / ROTATED_DELTA_FILE).exists()
+    assert keys(retrieval._LoadedIndex().refresh().search('feile')) == ['product:0']
+
+
+def test_reader_follows_rotation_during_rebuild():
+    build_index([Document('product:1', 'Bohrer', 'Bohrer')])
+    reader = retrieval._LoadedIndex()
+    reader.refresh()
+    # Noch nicht gelesen, wenn der Neuaufbau das Protokoll rotiert
+    record_change('product:2', Document('product:2', 'Bohrer', 'Bohrer lang'))
+    during_build = []
+
+    def documents():
+        # Während des Aufbaus: neuer Eintrag im neuen Protokoll, Suche noch auf dem alten Snapshot
+        record_change('product:3', Document('product:3', 'Bohrer', 'Bohrer kurz'))
+        during_build.extend(keys(reader.refresh().search('bohrer')))
+        yield Document('product:1', 'Bohrer', 'Bohrer')
+        yield Document('product:2', 'Bohrer', 'Bohrer lang')
+
+    build_index(documents())
+
+    assert sorted(during_build) == ['product:1', 'product:2', 'product:3']
+    assert sorted(keys(reader.refresh().search('bohrer'))) == ['product:1', 'product:2', 'product:3']
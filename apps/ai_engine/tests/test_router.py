@@ -0,0 +1,127 @@
+"""
+Tests des Intent-Routers: gemeinsamer Ausdruck über alle Tools, Vorrangregeln, Routing-Cache.
+"""
+
+import pytest
+
+from apps.ai_engine import registry, services
+from apps.ai_engine.registry import Tool, register_tool
+from apps.ai_engine.services import IntentRouter, get_router, normalize_message, route_cache_info, route_message
+
+
+def tool(name, *keywords, patterns=(), priority=0) -> Tool:
+    return Tool(name, f'Test-Tool {name}', func=lambda user: {}, keywords=keywords, patterns=patterns,
+                priority=priority)
+
+
+def route(router: IntentRouter, message: str):
+    return router.match(normalize_message(message))
+
+
+@pytest.fixture
+def router():
+    return IntentRouter([
+        tool('rechnung', 'rechnung', 'faktura'),
+        tool('kunde', 'kunde', patterns=(r'kd-\d{5}',)),
+        tool('lager', 'bestand', 'lager'),
+        tool('mahnung', 'mahnung', 'rechnung überfällig', priority=5),
+        tool('ohne_trigger'),
+    ])
+
+
+@pytest.mark.parametrize('message, expected', [
+    ('Bitte eine Rechnung erstellen', 'rechnung'),
+    ('FAKTURA', 'rechnung'),
+    ('Wer ist KD-12345?', 'kunde'),
+    ('kd-123', None),
+    ('Lagerbestand prüfen', 'lager'),
+    ('Hallo', None),
+    ('', None),
+])
+def test_each_tool_is_found_through_combined_pattern(router, message, expected):
+    assert route(router, message) == expected
+
+
+def test_leftmost_match_wins(router):
+    assert route(router, 'Kunde anlegen, danach Rechnung') == 'kunde'
+    assert route(router, 'Rechnung für Kunde') == 'rechnung'
+
+
+def test_higher_priority_wins_at_same_position(router):
+    # 'rechnung' und 'rechnung überfällig' beginnen an derselben Stelle
+    assert route(router, 'Rechnung   überfällig melden') == 'mahnung'
+    assert route(router, 'Rechnung erstellen') == 'rechnung'
+
+
+def test_registration_order_breaks_priority_ties():
+    router = IntentRouter([tool('erstes', 'angebot'), tool('zweites', 'angebot')])
+
+    assert route(router, 'Angebot') == 'erstes'
+
+
+def test_keywords_are_literal():
+    router = IntentRouter([tool('plus', 'c++'), tool('punkt', 'a.b')])
+
+    assert route(router, 'Kurs C++') == 'plus'
+    assert route(router, 'axb') is None
+    assert route(router, 'a.b') == 'punkt'
+
+
+def test_router_without_triggers_matches_nothing():
+    assert route(IntentRouter([tool('leer')]), 'irgendwas') is None
+    assert route(IntentRouter([]), 'irgendwas') is None
+
+
+@pytest.fixture
+def registered():
+    """Registriert Test-Tools und entfernt sie danach wieder aus Registry und Router."""
+    added = []
+
+    def add(name, *keywords, **options):
+        register_tool(name, f'Test-Tool {name}', keywords=list(keywords), **options)(lambda user: {})
+        added.append(name)
+
+    yield add
+    for name in added:
+        registry._registry.pop(name)
+    services._invalidate_router()
+
+
+def test_repeated_messages_are_answered_from_cache(registered):
+    registered('zaehlen', 'inventur')
+    hits, misses = route_cache_info()[:2]
+
+    assert route_message('Inventur starten').name == 'zaehlen'
+    # Normalisierte Varianten teilen sich den Eintrag
+    assert route_message('  inventur   STARTEN ').name == 'zaehlen'
+    assert route_message('Inventur starten').name == 'zaehlen'
+
+    assert route_cache_info()[:2] == (hits + 2, misses + 1)
+
+
+def test_unrouted_messages_are_cached_too(registered):
+    registered('zaehlen', 'inventur')
+    route_message('Guten Morgen')
+    hits = route_cache_info()[0]
+
+    assert route_message('guten morgen') is None
+    assert route_cache_info()[0] == hits + 1
+
+
+def test_registration_rebuilds_router_and_clears_cache(registered):
+    registered('zaehlen', 'inventur')
+    assert route_message('Stichtag Inventur') is not None
+    assert route_message('Stichtag melden') is None
+    router = get_router()
+
+    registered('stichtag', 'stichtag')
+
+    assert route_cache_info()[3] == 0
+    assert get_router() is not router
+    # Ohne Verwerfen käme die gecachte Entscheidung von vorher zurück
+    assert route_message('Stichtag melden').name == 'stichtag'
+    assert route_message('Stichtag Inventur').name == 'stichtag'
+
+
+def test_cache_is_bounded():
+    assert route_cache_info()[2] == services.ROUTE_CACHE_SIZE
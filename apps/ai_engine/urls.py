@@ -9,4 +9,5 @@ app_name = 'ai_engine'
 
 urlpatterns = [
     path('chat/', views.chat_endpoint, name='chat'),
+    path('chat/stream/', views.chat_stream, name='chat_stream'),
 ]
@@ -2,22 +2,58 @@
 Views für die AI Engine App.
 
 Diese App ist der zentrale Router für KI-gesteuerte Interaktionen.
+
+Die Chat-Views sind asynchron und werden über ASGI (`ai_erp/asgi.py`) ausgeliefert:
+`chat_endpoint` (POST) startet das Tool im Hintergrund und antwortet sofort mit
+einem Platzhalter, der per Server-Sent Events (htmx SSE-Extension) an `chat_stream`
+andockt. Der Stream (GET) führt nichts aus, er liefert nur das Ergebnis aus.
+Langsame Tools oder Modell-Aufrufe blockieren so weder den Browser noch einen
+Worker-Thread pro Chat-Sitzung.
+
+Jede Anfrage und Antwort landet im begrenzten Gesprächsgedächtnis der Session
+(`apps.ai_engine.memory`).
 """
 
-from django.http import HttpResponse
+import asyncio
+from typing import AsyncIterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.core import signing
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest, StreamingHttpResponse
 from django.template.loader import render_to_string
-from apps.sales.views import chat_invoice_preview
+from django.urls import reverse
+from django.utils import timezone
+from django.views.decorators.http import require_GET, require_POST
+
+from apps.ai_engine.memory import Turn, remember
+from apps.ai_engine.registry import get_tool
+from apps.ai_engine.services import route_message, start_tool_run, take_tool_run
+
 
+# Gültigkeit des signierten Stream-Tokens in Sekunden
+STREAM_TOKEN_MAX_AGE = 60
+STREAM_TOKEN_SALT = 'ai_engine.chat_stream'
+# Abstand (Sekunden), in dem der Stream nach dem Ergebnis des Tools sieht
+STREAM_POLL_INTERVAL = 0.1
 
-def chat_endpoint(request):
+NOT_UNDERSTOOD = 'Das habe ich nicht verstanden. Versuchen Sie: "Rechnung erstellen"'
+NO_PERMISSION = 'Dafür fehlt Ihnen die Berechtigung.'
+TOOL_FAILED = 'Bei der Ausführung ist ein Fehler aufgetreten. Bitte versuchen Sie es erneut.'
+RESULT_GONE = 'Die Antwort ist nicht mehr verfügbar. Bitte senden Sie die Nachricht erneut.'
+
+
+@require_POST
+async def chat_endpoint(request: HttpRequest) -> HttpResponse:
     """
     Zentraler Chat-Endpoint für KI-Interaktionen.
     
-    WICHTIG: Dies ist ein einfacher Prototyp ohne echte KI-Integration.
-    Nutzt einfache String-Matching-Logik.
+    WICHTIG: Dies ist ein Prototyp ohne echte KI-Integration.
+    Die Absicht wird über den kompilierten Intent-Router ermittelt
+    (Keywords/Patterns der registrierten Tools).
     
     Logik:
-    - Wenn Nachricht "Rechnung" enthält → Invoice-Preview anzeigen
+    - Tool erkannt und erlaubt → Tool im Hintergrund starten, Platzhalter
+      zurückgeben, der die Antwort per SSE streamt
     - Sonst → Fehlermeldung
     
     Returns:
@@ -25,15 +61,120 @@ def chat_endpoint(request):
     """
     # User-Nachricht aus POST-Daten
     user_message = request.POST.get('message', '').strip()
+    session_key = request.session.session_key
     
-    # Einfache Keyword-Erkennung (case-insensitive)
-    if 'rechnung' in user_message.lower():
-        # Delegiere an Sales-View
-        return chat_invoice_preview(request)
-    
-    # Fallback: Nicht verstanden
-    html = render_to_string('ai_engine/partials/chat_message_error.html', {
-        'message': 'Das habe ich nicht verstanden. Versuchen Sie: "Rechnung erstellen"',
+    tool = route_message(user_message)
+    if tool is None:
+        # Fallback: Nicht verstanden
+        await _remember(session_key, user_message, NOT_UNDERSTOOD)
+        return HttpResponse(await _render_error(request, NOT_UNDERSTOOD))
+
+    user = await request.auser()
+    try:
+        # Berechtigungsprüfung liest aus der Datenbank: im Threadpool
+        run_id = await sync_to_async(start_tool_run)(tool, user)
+    except PermissionError:
+        await _remember(session_key, user_message, NO_PERMISSION)
+        return HttpResponse(await _render_error(request, NO_PERMISSION))
+
+    # Ausführung und Nachricht signiert an den Stream übergeben (Ergebnis liegt im Cache)
+    token = signing.dumps(
+        {'run': run_id, 'message': user_message, 'session': session_key}, salt=STREAM_TOKEN_SALT,
+    )
+    html = await _render(request, 'ai_engine/partials/chat_message_pending.html', {
+        'stream_url': f"{reverse('ai_engine:chat_stream')}?token={token}",
     })
-    
     return HttpResponse(html)
+
+
+@require_GET
+async def chat_stream(request: HttpRequest) -> HttpResponse:
+    """
+    Streamt die Antwort eines in `chat_endpoint` gestarteten Tools als Server-Sent Events.
+
+    Führt selbst nichts aus; jede Ausführung wird genau einmal ausgeliefert.
+
+    Events:
+    - Kommentar direkt nach Verbindungsaufbau (erste Bytes in Millisekunden)
+    - 'chunk': HTML-Fragment für `#chat-messages`
+    - 'done': Ende des Streams (entfernt den Platzhalter, schließt die Verbindung)
+
+    Returns:
+        StreamingHttpResponse: `text/event-stream` Antwort
+    """
+    try:
+        payload = signing.loads(
+            request.GET.get('token', ''), salt=STREAM_TOKEN_SALT, max_age=STREAM_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return HttpResponseBadRequest('Ungültiges oder abgelaufenes Stream-Token.')
+
+    response = StreamingHttpResponse(
+        _stream_tool_response(request, payload['run'], payload['message'], payload.get('session')),
+        content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Proxy-Pufferung (nginx) deaktivieren
+    return response
+
+
+async def _stream_tool_response(
+    request: HttpRequest, run_id: str, message: str, session_key: Optional[str] = None,
+) -> AsyncIterator[str]:
+    """Wartet auf das Ergebnis des Tools und liefert die Antwort als SSE-Events."""
+    yield ': verbunden\n\n'
+
+    try:
+        # Cache-Backends können synchron auf DB/Netzwerk zugreifen
+        while (run := await sync_to_async(take_tool_run, thread_sensitive=False)(run_id)) is None:
+            await asyncio.sleep(STREAM_POLL_INTERVAL)
+    except LookupError:
+        # Bereits ausgeliefert (erneute Verbindung) oder abgelaufen: nicht erneut merken
+        yield _sse_event('chunk', await _render_error(request, RESULT_GONE))
+        yield _sse_event('done', '')
+        return
+
+    tool = get_tool(run.tool)
+    if run.result is None or tool is None:
+        answer, tool_name = TOOL_FAILED, ''
+        html = await _render_error(request, answer)
+    else:
+        answer, tool_name = run.result['message'], tool.name
+        html = await _render(request, tool.template, {
+            'message': run.result['message'],
+            'component': run.result.get('component'),
+            **run.result.get('data', {}),
+            'timestamp': timezone.now(),
+        })
+
+    yield _sse_event('chunk', html)
+    yield _sse_event('done', '')
+    await _remember(session_key, message, answer, tool_name)
+
+
+async def _remember(session_key: Optional[str], message: str, answer: str, tool_name: str = '') -> None:
+    """Speichert Anfrage und Antwort im Gesprächsgedächtnis der Session (ohne Session: nichts)."""
+    if not session_key:
+        return
+    turns = (Turn(Turn.USER, message), Turn(Turn.ASSISTANT, answer, tool_name))
+    # Cache-Backends können synchron auf DB/Netzwerk zugreifen
+    await sync_to_async(remember, thread_sensitive=False)(session_key, turns)
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Formatiert ein Server-Sent Event (mehrzeilige Daten je Zeile mit 'data:')."""
+    lines = data.splitlines() or ['']
+    return f"event: {event}\n" + ''.join(f"data: {line}\n" for line in lines) + '\n'
+
+
+async def _render(request: HttpRequest, template: str, context: dict) -> str:
+    """Rendert ein Partial mit Request (Context-Prozessoren, CSRF-Token)."""
+    # Context-Prozessoren lesen Benutzer und Session synchron (DB): daher im Threadpool
+    return await sync_to_async(render_to_string)(template, context, request=request)
+
+
+async def _render_error(request: HttpRequest, message: str) -> str:
+    """Rendert eine Fehlermeldung als Chat-Nachricht."""
+    return await _render(request, 'ai_engine/partials/chat_message_error.html', {
+        'message': message,
+    })
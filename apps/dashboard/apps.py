@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class DashboardConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.dashboard'
+
+    def ready(self) -> None:
+        # Kennzahlen inkrementell bei Buchungen und Bestandsänderungen fortschreiben
+        from apps.dashboard import receivers  # noqa: F401
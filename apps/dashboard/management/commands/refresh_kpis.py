@@ -0,0 +1,29 @@
+"""
+Berechnet die materialisierten Dashboard-Kennzahlen neu.
+
+Die Kennzahlen werden bei Buchungen und Bestandsänderungen inkrementell
+fortgeschrieben; dieser Befehl dient der Erstbefüllung und der regelmäßigen
+Korrektur (z.B. nächtlich per Cron).
+
+Aufruf:
+    python manage.py refresh_kpis
+    python manage.py refresh_kpis --period 202601
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.dashboard.services import get_dashboard_kpis, refresh_kpis
+
+
+class Command(BaseCommand):
+    help = 'Berechnet die Dashboard-Kennzahlen aus Hauptbuch und Lager neu.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--period', type=int, help='Aktuelle Periode JJJJMM (Standard: heute)')
+
+    def handle(self, *args, **options) -> None:
+        refresh_kpis(options['period'])
+        kpis = get_dashboard_kpis()
+        for name, value in kpis.items():
+            self.stdout.write(f"{name:<18} {value}")
+        self.stdout.write(self.style.SUCCESS("Kennzahlen aktualisiert."))
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:08
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='KpiFigure',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('key', models.CharField(choices=[('revenue', 'Umsatz'), ('receivables', 'Offene Forderungen'), ('stock_units', 'Lagerbestand (Stück)'), ('below_min_stock', 'Artikel unter Mindestbestand')], max_length=30)),
+                ('period', models.PositiveIntegerField(default=0, help_text='Periode JJJJMM bei Periodenwerten, 0 bei Stichtagswerten.')),
+                ('value', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'verbose_name': 'Kennzahl',
+                'verbose_name_plural': 'Kennzahlen',
+                'constraints': [models.UniqueConstraint(fields=('period', 'key'), name='dashboard_kpifigure_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+"""
+Models für die Dashboard App.
+
+`KpiFigure` ist eine materialisierte Kennzahlen-Tabelle: Die Werte werden bei
+Buchungen und Bestandsänderungen inkrementell fortgeschrieben (bzw. per
+`refresh_kpis` neu berechnet), damit das Dashboard keine Aggregat-Abfragen
+über Bewegungsdaten ausführen muss.
+"""
+
+from django.db import models
+
+from core.models import BaseModel
+
+
+class KpiFigure(BaseModel):
+    """Materialisierter Kennzahlenwert, je Kennzahl und Periode genau eine Zeile."""
+
+    class Key(models.TextChoices):
+        REVENUE = 'revenue', 'Umsatz'
+        RECEIVABLES = 'receivables', 'Offene Forderungen'
+        STOCK_UNITS = 'stock_units', 'Lagerbestand (Stück)'
+        BELOW_MIN_STOCK = 'below_min_stock', 'Artikel unter Mindestbestand'
+
+    key = models.CharField(max_length=30, choices=Key.choices)
+    period = models.PositiveIntegerField(
+        default=0, help_text="Periode JJJJMM bei Periodenwerten, 0 bei Stichtagswerten.",
+    )
+    value = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Kennzahl"
+        verbose_name_plural = "Kennzahlen"
+        constraints = [
+            # Periode zuerst: das Dashboard liest alle Kennzahlen weniger Perioden
+            models.UniqueConstraint(fields=['period', 'key'], name='dashboard_kpifigure_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_key_display()} ({self.period or 'aktuell'}): {self.value}"
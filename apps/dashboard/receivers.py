@@ -0,0 +1,76 @@
+"""
+Signal-Empfänger der Dashboard App.
+
+Übersetzen Buchungen und Bestandsänderungen in Kennzahlen-Deltas
+(`services.apply_deltas`). Laufen in der Transaktion des Senders.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+from uuid import UUID
+
+from django.conf import settings
+from django.dispatch import receiver
+
+from apps.dashboard.models import KpiFigure
+from apps.dashboard.services import apply_deltas
+from apps.finance.models import Account
+from apps.finance.signals import entries_posted
+from apps.inventory.models import StockItem
+from apps.inventory.signals import stock_changed
+
+
+@receiver(entries_posted, dispatch_uid='dashboard_entries_posted')
+def update_ledger_kpis(
+    sender: type,
+    movements: Dict[Tuple[Any, int], List[Decimal]],
+    **kwargs: Any,
+) -> None:
+    """Schreibt Umsatz (je Periode) und offene Forderungen aus Buchungsverkehrszahlen fort."""
+    receivable_numbers = set(settings.FINANCE_RECEIVABLE_ACCOUNTS)
+    accounts = {
+        pk: (number, account_type)
+        for pk, number, account_type in Account.objects.filter(
+            pk__in={account_id for account_id, _ in movements},
+        ).values_list('pk', 'number', 'account_type')
+    }
+
+    deltas: Dict[Tuple[str, int], Decimal] = defaultdict(Decimal)
+    for (account_id, period), (debit, credit) in movements.items():
+        number, account_type = accounts[account_id]
+        if account_type == Account.AccountType.REVENUE:
+            deltas[(KpiFigure.Key.REVENUE, period)] += credit - debit
+        if number in receivable_numbers:
+            deltas[(KpiFigure.Key.RECEIVABLES, 0)] += debit - credit
+    apply_deltas(deltas)
+
+
+@receiver(stock_changed, dispatch_uid='dashboard_stock_changed')
+def update_stock_kpis(
+    sender: type,
+    changes: Dict[UUID, int],
+    created: List[UUID],
+    **kwargs: Any,
+) -> None:
+    """
+    Schreibt Lagerbestand und Anzahl Artikel unter Mindestbestand fort.
+
+    Die betroffenen Bestandszeilen sind in der laufenden Transaktion bereits
+    gesperrt; der gelesene Stand ist also genau der Stand nach der Änderung.
+    Neu angelegte Bestandszeilen wurden vorher nicht mitgezählt.
+    """
+    new_items = set(created)
+    crossings = 0
+    for product_id, available, reserved, min_stock in StockItem.objects.filter(
+        product_id__in=changes.keys(),
+    ).values_list('product_id', 'available', 'reserved', 'product__min_stock'):
+        after = available + reserved
+        before = after - changes[product_id]
+        was_below = product_id not in new_items and before < min_stock
+        crossings += (after < min_stock) - was_below
+
+    apply_deltas({
+        (KpiFigure.Key.STOCK_UNITS, 0): Decimal(sum(changes.values())),
+        (KpiFigure.Key.BELOW_MIN_STOCK, 0): Decimal(crossings),
+    })
@@ -0,0 +1,175 @@
+"""
+Service Layer für die Dashboard App.
+
+Dieses Modul enthält die Kennzahlen (KPIs) des Dashboards:
+- Umsatz je Monat (aus dem Hauptbuch)
+- Offene Forderungen (Saldo der Forderungskonten)
+- Lagerbestand und Artikel unter Mindestbestand
+
+Die Kennzahlen werden in `KpiFigure` materialisiert und bei Schreibvorgängen
+inkrementell fortgeschrieben (`apply_deltas`, ausgelöst über die Signale der
+Finance- und Inventory-App). `refresh_kpis` berechnet alles aus den Services
+der Quell-Apps neu (z.B. nächtlich per `manage.py refresh_kpis`).
+
+Gelesen wird über einen versionierten Cache-Key: Jede Änderung erhöht die
+Version, ein Dashboard-Aufruf kostet daher höchstens eine indizierte Abfrage.
+Diese Abfrage geht an eine Lese-Replica, sofern konfiguriert (`core.db`).
+"""
+
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.dashboard.models import KpiFigure
+from apps.finance.services import get_receivables, get_revenue, period_of
+from apps.inventory.services import get_stock_summary
+from core.db import read_replica, using_replica
+from core.metrics import timed
+from core.queries import query_budget
+
+
+ZERO = Decimal('0.00')
+
+# Cache-Key der aktuellen Kennzahlen-Version
+VERSION_CACHE_KEY = 'dashboard:kpi_version'
+
+# Lebensdauer der gecachten Kennzahlen (Sekunden); invalidiert wird über die Version
+KPI_CACHE_TIMEOUT = 60 * 60
+
+# Von einer Replica gelesene Werte können dem letzten Commit hinterherhinken
+# (Version schon erhöht, Daten noch nicht repliziert): nur kurz cachen
+KPI_REPLICA_CACHE_TIMEOUT = 60
+
+
+def previous_period(period: int) -> int:
+    """
+    Ermittelt die Vorperiode (JJJJMM).
+
+    Args:
+        period: Periode, z.B. 202601
+
+    Returns:
+        int: Vorperiode, z.B. 202512
+    """
+    year, month = divmod(period, 100)
+    return (year - 1) * 100 + 12 if month == 1 else period - 1
+
+
+def _current_version() -> int:
+    # Startwert zeitbasiert: nach Verdrängung des Keys keine alten Einträge wiederverwenden
+    cache.add(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+    return cache.get(VERSION_CACHE_KEY) or 0
+
+
+def invalidate_kpis() -> None:
+    """Erhöht die Kennzahlen-Version; gecachte Werte werden damit ungültig."""
+    try:
+        cache.incr(VERSION_CACHE_KEY)
+    except ValueError:
+        cache.set(VERSION_CACHE_KEY, time.time_ns(), timeout=None)
+
+
+def apply_deltas(deltas: Dict[Tuple[str, int], Decimal]) -> None:
+    """
+    Schreibt Kennzahlen inkrementell fort (`value = value + delta`).
+
+    Läuft in der Transaktion der auslösenden Buchung/Bestandsänderung, damit
+    Kennzahlen und Quelldaten gemeinsam committet oder zurückgerollt werden.
+    Die Cache-Version wird erst nach dem Commit erhöht.
+
+    Args:
+        deltas: Veränderung je (Kennzahl, Periode); Periode 0 für Stichtagswerte
+    """
+    deltas = {target: delta for target, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    now = timezone.now()
+    with transaction.atomic():
+        # Feste Reihenfolge, damit parallele Schreiber nicht verklemmen
+        for key, period in sorted(deltas):
+            KpiFigure.objects.get_or_create(key=key, period=period)
+            KpiFigure.objects.filter(key=key, period=period).update(
+                value=F('value') + deltas[(key, period)], updated_at=now,
+            )
+        transaction.on_commit(invalidate_kpis)
+
+
+@transaction.atomic
+def refresh_kpis(period: Optional[int] = None) -> None:
+    """
+    Berechnet alle Kennzahlen aus den Services der Quell-Apps neu.
+
+    Korrigiert Werte, die sich nicht inkrementell fortschreiben lassen
+    (z.B. geänderte Mindestbestände), und dient als Erstbefüllung.
+
+    Args:
+        period: Aktuelle Periode JJJJMM (Standard: heute)
+    """
+    if period is None:
+        period = period_of(date.today())
+    units, below_min = get_stock_summary()
+    values = {
+        (KpiFigure.Key.REVENUE, period): get_revenue(period),
+        (KpiFigure.Key.REVENUE, previous_period(period)): get_revenue(previous_period(period)),
+        (KpiFigure.Key.RECEIVABLES, 0): get_receivables(),
+        (KpiFigure.Key.STOCK_UNITS, 0): Decimal(units),
+        (KpiFigure.Key.BELOW_MIN_STOCK, 0): Decimal(below_min),
+    }
+    for (key, figure_period), value in values.items():
+        KpiFigure.objects.update_or_create(key=key, period=figure_period, defaults={'value': value})
+    transaction.on_commit(invalidate_kpis)
+
+
+@timed
+@read_replica()
+@query_budget(1)
+def get_dashboard_kpis(today: Optional[date] = None) -> dict:
+    """
+    Liefert die Kennzahlen für das Dashboard.
+
+    Bei gültigem Cache ohne Datenbankzugriff, sonst mit genau einer
+    indizierten Abfrage auf `KpiFigure` (über eine Replica, falls vorhanden).
+
+    Args:
+        today: Stichtag (Standard: heute)
+
+    Returns:
+        dict: 'revenue', 'revenue_previous', 'revenue_change' (Prozent oder None),
+              'receivables', 'stock_units', 'below_min_stock'
+    """
+    period = period_of(today or date.today())
+    cache_key = f'dashboard:kpis:{_current_version()}:{period}'
+    kpis = cache.get(cache_key)
+    if kpis is not None:
+        return kpis
+
+    previous = previous_period(period)
+    figures = {
+        (key, figure_period): value
+        for key, figure_period, value in KpiFigure.objects.filter(
+            period__in=[0, period, previous],
+        ).values_list('key', 'period', 'value')
+    }
+    revenue = figures.get((KpiFigure.Key.REVENUE, period), ZERO)
+    revenue_previous = figures.get((KpiFigure.Key.REVENUE, previous), ZERO)
+    revenue_change = None
+    if revenue_previous:
+        revenue_change = ((revenue - revenue_previous) / revenue_previous * 100).quantize(Decimal('0.1'))
+
+    kpis = {
+        'revenue': revenue,
+        'revenue_previous': revenue_previous,
+        'revenue_change': revenue_change,
+        'receivables': figures.get((KpiFigure.Key.RECEIVABLES, 0), ZERO),
+        'stock_units': int(figures.get((KpiFigure.Key.STOCK_UNITS, 0), 0)),
+        'below_min_stock': int(figures.get((KpiFigure.Key.BELOW_MIN_STOCK, 0), 0)),
+    }
+    cache.set(cache_key, kpis, KPI_REPLICA_CACHE_TIMEOUT if using_replica() else KPI_CACHE_TIMEOUT)
+    return kpis
@@ -0,0 +1,114 @@
+"""
+Tests der Dashboard-Kennzahlen: inkrementelle Fortschreibung, versionierter Cache, eine Abfrage je Aufruf.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.core.cache import cache
+
+from apps.dashboard.models import KpiFigure
+from apps.dashboard.services import VERSION_CACHE_KEY, get_dashboard_kpis, previous_period, refresh_kpis
+from apps.finance.services import LineData, post_entry
+from apps.finance.tests.factories import AccountFactory
+from apps.inventory.services import adjust_stock
+from apps.inventory.tests.factories import ProductFactory
+
+pytestmark = pytest.mark.django_db
+
+MARCH = date(2026, 3, 20)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache(settings, tmp_path):
+    # Artikel schreiben auch das Änderungsprotokoll des Retrieval-Index
+    settings.RAG_INDEX_DIR = str(tmp_path)
+    cache.clear()
+
+
+@pytest.fixture
+def accounts():
+    """Forderungskonto aus `FINANCE_RECEIVABLE_ACCOUNTS` und ein Erlöskonto."""
+    return AccountFactory(number='1400', account_type='asset'), AccountFactory(account_type='revenue')
+
+
+def sell(accounts, amount: str, posting_date: date = MARCH) -> None:
+    receivables, revenue = accounts
+    post_entry(posting_date, 'Ausgangsrechnung', [
+        LineData(receivables.number, debit=Decimal(amount)),
+        LineData(revenue.number, credit=Decimal(amount)),
+    ])
+
+
+def figures() -> dict:
+    return {(key, period): value for key, period, value in KpiFigure.objects.values_list('key', 'period', 'value')}
+
+
+def test_previous_period_wraps_year():
+    assert (previous_period(202601), previous_period(202603)) == (202512, 202602)
+
+
+def test_postings_update_revenue_and_receivables(accounts, django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        sell(accounts, '100.00', date(2026, 2, 10))
+        sell(accounts, '150.00')
+
+    kpis = get_dashboard_kpis(MARCH)
+
+    assert (kpis['revenue'], kpis['revenue_previous'], kpis['revenue_change']) == (
+        Decimal('150.00'), Decimal('100.00'), Decimal('50.0'),
+    )
+    assert kpis['receivables'] == Decimal('250.00')
+
+
+def test_stock_changes_update_units_and_below_minimum(django_capture_on_commit_callbacks):
+    product = ProductFactory(min_stock=5)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        adjust_stock(product.pk, 3, 'Wareneingang')
+    kpis = get_dashboard_kpis(MARCH)
+    assert (kpis['stock_units'], kpis['below_min_stock']) == (3, 1)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        adjust_stock(product.pk, 4, 'Wareneingang')
+    kpis = get_dashboard_kpis(MARCH)
+    assert (kpis['stock_units'], kpis['below_min_stock']) == (7, 0)
+
+
+def test_incremental_figures_match_full_refresh(accounts, django_capture_on_commit_callbacks):
+    product = ProductFactory(min_stock=10)
+    with django_capture_on_commit_callbacks(execute=True):
+        sell(accounts, '80.00', date(2026, 2, 1))
+        sell(accounts, '19.99')
+        adjust_stock(product.pk, 12, 'Wareneingang')
+        adjust_stock(product.pk, -5, 'Inventur')
+    incremental = figures()
+
+    refresh_kpis(202603)
+
+    assert figures() == incremental
+
+
+def test_cached_kpis_are_served_without_queries(django_assert_num_queries):
+    with django_assert_num_queries(1):
+        get_dashboard_kpis(MARCH)
+    with django_assert_num_queries(0):
+        get_dashboard_kpis(MARCH)
+
+
+def test_change_bumps_cache_version_after_commit(accounts, django_capture_on_commit_callbacks):
+    assert get_dashboard_kpis(MARCH)['revenue'] == Decimal('0.00')
+    version = cache.get(VERSION_CACHE_KEY)
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        sell(accounts, '50.00')
+    # Vor dem Commit: alte Version, gecachter Wert
+    assert cache.get(VERSION_CACHE_KEY) == version
+    assert get_dashboard_kpis(MARCH)['revenue'] == Decimal('0.00')
+
+    for callback in callbacks:
+        callback()
+
+    assert cache.get(VERSION_CACHE_KEY) == version + 1
+    assert get_dashboard_kpis(MARCH)['revenue'] == Decimal('50.00')
@@ -4,3 +4,18 @@ from django.apps import AppConfig
 class FinanceConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.finance'
+
+    def ready(self) -> None:
+        # Kompilierte Steuerschlüssel bei Änderungen an Schlüsseln oder Regeln verwerfen
+        from django.db import transaction
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.finance.models import TaxKey, TaxRule
+        from apps.finance.services import invalidate_tax_table
+
+        def invalidate(**kwargs) -> None:
+            transaction.on_commit(invalidate_tax_table)
+
+        for model in (TaxKey, TaxRule):
+            post_save.connect(invalidate, sender=model, weak=False, dispatch_uid=f'tax_table_save_{model.__name__}')
+            post_delete.connect(invalidate, sender=model, weak=False, dispatch_uid=f'tax_table_delete_{model.__name__}')
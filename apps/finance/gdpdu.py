@@ -0,0 +1,489 @@
+"""
+Datenüberlassung an die Finanzverwaltung (GoBD Rz. 165 ff., Z3 / GDPdU-Format).
+
+Exportiert Sachkonten, Buchungssätze, Buchungszeilen und das Änderungsprotokoll
+als CSV-Dateien mit Beschreibungsdatei `index.xml`.
+
+- Jede Tabelle wird über einen Server-Side-Cursor (`iterator()`) gestreamt;
+  der Speicherbedarf ist unabhängig von der Anzahl Zeilen.
+- Die Tabellen werden parallel in einem Prozess-Pool exportiert.
+- Je Tabelle wird regelmäßig ein Checkpoint (Byte-Offset, letzter Schlüssel)
+  geschrieben. Ein abgebrochener Export setzt beim nächsten Aufruf dort fort.
+  Sortiert und fortgesetzt wird über einen monoton wachsenden Schlüssel
+  (Erfassungszeitpunkt + ID bzw. Sequenz des Änderungsprotokolls), nicht über
+  die zufälligen UUIDs: Zwischen zwei Läufen erfasste Zeilen werden so nicht
+  übersprungen, und die Dateien folgen der Erfassungsreihenfolge.
+- `index.xml` wird erst geschrieben, wenn alle Tabellen vollständig sind, und
+  enthält je Tabelle Zeilenanzahl und SHA-256-Prüfsumme.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import os
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from django.apps import apps
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+
+from core.utils.processes import process_pool
+
+
+# Zeilen je Datenbank-Fetch des Server-Side-Cursors
+CHUNK_SIZE = 5000
+
+# Nach so vielen Zeilen wird ein Checkpoint geschrieben
+CHECKPOINT_ROWS = 100_000
+
+INDEX_FILENAME = 'index.xml'
+DTD_FILENAME = 'gdpdu-01-08-2002.dtd'
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Spalte einer Exporttabelle.
+
+    Attributes:
+        name: Spaltenname in CSV und index.xml
+        source: ORM-Pfad für `values_list` (z.B. 'account__number')
+        kind: 'text', 'numeric' oder 'date'
+        accuracy: Nachkommastellen bei numerischen Spalten
+    """
+
+    name: str
+    source: str
+    kind: str = 'text'
+    accuracy: int = 0
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """
+    Beschreibung einer Exporttabelle.
+
+    Die erste Spalte ist der Primärschlüssel der Datei. Sortiert und bei der
+    Wiederaufnahme fortgesetzt wird nach `order_by` (Keyset, monoton wachsend).
+
+    Attributes:
+        name: Dateiname ohne Endung
+        description: Tabellenbeschreibung für index.xml
+        model: Model-Label (z.B. 'finance.LedgerLine')
+        columns: Spalten in Ausgabereihenfolge
+        date_field: ORM-Pfad für die Einschränkung auf einen Zeitraum
+        order_by: Eindeutiger, monoton wachsender Schlüssel (ORM-Pfade)
+    """
+
+    name: str
+    description: str
+    model: str
+    columns: Tuple[Column, ...]
+    date_field: Optional[str] = None
+    order_by: Tuple[str, ...] = ('created_at', 'pk')
+
+    @property
+    def filename(self) -> str:
+        return f'{self.name}.csv'
+
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    table.name: table
+    for table in (
+        ExportTable(
+            name='sachkonten',
+            description='Sachkonten',
+            model='finance.Account',
+            columns=(
+                Column('id', 'pk'),
+                Column('kontonummer', 'number'),
+                Column('bezeichnung', 'name'),
+                Column('kontoart', 'account_type'),
+            ),
+        ),
+        ExportTable(
+            name='buchungssaetze',
+            description='Buchungssätze (Journal)',
+            model='finance.JournalEntry',
+            columns=(
+                Column('id', 'pk'),
+                Column('buchungsdatum', 'posting_date', 'date'),
+                Column('periode', 'period', 'numeric'),
+                Column('buchungstext', 'description'),
+                Column('belegnummer', 'reference'),
+                Column('storno_von', 'reversal_of_id'),
+                Column('erfasst_am', 'created_at'),
+            ),
+            date_field='posting_date',
+        ),
+        ExportTable(
+            name='buchungszeilen',
+            description='Buchungszeilen',
+            model='finance.LedgerLine',
+            columns=(
+                Column('id', 'pk'),
+                Column('buchungssatz', 'entry_id'),
+                Column('buchungsdatum', 'entry__posting_date', 'date'),
+                Column('kontonummer', 'account__number'),
+                Column('soll', 'debit', 'numeric', 2),
+                Column('haben', 'credit', 'numeric', 2),
+            ),
+            date_field='entry__posting_date',
+        ),
+        ExportTable(
+            name='aenderungsprotokoll',
+            description='Änderungsprotokoll',
+            model='core.AuditLog',
+            columns=(
+                Column('sequenz', 'sequence', 'numeric'),
+                Column('zeitpunkt', 'timestamp'),
+                Column('benutzer', 'user_id'),
+                Column('ip_adresse', 'ip_address'),
+                Column('objekttyp', 'model_name'),
+                Column('objekt_id', 'object_id'),
+                Column('aktion', 'action'),
+                Column('aenderungen', 'changes'),
+                Column('vorgaenger_hash', 'previous_hash'),
+                Column('hash', 'hash'),
+            ),
+            date_field='timestamp__date',
+            order_by=('sequence',),
+        ),
+    )
+}
+
+
+@dataclass
+class TableResult:
+    """Ergebnis (bzw. Checkpoint) des Exports einer Tabelle."""
+
+    table: str
+    fingerprint: str
+    rows: int = 0
+    offset: int = 0
+    last_key: Optional[List[Any]] = None
+    complete: bool = False
+    sha256: str = ''
+
+
+def _fingerprint(table: ExportTable, date_from: Optional[date], date_to: Optional[date]) -> str:
+    """Kennung der Exportparameter; ein Checkpoint gilt nur für dieselben Parameter."""
+    return (
+        f"{table.name}|{date_from or ''}|{date_to or ''}|{','.join(c.source for c in table.columns)}"
+        f"|{','.join(table.order_by)}"
+    )
+
+
+def _checkpoint_path(directory: Path, table: ExportTable) -> Path:
+    return directory / f'.{table.name}.checkpoint.json'
+
+
+def _load_checkpoint(directory: Path, table: ExportTable, fingerprint: str) -> Optional[TableResult]:
+    path = _checkpoint_path(directory, table)
+    try:
+        state = TableResult(**json.loads(path.read_text(encoding='utf-8')))
+    except (FileNotFoundError, ValueError, TypeError):
+        return None
+    if state.fingerprint != fingerprint:
+        return None
+    csv_path = directory / table.filename
+    if not csv_path.exists() or csv_path.stat().st_size < state.offset:
+        return None
+    return state
+
+
+def _save_checkpoint(directory: Path, table: ExportTable, state: TableResult) -> None:
+    """Schreibt den Checkpoint atomar (temporäre Datei + Umbenennen)."""
+    path = _checkpoint_path(directory, table)
+    tmp = path.with_suffix('.tmp')
+    tmp.write_text(json.dumps(asdict(state)), encoding='utf-8')
+    os.replace(tmp, path)
+
+
+def _formatter(column: Column) -> Callable[[Any], str]:
+    """Formatierung nach index.xml: Dezimalkomma, Datum TT.MM.JJJJ, Texte unverändert."""
+    if column.kind == 'numeric':
+        return lambda value: '' if value is None else str(value).replace('.', ',')
+    if column.kind == 'date':
+        return lambda value: '' if value is None else value.strftime('%d.%m.%Y')
+
+    def format_text(value: Any) -> str:
+        if value is None:
+            return ''
+        if isinstance(value, datetime):
+            return timezone.localtime(value).strftime('%d.%m.%Y %H:%M:%S')
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, ensure_ascii=False, sort_keys=True)
+        return str(value)
+
+    return format_text
+
+
+def _after(keys: Tuple[str, ...], values: List[Any]) -> Q:
+    """Bedingung 'Schlüssel-Tupel > values' (lexikographisch, wie `ORDER BY keys`)."""
+    condition = Q()
+    for index, key in enumerate(keys):
+        step = Q(**{f'{key}__gt': values[index]})
+        for previous, value in zip(keys[:index], values):
+            step &= Q(**{previous: value})
+        condition |= step
+    # Bereichsgrenze auf dem ersten Schlüssel für den Index-Scan
+    return Q(**{f'{keys[0]}__gte': values[0]}) & condition
+
+
+def _key_value(value: Any) -> Any:
+    """Schlüsselwert JSON-tauglich für den Checkpoint (Datum ISO, UUID als Text)."""
+    if isinstance(value, (int, str)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _stream_rows(
+    table: ExportTable,
+    last_key: Optional[List[Any]],
+    date_from: Optional[date],
+    date_to: Optional[date],
+    chunk_size: int,
+) -> Iterator[tuple]:
+    """
+    Liefert die Zeilen einer Tabelle nach `order_by` ab `last_key` (Server-Side-Cursor).
+
+    Jede Zeile enthält die Spalten der Tabelle, gefolgt von den Schlüsselwerten.
+    """
+    model = apps.get_model(table.model)
+    queryset = model._base_manager.order_by(*table.order_by)
+    if last_key is not None:
+        queryset = queryset.filter(_after(table.order_by, last_key))
+    if table.date_field and date_from:
+        queryset = queryset.filter(**{f'{table.date_field}__gte': date_from})
+    if table.date_field and date_to:
+        queryset = queryset.filter(**{f'{table.date_field}__lte': date_to})
+    fields = [column.source for column in table.columns] + list(table.order_by)
+    return queryset.values_list(*fields).iterator(chunk_size=chunk_size)
+
+
+def file_sha256(path: Path) -> str:
+    """
+    Berechnet die SHA-256-Prüfsumme einer Datei blockweise.
+
+    Args:
+        path: Dateipfad
+
+    Returns:
+        str: Prüfsumme als Hex-String
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def export_table(
+    name: str,
+    directory: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    chunk_size: int = CHUNK_SIZE,
+) -> TableResult:
+    """
+    Exportiert eine Tabelle als CSV; setzt einen abgebrochenen Export fort.
+
+    Läuft im Prozess-Pool, daher nur picklebare Argumente.
+
+    Args:
+        name: Schlüssel aus `EXPORT_TABLES`
+        directory: Zielverzeichnis
+        date_from: Erster Buchungstag (inklusive)
+        date_to: Letzter Buchungstag (inklusive)
+        chunk_size: Zeilen je Datenbank-Fetch
+
+    Returns:
+        TableResult: Zeilenanzahl und Prüfsumme der fertigen Datei
+    """
+    table = EXPORT_TABLES[name]
+    target = Path(directory)
+    fingerprint = _fingerprint(table, date_from, date_to)
+    state = _load_checkpoint(target, table, fingerprint) or TableResult(name, fingerprint)
+    if state.complete:
+        return state
+
+    formatters = [_formatter(column) for column in table.columns]
+    width = len(table.columns)
+    with open(target / table.filename, 'r+b' if state.offset else 'wb') as raw:
+        # Nach dem letzten Checkpoint geschriebene (unbestätigte) Zeilen verwerfen
+        raw.truncate(state.offset)
+        raw.seek(state.offset)
+        text = io.TextIOWrapper(raw, encoding='utf-8', newline='')
+        writer = csv.writer(text, delimiter=';', quotechar='"', lineterminator='\r\n')
+        if not state.offset:
+            writer.writerow([column.name for column in table.columns])
+
+        def checkpoint() -> None:
+            text.flush()
+            os.fsync(raw.fileno())
+            state.offset = raw.tell()
+            _save_checkpoint(target, table, state)
+
+        for row in _stream_rows(table, state.last_key, date_from, date_to, chunk_size):
+            writer.writerow([format_value(value) for format_value, value in zip(formatters, row)])
+            state.rows += 1
+            state.last_key = [_key_value(value) for value in row[width:]]
+            if state.rows % CHECKPOINT_ROWS == 0:
+                checkpoint()
+        checkpoint()
+        text.detach()
+
+    state.sha256 = file_sha256(target / table.filename)
+    state.complete = True
+    _save_checkpoint(target, table, state)
+    return state
+
+
+def _column_element(parent: ElementTree.Element, tag: str, column: Column) -> None:
+    element = ElementTree.SubElement(parent, tag)
+    ElementTree.SubElement(element, 'Name').text = column.name
+    if column.kind == 'numeric':
+        numeric = ElementTree.SubElement(element, 'Numeric')
+        if column.accuracy:
+            ElementTree.SubElement(numeric, 'Accuracy').text = str(column.accuracy)
+    elif column.kind == 'date':
+        ElementTree.SubElement(ElementTree.SubElement(element, 'Date'), 'Format').text = 'DD.MM.YYYY'
+    else:
+        ElementTree.SubElement(element, 'AlphaNumeric')
+
+
+def write_index(
+    directory: Path,
+    results: List[TableResult],
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    supplier: str = '',
+) -> Path:
+    """
+    Schreibt die Beschreibungsdatei `index.xml` (Beschreibungsstandard GDPdU).
+
+    Zeilenanzahl und SHA-256-Prüfsumme stehen je Tabelle in `Description`,
+    da der Beschreibungsstandard dafür kein eigenes Element vorsieht.
+
+    Args:
+        directory: Exportverzeichnis
+        results: Ergebnisse aller Tabellen
+        date_from: Beginn des exportierten Zeitraums
+        date_to: Ende des exportierten Zeitraums
+        supplier: Name des Datenlieferanten
+
+    Returns:
+        Path: Pfad der geschriebenen index.xml
+    """
+    root = ElementTree.Element('DataSet')
+    ElementTree.SubElement(root, 'Version').text = '1.0'
+    data_supplier = ElementTree.SubElement(root, 'DataSupplier')
+    ElementTree.SubElement(data_supplier, 'Name').text = supplier
+    ElementTree.SubElement(data_supplier, 'Location').text = ''
+    ElementTree.SubElement(data_supplier, 'Comment').text = (
+        f"Erstellt am {timezone.localtime().strftime('%d.%m.%Y %H:%M')}"
+    )
+    media = ElementTree.SubElement(root, 'Media')
+    ElementTree.SubElement(media, 'Name').text = 'Datenträger 1'
+
+    for result in results:
+        table = EXPORT_TABLES[result.table]
+        element = ElementTree.SubElement(media, 'Table')
+        ElementTree.SubElement(element, 'URL').text = table.filename
+        ElementTree.SubElement(element, 'Name').text = table.name
+        ElementTree.SubElement(element, 'Description').text = (
+            f"{table.description}; {result.rows} Datensätze; SHA-256 {result.sha256}"
+        )
+        if table.date_field and (date_from or date_to):
+            validity = ElementTree.SubElement(ElementTree.SubElement(element, 'Validity'), 'Range')
+            ElementTree.SubElement(validity, 'From').text = date_from.strftime('%d.%m.%Y') if date_from else ''
+            ElementTree.SubElement(validity, 'To').text = date_to.strftime('%d.%m.%Y') if date_to else ''
+        ElementTree.SubElement(element, 'UTF8')
+        ElementTree.SubElement(element, 'DecimalSymbol').text = ','
+        ElementTree.SubElement(element, 'DigitGroupingSymbol').text = '.'
+        # Erste Zeile enthält die Spaltennamen
+        ElementTree.SubElement(ElementTree.SubElement(element, 'Range'), 'From').text = '2'
+        layout = ElementTree.SubElement(element, 'VariableLength')
+        ElementTree.SubElement(layout, 'ColumnDelimiter').text = ';'
+        ElementTree.SubElement(layout, 'RecordDelimiter').text = '\r\n'
+        ElementTree.SubElement(layout, 'TextEncapsulator').text = '"'
+        _column_element(layout, 'VariablePrimaryKey', table.columns[0])
+        for column in table.columns[1:]:
+            _column_element(layout, 'VariableColumn', column)
+
+    ElementTree.indent(root)
+    path = directory / INDEX_FILENAME
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', encoding='utf-8', newline='\n') as handle:
+        handle.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+        handle.write(f'<!DOCTYPE DataSet SYSTEM "{DTD_FILENAME}">\n')
+        handle.write(ElementTree.tostring(root, encoding='unicode').replace('\r\n', '&#13;&#10;'))
+        handle.write('\n')
+    os.replace(tmp, path)
+    return path
+
+
+def export_gdpdu(
+    directory: Path,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    workers: Optional[int] = None,
+    tables: Optional[List[str]] = None,
+    chunk_size: int = CHUNK_SIZE,
+    supplier: str = '',
+) -> List[TableResult]:
+    """
+    Erstellt den vollständigen Z3-Export (CSV-Dateien + index.xml).
+
+    Bereits vollständig exportierte Tabellen eines früheren, abgebrochenen
+    Laufs mit denselben Parametern werden übernommen, angefangene fortgesetzt.
+
+    Args:
+        directory: Zielverzeichnis (wird angelegt)
+        date_from: Erster Buchungstag (inklusive)
+        date_to: Letzter Buchungstag (inklusive)
+        workers: Anzahl Prozesse (Standard: eine je Tabelle; 1 = ohne Pool)
+        tables: Auswahl aus `EXPORT_TABLES` (Standard: alle)
+        chunk_size: Zeilen je Datenbank-Fetch
+        supplier: Name des Datenlieferanten für index.xml
+
+    Returns:
+        List[TableResult]: Ergebnis je Tabelle
+
+    Raises:
+        ValueError: Bei unbekannten Tabellennamen oder wenn das Verzeichnis
+            bereits einen abgeschlossenen Export enthält
+    """
+    names = tables or list(EXPORT_TABLES)
+    unknown = set(names) - EXPORT_TABLES.keys()
+    if unknown:
+        raise ValueError(f"Unbekannte Exporttabellen: {', '.join(sorted(unknown))}")
+
+    if (directory / INDEX_FILENAME).exists():
+        raise ValueError(f"{directory} enthält bereits einen abgeschlossenen Export.")
+    directory.mkdir(parents=True, exist_ok=True)
+
+    workers = min(workers or len(names), len(names))
+    if workers == 1:
+        results = [export_table(name, str(directory), date_from, date_to, chunk_size) for name in names]
+    else:
+        # Verbindungen nicht an Kindprozesse vererben; jeder Prozess initialisiert Django selbst
+        connections.close_all()
+        with process_pool(workers) as pool:
+            futures = [
+                pool.submit(export_table, name, str(directory), date_from, date_to, chunk_size)
+                for name in names
+            ]
+            results = [future.result() for future in futures]
+
+    write_index(directory, results, date_from, date_to, supplier)
+    return results
@@ -0,0 +1,96 @@
+"""
+Benchmark für den streamenden SEPA-Generator.
+
+Erzeugt einen synthetischen Zahlungslauf (Überweisungen oder Lastschriften),
+schreibt ihn in Dateien zu je `--batch-size` Transaktionen und validiert sie
+mit `--validate` parallel gegen das XSD (`settings.SEPA_XSD_DIR`). Ausgegeben werden
+Transaktionen pro Sekunde und der maximale Speicherzuwachs.
+
+Aufruf:
+    python manage.py benchmark_sepa /tmp/sepa --transactions 100000 --type pain.008
+    SEPA_XSD_DIR=/pfad/zu/xsd python manage.py benchmark_sepa /tmp/sepa --validate
+"""
+
+import random
+import resource
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Iterator
+
+from django.core.management.base import BaseCommand
+
+from apps.finance.sepa import (
+    PAIN_001, PAIN_008, CreditTransfer, DirectDebit, Party,
+    write_credit_transfers, write_direct_debits,
+)
+
+
+# Gültige Beispiel-IBANs (Prüfziffer korrekt)
+IBANS = ['DE89370400440532013000', 'DE02120300000000202051', 'DE02500105170137075030']
+
+
+class Command(BaseCommand):
+    help = 'Misst den Durchsatz der SEPA-XML-Erzeugung (pain.001/pain.008), optional mit XSD-Validierung.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('directory', type=Path, help='Zielverzeichnis')
+        parser.add_argument('--transactions', type=int, default=100_000, help='Anzahl Transaktionen')
+        parser.add_argument('--batch-size', type=int, default=20_000, help='Transaktionen je Datei')
+        parser.add_argument('--type', choices=[PAIN_001, PAIN_008], default=PAIN_001, help='Format')
+        parser.add_argument('--workers', type=int, help='Prozesse für die Validierung')
+        parser.add_argument('--validate', action='store_true', help='Gegen das XSD prüfen (SEPA_XSD_DIR)')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        own = Party('Muster GmbH', 'DE89 3704 0044 0532 0130 00', 'COBADEFFXXX')
+        execution_date = date.today() + timedelta(days=2)
+        count = options['transactions']
+        rng = random.Random(options['seed'])
+        memory_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+        started = time.perf_counter()
+        if options['type'] == PAIN_001:
+            files = write_credit_transfers(
+                options['directory'], own, execution_date, self._transfers(rng, count),
+                batch_size=options['batch_size'], validate=options['validate'], workers=options['workers'],
+            )
+        else:
+            files = write_direct_debits(
+                options['directory'], own, 'DE98ZZZ09999999999', execution_date, self._debits(rng, count),
+                batch_size=options['batch_size'], validate=options['validate'], workers=options['workers'],
+            )
+        seconds = time.perf_counter() - started
+        memory_growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - memory_before
+
+        for sepa_file in files:
+            self.stdout.write(
+                f"{sepa_file.path.name}: {sepa_file.transactions:,} Transaktionen, CtrlSum {sepa_file.control_sum}"
+            )
+        self.stdout.write(f"Dauer:          {seconds:.2f} s ({count / seconds:,.0f} Transaktionen/s)")
+        self.stdout.write(f"Speicherzuwachs: {memory_growth / 1024:.1f} MB (max. RSS)")
+        self.stdout.write(self.style.SUCCESS(
+            "Alle Dateien schemakonform." if options['validate'] else "Ohne XSD-Validierung erzeugt."
+        ))
+
+    def _transfers(self, rng: random.Random, count: int) -> Iterator[CreditTransfer]:
+        for index in range(count):
+            yield CreditTransfer(
+                end_to_end_id=f'ER-{index:08d}',
+                amount=Decimal(rng.randint(1, 500_000)) / 100,
+                creditor=Party(f'Lieferant Müller & Söhne {index % 1000}', rng.choice(IBANS)),
+                remittance=f'Rechnung ER-{index:08d} Kd-Nr {index % 5000}',
+            )
+
+    def _debits(self, rng: random.Random, count: int) -> Iterator[DirectDebit]:
+        for index in range(count):
+            yield DirectDebit(
+                end_to_end_id=f'RE-{index:08d}',
+                amount=Decimal(rng.randint(1, 50_000)) / 100,
+                debtor=Party(f'Kunde {index % 1000}', rng.choice(IBANS), 'COBADEFFXXX' if index % 2 else ''),
+                mandate_reference=f'M-{index % 20_000:06d}',
+                mandate_signature_date=date(2024, 1, 1),
+                sequence_type=rng.choice(['FRST', 'RCUR']),
+                remittance=f'Rechnung RE-{index:08d}',
+            )
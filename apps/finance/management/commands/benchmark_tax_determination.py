@@ -0,0 +1,94 @@
+"""
+Benchmark für die Steuerfindung mit gemischten Steuerfällen.
+
+Vergleicht eine Abfrage je Position (Schlüsselsuche per ORM) mit der
+kompilierten Tabelle (`determine_tax`), prüft, dass beide dieselben Regeln
+liefern, und gibt Positionen pro Sekunde sowie die Anzahl Datenbankabfragen aus.
+
+Aufruf:
+    python manage.py benchmark_tax_determination --lines 200000
+"""
+
+import random
+import time
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.finance.models import TaxKey
+from apps.finance.services import TaxCase, determine_tax, get_tax_table, invalidate_tax_table, tax_region
+
+
+# Inland, EU-Ausland und Drittland gemischt
+COUNTRIES = ['DE'] * 6 + ['AT', 'FR', 'NL', 'IT', 'PL', 'US', 'CH', 'GB', 'CN']
+TAX_CLASSES = [value for value in TaxKey.TaxClass.values if value != TaxKey.TaxClass.ANY]
+
+
+class Command(BaseCommand):
+    help = 'Misst die Steuerfindung für gemischte Rechnungsbatches (Positionen/s, Abfragen).'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--lines', type=int, default=100_000, help='Anzahl Positionen')
+        parser.add_argument('--naive-lines', type=int, default=2_000, help='Positionen für den Vergleichslauf')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        if not TaxKey.objects.exists():
+            raise CommandError("Keine Steuerschlüssel vorhanden (Migrationen ausgeführt?).")
+
+        rng = random.Random(options['seed'])
+        cases = [
+            TaxCase('DE', rng.choice(COUNTRIES), rng.choice(['b2b', 'b2c']), rng.choice(TAX_CLASSES))
+            for _ in range(options['lines'])
+        ]
+        sample = cases[:options['naive_lines']]
+
+        with CaptureQueriesContext(connection) as naive_queries:
+            started = time.perf_counter()
+            naive = [self._determine_naive(case) for case in sample]
+            naive_seconds = time.perf_counter() - started
+
+        invalidate_tax_table()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            decisions = determine_tax(cases)
+            seconds = time.perf_counter() - started
+
+        if [decision.rule_name for decision in decisions[:len(sample)]] != naive:
+            raise CommandError("Kompilierte Tabelle und Einzelabfragen liefern unterschiedliche Regeln!")
+
+        rules = {}
+        for decision in decisions:
+            rules[decision.rule_name] = rules.get(decision.rule_name, 0) + 1
+        for name, count in sorted(rules.items(), key=lambda item: -item[1]):
+            self.stdout.write(f"  {name:<42} {count:>9,}")
+        self.stdout.write(
+            f"Abfrage je Position:  {len(sample) / naive_seconds:>12,.0f} Positionen/s "
+            f"({len(naive_queries)} Abfragen für {len(sample):,} Positionen)"
+        )
+        self.stdout.write(
+            f"Kompilierte Tabelle:  {len(cases) / seconds:>12,.0f} Positionen/s "
+            f"({len(queries)} Abfragen für {len(cases):,} Positionen, "
+            f"{len(get_tax_table().keys)} Schlüssel)"
+        )
+        self.stdout.write(self.style.SUCCESS("Ergebnisse identisch."))
+
+    def _determine_naive(self, case: TaxCase) -> str:
+        """Referenz: spezifischsten passenden Schlüssel per Datenbankabfrage suchen."""
+        region = tax_region(case.seller_country, case.buyer_country)
+        candidates: List = list(TaxKey.objects.filter(
+            seller_country=case.seller_country,
+            buyer_country__in=[case.buyer_country, region],
+            buyer_type__in=[case.buyer_type, TaxKey.BuyerType.ANY],
+            tax_class__in=[case.tax_class, TaxKey.TaxClass.ANY],
+        ).select_related('rule'))
+        candidates.sort(key=lambda key: (
+            key.buyer_country != case.buyer_country,
+            key.buyer_type != case.buyer_type,
+            key.tax_class != case.tax_class,
+        ))
+        if not candidates:
+            raise CommandError(f"Kein Steuerschlüssel für {case}.")
+        return candidates[0].rule.name
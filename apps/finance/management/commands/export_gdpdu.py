@@ -0,0 +1,58 @@
+"""
+Datenüberlassung nach GoBD (Z3): Export im Beschreibungsstandard GDPdU.
+
+Schreibt je Tabelle eine CSV-Datei und abschließend `index.xml` mit
+Zeilenanzahl und SHA-256-Prüfsummen. Ein abgebrochener Export wird beim
+erneuten Aufruf mit denselben Parametern fortgesetzt; für einen neuen
+Export ein leeres Verzeichnis angeben.
+
+Aufruf:
+    python manage.py export_gdpdu /pfad/zum/export --from 2025-01-01 --to 2025-12-31
+    python manage.py export_gdpdu /pfad/zum/export --workers 1 --tables buchungszeilen
+"""
+
+import time
+from datetime import date
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.finance.gdpdu import EXPORT_TABLES, INDEX_FILENAME, export_gdpdu
+
+
+class Command(BaseCommand):
+    help = 'Exportiert Hauptbuch und Änderungsprotokoll für die Betriebsprüfung (GoBD Z3 / GDPdU).'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('directory', type=Path, help='Zielverzeichnis')
+        parser.add_argument('--from', dest='date_from', type=date.fromisoformat, help='Erster Tag (JJJJ-MM-TT)')
+        parser.add_argument('--to', dest='date_to', type=date.fromisoformat, help='Letzter Tag (JJJJ-MM-TT)')
+        parser.add_argument('--workers', type=int, help='Anzahl Prozesse (Standard: eine je Tabelle)')
+        parser.add_argument(
+            '--tables', nargs='+', choices=sorted(EXPORT_TABLES), help='Nur diese Tabellen exportieren',
+        )
+        parser.add_argument('--supplier', default='', help='Name des Datenlieferanten')
+
+    def handle(self, *args, **options) -> None:
+        if options['date_from'] and options['date_to'] and options['date_from'] > options['date_to']:
+            raise CommandError("--from liegt nach --to.")
+
+        started = time.perf_counter()
+        try:
+            results = export_gdpdu(
+                options['directory'],
+                date_from=options['date_from'],
+                date_to=options['date_to'],
+                workers=options['workers'],
+                tables=options['tables'],
+                supplier=options['supplier'],
+            )
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        seconds = time.perf_counter() - started
+
+        for result in results:
+            self.stdout.write(f"{result.table:<22} {result.rows:>12,} Zeilen  SHA-256 {result.sha256}")
+        self.stdout.write(self.style.SUCCESS(
+            f"Export abgeschlossen in {seconds:.1f} s: {options['directory'] / INDEX_FILENAME}"
+        ))
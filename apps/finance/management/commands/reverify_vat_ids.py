@@ -0,0 +1,36 @@
+"""
+Prüft die USt-IdNrn. gesammelt erneut über VIES.
+
+Fragt jede bekannte Nummer einmal ab, bevor ihre letzte Prüfung abläuft, damit
+die Rechnungserstellung ausschließlich auf gespeicherte Ergebnisse zugreift
+(z.B. nächtlich per Cron).
+
+Aufruf:
+    python manage.py reverify_vat_ids
+    python manage.py reverify_vat_ids DE136695976 ATU13585627 --workers 8
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.finance.services import reverify_vat_ids
+
+
+class Command(BaseCommand):
+    help = 'Prüft USt-IdNrn. vor Ablauf ihrer letzten Prüfung erneut über VIES.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('vat_ids', nargs='*', help='USt-IdNrn. (Standard: alle bereits geprüften)')
+        parser.add_argument('--refresh-days', type=int, default=7,
+                            help='Nummern prüfen, deren Prüfung in diesem Zeitraum abläuft')
+        parser.add_argument('--workers', type=int, default=4, help='Parallele VIES-Abfragen')
+
+    def handle(self, *args, **options) -> None:
+        result = reverify_vat_ids(
+            options['vat_ids'] or None,
+            refresh_days=options['refresh_days'],
+            workers=options['workers'],
+        )
+        for name, count in result.items():
+            self.stdout.write(f"{name:<8} {count}")
+        style = self.style.WARNING if result['failed'] else self.style.SUCCESS
+        self.stdout.write(style("Prüfung abgeschlossen."))
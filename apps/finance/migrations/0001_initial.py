@@ -0,0 +1,87 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:01
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Account',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('number', models.CharField(help_text='Kontonummer, z.B. 8400.', max_length=10, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('account_type', models.CharField(choices=[('asset', 'Aktiva'), ('liability', 'Passiva'), ('equity', 'Eigenkapital'), ('revenue', 'Erlöse'), ('expense', 'Aufwand')], max_length=20)),
+            ],
+            options={
+                'verbose_name': 'Sachkonto',
+                'verbose_name_plural': 'Sachkonten',
+                'ordering': ['number'],
+            },
+        ),
+        migrations.CreateModel(
+            name='JournalEntry',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('posting_date', models.DateField(help_text='Buchungsdatum.')),
+                ('period', models.PositiveIntegerField(db_index=True, help_text='Buchungsperiode als JJJJMM.')),
+                ('description', models.CharField(max_length=255)),
+                ('reference', models.CharField(blank=True, help_text='Belegnummer (Belegprinzip).', max_length=100)),
+                ('reversal_of', models.OneToOneField(blank=True, help_text='Stornierte Buchung, falls dies eine Stornobuchung ist.', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='reversed_by', to='finance.journalentry')),
+            ],
+            options={
+                'verbose_name': 'Buchungssatz',
+                'verbose_name_plural': 'Buchungssätze',
+                'ordering': ['posting_date', 'created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='AccountBalance',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('period', models.PositiveIntegerField(help_text='Buchungsperiode als JJJJMM.')),
+                ('period_debit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('period_credit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('closing_debit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('closing_credit', models.DecimalField(decimal_places=2, default=0, max_digits=18)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='balances', to='finance.account')),
+            ],
+            options={
+                'verbose_name': 'Kontensaldo',
+                'verbose_name_plural': 'Kontensalden',
+                'ordering': ['account', 'period'],
+                'constraints': [models.UniqueConstraint(fields=('account', 'period'), name='finance_accountbalance_unique_period')],
+            },
+        ),
+        migrations.CreateModel(
+            name='LedgerLine',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('debit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('credit', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('account', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='ledger_lines', to='finance.account')),
+                ('entry', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='lines', to='finance.journalentry')),
+            ],
+            options={
+                'verbose_name': 'Buchungszeile',
+                'verbose_name_plural': 'Buchungszeilen',
+                'constraints': [models.CheckConstraint(condition=models.Q(('credit__gte', 0), ('debit__gte', 0)), name='finance_ledgerline_non_negative')],
+            },
+        ),
+    ]
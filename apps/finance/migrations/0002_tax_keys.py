@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:14
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaxRule',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(help_text="z.B. 'Innergemeinschaftliche Lieferung'.", max_length=100)),
+                ('tax_rate', models.DecimalField(decimal_places=2, help_text='Steuersatz in Prozent.', max_digits=5)),
+                ('is_reverse_charge', models.BooleanField(default=False)),
+                ('is_intra_community', models.BooleanField(default=False)),
+                ('is_export', models.BooleanField(default=False)),
+                ('datev_tax_key', models.CharField(blank=True, help_text='DATEV-Steuerschlüssel.', max_length=4)),
+                ('invoice_note', models.CharField(blank=True, help_text='Pflichthinweis auf der Rechnung.', max_length=200)),
+            ],
+            options={
+                'verbose_name': 'Steuerregel',
+                'verbose_name_plural': 'Steuerregeln',
+                'ordering': ['name'],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaxKey',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('seller_country', models.CharField(help_text='ISO-Ländercode des Leistenden.', max_length=2)),
+                ('buyer_country', models.CharField(help_text='ISO-Ländercode oder Region.', max_length=8)),
+                ('buyer_type', models.CharField(choices=[('b2b', 'Unternehmer (B2B)'), ('b2c', 'Privatkunde (B2C)'), ('*', 'Alle')], max_length=3)),
+                ('tax_class', models.CharField(choices=[('goods_standard', 'Ware (Regelsteuersatz)'), ('goods_reduced', 'Ware (ermäßigter Steuersatz)'), ('service_standard', 'Sonstige Leistung (Regelsteuersatz)'), ('service_reduced', 'Sonstige Leistung (ermäßigter Steuersatz)'), ('*', 'Alle')], max_length=20)),
+                ('rule', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='keys', to='finance.taxrule')),
+            ],
+            options={
+                'verbose_name': 'Steuerschlüssel',
+                'verbose_name_plural': 'Steuerschlüssel',
+                'constraints': [models.UniqueConstraint(fields=('seller_country', 'buyer_country', 'buyer_type', 'tax_class'), name='finance_taxkey_unique')],
+            },
+        ),
+    ]
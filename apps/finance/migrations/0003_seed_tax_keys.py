@@ -0,0 +1,82 @@
+"""
+Standard-Steuerschlüssel für ein deutsches Unternehmen (Entscheidungsmatrix
+aus `.agent/knowledge/ustg_vat_logic.md`, Abschnitt 1).
+
+Fernverkäufe an Privatkunden im EU-Ausland werden mit deutscher USt
+angelegt (unterhalb der Lieferschwelle, § 3c Abs. 4 UStG); bei OSS-Pflicht
+werden länderspezifische Schlüssel ergänzt, die Vorrang haben.
+"""
+
+from decimal import Decimal
+
+from django.db import migrations
+
+
+RULES = {
+    'DE19': dict(name='Regelsteuersatz 19 %', tax_rate=Decimal('19.00'), datev_tax_key='3'),
+    'DE7': dict(name='Ermäßigter Steuersatz 7 %', tax_rate=Decimal('7.00'), datev_tax_key='2'),
+    'IGL': dict(
+        name='Innergemeinschaftliche Lieferung', tax_rate=Decimal('0.00'), is_intra_community=True,
+        invoice_note='Steuerfreie innergemeinschaftliche Lieferung (§ 4 Nr. 1b UStG)',
+    ),
+    'RC': dict(
+        name='Reverse Charge (EU)', tax_rate=Decimal('0.00'), is_reverse_charge=True,
+        invoice_note='Steuerschuldnerschaft des Leistungsempfängers (Reverse Charge)',
+    ),
+    'EXPORT': dict(
+        name='Ausfuhrlieferung', tax_rate=Decimal('0.00'), is_export=True,
+        invoice_note='Steuerfreie Ausfuhrlieferung (§ 4 Nr. 1a UStG)',
+    ),
+    'THIRD_B2B': dict(
+        name='Nicht steuerbare Leistung (Drittland)', tax_rate=Decimal('0.00'), is_reverse_charge=True,
+        invoice_note='Nicht im Inland steuerbare Leistung (§ 3a Abs. 2 UStG), '
+                     'Steuerschuldnerschaft des Leistungsempfängers',
+    ),
+}
+
+STANDARD = ('goods_standard', 'service_standard')
+REDUCED = ('goods_reduced', 'service_reduced')
+GOODS = ('goods_standard', 'goods_reduced')
+SERVICES = ('service_standard', 'service_reduced')
+
+# (Empfängerregion, Kundenstatus, Steuerklassen, Regel)
+KEYS = [
+    ('domestic', '*', STANDARD, 'DE19'),
+    ('domestic', '*', REDUCED, 'DE7'),
+    ('eu', 'b2b', GOODS, 'IGL'),
+    ('eu', 'b2b', SERVICES, 'RC'),
+    ('eu', 'b2c', STANDARD, 'DE19'),
+    ('eu', 'b2c', REDUCED, 'DE7'),
+    ('third', '*', GOODS, 'EXPORT'),
+    ('third', 'b2b', SERVICES, 'THIRD_B2B'),
+    ('third', 'b2c', ('service_standard',), 'DE19'),
+    ('third', 'b2c', ('service_reduced',), 'DE7'),
+]
+
+
+def seed_tax_keys(apps, schema_editor):
+    TaxRule = apps.get_model('finance', 'TaxRule')
+    TaxKey = apps.get_model('finance', 'TaxKey')
+    rules = {code: TaxRule.objects.create(**fields) for code, fields in RULES.items()}
+    TaxKey.objects.bulk_create([
+        TaxKey(seller_country='DE', buyer_country=region, buyer_type=buyer_type, tax_class=tax_class,
+               rule=rules[code])
+        for region, buyer_type, tax_classes, code in KEYS
+        for tax_class in tax_classes
+    ])
+
+
+def remove_tax_keys(apps, schema_editor):
+    apps.get_model('finance', 'TaxKey').objects.all().delete()
+    apps.get_model('finance', 'TaxRule').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0002_tax_keys'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed_tax_keys, remove_tax_keys),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:18
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0003_seed_tax_keys'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VatIdCheck',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('vat_id', models.CharField(help_text='Normalisierte USt-IdNr. inkl. Länderpräfix.', max_length=16)),
+                ('is_valid', models.BooleanField()),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('address', models.TextField(blank=True)),
+                ('request_identifier', models.CharField(blank=True, help_text='VIES-Abfragekennung.', max_length=50)),
+            ],
+            options={
+                'verbose_name': 'USt-IdNr.-Prüfung',
+                'verbose_name_plural': 'USt-IdNr.-Prüfungen',
+                'indexes': [models.Index(fields=['vat_id', '-created_at'], name='finance_vatidcheck_latest')],
+            },
+        ),
+    ]
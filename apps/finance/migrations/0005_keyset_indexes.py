@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('finance', '0004_vat_id_checks'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ledgerline',
+            index=models.Index(fields=['created_at', 'id'], name='finance_ledgerline_keyset'),
+        ),
+    ]
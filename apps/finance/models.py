@@ -1,3 +1,211 @@
+"""
+Models für die Finance App (Hauptbuch / General Ledger).
+
+Buchungen sind nach GoBD unveränderbar (Rz. 58 ff.): Journal-Einträge und
+Buchungszeilen werden nur angelegt, nie geändert oder gelöscht. Korrekturen
+erfolgen ausschließlich über Stornobuchungen (`services.reverse_entry`).
+"""
+
 from django.db import models
 
-# Create your models here.
+from core.models import AppendOnlyModel, BaseModel
+
+
+class Account(BaseModel):
+    """Sachkonto des Kontenrahmens (z.B. SKR03/SKR04)."""
+
+    class AccountType(models.TextChoices):
+        ASSET = 'asset', 'Aktiva'
+        LIABILITY = 'liability', 'Passiva'
+        EQUITY = 'equity', 'Eigenkapital'
+        REVENUE = 'revenue', 'Erlöse'
+        EXPENSE = 'expense', 'Aufwand'
+
+    number = models.CharField(max_length=10, unique=True, help_text="Kontonummer, z.B. 8400.")
+    name = models.CharField(max_length=255)
+    account_type = models.CharField(max_length=20, choices=AccountType.choices)
+
+    class Meta:
+        verbose_name = "Sachkonto"
+        verbose_name_plural = "Sachkonten"
+        ordering = ['number']
+
+    def __str__(self) -> str:
+        return f"{self.number} {self.name}"
+
+
+class JournalEntry(AppendOnlyModel):
+    """Buchungssatz (Kopf) mit Belegdatum und Buchungsperiode."""
+
+    posting_date = models.DateField(help_text="Buchungsdatum.")
+    period = models.PositiveIntegerField(db_index=True, help_text="Buchungsperiode als JJJJMM.")
+    description = models.CharField(max_length=255)
+    reference = models.CharField(max_length=100, blank=True, help_text="Belegnummer (Belegprinzip).")
+    reversal_of = models.OneToOneField(
+        'self',
+        null=True,
+        blank=True,
+        on_delete=models.PROTECT,
+        related_name='reversed_by',
+        help_text="Stornierte Buchung, falls dies eine Stornobuchung ist.",
+    )
+
+    class Meta:
+        verbose_name = "Buchungssatz"
+        verbose_name_plural = "Buchungssätze"
+        ordering = ['posting_date', 'created_at']
+
+    def __str__(self) -> str:
+        return f"{self.posting_date} {self.description}"
+
+
+class LedgerLine(AppendOnlyModel):
+    """Buchungszeile: Soll- oder Haben-Betrag auf einem Sachkonto."""
+
+    entry = models.ForeignKey(JournalEntry, on_delete=models.PROTECT, related_name='lines')
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name='ledger_lines')
+    debit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    credit = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Buchungszeile"
+        verbose_name_plural = "Buchungszeilen"
+        indexes = [
+            # Seitenweises Blättern des Buchungsjournals (core.listing)
+            models.Index(fields=['created_at', 'id'], name='finance_ledgerline_keyset'),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(debit__gte=0, credit__gte=0),
+                name='finance_ledgerline_non_negative',
+            ),
+        ]
+
+
+class AccountBalance(BaseModel):
+    """
+    Inkrementell gepflegter Saldo-Snapshot je Konto und Periode.
+
+    Enthält die Verkehrszahlen der Periode sowie die kumulierten Summen bis
+    einschließlich dieser Periode. Saldenlisten lesen so je Konto genau eine
+    Zeile, statt alle Buchungszeilen zu summieren.
+    Wird ausschließlich von `apps.finance.services` geschrieben.
+    """
+
+    account = models.ForeignKey(Account, on_delete=models.PROTECT, related_name='balances')
+    period = models.PositiveIntegerField(help_text="Buchungsperiode als JJJJMM.")
+    period_debit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    period_credit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    closing_debit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+    closing_credit = models.DecimalField(max_digits=18, decimal_places=2, default=0)
+
+    class Meta:
+        verbose_name = "Kontensaldo"
+        verbose_name_plural = "Kontensalden"
+        ordering = ['account', 'period']
+        constraints = [
+            models.UniqueConstraint(fields=['account', 'period'], name='finance_accountbalance_unique_period'),
+        ]
+
+
+class TaxRule(BaseModel):
+    """
+    Steuerregel: wie versteuert wird (Satz, Steuerart, Rechnungshinweis).
+
+    Siehe `.agent/knowledge/ustg_vat_logic.md`, Abschnitt 5.1.
+    """
+
+    name = models.CharField(max_length=100, help_text="z.B. 'Innergemeinschaftliche Lieferung'.")
+    tax_rate = models.DecimalField(max_digits=5, decimal_places=2, help_text="Steuersatz in Prozent.")
+
+    # Buchungslogik
+    is_reverse_charge = models.BooleanField(default=False)
+    is_intra_community = models.BooleanField(default=False)
+    is_export = models.BooleanField(default=False)
+
+    datev_tax_key = models.CharField(max_length=4, blank=True, help_text="DATEV-Steuerschlüssel.")
+    invoice_note = models.CharField(max_length=200, blank=True, help_text="Pflichthinweis auf der Rechnung.")
+
+    class Meta:
+        verbose_name = "Steuerregel"
+        verbose_name_plural = "Steuerregeln"
+        ordering = ['name']
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.tax_rate} %)"
+
+
+class TaxKey(BaseModel):
+    """
+    Steuerschlüssel: ordnet einen Steuerfall einer Steuerregel zu.
+
+    Ein Steuerfall besteht aus Land des Leistenden, Land des Empfängers,
+    Kundenstatus und Steuerklasse des Artikels. Beim Empfängerland sind neben
+    ISO-Ländercodes die Regionen 'domestic' (Land des Leistenden), 'eu'
+    (übrige EU-Mitgliedstaaten) und 'third' (Drittland) erlaubt; bei
+    Kundenstatus und Steuerklasse steht '*' für "alle". Der spezifischste
+    Schlüssel gewinnt (Land vor Region, dann Kundenstatus, dann Steuerklasse).
+    """
+
+    class Region(models.TextChoices):
+        DOMESTIC = 'domestic', 'Inland'
+        EU = 'eu', 'EU-Ausland'
+        THIRD = 'third', 'Drittland'
+
+    class BuyerType(models.TextChoices):
+        B2B = 'b2b', 'Unternehmer (B2B)'
+        B2C = 'b2c', 'Privatkunde (B2C)'
+        ANY = '*', 'Alle'
+
+    class TaxClass(models.TextChoices):
+        GOODS_STANDARD = 'goods_standard', 'Ware (Regelsteuersatz)'
+        GOODS_REDUCED = 'goods_reduced', 'Ware (ermäßigter Steuersatz)'
+        SERVICE_STANDARD = 'service_standard', 'Sonstige Leistung (Regelsteuersatz)'
+        SERVICE_REDUCED = 'service_reduced', 'Sonstige Leistung (ermäßigter Steuersatz)'
+        ANY = '*', 'Alle'
+
+    seller_country = models.CharField(max_length=2, help_text="ISO-Ländercode des Leistenden.")
+    buyer_country = models.CharField(max_length=8, help_text="ISO-Ländercode oder Region.")
+    buyer_type = models.CharField(max_length=3, choices=BuyerType.choices)
+    tax_class = models.CharField(max_length=20, choices=TaxClass.choices)
+    rule = models.ForeignKey(TaxRule, on_delete=models.PROTECT, related_name='keys')
+
+    class Meta:
+        verbose_name = "Steuerschlüssel"
+        verbose_name_plural = "Steuerschlüssel"
+        constraints = [
+            models.UniqueConstraint(
+                fields=['seller_country', 'buyer_country', 'buyer_type', 'tax_class'],
+                name='finance_taxkey_unique',
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.seller_country}→{self.buyer_country} {self.buyer_type} {self.tax_class}: {self.rule.name}"
+
+
+class VatIdCheck(AppendOnlyModel):
+    """
+    Ergebnis einer qualifizierten Bestätigungsabfrage einer USt-IdNr. (§ 18e UStG).
+
+    Jede Abfrage wird als eigener Datensatz festgeschrieben und dient als
+    Nachweis für steuerfreie innergemeinschaftliche Lieferungen (§ 6a UStG).
+    Die jüngste Abfrage je Nummer ist zugleich der Cache für
+    `services.get_vat_id_statuses`; geschrieben wird nur über die Services.
+    """
+
+    vat_id = models.CharField(max_length=16, help_text="Normalisierte USt-IdNr. inkl. Länderpräfix.")
+    is_valid = models.BooleanField()
+    name = models.CharField(max_length=255, blank=True)
+    address = models.TextField(blank=True)
+    request_identifier = models.CharField(max_length=50, blank=True, help_text="VIES-Abfragekennung.")
+
+    class Meta:
+        verbose_name = "USt-IdNr.-Prüfung"
+        verbose_name_plural = "USt-IdNr.-Prüfungen"
+        indexes = [
+            models.Index(fields=['vat_id', '-created_at'], name='finance_vatidcheck_latest'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.vat_id}: {'gültig' if self.is_valid else 'ungültig'}"
@@ -0,0 +1,586 @@
+"""
+Streamender SEPA-XML-Generator (ISO 20022, DK-Spezifikation Anlage 3).
+
+Erzeugt Überweisungen (`pain.001.001.03`, CstmrCdtTrfInitn) und Lastschriften
+(`pain.008.001.02`, CstmrDrctDbtInitn), ohne das Dokument im Speicher
+aufzubauen:
+
+- Transaktionen werden sofort als XML-Fragment in einen Zwischenspeicher je
+  Zahlungsgruppe (`PmtInf`) geschrieben; `NbOfTxs` und `CtrlSum` werden
+  laufend mitgezählt.
+- Ist die Batchgröße erreicht, wird die Datei abgeschlossen: Kopf mit den
+  Kontrollsummen schreiben, Gruppen anhängen. Der Speicherbedarf ist damit
+  unabhängig von der Anzahl Transaktionen.
+- Mit `validate=True` werden fertige Dateien sofort an einen Prozess-Pool
+  zur XSD-Validierung übergeben, während die nächste Datei geschrieben wird.
+- MsgId und Dateiname enthalten einen eindeutigen Laufanteil; vorhandene
+  Dateien werden nie überschrieben. Bricht ein Lauf ab (z.B. ungültige IBAN
+  in Transaktion N), werden die bereits geschriebenen Dateien gelöscht, damit
+  kein unvollständiger Zahlungslauf an die Bank übertragen wird.
+
+Die XSD-Validierung ist optional, da die Schemata nicht im Repository liegen:
+`pain.001.001.03.xsd` und `pain.008.001.02.xsd` (ISO 20022 bzw. DK-Anlage 3)
+in ein Verzeichnis legen, `settings.SEPA_XSD_DIR` darauf setzen und
+`validate=True` übergeben.
+"""
+
+import re
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, IO, Iterable, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils import timezone
+
+from core.utils.processes import process_pool
+
+
+PAIN_001 = 'pain.001.001.03'
+PAIN_008 = 'pain.008.001.02'
+
+# Standard: Transaktionen je Datei (viele Banken begrenzen die Dateigröße)
+DEFAULT_BATCH_SIZE = 50_000
+
+MAX_AMOUNT = Decimal('999999999.99')
+CENT = Decimal('0.01')
+
+# Zeichen bleiben 1:1 erhalten, Umlaute werden umschrieben (DK-Zeichensatz)
+_TRANSLITERATION = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'Ae', 'Ö': 'Oe', 'Ü': 'Ue', 'ß': 'ss', '&': '+',
+})
+_NOT_ALLOWED = re.compile(r"[^A-Za-z0-9/\-?:().,'+ ]")
+
+# IBAN-Prüfziffer: Buchstaben A-Z werden zu 10-35
+_IBAN_DIGITS = str.maketrans({chr(code): str(code - 55) for code in range(ord('A'), ord('Z') + 1)})
+
+# Je Worker-Prozess einmal geladene XSD-Schemata
+_schemas: Dict[str, object] = {}
+
+
+class SepaValidationError(Exception):
+    """Mindestens eine erzeugte Datei entspricht nicht dem XSD-Schema."""
+
+    def __init__(self, files: List['SepaFile']) -> None:
+        self.files = files
+        details = '; '.join(f"{item.path.name}: {item.errors[0]}" for item in files)
+        super().__init__(f"SEPA-Dateien ungültig ({details}).")
+
+
+@dataclass(frozen=True)
+class Party:
+    """
+    Kontoinhaber (Auftraggeber oder Empfänger).
+
+    Attributes:
+        name: Name (wird auf 70 Zeichen im SEPA-Zeichensatz gekürzt)
+        iban: IBAN (Leerzeichen erlaubt)
+        bic: BIC (optional, "IBAN only")
+    """
+
+    name: str
+    iban: str
+    bic: str = ''
+
+
+@dataclass(frozen=True)
+class CreditTransfer:
+    """Einzelne Überweisung (pain.001)."""
+
+    end_to_end_id: str
+    amount: Decimal
+    creditor: Party
+    remittance: str = ''
+
+
+@dataclass(frozen=True)
+class DirectDebit:
+    """
+    Einzelne Lastschrift (pain.008).
+
+    Attributes:
+        sequence_type: FRST, RCUR, OOFF oder FNAL
+        local_instrument: CORE (Basislastschrift) oder B2B (Firmenlastschrift)
+    """
+
+    end_to_end_id: str
+    amount: Decimal
+    debtor: Party
+    mandate_reference: str
+    mandate_signature_date: date
+    sequence_type: str = 'RCUR'
+    local_instrument: str = 'CORE'
+    remittance: str = ''
+
+
+@dataclass
+class SepaFile:
+    """Ergebnis einer erzeugten SEPA-Datei."""
+
+    path: Path
+    message_id: str
+    transactions: int
+    control_sum: Decimal
+    errors: List[str] = field(default_factory=list)
+
+
+def sepa_text(value: str, max_length: int) -> str:
+    """
+    Wandelt einen Text in den SEPA-Basiszeichensatz um und kürzt ihn.
+
+    Args:
+        value: Beliebiger Text
+        max_length: Maximale Länge laut Schema (z.B. 70 für Namen)
+
+    Returns:
+        str: Zulässiger Text (Umlaute umschrieben, andere Zeichen durch Leerzeichen ersetzt)
+    """
+    if _NOT_ALLOWED.search(value) is None:
+        return value.strip()[:max_length]
+    return _NOT_ALLOWED.sub(' ', value.translate(_TRANSLITERATION)).strip()[:max_length]
+
+
+def normalize_iban(iban: str) -> str:
+    """
+    Normalisiert und prüft eine IBAN (Länge, Format, Prüfziffer modulo 97).
+
+    Args:
+        iban: IBAN, auch mit Leerzeichen
+
+    Returns:
+        str: IBAN ohne Leerzeichen in Großbuchstaben
+
+    Raises:
+        ValueError: Bei ungültiger IBAN
+    """
+    compact = iban.replace(' ', '').upper()
+    if not re.fullmatch(r'[A-Z]{2}[0-9]{2}[A-Z0-9]{11,30}', compact):
+        raise ValueError(f"Ungültiges IBAN-Format: {iban}")
+    if int((compact[4:] + compact[:4]).translate(_IBAN_DIGITS)) % 97 != 1:
+        raise ValueError(f"Ungültige IBAN-Prüfziffer: {iban}")
+    return compact
+
+
+def _amount(value: Decimal, end_to_end_id: str) -> Decimal:
+    amount = Decimal(value).quantize(CENT, rounding=ROUND_HALF_UP)
+    if amount != value or not CENT <= amount <= MAX_AMOUNT:
+        raise ValueError(f"Ungültiger Betrag {value} (Transaktion {end_to_end_id}).")
+    return amount
+
+
+def _agent(bic: str) -> str:
+    if bic:
+        return f'<FinInstnId><BIC>{escape(bic.replace(" ", "").upper())}</BIC></FinInstnId>'
+    return '<FinInstnId><Othr><Id>NOTPROVIDED</Id></Othr></FinInstnId>'
+
+
+@lru_cache(maxsize=65536)
+def _account(iban: str) -> str:
+    # Zahlungsläufe enthalten dieselben Gegenkonten vielfach: Prüfung nur einmal je IBAN
+    return f'<Id><IBAN>{normalize_iban(iban)}</IBAN></Id>'
+
+
+def _name(value: str) -> str:
+    return f'<Nm>{escape(sepa_text(value, 70))}</Nm>'
+
+
+def _remittance(value: str) -> str:
+    return f'<RmtInf><Ustrd>{escape(sepa_text(value, 140))}</Ustrd></RmtInf>' if value else ''
+
+
+def _run_prefix(kind: str, day: date) -> str:
+    # Datum + UUID-Fragment: eindeutig je Lauf, mit Dateizähler 25 der 35 Zeichen einer MsgId
+    return f'{kind}{day:%Y%m%d}-{uuid.uuid4().hex[:8].upper()}'
+
+
+@dataclass
+class _Group:
+    """Zahlungsgruppe (`PmtInf`) mit ausgelagerten Transaktionsfragmenten."""
+
+    spool: IO[str]
+    transactions: int = 0
+    control_sum: Decimal = Decimal('0.00')
+
+
+class _SepaWriter:
+    """
+    Gemeinsame Logik für pain.001/pain.008: Gruppen, Kontrollsummen, Dateiwechsel.
+
+    Unterklassen liefern Schema, Wurzelelement, Gruppenkopf und das
+    XML-Fragment einer Transaktion.
+    """
+
+    schema = ''
+    root = ''
+
+    def __init__(
+        self,
+        directory: Path,
+        message_prefix: str,
+        initiating_party: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        on_file: Optional[Callable[[SepaFile], None]] = None,
+    ) -> None:
+        if batch_size < 1:
+            raise ValueError("Batchgröße muss mindestens 1 sein.")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.message_prefix = sepa_text(message_prefix, 28)
+        self.initiating_party = initiating_party
+        self.batch_size = batch_size
+        self.on_file = on_file
+        self.files: List[SepaFile] = []
+        self._written: List[Path] = []
+        self._groups: Dict[Tuple[str, ...], _Group] = {}
+        self._transactions = 0
+
+    def __enter__(self) -> '_SepaWriter':
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if exc_type is not None:
+            self._discard()
+            return
+        try:
+            self.close()
+        except BaseException:
+            self._discard()
+            raise
+
+    def _add(self, group_key: Tuple[str, ...], amount: Decimal, fragment: str) -> None:
+        group = self._groups.get(group_key)
+        if group is None:
+            # Bis 1 MB im Speicher, darüber automatisch in eine temporäre Datei
+            group = _Group(spool=tempfile.SpooledTemporaryFile(max_size=1024 * 1024, mode='w+', encoding='utf-8'))
+            self._groups[group_key] = group
+        group.spool.write(fragment)
+        group.transactions += 1
+        group.control_sum += amount
+        self._transactions += 1
+        if self._transactions >= self.batch_size:
+            self._finish_file()
+
+    def _group_header(self, payment_id: str, group_key: Tuple[str, ...], group: _Group) -> str:
+        raise NotImplementedError
+
+    def _finish_file(self) -> None:
+        if not self._groups:
+            return
+        message_id = f'{self.message_prefix}-{len(self.files) + 1:04d}'
+        path = self.directory / f'{message_id}.xml'
+        control_sum = sum((group.control_sum for group in self._groups.values()), Decimal('0.00'))
+        created = timezone.localtime().replace(microsecond=0).isoformat()
+
+        try:
+            handle = open(path, 'x', encoding='utf-8')
+        except FileExistsError:
+            raise FileExistsError(f"SEPA-Datei {path} existiert bereits und wird nicht überschrieben.") from None
+        with handle:
+            # Vor dem Schreiben vormerken: `_discard` entfernt auch eine angefangene Datei
+            self._written.append(path)
+            handle.write(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<Document xmlns="urn:iso:std:iso:20022:tech:xsd:{self.schema}" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance">'
+                f'<{self.root}><GrpHdr><MsgId>{escape(message_id)}</MsgId><CreDtTm>{created}</CreDtTm>'
+                f'<NbOfTxs>{self._transactions}</NbOfTxs><CtrlSum>{control_sum}</CtrlSum>'
+                f'<InitgPty>{_name(self.initiating_party)}</InitgPty></GrpHdr>'
+            )
+            for index, (group_key, group) in enumerate(self._groups.items(), start=1):
+                handle.write(self._group_header(f'{message_id}-{index}', group_key, group))
+                group.spool.seek(0)
+                shutil.copyfileobj(group.spool, handle)
+                group.spool.close()
+                handle.write('</PmtInf>')
+            handle.write(f'</{self.root}></Document>\n')
+
+        sepa_file = SepaFile(path, message_id, self._transactions, control_sum)
+        self.files.append(sepa_file)
+        self._groups = {}
+        self._transactions = 0
+        if self.on_file is not None:
+            self.on_file(sepa_file)
+
+    def _discard(self) -> None:
+        for group in self._groups.values():
+            group.spool.close()
+        for path in self._written:
+            path.unlink(missing_ok=True)
+        self._written = []
+        self.files = []
+        self._groups = {}
+        self._transactions = 0
+
+    def close(self) -> List[SepaFile]:
+        """
+        Schließt die letzte (angefangene) Datei ab.
+
+        Returns:
+            List[SepaFile]: Alle erzeugten Dateien
+        """
+        self._finish_file()
+        return self.files
+
+
+class CreditTransferWriter(_SepaWriter):
+    """Streamender Writer für SEPA-Überweisungen (pain.001.001.03)."""
+
+    schema = PAIN_001
+    root = 'CstmrCdtTrfInitn'
+
+    def __init__(self, directory: Path, debtor: Party, execution_date: date, **kwargs) -> None:
+        """
+        Args:
+            directory: Zielverzeichnis
+            debtor: Eigenes Konto (Auftraggeber)
+            execution_date: Gewünschtes Ausführungsdatum
+            **kwargs: message_prefix, batch_size, on_file (siehe `_SepaWriter`)
+        """
+        kwargs.setdefault('message_prefix', _run_prefix('SCT', execution_date))
+        super().__init__(directory, initiating_party=debtor.name, **kwargs)
+        self.debtor = debtor
+        self.execution_date = execution_date
+        self._debtor_account = _account(debtor.iban)
+
+    def add(self, transfer: CreditTransfer) -> None:
+        """Schreibt eine Überweisung (Validierung von IBAN und Betrag inklusive)."""
+        amount = _amount(transfer.amount, transfer.end_to_end_id)
+        creditor = transfer.creditor
+        agent = f'<CdtrAgt>{_agent(creditor.bic)}</CdtrAgt>' if creditor.bic else ''
+        self._add(('',), amount, (
+            f'<CdtTrfTxInf><PmtId><EndToEndId>{escape(sepa_text(transfer.end_to_end_id, 35))}</EndToEndId></PmtId>'
+            f'<Amt><InstdAmt Ccy="EUR">{amount}</InstdAmt></Amt>{agent}'
+            f'<Cdtr>{_name(creditor.name)}</Cdtr><CdtrAcct>{_account(creditor.iban)}</CdtrAcct>'
+            f'{_remittance(transfer.remittance)}</CdtTrfTxInf>'
+        ))
+
+    def _group_header(self, payment_id: str, group_key: Tuple[str, ...], group: _Group) -> str:
+        return (
+            f'<PmtInf><PmtInfId>{escape(payment_id)}</PmtInfId><PmtMtd>TRF</PmtMtd><BtchBookg>true</BtchBookg>'
+            f'<NbOfTxs>{group.transactions}</NbOfTxs><CtrlSum>{group.control_sum}</CtrlSum>'
+            '<PmtTpInf><SvcLvl><Cd>SEPA</Cd></SvcLvl></PmtTpInf>'
+            f'<ReqdExctnDt>{self.execution_date.isoformat()}</ReqdExctnDt>'
+            f'<Dbtr>{_name(self.debtor.name)}</Dbtr><DbtrAcct>{self._debtor_account}</DbtrAcct>'
+            f'<DbtrAgt>{_agent(self.debtor.bic)}</DbtrAgt><ChrgBr>SLEV</ChrgBr>'
+        )
+
+
+class DirectDebitWriter(_SepaWriter):
+    """
+    Streamender Writer für SEPA-Lastschriften (pain.008.001.02).
+
+    Je Kombination aus Lastschriftart (CORE/B2B) und Sequenztyp wird eine
+    eigene Zahlungsgruppe (`PmtInf`) gebildet.
+    """
+
+    schema = PAIN_008
+    root = 'CstmrDrctDbtInitn'
+    SEQUENCE_TYPES = ('FRST', 'RCUR', 'OOFF', 'FNAL')
+    LOCAL_INSTRUMENTS = ('CORE', 'B2B')
+
+    def __init__(
+        self,
+        directory: Path,
+        creditor: Party,
+        creditor_id: str,
+        collection_date: date,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            directory: Zielverzeichnis
+            creditor: Eigenes Konto (Zahlungsempfänger)
+            creditor_id: Gläubiger-Identifikationsnummer (z.B. DE98ZZZ09999999999)
+            collection_date: Fälligkeitsdatum der Lastschriften
+            **kwargs: message_prefix, batch_size, on_file (siehe `_SepaWriter`)
+        """
+        kwargs.setdefault('message_prefix', _run_prefix('SDD', collection_date))
+        super().__init__(directory, initiating_party=creditor.name, **kwargs)
+        self.creditor = creditor
+        self.creditor_id = sepa_text(creditor_id, 35)
+        self.collection_date = collection_date
+        self._creditor_account = _account(creditor.iban)
+
+    def add(self, debit: DirectDebit) -> None:
+        """Schreibt eine Lastschrift (Validierung von IBAN, Betrag und Sequenztyp inklusive)."""
+        if debit.sequence_type not in self.SEQUENCE_TYPES:
+            raise ValueError(f"Ungültiger Sequenztyp {debit.sequence_type} (Transaktion {debit.end_to_end_id}).")
+        if debit.local_instrument not in self.LOCAL_INSTRUMENTS:
+            raise ValueError(
+                f"Ungültige Lastschriftart {debit.local_instrument} (Transaktion {debit.end_to_end_id})."
+            )
+        amount = _amount(debit.amount, debit.end_to_end_id)
+        debtor = debit.debtor
+        self._add((debit.local_instrument, debit.sequence_type), amount, (
+            f'<DrctDbtTxInf><PmtId><EndToEndId>{escape(sepa_text(debit.end_to_end_id, 35))}</EndToEndId></PmtId>'
+            f'<InstdAmt Ccy="EUR">{amount}</InstdAmt>'
+            f'<DrctDbtTx><MndtRltdInf><MndtId>{escape(sepa_text(debit.mandate_reference, 35))}</MndtId>'
+            f'<DtOfSgntr>{debit.mandate_signature_date.isoformat()}</DtOfSgntr></MndtRltdInf></DrctDbtTx>'
+            f'<DbtrAgt>{_agent(debtor.bic)}</DbtrAgt><Dbtr>{_name(debtor.name)}</Dbtr>'
+            f'<DbtrAcct>{_account(debtor.iban)}</DbtrAcct>{_remittance(debit.remittance)}</DrctDbtTxInf>'
+        ))
+
+    def _group_header(self, payment_id: str, group_key: Tuple[str, ...], group: _Group) -> str:
+        local_instrument, sequence_type = group_key
+        return (
+            f'<PmtInf><PmtInfId>{escape(payment_id)}</PmtInfId><PmtMtd>DD</PmtMtd><BtchBookg>true</BtchBookg>'
+            f'<NbOfTxs>{group.transactions}</NbOfTxs><CtrlSum>{group.control_sum}</CtrlSum>'
+            f'<PmtTpInf><SvcLvl><Cd>SEPA</Cd></SvcLvl><LclInstrm><Cd>{local_instrument}</Cd></LclInstrm>'
+            f'<SeqTp>{sequence_type}</SeqTp></PmtTpInf>'
+            f'<ReqdColltnDt>{self.collection_date.isoformat()}</ReqdColltnDt>'
+            f'<Cdtr>{_name(self.creditor.name)}</Cdtr><CdtrAcct>{self._creditor_account}</CdtrAcct>'
+            f'<CdtrAgt>{_agent(self.creditor.bic)}</CdtrAgt><ChrgBr>SLEV</ChrgBr>'
+            f'<CdtrSchmeId><Id><PrvtId><Othr><Id>{escape(self.creditor_id)}</Id>'
+            '<SchmeNm><Prtry>SEPA</Prtry></SchmeNm></Othr></PrvtId></Id></CdtrSchmeId>'
+        )
+
+
+def validate_file(path: str, xsd_path: str) -> List[str]:
+    """
+    Validiert eine Datei gegen ein XSD-Schema (läuft im Prozess-Pool).
+
+    Args:
+        path: Pfad der XML-Datei
+        xsd_path: Pfad des XSD-Schemas
+
+    Returns:
+        List[str]: Fehlermeldungen (leer = gültig)
+    """
+    from lxml import etree
+
+    schema = _schemas.get(xsd_path)
+    if schema is None:
+        schema = _schemas[xsd_path] = etree.XMLSchema(etree.parse(xsd_path))
+    document = etree.parse(path, etree.XMLParser(huge_tree=True))
+    if schema.validate(document):
+        return []
+    return [f"Zeile {error.line}: {error.message}" for error in schema.error_log]
+
+
+def _xsd_path(schema: str) -> str:
+    directory = getattr(settings, 'SEPA_XSD_DIR', '')
+    path = Path(directory) / f'{schema}.xsd' if directory else None
+    if path is None or not path.exists():
+        raise ImproperlyConfigured(
+            f"XSD für {schema} nicht gefunden; SEPA_XSD_DIR auf das Verzeichnis der ISO-20022-Schemata setzen."
+        )
+    return str(path)
+
+
+def _write_batches(
+    writer_factory: Callable[..., _SepaWriter],
+    schema: str,
+    items: Iterable,
+    validate: bool,
+    workers: Optional[int],
+) -> List[SepaFile]:
+    """Schreibt alle Transaktionen und validiert fertige Dateien parallel im Prozess-Pool."""
+    if not validate:
+        with writer_factory(on_file=None) as writer:
+            for item in items:
+                writer.add(item)
+        return writer.files
+
+    xsd_path = _xsd_path(schema)
+    pending: List[Tuple[SepaFile, Future]] = []
+    with process_pool(workers, setup_django=False) as pool:
+        def submit(sepa_file: SepaFile) -> None:
+            pending.append((sepa_file, pool.submit(validate_file, str(sepa_file.path), xsd_path)))
+
+        with writer_factory(on_file=submit) as writer:
+            for item in items:
+                writer.add(item)
+        for sepa_file, future in pending:
+            sepa_file.errors = future.result()
+
+    invalid = [sepa_file for sepa_file in writer.files if sepa_file.errors]
+    if invalid:
+        raise SepaValidationError(invalid)
+    return writer.files
+
+
+def write_credit_transfers(
+    directory: Path,
+    debtor: Party,
+    execution_date: date,
+    transfers: Iterable[CreditTransfer],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    validate: bool = False,
+    workers: Optional[int] = None,
+) -> List[SepaFile]:
+    """
+    Erzeugt pain.001-Dateien für einen Zahlungslauf (Überweisungen).
+
+    Args:
+        directory: Zielverzeichnis
+        debtor: Eigenes Konto
+        execution_date: Ausführungsdatum
+        transfers: Überweisungen (beliebiger Iterator, wird nur einmal durchlaufen)
+        batch_size: Maximale Transaktionen je Datei
+        validate: Dateien gegen das XSD prüfen (erfordert `settings.SEPA_XSD_DIR`)
+        workers: Prozesse für die Validierung (Standard: Anzahl CPUs)
+
+    Returns:
+        List[SepaFile]: Erzeugte Dateien mit Anzahl und Kontrollsumme
+
+    Raises:
+        ValueError: Bei ungültigen Transaktionsdaten (IBAN, Betrag); bereits geschriebene Dateien werden gelöscht
+        FileExistsError: Wenn eine Zieldatei bereits existiert
+        SepaValidationError: Wenn eine Datei nicht schemakonform ist
+        ImproperlyConfigured: Bei `validate=True` ohne XSD in `settings.SEPA_XSD_DIR`
+    """
+    return _write_batches(
+        lambda on_file: CreditTransferWriter(
+            directory, debtor, execution_date, batch_size=batch_size, on_file=on_file,
+        ),
+        PAIN_001, transfers, validate, workers,
+    )
+
+
+def write_direct_debits(
+    directory: Path,
+    creditor: Party,
+    creditor_id: str,
+    collection_date: date,
+    debits: Iterable[DirectDebit],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    validate: bool = False,
+    workers: Optional[int] = None,
+) -> List[SepaFile]:
+    """
+    Erzeugt pain.008-Dateien für einen Lastschrifteinzug.
+
+    Args:
+        directory: Zielverzeichnis
+        creditor: Eigenes Konto
+        creditor_id: Gläubiger-Identifikationsnummer
+        collection_date: Fälligkeitsdatum
+        debits: Lastschriften (beliebiger Iterator, wird nur einmal durchlaufen)
+        batch_size: Maximale Transaktionen je Datei
+        validate: Dateien gegen das XSD prüfen (erfordert `settings.SEPA_XSD_DIR`)
+        workers: Prozesse für die Validierung (Standard: Anzahl CPUs)
+
+    Returns:
+        List[SepaFile]: Erzeugte Dateien mit Anzahl und Kontrollsumme
+
+    Raises:
+        ValueError: Bei ungültigen Transaktionsdaten (IBAN, Betrag, Sequenztyp); bereits geschriebene Dateien
+            werden gelöscht
+        FileExistsError: Wenn eine Zieldatei bereits existiert
+        SepaValidationError: Wenn eine Datei nicht schemakonform ist
+        ImproperlyConfigured: Bei `validate=True` ohne XSD in `settings.SEPA_XSD_DIR`
+    """
+    return _write_batches(
+        lambda on_file: DirectDebitWriter(
+            directory, creditor, creditor_id, collection_date, batch_size=batch_size, on_file=on_file,
+        ),
+        PAIN_008, debits, validate, workers,
+    )
@@ -6,16 +6,938 @@ Dieses Modul wird Business-Logik enthalten für:
 - Buchungseinträge (Accounting Entries)
 - Finanzberichte (Financial Reports)
 - Steuerberechnungen (Tax Calculations)
+- Prüfung von USt-IdNrn. (VIES)
 
 Alle Finance Business-Logik muss hier implementiert werden, nicht in Views.
 Hinweis: Dies ist die "Source of Truth" für alle monetären Transaktionen.
 """
 
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
 from decimal import Decimal
-from typing import List, Optional
+from itertools import product
+from typing import Dict, Iterable, List, Optional, Tuple
 
-# Placeholder für zukünftige Service-Funktionen
-# Beispiel:
-# def create_ledger_entry(account: str, amount: Decimal, description: str) -> LedgerEntry:
-#     """Erstellt einen neuen Hauptbucheintrag."""
-#     pass
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from apps.ai_engine.retrieval import retrieval_source
+from apps.finance.models import Account, AccountBalance, JournalEntry, LedgerLine, TaxKey, VatIdCheck
+from apps.finance.signals import entries_posted
+from apps.sales.models import Customer
+from core import audit
+from core.adapters.vies import ViesError, get_vies_adapter
+from core.cache import cached_service, invalidate_tags
+from core.compliance_constants import EU_MEMBER_STATES
+from core.models import AuditLog
+from core.queries import query_budget
+
+
+# Anzahl Datensätze je INSERT beim Massenbuchen
+BULK_BATCH_SIZE = 1000
+
+ZERO = Decimal('0.00')
+
+
+@dataclass
+class LineData:
+    """
+    Eingabedaten einer Buchungszeile.
+
+    Attributes:
+        account: Kontonummer (z.B. '8400')
+        debit: Soll-Betrag
+        credit: Haben-Betrag
+    """
+
+    account: str
+    debit: Decimal = ZERO
+    credit: Decimal = ZERO
+
+
+@dataclass
+class EntryData:
+    """
+    Eingabedaten eines Buchungssatzes.
+
+    Attributes:
+        posting_date: Buchungsdatum
+        description: Buchungstext
+        lines: Mindestens zwei Buchungszeilen, Soll = Haben
+        reference: Belegnummer
+        reversal_of: Stornierter Buchungssatz (nur bei Stornobuchungen)
+    """
+
+    posting_date: date
+    description: str
+    lines: List[LineData] = field(default_factory=list)
+    reference: str = ''
+    reversal_of: Optional[JournalEntry] = None
+
+
+def period_of(posting_date: date) -> int:
+    """
+    Ermittelt die Buchungsperiode (JJJJMM) eines Datums.
+
+    Args:
+        posting_date: Buchungsdatum
+
+    Returns:
+        int: Periode, z.B. 202601
+    """
+    return posting_date.year * 100 + posting_date.month
+
+
+def _validate_entry(entry: EntryData) -> None:
+    """
+    Prüft einen Buchungssatz auf formale Korrektheit (doppelte Buchführung).
+
+    Raises:
+        ValueError: Bei unausgeglichenen, leeren oder negativen Buchungen und
+                    Beträgen mit mehr als zwei Nachkommastellen
+    """
+    if len(entry.lines) < 2:
+        raise ValueError(f"Buchungssatz '{entry.description}' benötigt mindestens zwei Zeilen.")
+    debit = ZERO
+    credit = ZERO
+    for line in entry.lines:
+        if line.debit < 0 or line.credit < 0:
+            raise ValueError(f"Negative Beträge sind nicht zulässig ('{entry.description}').")
+        # Die Datenbank speichert Cent; Bruchteile würden beim Speichern gerundet und
+        # Buchungszeilen und Saldo-Snapshots (aus den ungerundeten Beträgen) auseinanderlaufen
+        if line.debit.quantize(ZERO) != line.debit or line.credit.quantize(ZERO) != line.credit:
+            raise ValueError(
+                f"Beträge dürfen höchstens zwei Nachkommastellen haben ('{entry.description}')."
+            )
+        if (line.debit == 0) == (line.credit == 0):
+            raise ValueError(
+                f"Jede Zeile muss genau einen Soll- oder Haben-Betrag haben ('{entry.description}')."
+            )
+        debit += line.debit
+        credit += line.credit
+    if debit != credit:
+        raise ValueError(
+            f"Buchungssatz '{entry.description}' ist nicht ausgeglichen: Soll {debit} ≠ Haben {credit}."
+        )
+
+
+@audit.atomic
+def bulk_post(entries: List[EntryData]) -> List[JournalEntry]:
+    """
+    Bucht viele Buchungssätze in einer Transaktion.
+
+    Buchungssätze und -zeilen werden per `bulk_create` in Batches geschrieben.
+    Die Saldo-Snapshots (`AccountBalance`) werden einmal je betroffenem Konto
+    aktualisiert, nicht je Buchungszeile. Entweder werden alle Buchungen
+    übernommen oder keine.
+
+    Args:
+        entries: Zu buchende Buchungssätze
+
+    Returns:
+        List[JournalEntry]: Angelegte Buchungssätze in Eingabereihenfolge
+
+    Raises:
+        ValueError: Bei unausgeglichenen Buchungen oder unbekannten Konten
+    """
+    if not entries:
+        return []
+
+    for entry in entries:
+        _validate_entry(entry)
+
+    numbers = {line.account for entry in entries for line in entry.lines}
+    accounts = {account.number: account for account in Account.objects.filter(number__in=numbers)}
+    missing = numbers - accounts.keys()
+    if missing:
+        raise ValueError(f"Unbekannte Konten: {', '.join(sorted(missing))}")
+
+    journal = [
+        JournalEntry(
+            posting_date=entry.posting_date,
+            period=period_of(entry.posting_date),
+            description=entry.description,
+            reference=entry.reference,
+            reversal_of=entry.reversal_of,
+        )
+        for entry in entries
+    ]
+    JournalEntry.objects.bulk_create(journal, batch_size=BULK_BATCH_SIZE)
+
+    lines = []
+    movements: Dict[Tuple[int, int], List[Decimal]] = defaultdict(lambda: [ZERO, ZERO])
+    for journal_entry, entry in zip(journal, entries):
+        for line in entry.lines:
+            account = accounts[line.account]
+            lines.append(LedgerLine(
+                entry=journal_entry, account=account, debit=line.debit, credit=line.credit,
+            ))
+            movement = movements[(account.pk, journal_entry.period)]
+            movement[0] += line.debit
+            movement[1] += line.credit
+    LedgerLine.objects.bulk_create(lines, batch_size=BULK_BATCH_SIZE)
+
+    audit.record_many(journal, AuditLog.Action.CREATE)
+    audit.record_many(lines, AuditLog.Action.CREATE)
+
+    _apply_movements(movements)
+    entries_posted.send(sender=JournalEntry, entries=journal, movements=movements)
+    return journal
+
+
+def _apply_movements(movements: Dict[Tuple[object, int], List[Decimal]]) -> None:
+    """
+    Schreibt Verkehrszahlen in die Saldo-Snapshots und führt die kumulierten Summen fort.
+
+    Die Konten werden in fester Reihenfolge gesperrt, damit parallele
+    Buchungsläufe nicht verklemmen. Rückwirkende Buchungen aktualisieren die
+    kumulierten Summen aller späteren Perioden des Kontos.
+    """
+    by_account: Dict[object, Dict[int, List[Decimal]]] = defaultdict(dict)
+    for (account_id, period), movement in movements.items():
+        by_account[account_id][period] = movement
+
+    account_ids = sorted(by_account, key=str)
+    list(Account.objects.select_for_update().filter(pk__in=account_ids).order_by('pk').values_list('pk'))
+
+    existing: Dict[object, Dict[int, AccountBalance]] = defaultdict(dict)
+    for balance in AccountBalance.objects.filter(account_id__in=account_ids):
+        existing[balance.account_id][balance.period] = balance
+
+    to_create = []
+    to_update = []
+    for account_id in account_ids:
+        rows = existing[account_id]
+        new_periods = by_account[account_id]
+        first_period = min(new_periods)
+        closing_debit = ZERO
+        closing_credit = ZERO
+
+        for period in sorted(rows.keys() | new_periods.keys()):
+            balance = rows.get(period)
+            if balance is None:
+                balance = AccountBalance(account_id=account_id, period=period)
+                to_create.append(balance)
+            elif period >= first_period:
+                to_update.append(balance)
+
+            movement = new_periods.get(period)
+            if movement is not None:
+                balance.period_debit += movement[0]
+                balance.period_credit += movement[1]
+            closing_debit += balance.period_debit
+            closing_credit += balance.period_credit
+            balance.closing_debit = closing_debit
+            balance.closing_credit = closing_credit
+
+    now = timezone.now()
+    for balance in to_update:
+        balance.updated_at = now
+
+    AccountBalance.objects.bulk_create(to_create, batch_size=BULK_BATCH_SIZE)
+    AccountBalance.objects.bulk_update(
+        to_update,
+        ['period_debit', 'period_credit', 'closing_debit', 'closing_credit', 'updated_at'],
+        batch_size=BULK_BATCH_SIZE,
+    )
+    # bulk_update löst keine Signale aus: gecachte Auswertungen explizit verwerfen
+    transaction.on_commit(lambda: invalidate_tags('finance.AccountBalance'))
+
+
+def post_entry(
+    posting_date: date,
+    description: str,
+    lines: List[LineData],
+    reference: str = '',
+) -> JournalEntry:
+    """
+    Bucht einen einzelnen Buchungssatz.
+
+    Args:
+        posting_date: Buchungsdatum
+        description: Buchungstext
+        lines: Buchungszeilen (Soll = Haben)
+        reference: Belegnummer
+
+    Returns:
+        JournalEntry: Der angelegte Buchungssatz
+
+    Raises:
+        ValueError: Bei unausgeglichenen Buchungen oder unbekannten Konten
+    """
+    return bulk_post([EntryData(posting_date, description, lines, reference)])[0]
+
+
+@audit.atomic
+def reverse_entry(entry: JournalEntry, posting_date: Optional[date] = None) -> JournalEntry:
+    """
+    Storniert einen Buchungssatz durch eine Gegenbuchung (GoBD-konforme Korrektur).
+
+    Args:
+        entry: Zu stornierender Buchungssatz
+        posting_date: Datum der Stornobuchung (Standard: heute)
+
+    Returns:
+        JournalEntry: Die Stornobuchung
+
+    Raises:
+        ValueError: Wenn die Buchung bereits storniert wurde
+    """
+    if JournalEntry.objects.filter(reversal_of=entry).exists():
+        raise ValueError(f"Buchungssatz '{entry.description}' wurde bereits storniert.")
+
+    lines = [
+        LineData(account=line.account.number, debit=line.credit, credit=line.debit)
+        for line in entry.lines.select_related('account')
+    ]
+    reversal = EntryData(
+        posting_date=posting_date or date.today(),
+        description=f"Storno: {entry.description}",
+        lines=lines,
+        reference=entry.reference,
+        reversal_of=entry,
+    )
+    return bulk_post([reversal])[0]
+
+
+def get_account_balance(account_number: str, period: Optional[int] = None) -> Decimal:
+    """
+    Gibt den Saldo (Soll - Haben) eines Kontos bis einschließlich einer Periode zurück.
+
+    Liest genau eine Snapshot-Zeile, unabhängig von der Anzahl Buchungen.
+
+    Args:
+        account_number: Kontonummer
+        period: Periode JJJJMM (Standard: aktueller Stand)
+
+    Returns:
+        Decimal: Saldo; positiv = Soll-Saldo, negativ = Haben-Saldo
+    """
+    balances = AccountBalance.objects.filter(account__number=account_number)
+    if period is not None:
+        balances = balances.filter(period__lte=period)
+    latest = balances.order_by('-period').values('closing_debit', 'closing_credit').first()
+    if latest is None:
+        return ZERO
+    return latest['closing_debit'] - latest['closing_credit']
+
+
+@cached_service(ttl=300, tags=('finance.Account', 'finance.AccountBalance'))
+def get_trial_balance(period: Optional[int] = None) -> List[dict]:
+    """
+    Erstellt eine Summen- und Saldenliste bis einschließlich einer Periode.
+
+    Liest je Konto die letzte Snapshot-Zeile (O(Konten)), ohne Buchungszeilen
+    zu summieren. Gecacht, bis eine Buchung die Salden ändert.
+
+    Args:
+        period: Periode JJJJMM (Standard: aktueller Stand)
+
+    Returns:
+        List[dict]: Je Konto 'number', 'name', 'debit', 'credit' und 'balance'
+    """
+    latest = AccountBalance.objects.filter(account=OuterRef('pk'))
+    if period is not None:
+        latest = latest.filter(period__lte=period)
+    latest = latest.order_by('-period')
+
+    rows = Account.objects.annotate(
+        debit=Subquery(latest.values('closing_debit')[:1]),
+        credit=Subquery(latest.values('closing_credit')[:1]),
+    ).filter(debit__isnull=False).order_by('number').values('number', 'name', 'debit', 'credit')
+
+    return [
+        {**row, 'balance': row['debit'] - row['credit']}
+        for row in rows
+    ]
+
+
+def get_revenue(period: int) -> Decimal:
+    """
+    Summiert die Erlöse (Haben - Soll aller Erlöskonten) einer Periode.
+
+    Liest nur die Saldo-Snapshots der Periode, keine Buchungszeilen.
+
+    Args:
+        period: Periode JJJJMM
+
+    Returns:
+        Decimal: Nettoerlöse der Periode
+    """
+    totals = AccountBalance.objects.filter(
+        account__account_type=Account.AccountType.REVENUE, period=period,
+    ).aggregate(debit=Sum('period_debit'), credit=Sum('period_credit'))
+    return (totals['credit'] or ZERO) - (totals['debit'] or ZERO)
+
+
+def get_receivables() -> Decimal:
+    """
+    Gibt die offenen Forderungen zurück (Saldo der Forderungskonten).
+
+    Die Konten werden über `settings.FINANCE_RECEIVABLE_ACCOUNTS` festgelegt.
+
+    Returns:
+        Decimal: Summe der Soll-Salden der Forderungskonten
+    """
+    return sum(
+        (get_account_balance(number) for number in settings.FINANCE_RECEIVABLE_ACCOUNTS),
+        ZERO,
+    )
+
+
+@retrieval_source('finance.Account', prefix='account')
+def account_search_text(account: Account) -> Tuple[str, str]:
+    """Titel und Text eines Sachkontos für den Retrieval-Index der AI Engine."""
+    return str(account), f"Sachkonto {account.number} {account.name} ({account.get_account_type_display()})"
+
+
+# ============================================================================
+# Steuerfindung (Tax Determination)
+# ============================================================================
+
+# Cache-Key der Steuerschlüssel-Version (prozessübergreifende Invalidierung)
+TAX_TABLE_VERSION_KEY = 'finance:tax_table_version'
+
+
+@dataclass(frozen=True)
+class TaxCase:
+    """
+    Steuerfall einer Rechnungsposition.
+
+    Attributes:
+        seller_country: ISO-Ländercode des Leistenden (z.B. 'DE')
+        buyer_country: ISO-Ländercode des Empfängers
+        buyer_type: 'b2b' oder 'b2c'
+        tax_class: Steuerklasse des Artikels (`TaxKey.TaxClass`)
+    """
+
+    seller_country: str
+    buyer_country: str
+    buyer_type: str
+    tax_class: str
+
+
+@dataclass(frozen=True)
+class TaxDecision:
+    """Ergebnis der Steuerfindung (unveränderlich, wird zwischen Positionen geteilt)."""
+
+    rule_name: str
+    tax_rate: Decimal
+    is_reverse_charge: bool
+    is_intra_community: bool
+    is_export: bool
+    datev_tax_key: str
+    invoice_note: str
+
+
+def tax_region(seller_country: str, buyer_country: str) -> str:
+    """
+    Ordnet das Empfängerland einer Region der Steuerschlüssel zu.
+
+    Args:
+        seller_country: ISO-Ländercode des Leistenden
+        buyer_country: ISO-Ländercode des Empfängers
+
+    Returns:
+        str: `TaxKey.Region` (Inland, EU-Ausland oder Drittland)
+    """
+    if buyer_country == seller_country:
+        return TaxKey.Region.DOMESTIC
+    if buyer_country in EU_MEMBER_STATES:
+        return TaxKey.Region.EU
+    return TaxKey.Region.THIRD
+
+
+class TaxTable:
+    """
+    Kompilierte Steuerschlüssel-Tabelle im Speicher.
+
+    Hält die Schlüssel als Dictionary (Verkäuferland, Empfängerland/Region,
+    Kundenstatus, Steuerklasse) -> Entscheidung. Aufgelöste Steuerfälle
+    werden zusätzlich memoisiert, so dass jeder konkrete Fall nach der
+    ersten Auflösung genau einen Dictionary-Zugriff kostet.
+    """
+
+    def __init__(self, keys: Dict[Tuple[str, str, str, str], TaxDecision], version: Optional[int]) -> None:
+        self.keys = keys
+        self.version = version
+        self._resolved: Dict[Tuple[str, str, str, str], TaxDecision] = {}
+
+    def lookup(self, seller_country: str, buyer_country: str, buyer_type: str, tax_class: str) -> TaxDecision:
+        """
+        Ermittelt die Steuerregel eines Steuerfalls (spezifischster Schlüssel gewinnt).
+
+        Raises:
+            ValueError: Wenn kein Steuerschlüssel passt
+        """
+        case = (seller_country, buyer_country, buyer_type, tax_class)
+        decision = self._resolved.get(case)
+        if decision is not None:
+            return decision
+
+        for country, type_, class_ in product(
+            (buyer_country, tax_region(seller_country, buyer_country)),
+            (buyer_type, TaxKey.BuyerType.ANY),
+            (tax_class, TaxKey.TaxClass.ANY),
+        ):
+            decision = self.keys.get((seller_country, country, type_, class_))
+            if decision is not None:
+                self._resolved[case] = decision
+                return decision
+        raise ValueError(
+            f"Kein Steuerschlüssel für {seller_country}→{buyer_country}, {buyer_type}, {tax_class}."
+        )
+
+
+_tax_table: Optional[TaxTable] = None
+_tax_table_lock = threading.Lock()
+
+
+def _load_tax_table(version: Optional[int]) -> TaxTable:
+    """Lädt alle Steuerschlüssel mit ihren Regeln in einer Abfrage."""
+    decisions: Dict[object, TaxDecision] = {}
+    keys = {}
+    for key in TaxKey.objects.select_related('rule'):
+        rule = key.rule
+        decision = decisions.get(rule.pk)
+        if decision is None:
+            decision = decisions[rule.pk] = TaxDecision(
+                rule_name=rule.name,
+                tax_rate=rule.tax_rate,
+                is_reverse_charge=rule.is_reverse_charge,
+                is_intra_community=rule.is_intra_community,
+                is_export=rule.is_export,
+                datev_tax_key=rule.datev_tax_key,
+                invoice_note=rule.invoice_note,
+            )
+        keys[(key.seller_country, key.buyer_country, key.buyer_type, key.tax_class)] = decision
+    return TaxTable(keys, version)
+
+
+def get_tax_table() -> TaxTable:
+    """
+    Gibt die kompilierte Steuerschlüssel-Tabelle zurück.
+
+    Die Tabelle wird je Prozess einmal geladen und nur neu geladen, wenn sich
+    die Version im Cache geändert hat (`invalidate_tax_table`).
+
+    Returns:
+        TaxTable: Aktuelle Tabelle
+    """
+    global _tax_table
+    version = cache.get(TAX_TABLE_VERSION_KEY)
+    table = _tax_table
+    if table is not None and table.version == version:
+        return table
+    with _tax_table_lock:
+        if _tax_table is None or _tax_table.version != version:
+            _tax_table = _load_tax_table(version)
+        return _tax_table
+
+
+def invalidate_tax_table() -> None:
+    """
+    Verwirft die kompilierte Steuerschlüssel-Tabelle in allen Prozessen.
+
+    Wird nach dem Commit von Änderungen an `TaxKey`/`TaxRule` aufgerufen
+    (Signal-Empfänger in `apps.finance.apps`).
+    """
+    global _tax_table
+    try:
+        cache.incr(TAX_TABLE_VERSION_KEY)
+    except ValueError:
+        cache.set(TAX_TABLE_VERSION_KEY, 1, timeout=None)
+    _tax_table = None
+
+
+@query_budget(1)
+def determine_tax(cases: Iterable[TaxCase]) -> List[TaxDecision]:
+    """
+    Ermittelt die Steuerregeln vieler Rechnungspositionen ohne Datenbankabfragen.
+
+    Für Rechnungsbatches: Die Steuerschlüssel werden einmal geladen und
+    kompiliert; je Position bleibt ein Dictionary-Zugriff.
+
+    Args:
+        cases: Steuerfälle der Positionen
+
+    Returns:
+        List[TaxDecision]: Entscheidung je Position in Eingabereihenfolge
+
+    Raises:
+        ValueError: Wenn für einen Steuerfall kein Steuerschlüssel existiert
+    """
+    lookup = get_tax_table().lookup
+    return [
+        lookup(case.seller_country, case.buyer_country, case.buyer_type, case.tax_class)
+        for case in cases
+    ]
+
+
+# ============================================================================
+# USt-IdNr.-Prüfung
+# ============================================================================
+
+# Aufbau der USt-IdNr. je Mitgliedstaat (ohne Länderpräfix, wie von VIES erwartet)
+VAT_ID_FORMATS: Dict[str, re.Pattern] = {
+    country: re.compile(pattern)
+    for country, pattern in {
+        'AT': r'U\d{8}',
+        'BE': r'[01]\d{9}',
+        'BG': r'\d{9,10}',
+        'CY': r'\d{8}[A-Z]',
+        'CZ': r'\d{8,10}',
+        'DE': r'\d{9}',
+        'DK': r'\d{8}',
+        'EE': r'\d{9}',
+        'EL': r'\d{9}',
+        'ES': r'[A-Z0-9]\d{7}[A-Z0-9]',
+        'FI': r'\d{8}',
+        'FR': r'[A-HJ-NP-Z0-9]{2}\d{9}',
+        'HR': r'\d{11}',
+        'HU': r'\d{8}',
+        'IE': r'\d[A-Z0-9+*]\d{5}[A-W][A-I]?',
+        'IT': r'\d{11}',
+        'LT': r'\d{9}|\d{12}',
+        'LU': r'\d{8}',
+        'LV': r'\d{11}',
+        'MT': r'\d{8}',
+        'NL': r'\d{9}B\d{2}',
+        'PL': r'\d{10}',
+        'PT': r'\d{9}',
+        'RO': r'[1-9]\d{1,9}',
+        'SE': r'\d{10}01',
+        'SI': r'[1-9]\d{7}',
+        'SK': r'[1-9]\d{9}',
+    }.items()
+}
+
+_VAT_ID_SEPARATORS = str.maketrans('', '', ' .-/')
+
+
+def _weighted(digits: str, weights: Iterable[int]) -> int:
+    return sum(int(digit) * weight for digit, weight in zip(digits, weights))
+
+
+def _luhn(digits: str) -> bool:
+    total = 0
+    for index, digit in enumerate(reversed(digits)):
+        value = int(digit) * (2 if index % 2 else 1)
+        total += value // 10 + value % 10
+    return total % 10 == 0
+
+
+def _check_de(number: str) -> bool:
+    # ISO 7064 MOD 11,10
+    product_ = 10
+    for digit in number[:8]:
+        total = (int(digit) + product_) % 10 or 10
+        product_ = (2 * total) % 11
+    return (11 - product_) % 10 == int(number[8])
+
+
+def _check_at(number: str) -> bool:
+    total = 0
+    for index, digit in enumerate(number[1:8]):
+        value = int(digit) * (2 if index % 2 else 1)
+        total += value // 10 + value % 10
+    return (10 - (total + 4) % 10) % 10 == int(number[8])
+
+
+def _check_fi(number: str) -> bool:
+    remainder = _weighted(number, (7, 9, 10, 5, 8, 4, 2)) % 11
+    return remainder != 1 and (11 - remainder) % 11 == int(number[7])
+
+
+def _check_fr(number: str) -> bool:
+    # Alphanumerische Prüfschlüssel (neueres Verfahren) nur formal prüfbar
+    if not number[:2].isdigit():
+        return True
+    return int(number[:2]) == (12 + 3 * (int(number[2:]) % 97)) % 97
+
+
+def _check_nl(number: str) -> bool:
+    # Seit 2020 sind neben MOD 11 auch Nummern nach ISO 7064 MOD 97-10 zulässig
+    if (_weighted(number, (9, 8, 7, 6, 5, 4, 3, 2)) - int(number[8])) % 11 == 0:
+        return True
+    converted = ''.join(str(ord(char) - 55) if char.isalpha() else char for char in 'NL' + number)
+    return int(converted) % 97 == 1
+
+
+def _check_pt(number: str) -> bool:
+    return (11 - _weighted(number, (9, 8, 7, 6, 5, 4, 3, 2)) % 11) % 11 % 10 == int(number[8])
+
+
+# Prüfziffernverfahren der Mitgliedstaaten; für übrige Länder nur Formatprüfung
+VAT_ID_CHECKSUMS = {
+    'AT': _check_at,
+    'BE': lambda number: 97 - int(number[:8]) % 97 == int(number[8:]),
+    'DE': _check_de,
+    'DK': lambda number: _weighted(number, (2, 7, 6, 5, 4, 3, 2, 1)) % 11 == 0,
+    'FI': _check_fi,
+    'FR': _check_fr,
+    'IT': _luhn,
+    'LU': lambda number: int(number[:6]) % 89 == int(number[6:]),
+    'NL': _check_nl,
+    'PL': lambda number: _weighted(number, (6, 5, 7, 2, 3, 4, 5, 6, 7)) % 11 == int(number[9]),
+    'PT': _check_pt,
+    'SE': lambda number: _luhn(number[:10]),
+}
+
+
+@dataclass(frozen=True)
+class VatIdStatus:
+    """
+    Prüfstatus einer USt-IdNr.
+
+    Attributes:
+        vat_id: Normalisierte USt-IdNr.
+        is_valid: True/False laut Prüfung; None, wenn keine aktuelle Bestätigung vorliegt
+        checked_at: Zeitpunkt der letzten qualifizierten Abfrage
+        request_identifier: VIES-Abfragekennung als Nachweis
+    """
+
+    vat_id: str
+    is_valid: Optional[bool]
+    checked_at: Optional[datetime] = None
+    request_identifier: str = ''
+
+
+def normalize_vat_id(vat_id: str) -> str:
+    """
+    Normalisiert eine USt-IdNr. (Großschreibung, ohne Trennzeichen, 'GR' -> 'EL').
+
+    Args:
+        vat_id: Eingegebene USt-IdNr., z.B. 'de 136 695 976'
+
+    Returns:
+        str: Normalisierte USt-IdNr., z.B. 'DE136695976'
+    """
+    vat_id = vat_id.upper().translate(_VAT_ID_SEPARATORS)
+    return 'EL' + vat_id[2:] if vat_id.startswith('GR') else vat_id
+
+
+def is_plausible_vat_id(vat_id: str) -> bool:
+    """
+    Prüft Aufbau und (soweit bekannt) Prüfziffer einer USt-IdNr. lokal ohne Netzwerkzugriff.
+
+    Args:
+        vat_id: Normalisierte USt-IdNr.
+
+    Returns:
+        bool: True, wenn die Nummer gültig sein kann
+    """
+    pattern = VAT_ID_FORMATS.get(vat_id[:2])
+    number = vat_id[2:]
+    if pattern is None or not pattern.fullmatch(number):
+        return False
+    checksum = VAT_ID_CHECKSUMS.get(vat_id[:2])
+    return checksum is None or checksum(number)
+
+
+def _check_ttl() -> timedelta:
+    return timedelta(days=settings.VAT_ID_CHECK_TTL_DAYS)
+
+
+@query_budget(1)
+def get_vat_id_statuses(vat_ids: Iterable[str]) -> Dict[str, VatIdStatus]:
+    """
+    Liefert den Prüfstatus vieler USt-IdNrn. ohne Netzwerkzugriff.
+
+    Formal ungültige Nummern sind sofort ungültig; für die übrigen wird die
+    jüngste Prüfung innerhalb von `VAT_ID_CHECK_TTL_DAYS` in einer einzigen
+    Abfrage gelesen. Fehlt sie, ist `is_valid` None.
+
+    Args:
+        vat_ids: USt-IdNrn. (beliebig formatiert, Duplikate erlaubt)
+
+    Returns:
+        Dict[str, VatIdStatus]: Status je normalisierter USt-IdNr.
+    """
+    statuses: Dict[str, VatIdStatus] = {}
+    for vat_id in {normalize_vat_id(vat_id) for vat_id in vat_ids}:
+        statuses[vat_id] = VatIdStatus(vat_id, None if is_plausible_vat_id(vat_id) else False)
+
+    pending = [vat_id for vat_id, status in statuses.items() if status.is_valid is None]
+    if pending:
+        checks = VatIdCheck.objects.filter(
+            vat_id__in=pending, created_at__gte=timezone.now() - _check_ttl(),
+        ).order_by('vat_id', '-created_at').values_list('vat_id', 'is_valid', 'created_at', 'request_identifier')
+        for vat_id, is_valid, checked_at, request_identifier in checks:
+            if statuses[vat_id].checked_at is None:
+                statuses[vat_id] = VatIdStatus(vat_id, is_valid, checked_at, request_identifier)
+    return statuses
+
+
+def _query_vies(vat_ids: List[str], workers: int) -> Tuple[List[VatIdCheck], List[str]]:
+    """Fragt VIES parallel ab; liefert die neuen Prüfungen und die nicht prüfbaren Nummern."""
+    adapter = get_vies_adapter()
+
+    def query(vat_id: str):
+        try:
+            return vat_id, adapter.check(vat_id)
+        except ViesError:
+            return vat_id, None
+
+    checks, failed = [], []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(vat_ids)))) as pool:
+        for vat_id, result in pool.map(query, vat_ids):
+            if result is None:
+                failed.append(vat_id)
+                continue
+            checks.append(VatIdCheck(
+                vat_id=vat_id,
+                is_valid=result.valid,
+                name=result.name[:255],
+                address=result.address,
+                request_identifier=result.request_identifier[:50],
+            ))
+    return checks, failed
+
+
+def _record_checks(checks: List[VatIdCheck]) -> None:
+    with audit.atomic():
+        VatIdCheck.objects.bulk_create(checks, batch_size=BULK_BATCH_SIZE)
+        audit.record_many(checks, AuditLog.Action.CREATE)
+
+
+def validate_vat_ids(vat_ids: Iterable[str], workers: int = 4) -> Dict[str, VatIdStatus]:
+    """
+    Prüft USt-IdNrn.; VIES wird nur für Nummern ohne aktuelle Prüfung abgefragt.
+
+    Ist VIES bzw. der Mitgliedstaat nicht erreichbar, bleibt `is_valid` None
+    (erneute Prüfung über `reverify_vat_ids`).
+
+    Args:
+        vat_ids: USt-IdNrn. (beliebig formatiert, Duplikate erlaubt)
+        workers: Anzahl paralleler VIES-Abfragen
+
+    Returns:
+        Dict[str, VatIdStatus]: Status je normalisierter USt-IdNr.
+    """
+    statuses = get_vat_id_statuses(vat_ids)
+    missing = sorted(vat_id for vat_id, status in statuses.items() if status.is_valid is None)
+    if missing:
+        checks, _ = _query_vies(missing, workers)
+        _record_checks(checks)
+        for check in checks:
+            statuses[check.vat_id] = VatIdStatus(
+                check.vat_id, check.is_valid, check.created_at, check.request_identifier,
+            )
+    return statuses
+
+
+def validate_vat_id(vat_id: str) -> VatIdStatus:
+    """
+    Prüft eine einzelne USt-IdNr. (z.B. bei der Stammdatenerfassung).
+
+    Args:
+        vat_id: USt-IdNr. (beliebig formatiert)
+
+    Returns:
+        VatIdStatus: Prüfstatus der normalisierten Nummer
+    """
+    return next(iter(validate_vat_ids([vat_id], workers=1).values()))
+
+
+def reverify_vat_ids(
+    vat_ids: Optional[Iterable[str]] = None,
+    refresh_days: int = 7,
+    workers: int = 4,
+) -> Dict[str, int]:
+    """
+    Prüft USt-IdNrn. gesammelt erneut, bevor ihre letzte Prüfung abläuft.
+
+    Jede Nummer wird genau einmal abgefragt, auch wenn sie bei mehreren
+    Kunden hinterlegt ist. So liegt beim Rechnungslauf für alle bekannten
+    Nummern eine aktuelle Prüfung vor (z.B. nächtlich per
+    `manage.py reverify_vat_ids`).
+
+    Args:
+        vat_ids: Zu prüfende USt-IdNrn., beliebig formatiert (Standard: alle bereits
+            geprüften und alle bei Kunden hinterlegten, auch noch nie geprüfte)
+        refresh_days: Nummern erneut prüfen, deren Prüfung in diesem Zeitraum abläuft
+        workers: Anzahl paralleler VIES-Abfragen
+
+    Returns:
+        Dict[str, int]: Anzahl 'checked', 'valid', 'invalid', 'failed' und 'skipped'
+    """
+    if vat_ids is None:
+        # Bei Kunden erfasste Nummern sind nicht zwingend normalisiert (z.B. über den Admin)
+        vat_ids = [
+            *VatIdCheck.objects.values_list('vat_id', flat=True).distinct(),
+            *Customer.objects.exclude(vat_id='').values_list('vat_id', flat=True).distinct(),
+        ]
+    candidates = {normalize_vat_id(vat_id) for vat_id in vat_ids}
+    plausible = {vat_id for vat_id in candidates if is_plausible_vat_id(vat_id)}
+
+    fresh_since = timezone.now() - _check_ttl() + timedelta(days=refresh_days)
+    fresh = set(
+        VatIdCheck.objects.filter(vat_id__in=plausible, created_at__gte=fresh_since)
+        .values_list('vat_id', flat=True).distinct()
+    ) if plausible else set()
+    due = sorted(plausible - fresh)
+
+    checks, failed = _query_vies(due, workers) if due else ([], [])
+    _record_checks(checks)
+    valid = sum(check.is_valid for check in checks)
+    return {
+        'checked': len(checks),
+        'valid': valid,
+        'invalid': len(checks) - valid + len(candidates - plausible),
+        'failed': len(failed),
+        'skipped': len(fresh),
+    }
+
+
+def schedule_vat_id_reverification(vat_ids: Optional[Iterable[str]] = None):
+    """
+    Reiht die erneute Prüfung der USt-IdNrn. als Hintergrund-Task ein.
+
+    Args:
+        vat_ids: Zu prüfende USt-IdNrn., beliebig formatiert (Standard: alle bereits
+            geprüften und alle bei Kunden hinterlegten, siehe `reverify_vat_ids`)
+
+    Returns:
+        TaskRecord: Der Auftrag; der auslösende Benutzer wird bei Abschluss benachrichtigt
+    """
+    from apps.finance.tasks import reverify_vat_ids_task
+
+    if vat_ids is not None:
+        vat_ids = sorted({normalize_vat_id(vat_id) for vat_id in vat_ids})
+    return reverify_vat_ids_task.delay(vat_ids)
+
+
+def schedule_gdpdu_export(
+    directory: str,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    supplier: str = '',
+):
+    """
+    Reiht einen Z3-Export (`apps.finance.gdpdu`) als Hintergrund-Task ein.
+
+    Args:
+        directory: Zielverzeichnis
+        date_from: Erster Buchungstag (inklusive)
+        date_to: Letzter Buchungstag (inklusive)
+        supplier: Name des Datenlieferanten
+
+    Returns:
+        TaskRecord: Der Auftrag; der auslösende Benutzer wird bei Abschluss benachrichtigt
+    """
+    from apps.finance.tasks import export_gdpdu_task
+
+    return export_gdpdu_task.delay(
+        str(directory),
+        date_from.isoformat() if date_from else None,
+        date_to.isoformat() if date_to else None,
+        supplier,
+    )
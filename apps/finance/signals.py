@@ -0,0 +1,14 @@
+"""
+Signale der Finance App.
+
+Andere Apps (z.B. Dashboard-Kennzahlen) reagieren auf Buchungen, ohne dass
+die Finance App sie kennen muss.
+"""
+
+from django.dispatch import Signal
+
+
+# Gesendet von `services.bulk_post` innerhalb der Buchungstransaktion.
+# Argumente: entries (List[JournalEntry]),
+#            movements (Dict[(account_id, period), [debit, credit]])
+entries_posted = Signal()
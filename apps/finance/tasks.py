@@ -0,0 +1,37 @@
+"""
+Hintergrund-Tasks der Finance App (`core.tasks`).
+
+Ausgelöst werden sie aus `apps.finance.services` mit `.delay()`; die
+Ergebnisse müssen JSON-serialisierbar sein.
+"""
+
+from dataclasses import asdict
+from datetime import date
+from pathlib import Path
+from typing import List, Optional
+
+from apps.finance.gdpdu import export_gdpdu
+from apps.finance.services import reverify_vat_ids
+from core.tasks import task
+
+
+@task(title='Prüfung der USt-IdNrn.', max_retries=2, retry_delay=300)
+def reverify_vat_ids_task(vat_ids: Optional[List[str]] = None, refresh_days: int = 7) -> dict:
+    return reverify_vat_ids(vat_ids, refresh_days=refresh_days)
+
+
+@task(title='Z3-Export', priority=-10, max_retries=2)
+def export_gdpdu_task(
+    directory: str,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    supplier: str = '',
+) -> List[dict]:
+    # Wiederholungen setzen den Export am letzten Checkpoint fort
+    results = export_gdpdu(
+        Path(directory),
+        date.fromisoformat(date_from) if date_from else None,
+        date.fromisoformat(date_to) if date_to else None,
+        supplier=supplier,
+    )
+    return [asdict(result) for result in results]
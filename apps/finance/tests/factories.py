@@ -0,0 +1,31 @@
+"""
+Testdaten-Factories der Finance-App (factory_boy).
+"""
+
+import factory
+
+from apps.finance.models import Account, VatIdCheck
+
+
+class AccountFactory(factory.django.DjangoModelFactory):
+    """Sachkonto; Kontonummern fortlaufend ab 9000."""
+
+    class Meta:
+        model = Account
+        django_get_or_create = ('number',)
+
+    number = factory.Sequence(lambda n: str(9000 + n))
+    name = factory.Faker('word', locale='de_DE')
+    account_type = Account.AccountType.ASSET
+
+
+class VatIdCheckFactory(factory.django.DjangoModelFactory):
+    """Qualifizierte VIES-Prüfung einer USt-IdNr."""
+
+    class Meta:
+        model = VatIdCheck
+
+    vat_id = 'FR40303265045'
+    is_valid = True
+    name = factory.Faker('company', locale='fr_FR')
+    request_identifier = factory.Sequence(lambda n: f'WAPIAAAA{n:08d}')
@@ -0,0 +1,144 @@
+"""
+Tests des Z3-Exports: Wiederaufnahme nach Abbruch, Zeilenanzahl und Prüfsummen in index.xml.
+"""
+
+from datetime import date
+from decimal import Decimal
+from xml.etree import ElementTree
+
+import pytest
+
+from apps.finance import gdpdu
+from apps.finance.gdpdu import INDEX_FILENAME, export_gdpdu, file_sha256
+from apps.finance.services import EntryData, LineData, bulk_post
+from apps.finance.tests.factories import AccountFactory
+
+pytestmark = pytest.mark.django_db
+
+TABLES = ['sachkonten', 'buchungszeilen']
+
+
+@pytest.fixture
+def entries():
+    """Fünf Ausgangsrechnungen, d.h. zehn Buchungszeilen."""
+    receivables, revenue = AccountFactory(account_type='asset'), AccountFactory(account_type='revenue')
+    return bulk_post([
+        EntryData(date(2026, 3, day), 'Ausgangsrechnung', [
+            LineData(receivables.number, debit=Decimal(f'{day}00.00')),
+            LineData(revenue.number, credit=Decimal(f'{day}00.00')),
+        ])
+        for day in range(1, 6)
+    ])
+
+
+def read_index(directory):
+    """Liefert je Tabelle die Beschreibung aus index.xml."""
+    root = ElementTree.parse(directory / INDEX_FILENAME).getroot()
+    return {table.findtext('URL'): table.findtext('Description') for table in root.iter('Table')}
+
+
+def data_lines(path):
+    """Datenzeilen einer Exportdatei ohne Kopfzeile."""
+    return path.read_bytes().split(b'\r\n')[1:-1]
+
+
+class StreamSpy:
+    """Zählt die aus der Datenbank gelesenen Zeilen und bricht auf Wunsch nach `fail_after` Zeilen ab."""
+
+    def __init__(self, stream_rows):
+        self.stream_rows = stream_rows
+        self.rows = 0
+        self.fail_after = None
+
+    def __call__(self, *args, **kwargs):
+        for row in self.stream_rows(*args, **kwargs):
+            if self.rows == self.fail_after:
+                raise RuntimeError('Verbindung abgebrochen')
+            self.rows += 1
+            yield row
+
+
+@pytest.fixture
+def stream(monkeypatch):
+    spy = StreamSpy(gdpdu._stream_rows)
+    monkeypatch.setattr(gdpdu, '_stream_rows', spy)
+    return spy
+
+
+def test_index_lists_row_count_and_sha256_per_file(tmp_path, entries):
+    results = export_gdpdu(tmp_path, workers=1, tables=TABLES, supplier='Muster GmbH')
+
+    descriptions = read_index(tmp_path)
+    assert set(descriptions) == {'sachkonten.csv', 'buchungszeilen.csv'}
+    for result in results:
+        path = tmp_path / f'{result.table}.csv'
+        assert result.rows == len(data_lines(path))
+        assert result.sha256 == file_sha256(path)
+        assert descriptions[path.name].endswith(f'; {result.rows} Datensätze; SHA-256 {result.sha256}')
+    assert [result.rows for result in results] == [2, 10]
+
+
+def test_interrupted_export_resumes_from_checkpoint(tmp_path, entries, stream, monkeypatch):
+    monkeypatch.setattr(gdpdu, 'CHECKPOINT_ROWS', 4)
+    stream.fail_after = 6
+
+    with pytest.raises(RuntimeError, match='Verbindung abgebrochen'):
+        export_gdpdu(tmp_path / 'z3', workers=1, tables=['buchungszeilen'])
+
+    assert not (tmp_path / 'z3' / INDEX_FILENAME).exists()
+    resumed = tmp_path / 'z3' / 'buchungszeilen.csv'
+    assert len(data_lines(resumed)) == 4
+    # Nach dem Checkpoint halb geschriebene Zeile wird bei der Wiederaufnahme verworfen
+    with open(resumed, 'ab') as handle:
+        handle.write(b'halbe;Zeile;' * 100)
+
+    stream.rows, stream.fail_after = 0, None
+    result, = export_gdpdu(tmp_path / 'z3', workers=1, tables=['buchungszeilen'])
+    # Fortgesetzt nach dem vierten Datensatz
+    assert stream.rows == 6
+
+    export_gdpdu(tmp_path / 'komplett', workers=1, tables=['buchungszeilen'])
+    complete = tmp_path / 'komplett' / 'buchungszeilen.csv'
+    assert resumed.read_bytes() == complete.read_bytes()
+    assert (result.rows, result.sha256) == (10, file_sha256(complete))
+    assert read_index(tmp_path / 'z3')['buchungszeilen.csv'].endswith(f'; 10 Datensätze; SHA-256 {result.sha256}')
+
+
+def test_completed_tables_are_taken_over(tmp_path, entries, stream):
+    stream.fail_after = 2 + 3
+    with pytest.raises(RuntimeError):
+        export_gdpdu(tmp_path, workers=1, tables=TABLES)
+
+    stream.rows, stream.fail_after = 0, None
+    sachkonten, buchungszeilen = export_gdpdu(tmp_path, workers=1, tables=TABLES)
+
+    # Sachkonten waren schon vollständig; Buchungszeilen beginnen mangels Checkpoint neu
+    assert stream.rows == 10
+    assert (sachkonten.rows, buchungszeilen.rows) == (2, 10)
+
+
+def test_rows_recorded_between_runs_are_appended(tmp_path, entries, stream, monkeypatch):
+    monkeypatch.setattr(gdpdu, 'CHECKPOINT_ROWS', 2)
+    stream.fail_after = 3
+    with pytest.raises(RuntimeError):
+        export_gdpdu(tmp_path, workers=1, tables=['buchungszeilen'])
+
+    receivables, revenue = (line.account.number for line in entries[0].lines.order_by('-debit'))
+    late, = bulk_post([EntryData(date(2026, 3, 1), 'Nachtrag', [
+        LineData(receivables, debit=Decimal('1.00')),
+        LineData(revenue, credit=Decimal('1.00')),
+    ])])
+    stream.fail_after = None
+    result, = export_gdpdu(tmp_path, workers=1, tables=['buchungszeilen'])
+
+    ids = [line.split(b';')[0].decode() for line in data_lines(tmp_path / 'buchungszeilen.csv')]
+    assert result.rows == len(ids) == len(set(ids)) == 12
+    # Nach Erfassungszeitpunkt sortiert: der Nachtrag steht trotz frühem Buchungsdatum am Ende
+    assert set(ids[-2:]) == {str(pk) for pk in late.lines.values_list('pk', flat=True)}
+
+
+def test_completed_export_is_not_overwritten(tmp_path, entries):
+    export_gdpdu(tmp_path, workers=1, tables=TABLES)
+
+    with pytest.raises(ValueError, match='bereits einen abgeschlossenen Export'):
+        export_gdpdu(tmp_path, workers=1, tables=TABLES)
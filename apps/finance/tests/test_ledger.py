@@ -0,0 +1,142 @@
+"""
+Tests des Hauptbuchs: Buchen, Stornieren und Saldo-Snapshots.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+from django.db.models import Sum
+
+from apps.finance.models import AccountBalance, JournalEntry, LedgerLine
+from apps.finance.services import (
+    EntryData,
+    LineData,
+    bulk_post,
+    get_account_balance,
+    post_entry,
+    reverse_entry,
+)
+from apps.finance.tests.factories import AccountFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def accounts():
+    """Forderungen (Soll) und Erlöse (Haben)."""
+    return AccountFactory(account_type='asset'), AccountFactory(account_type='revenue')
+
+
+def sale(receivables, revenue, amount, posting_date=date(2026, 3, 15)) -> EntryData:
+    return EntryData(posting_date, 'Ausgangsrechnung', [
+        LineData(receivables.number, debit=Decimal(amount)),
+        LineData(revenue.number, credit=Decimal(amount)),
+    ])
+
+
+def assert_snapshots_match_lines():
+    """Jeder Saldo-Snapshot entspricht der Summe der Buchungszeilen bis zu seiner Periode."""
+    for balance in AccountBalance.objects.select_related('account'):
+        lines = LedgerLine.objects.filter(account=balance.account)
+        period = lines.filter(entry__period=balance.period).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+        closing = lines.filter(entry__period__lte=balance.period).aggregate(debit=Sum('debit'), credit=Sum('credit'))
+        assert (balance.period_debit, balance.period_credit) == (period['debit'] or 0, period['credit'] or 0)
+        assert (balance.closing_debit, balance.closing_credit) == (closing['debit'] or 0, closing['credit'] or 0)
+
+
+def test_post_entry_updates_both_balances(accounts):
+    receivables, revenue = accounts
+
+    entry = post_entry(date(2026, 3, 15), 'Ausgangsrechnung', [
+        LineData(receivables.number, debit=Decimal('119.00')),
+        LineData(revenue.number, credit=Decimal('119.00')),
+    ], reference='RE-2026-00001')
+
+    assert entry.period == 202603
+    assert get_account_balance(receivables.number) == Decimal('119.00')
+    assert get_account_balance(revenue.number) == Decimal('-119.00')
+    assert_snapshots_match_lines()
+
+
+@pytest.mark.parametrize('lines, message', [
+    ([('debit', '100.00'), ('credit', '99.99')], 'nicht ausgeglichen'),
+    ([('debit', '10.005'), ('credit', '10.005')], 'zwei Nachkommastellen'),
+    ([('debit', '-5.00'), ('credit', '-5.00')], 'Negative'),
+    ([('debit', '5.00')], 'mindestens zwei'),
+])
+def test_invalid_entries_are_rejected(accounts, lines, message):
+    receivables, revenue = accounts
+    ledger_lines = [
+        LineData(receivables.number if side == 'debit' else revenue.number, **{side: Decimal(amount)})
+        for side, amount in lines
+    ]
+
+    with pytest.raises(ValueError, match=message):
+        post_entry(date(2026, 3, 15), 'Fehlerhaft', ledger_lines)
+    assert not JournalEntry.objects.exists()
+    assert not AccountBalance.objects.exists()
+
+
+def test_unknown_account_is_rejected(accounts):
+    receivables, _ = accounts
+
+    with pytest.raises(ValueError):
+        post_entry(date(2026, 3, 15), 'Unbekanntes Konto', [
+            LineData(receivables.number, debit=Decimal('10.00')),
+            LineData('99999', credit=Decimal('10.00')),
+        ])
+    assert not JournalEntry.objects.exists()
+
+
+def test_reverse_entry_restores_balances(accounts):
+    receivables, revenue = accounts
+    entry = bulk_post([sale(receivables, revenue, '250.00')])[0]
+
+    reversal = reverse_entry(entry, posting_date=date(2026, 4, 2))
+
+    assert reversal.reversal_of == entry
+    assert get_account_balance(receivables.number, period=202603) == Decimal('250.00')
+    assert get_account_balance(receivables.number) == 0
+    assert get_account_balance(revenue.number) == 0
+    assert_snapshots_match_lines()
+
+
+def test_entry_can_only_be_reversed_once(accounts):
+    entry = bulk_post([sale(*accounts, '10.00')])[0]
+    reverse_entry(entry)
+
+    with pytest.raises(ValueError, match='bereits storniert'):
+        reverse_entry(entry)
+    assert JournalEntry.objects.count() == 2
+
+
+def test_bulk_post_keeps_snapshots_consistent_across_periods(accounts):
+    receivables, revenue = accounts
+    bulk_post([
+        sale(receivables, revenue, '100.00', date(2026, 1, 10)),
+        sale(receivables, revenue, '200.00', date(2026, 3, 10)),
+        sale(receivables, revenue, '0.01', date(2026, 3, 31)),
+    ])
+    # Rückwirkende Buchung: spätere Snapshots müssen mitgeführt werden
+    bulk_post([sale(receivables, revenue, '50.00', date(2026, 2, 1))])
+
+    assert get_account_balance(receivables.number, period=202601) == Decimal('100.00')
+    assert get_account_balance(receivables.number, period=202602) == Decimal('150.00')
+    assert get_account_balance(receivables.number) == Decimal('350.01')
+    totals = LedgerLine.objects.aggregate(debit=Sum('debit'), credit=Sum('credit'))
+    assert totals['debit'] == totals['credit'] == Decimal('350.01')
+    assert_snapshots_match_lines()
+
+
+def test_bulk_post_is_all_or_nothing(accounts):
+    receivables, revenue = accounts
+    unbalanced = EntryData(date(2026, 3, 1), 'Unausgeglichen', [
+        LineData(receivables.number, debit=Decimal('1.00')),
+        LineData(revenue.number, credit=Decimal('2.00')),
+    ])
+
+    with pytest.raises(ValueError):
+        bulk_post([sale(receivables, revenue, '10.00'), unbalanced])
+    assert not JournalEntry.objects.exists()
+    assert get_account_balance(receivables.number) == 0
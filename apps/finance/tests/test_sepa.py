@@ -0,0 +1,49 @@
+"""
+Tests der SEPA-Dateierzeugung: eindeutige Läufe, kein Überschreiben, kein Teillauf.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from apps.finance.sepa import CreditTransfer, CreditTransferWriter, Party, write_credit_transfers
+
+OWN = Party('Muster GmbH', 'DE89 3704 0044 0532 0130 00', 'COBADEFFXXX')
+EXECUTION_DATE = date(2026, 3, 2)
+
+
+def transfers(count: int, invalid_at: int = -1):
+    for index in range(count):
+        iban = 'DE00000000000000000000' if index == invalid_at else 'DE02120300000000202051'
+        yield CreditTransfer(f'ER-{index:05d}', Decimal('10.00'), Party('Lieferant', iban))
+
+
+def test_runs_get_unique_message_ids(tmp_path):
+    first = write_credit_transfers(tmp_path, OWN, EXECUTION_DATE, transfers(5), batch_size=2)
+    second = write_credit_transfers(tmp_path, OWN, EXECUTION_DATE, transfers(5), batch_size=2)
+
+    message_ids = [sepa_file.message_id for sepa_file in first + second]
+    assert len(set(message_ids)) == 6
+    assert all(message_id.startswith('SCT20260302-') and len(message_id) <= 35 for message_id in message_ids)
+    assert len(list(tmp_path.glob('*.xml'))) == 6
+    assert f'<MsgId>{first[0].message_id}</MsgId>' in first[0].path.read_text(encoding='utf-8')
+
+
+def test_existing_file_is_not_overwritten(tmp_path):
+    existing = tmp_path / 'LAUF-0001.xml'
+    existing.write_text('Bereits übertragen', encoding='utf-8')
+
+    with pytest.raises(FileExistsError):
+        with CreditTransferWriter(tmp_path, OWN, EXECUTION_DATE, message_prefix='LAUF') as writer:
+            for transfer in transfers(3):
+                writer.add(transfer)
+
+    assert existing.read_text(encoding='utf-8') == 'Bereits übertragen'
+
+
+def test_failed_run_removes_finished_files(tmp_path):
+    with pytest.raises(ValueError, match='IBAN'):
+        write_credit_transfers(tmp_path, OWN, EXECUTION_DATE, transfers(7, invalid_at=5), batch_size=2)
+
+    assert list(tmp_path.iterdir()) == []
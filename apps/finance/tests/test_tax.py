@@ -0,0 +1,95 @@
+"""
+Tests der Steuerfindung (Regeln aus den Standard-Steuerschlüsseln, Abfragebudget).
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from apps.finance.models import TaxRule
+from apps.finance.services import TaxCase, determine_tax, invalidate_tax_table, tax_region
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fresh_tax_table():
+    """Die kompilierte Tabelle lebt im Prozess und überdauert den Rollback der Testdaten."""
+    invalidate_tax_table()
+    yield
+    invalidate_tax_table()
+
+
+@pytest.mark.parametrize('buyer_country, region', [('DE', 'domestic'), ('FR', 'eu'), ('CH', 'third')])
+def test_tax_region(buyer_country, region):
+    assert tax_region('DE', buyer_country) == region
+
+
+@pytest.mark.parametrize('buyer_country, buyer_type, tax_class, rule, rate', [
+    ('DE', 'b2b', 'goods_standard', 'Regelsteuersatz 19 %', '19.00'),
+    ('DE', 'b2c', 'service_reduced', 'Ermäßigter Steuersatz 7 %', '7.00'),
+    ('FR', 'b2b', 'goods_standard', 'Innergemeinschaftliche Lieferung', '0.00'),
+    ('FR', 'b2b', 'service_standard', 'Reverse Charge (EU)', '0.00'),
+    ('FR', 'b2c', 'goods_standard', 'Regelsteuersatz 19 %', '19.00'),
+    ('FR', 'b2c', 'goods_reduced', 'Ermäßigter Steuersatz 7 %', '7.00'),
+    ('CH', 'b2c', 'goods_standard', 'Ausfuhrlieferung', '0.00'),
+    ('US', 'b2b', 'service_standard', 'Nicht steuerbare Leistung (Drittland)', '0.00'),
+    ('US', 'b2c', 'service_standard', 'Regelsteuersatz 19 %', '19.00'),
+])
+def test_determine_tax_rules(buyer_country, buyer_type, tax_class, rule, rate):
+    decision, = determine_tax([TaxCase('DE', buyer_country, buyer_type, tax_class)])
+
+    assert decision.rule_name == rule
+    assert decision.tax_rate == Decimal(rate)
+
+
+def test_intra_community_supply_carries_invoice_note():
+    decision, = determine_tax([TaxCase('DE', 'AT', 'b2b', 'goods_reduced')])
+
+    assert decision.is_intra_community and not decision.is_reverse_charge
+    assert decision.invoice_note == 'Steuerfreie innergemeinschaftliche Lieferung (§ 4 Nr. 1b UStG)'
+
+
+def test_missing_tax_key_raises():
+    with pytest.raises(ValueError, match='Kein Steuerschlüssel'):
+        determine_tax([TaxCase('FR', 'DE', 'b2b', 'goods_standard')])
+
+
+def test_determine_tax_keeps_input_order():
+    cases = [
+        TaxCase('DE', 'DE', 'b2c', 'goods_reduced'),
+        TaxCase('DE', 'FR', 'b2b', 'goods_standard'),
+        TaxCase('DE', 'DE', 'b2c', 'goods_reduced'),
+    ]
+
+    assert [decision.tax_rate for decision in determine_tax(cases)] == [
+        Decimal('7.00'), Decimal('0.00'), Decimal('7.00'),
+    ]
+
+
+def test_determine_tax_query_budget(django_assert_num_queries):
+    cases = [
+        TaxCase('DE', country, buyer_type, tax_class)
+        for country in ('DE', 'FR', 'IT', 'CH')
+        for buyer_type in ('b2b', 'b2c')
+        for tax_class in ('goods_standard', 'service_reduced')
+    ] * 500
+
+    # Erster Aufruf lädt die Steuerschlüssel in einer Abfrage, danach keine mehr
+    with django_assert_num_queries(1):
+        determine_tax(cases)
+    with django_assert_num_queries(0):
+        decisions = determine_tax(cases)
+    assert len(decisions) == len(cases)
+
+
+def test_rule_change_invalidates_compiled_table(django_capture_on_commit_callbacks):
+    determine_tax([TaxCase('DE', 'DE', 'b2c', 'goods_reduced')])
+
+    with django_capture_on_commit_callbacks(execute=True):
+        rule = TaxRule.objects.get(name='Ermäßigter Steuersatz 7 %')
+        rule.tax_rate = Decimal('5.00')
+        rule.save()
+
+    decision, = determine_tax([TaxCase('DE', 'DE', 'b2c', 'goods_reduced')])
+    assert decision.tax_rate == Decimal('5.00')
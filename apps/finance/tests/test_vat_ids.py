@@ -0,0 +1,122 @@
+"""
+Tests der USt-IdNr.-Prüfung (Prüfziffern, Prüfprotokoll, VIES-Abfragen).
+"""
+
+import pytest
+
+from apps.finance.models import VatIdCheck
+from apps.finance.services import (
+    get_vat_id_statuses,
+    is_plausible_vat_id,
+    normalize_vat_id,
+    reverify_vat_ids,
+    schedule_vat_id_reverification,
+    validate_vat_ids,
+)
+from apps.finance.tests.factories import VatIdCheckFactory
+from apps.sales.tests.factories import CustomerFactory
+from core.adapters.vies import get_vies_adapter
+from core.models import TaskRecord
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def vies(settings):
+    """VIES-Stub: FR-Nummer gültig, Italien nicht erreichbar."""
+    settings.VIES_ADAPTER = 'core.adapters.vies.StubViesAdapter'
+    settings.VIES_ADAPTER_OPTIONS = {'valid_ids': ['FR40303265045', 'DE136695976'], 'unavailable': ['IT']}
+    get_vies_adapter.cache_clear()
+    yield get_vies_adapter()
+    get_vies_adapter.cache_clear()
+
+
+@pytest.mark.parametrize('raw, normalized', [
+    ('de 136 695 976', 'DE136695976'),
+    ('FR-40.303/265045', 'FR40303265045'),
+    ('gr123456789', 'EL123456789'),
+])
+def test_normalize_vat_id(raw, normalized):
+    assert normalize_vat_id(raw) == normalized
+
+
+@pytest.mark.parametrize('vat_id', [
+    'DE136695976', 'FR40303265045', 'ATU13585627', 'IT00743110157', 'NL004495445B01', 'BE0403019261',
+])
+def test_valid_checksums(vat_id):
+    assert is_plausible_vat_id(vat_id)
+
+
+@pytest.mark.parametrize('vat_id', [
+    'DE136695977', 'FR41303265045', 'ATU13585626', 'IT00743110158', 'DE12345678', 'XX123456789',
+])
+def test_invalid_checksums_and_formats(vat_id):
+    assert not is_plausible_vat_id(vat_id)
+
+
+def test_statuses_read_recent_checks_in_one_query(django_assert_num_queries):
+    VatIdCheckFactory(vat_id='FR40303265045', is_valid=True)
+    VatIdCheckFactory(vat_id='DE136695976', is_valid=False)
+
+    with django_assert_num_queries(1):
+        statuses = get_vat_id_statuses(['fr 40303265045', 'DE136695976', 'DE136695977', 'ATU13585627'])
+
+    assert statuses['FR40303265045'].is_valid is True
+    assert statuses['FR40303265045'].request_identifier
+    assert statuses['DE136695976'].is_valid is False
+    # Prüfziffer falsch: ohne Abfrage ungültig; plausibel, aber nie geprüft: unbekannt
+    assert statuses['DE136695977'].is_valid is False
+    assert statuses['ATU13585627'].is_valid is None
+
+
+def test_expired_checks_are_ignored(settings):
+    VatIdCheckFactory(vat_id='FR40303265045')
+    # Prüfprotokoll ist unveränderbar: statt die Prüfung zu altern, Gültigkeitsdauer verkürzen
+    settings.VAT_ID_CHECK_TTL_DAYS = 0
+
+    assert get_vat_id_statuses(['FR40303265045'])['FR40303265045'].is_valid is None
+
+
+def test_validate_queries_vies_only_for_unknown_ids(vies):
+    VatIdCheckFactory(vat_id='DE136695976', is_valid=True)
+
+    statuses = validate_vat_ids(['FR40303265045', 'DE136695976', 'ATU13585627', 'IT00743110157', 'DE136695977'])
+
+    assert vies.calls == 3
+    assert statuses['FR40303265045'].is_valid is True
+    assert statuses['ATU13585627'].is_valid is False
+    # Mitgliedstaat nicht erreichbar: bleibt offen und wird nicht protokolliert
+    assert statuses['IT00743110157'].is_valid is None
+    assert set(VatIdCheck.objects.values_list('vat_id', flat=True)) == {
+        'DE136695976', 'FR40303265045', 'ATU13585627',
+    }
+
+
+def test_reverify_includes_customer_ids_never_checked(vies):
+    VatIdCheckFactory(vat_id='DE136695976')
+    CustomerFactory(vat_id='FR40303265045')
+    CustomerFactory(vat_id='ATU13585626')
+
+    result = reverify_vat_ids()
+
+    assert result == {'checked': 1, 'valid': 1, 'invalid': 1, 'failed': 0, 'skipped': 1}
+    assert VatIdCheck.objects.filter(vat_id='FR40303265045', is_valid=True).exists()
+
+
+def test_reverify_normalizes_customer_ids(vies):
+    VatIdCheckFactory(vat_id='DE136695976')
+    CustomerFactory(vat_id='de 136 695 976')
+    CustomerFactory(vat_id='fr 40303265045')
+    CustomerFactory(vat_id='FR-40.303/265045')
+
+    result = reverify_vat_ids()
+
+    assert result == {'checked': 1, 'valid': 1, 'invalid': 0, 'failed': 0, 'skipped': 1}
+    assert vies.calls == 1
+    assert VatIdCheck.objects.filter(vat_id='FR40303265045', is_valid=True).exists()
+
+
+def test_schedule_passes_normalized_ids():
+    record = schedule_vat_id_reverification(['fr 40303265045', 'FR40303265045', 'gr123456789'])
+
+    assert TaskRecord.objects.get(pk=record.pk).args == [['EL123456789', 'FR40303265045']]
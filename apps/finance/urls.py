@@ -0,0 +1,12 @@
+"""
+URL-Konfiguration für die Finance App.
+"""
+
+from django.urls import path
+from apps.finance import views
+
+app_name = 'finance'
+
+urlpatterns = [
+    path('', views.ledger_list, name='ledger_list'),
+]
@@ -0,0 +1,40 @@
+"""
+Views für die Finance App.
+
+WICHTIG: Diese Views enthalten KEINE Geschäftslogik.
+Alle Logik muss in services.py implementiert werden.
+"""
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.views.decorators.http import require_GET
+
+from apps.finance.models import LedgerLine
+from core.listing import Column, KeysetList
+
+
+LEDGER_LIST = KeysetList(
+    title='Buchungsjournal',
+    subtitle='Buchungszeilen, zuletzt gebuchte zuerst',
+    queryset=LedgerLine.objects.all,
+    columns=(
+        Column('entry__posting_date', 'Datum', 'date'),
+        Column('entry__reference', 'Beleg'),
+        Column('entry__description', 'Buchungstext'),
+        Column('account__number', 'Konto'),
+        Column('debit', 'Soll', 'amount'),
+        Column('credit', 'Haben', 'amount'),
+    ),
+)
+
+
+@login_required
+@permission_required('finance.view_ledgerline', raise_exception=True)
+@require_GET
+def ledger_list(request):
+    """
+    Buchungsjournal mit Keyset-Pagination (Infinite Scroll über HTMX).
+
+    Returns:
+        HttpResponse: Seite, Tabelle oder Folgezeilen (siehe `core.listing.KeysetList.render`)
+    """
+    return LEDGER_LIST.render(request)
@@ -0,0 +1,120 @@
+"""
+Nebenläufigkeits-Benchmark für die Bestandsreservierung.
+
+Viele Threads reservieren gleichzeitig auf wenige "heiße" Artikel, bis der
+Bestand erschöpft ist. Gemessen werden Reservierungen pro Sekunde; danach wird
+geprüft, dass kein Überverkauf stattgefunden hat.
+
+ACHTUNG: Legt Benchmark-Artikel (SKU-Präfix 'BENCH-') in der konfigurierten
+Datenbank an. Aussagekräftig nur gegen PostgreSQL (SQLite serialisiert alle
+Schreibzugriffe).
+
+Aufruf:
+    python manage.py benchmark_reservations --threads 32 --skus 4 --stock 5000
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection
+from django.db.models import Sum
+
+from apps.inventory.models import Product, StockMovement
+from apps.inventory.services import InsufficientStockError, adjust_stock, get_stock_levels, reserve_order
+from core.audit import audit_scope
+
+
+class Command(BaseCommand):
+    help = 'Misst Reservierungen/s bei parallelen Zugriffen auf wenige Artikel und prüft auf Überverkauf.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--threads', type=int, default=16, help='Anzahl paralleler Worker')
+        parser.add_argument('--skus', type=int, default=4, help='Anzahl heißer Artikel')
+        parser.add_argument('--stock', type=int, default=2000, help='Anfangsbestand je Artikel')
+        parser.add_argument('--lines', type=int, default=2, help='Max. Zeilen je Auftrag')
+
+    def handle(self, *args, **options) -> None:
+        run_id = uuid.uuid4().hex[:8]
+        products = []
+        for index in range(options['skus']):
+            product = Product.objects.create(sku=f'BENCH-{run_id}-{index}', name=f'Benchmark {index}')
+            adjust_stock(product.pk, options['stock'], 'Benchmark-Anfangsbestand')
+            products.append(product.pk)
+
+        counts = Counter()
+        lock = threading.Lock()
+
+        def worker(seed: int) -> None:
+            rng = random.Random(seed)
+            local_counts = Counter()
+            try:
+                with audit_scope():
+                    self._reserve_until_empty(
+                        rng, products, run_id, seed, options['lines'], local_counts,
+                    )
+            finally:
+                connection.close()
+                with lock:
+                    counts.update(local_counts)
+
+        threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        seconds = time.perf_counter() - started
+
+        # Maßgeblich ist das Bewegungsprotokoll, nicht die Zähler der Threads
+        logged = dict(
+            StockMovement.objects.filter(
+                product_id__in=products, movement_type=StockMovement.MovementType.RESERVATION,
+            ).values('product_id').annotate(total=Sum('quantity')).values_list('product_id', 'total')
+        )
+        oversold = [
+            product_id
+            for product_id, (available, reserved_qty) in get_stock_levels(products).items()
+            if available < 0 or reserved_qty != logged.get(product_id, 0)
+            or available + reserved_qty != options['stock']
+        ]
+
+        self.stdout.write(f"Threads:            {options['threads']}")
+        self.stdout.write(f"Aufträge reserviert: {counts['orders']} ({sum(logged.values())} Stück)")
+        self.stdout.write(f"Abgelehnt:          {counts['rejected']}")
+        self.stdout.write(f"Lock-Wiederholungen: {counts['lock_retries']}")
+        self.stdout.write(f"Durchsatz:          {counts['orders'] / seconds:,.0f} Reservierungen/s")
+        if oversold:
+            raise CommandError(f"Überverkauf/Inkonsistenz bei {len(oversold)} Artikeln!")
+        self.stdout.write(self.style.SUCCESS("Kein Überverkauf: Bestand und Reservierungen konsistent."))
+
+    def _reserve_until_empty(
+        self,
+        rng: random.Random,
+        products: list,
+        run_id: str,
+        seed: int,
+        max_lines: int,
+        counts: Counter,
+    ) -> None:
+        """Reserviert zufällige Aufträge, bis kein heißer Artikel mehr ausreicht."""
+        while True:
+            lines = [
+                (rng.choice(products), rng.randint(1, 3))
+                for _ in range(rng.randint(1, max_lines))
+            ]
+            try:
+                reserve_order(lines, reference=f'BENCH-{run_id}-{seed}')
+            except InsufficientStockError:
+                counts['rejected'] += 1
+                levels = get_stock_levels(products)
+                if all(available < 3 for available, _ in levels.values()):
+                    break
+                continue
+            except OperationalError:
+                counts['lock_retries'] += 1
+                continue
+            counts['orders'] += 1
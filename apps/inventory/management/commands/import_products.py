@@ -0,0 +1,54 @@
+"""
+Importiert den Artikelstamm aus einer CSV-Datei.
+
+Bestehende Artikel (gleiche Artikelnummer) werden aktualisiert, unveränderte
+übersprungen. Fehlerhafte Zeilen werden gemeldet, ohne den Import
+abzubrechen. Danach `build_rag_index` ausführen, damit die AI Engine die
+importierten Artikel findet.
+
+Aufruf:
+    python manage.py import_products artikel.csv
+    python manage.py import_products artikel.csv --workers 4 --errors fehler.csv
+    python manage.py import_products artikel.csv --dry-run
+"""
+
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.inventory.services import import_products
+from core.imports import ImportReport
+
+
+# Ausgegebene Fehler (alle Fehler: --errors)
+PRINTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = 'Importiert Artikel aus CSV.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('path', type=Path, help='Importdatei')
+        parser.add_argument('--workers', type=int, help='Validierungs-Prozesse (Standard: Anzahl CPUs)')
+        parser.add_argument('--dry-run', action='store_true', help='Nur prüfen, nichts schreiben')
+        parser.add_argument('--errors', type=Path, help='CSV-Datei für alle fehlerhaften Zeilen')
+
+    def handle(self, *args, **options) -> None:
+        if not options['path'].is_file():
+            raise CommandError(f"Datei nicht gefunden: {options['path']}")
+        report = import_products(
+            options['path'],
+            workers=options['workers'],
+            dry_run=options['dry_run'],
+            error_file=options['errors'],
+            progress=self._progress,
+        )
+        self.stdout.write('')
+        for error in report.errors[:PRINTED_ERRORS]:
+            self.stdout.write(f"Zeile {error.line}, {error.field}: {error.message}")
+        style = self.style.WARNING if report.failed else self.style.SUCCESS
+        self.stdout.write(style(report.summary()))
+
+    def _progress(self, report: ImportReport) -> None:
+        self.stdout.write(f"\rGelesen: {report.read}", ending='')
+        self.stdout.flush()
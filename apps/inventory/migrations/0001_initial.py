@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:04
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sku', models.CharField(help_text='Artikelnummer.', max_length=64, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('unit_price', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('min_stock', models.PositiveIntegerField(default=0, help_text='Mindestbestand.')),
+            ],
+            options={
+                'verbose_name': 'Artikel',
+                'verbose_name_plural': 'Artikel',
+                'ordering': ['sku'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockMovement',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('movement_type', models.CharField(choices=[('receipt', 'Wareneingang'), ('adjustment', 'Inventurkorrektur'), ('reservation', 'Reservierung'), ('release', 'Freigabe'), ('issue', 'Warenausgang')], max_length=20)),
+                ('quantity', models.IntegerField(help_text='Menge (positiv = Zugang zur jeweiligen Bestandsart).')),
+                ('reference', models.CharField(blank=True, db_index=True, help_text='z.B. Auftragsnummer.', max_length=100)),
+                ('reason', models.CharField(blank=True, max_length=255)),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='movements', to='inventory.product')),
+            ],
+            options={
+                'verbose_name': 'Lagerbewegung',
+                'verbose_name_plural': 'Lagerbewegungen',
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='StockItem',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('available', models.IntegerField(default=0)),
+                ('reserved', models.IntegerField(default=0)),
+                ('product', models.OneToOneField(on_delete=django.db.models.deletion.PROTECT, related_name='stock', to='inventory.product')),
+            ],
+            options={
+                'verbose_name': 'Bestand',
+                'verbose_name_plural': 'Bestände',
+                'constraints': [models.CheckConstraint(condition=models.Q(('available__gte', 0), ('reserved__gte', 0)), name='inventory_stockitem_non_negative')],
+            },
+        ),
+    ]
@@ -1,3 +1,82 @@
+"""
+Models für die Inventory App.
+
+Bestände werden ausschließlich über `apps.inventory.services` verändert
+(atomare, bedingte UPDATEs). Jede Bestandsänderung erzeugt eine
+unveränderbare Lagerbewegung (`StockMovement`).
+"""
+
 from django.db import models
 
-# Create your models here.
+from core.models import AppendOnlyModel, BaseModel
+
+
+class Product(BaseModel):
+    """Artikel des Produktkatalogs."""
+
+    sku = models.CharField(max_length=64, unique=True, help_text="Artikelnummer.")
+    name = models.CharField(max_length=255)
+    unit_price = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    min_stock = models.PositiveIntegerField(default=0, help_text="Mindestbestand.")
+
+    class Meta:
+        verbose_name = "Artikel"
+        verbose_name_plural = "Artikel"
+        ordering = ['sku']
+        indexes = [
+            # Seitenweises Blättern der Artikelliste (core.listing)
+            models.Index(fields=['created_at', 'id'], name='inventory_product_keyset'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.sku} {self.name}"
+
+
+class StockItem(BaseModel):
+    """
+    Aktueller Bestand eines Artikels.
+
+    `available` ist frei verfügbar, `reserved` ist für Aufträge reserviert;
+    der physische Bestand ist die Summe beider.
+    """
+
+    product = models.OneToOneField(Product, on_delete=models.PROTECT, related_name='stock')
+    available = models.IntegerField(default=0)
+    reserved = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Bestand"
+        verbose_name_plural = "Bestände"
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(available__gte=0, reserved__gte=0),
+                name='inventory_stockitem_non_negative',
+            ),
+        ]
+
+    @property
+    def on_hand(self) -> int:
+        """Physischer Bestand (verfügbar + reserviert)."""
+        return self.available + self.reserved
+
+
+class StockMovement(AppendOnlyModel):
+    """Unveränderbare Lagerbewegung (Bewegungsprotokoll)."""
+
+    class MovementType(models.TextChoices):
+        RECEIPT = 'receipt', 'Wareneingang'
+        ADJUSTMENT = 'adjustment', 'Inventurkorrektur'
+        RESERVATION = 'reservation', 'Reservierung'
+        RELEASE = 'release', 'Freigabe'
+        ISSUE = 'issue', 'Warenausgang'
+
+    product = models.ForeignKey(Product, on_delete=models.PROTECT, related_name='movements')
+    movement_type = models.CharField(max_length=20, choices=MovementType.choices)
+    quantity = models.IntegerField(help_text="Menge (positiv = Zugang zur jeweiligen Bestandsart).")
+    reference = models.CharField(max_length=100, blank=True, db_index=True, help_text="z.B. Auftragsnummer.")
+    reason = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        verbose_name = "Lagerbewegung"
+        verbose_name_plural = "Lagerbewegungen"
+        ordering = ['created_at']
@@ -8,12 +8,388 @@ Dieses Modul wird Business-Logik enthalten für:
 - Lageroperationen (Warehouse Operations)
 
 Alle Inventory Business-Logik muss hier implementiert werden, nicht in Views.
+
+Andere Apps (z.B. Sales) ändern Bestände ausschließlich über `reserve_stock`,
+`reserve_order`, `release_reservation` und `issue_reservation`.
 """
 
-from typing import Optional
+from collections import Counter
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Collection, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+from django.db.models import Case, Count, F, IntegerField, Q, Sum, Value, When
+
+from apps.ai_engine.retrieval import retrieval_source
+from apps.inventory.models import Product, StockItem, StockMovement
+from apps.inventory.signals import stock_changed
+from core import audit
+from core.imports import ImportReport, Importer, import_file, parse_decimal
+from core.models import AuditLog
+from core.queries import query_budget
+from core.search import search_source
+
+
+class InsufficientStockError(Exception):
+    """Nicht genügend verfügbarer Bestand für eine Reservierung."""
+
+    def __init__(self, shortages: Dict[UUID, Tuple[int, int]]) -> None:
+        self.shortages = shortages
+        details = ', '.join(
+            f"{product_id}: benötigt {needed}, verfügbar {available}"
+            for product_id, (needed, available) in shortages.items()
+        )
+        super().__init__(f"Nicht genügend Bestand ({details}).")
+
+
+def _per_product(lines: Iterable[Tuple[UUID, int]]) -> Dict[UUID, int]:
+    """Fasst Auftragszeilen je Artikel zusammen und prüft die Mengen."""
+    totals: Counter = Counter()
+    for product_id, quantity in lines:
+        if quantity <= 0:
+            raise ValueError(f"Menge muss positiv sein (Artikel {product_id}).")
+        totals[product_id] += quantity
+    return dict(totals)
+
+
+def _case(quantities: Dict[UUID, int]) -> Case:
+    """CASE-Ausdruck: Menge je Artikel (für ein einziges UPDATE über alle Zeilen)."""
+    return Case(
+        *[When(product_id=product_id, then=Value(quantity)) for product_id, quantity in quantities.items()],
+        output_field=IntegerField(),
+    )
+
+
+def _lock_stock(product_ids: Collection[UUID]) -> None:
+    """
+    Sperrt mehrere Bestandszeilen in Artikel-ID-Reihenfolge (bis zum Ende der Transaktion).
+
+    Ein UPDATE über mehrere Zeilen sperrt in der Reihenfolge des Ausführungsplans;
+    zwei Aufträge mit denselben Artikeln könnten sich so gegenseitig blockieren
+    (Deadlock). Mit fester Reihenfolge wartet der zweite nur auf den ersten.
+    Eine einzelne Zeile sperrt das bedingte UPDATE selbst, ohne zusätzliche Abfrage.
+    """
+    if len(product_ids) < 2:
+        return
+    list(
+        StockItem.objects.select_for_update().filter(product_id__in=product_ids)
+        .order_by('product_id').values_list('pk', flat=True)
+    )
+
+
+def _lock_reservations(reference: str) -> None:
+    """
+    Sperrt die Reservierungsbewegungen einer Referenz (bis zum Ende der Transaktion).
+
+    Serialisiert Freigabe und Warenausgang derselben Referenz: Ein paralleler
+    Aufruf wartet hier und liest die offenen Mengen erst danach, also
+    einschließlich der bereits gebuchten Freigabe bzw. des Warenausgangs.
+    """
+    list(
+        StockMovement.objects.select_for_update().filter(
+            reference=reference, movement_type=StockMovement.MovementType.RESERVATION,
+        ).order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def _log_movements(
+    quantities: Dict[UUID, int],
+    movement_type: str,
+    reference: str,
+    reason: str = '',
+    sign: int = 1,
+) -> List[StockMovement]:
+    movements = [
+        StockMovement(
+            product_id=product_id,
+            movement_type=movement_type,
+            quantity=sign * quantity,
+            reference=reference,
+            reason=reason,
+        )
+        for product_id, quantity in quantities.items()
+    ]
+    StockMovement.objects.bulk_create(movements)
+    audit.record_many(movements, AuditLog.Action.CREATE)
+    return movements
+
+
+@audit.atomic
+def reserve_order(lines: Iterable[Tuple[UUID, int]], reference: str) -> List[StockMovement]:
+    """
+    Reserviert alle Zeilen eines Auftrags atomar (alles oder nichts).
+
+    Bei mehreren Artikeln werden die Bestandszeilen zuerst in Artikel-ID-Reihenfolge
+    gesperrt (`_lock_stock`, verhindert Deadlocks zwischen Aufträgen mit denselben
+    Artikeln), dann alle mit einem einzigen bedingten UPDATE
+    (`available = available - qty WHERE available >= qty`) reserviert. Ein
+    Überverkauf ist ausgeschlossen, weil die Bedingung in der Datenbank
+    geprüft wird.
+
+    Args:
+        lines: Paare aus (Artikel-ID, Menge); mehrfache Artikel werden addiert
+        reference: Auftragsreferenz für das Bewegungsprotokoll
+
+    Returns:
+        List[StockMovement]: Reservierungsbewegungen je Artikel
+
+    Raises:
+        ValueError: Bei nicht positiven Mengen
+        InsufficientStockError: Wenn mindestens ein Artikel nicht ausreicht
+    """
+    quantities = _per_product(lines)
+    if not quantities:
+        return []
+
+    _lock_stock(quantities.keys())
+    needed = _case(quantities)
+    updated = StockItem.objects.filter(
+        product_id__in=quantities.keys(), available__gte=needed,
+    ).update(
+        available=F('available') - needed,
+        reserved=F('reserved') + needed,
+    )
+
+    if updated != len(quantities):
+        # Mindestens ein Artikel reicht nicht: Exception rollt das UPDATE zurück
+        available = dict(
+            StockItem.objects.filter(product_id__in=quantities.keys()).values_list('product_id', 'available')
+        )
+        shortages = {
+            product_id: (quantity, available.get(product_id, 0))
+            for product_id, quantity in quantities.items()
+            if available.get(product_id, 0) < quantity
+        }
+        raise InsufficientStockError(shortages)
+
+    return _log_movements(quantities, StockMovement.MovementType.RESERVATION, reference)
+
+
+def reserve_stock(product_id: UUID, quantity: int, reference: str) -> StockMovement:
+    """
+    Reserviert Bestand für einen einzelnen Artikel.
+
+    Args:
+        product_id: Artikel-ID
+        quantity: Zu reservierende Menge
+        reference: Auftragsreferenz
+
+    Returns:
+        StockMovement: Die Reservierungsbewegung
+
+    Raises:
+        InsufficientStockError: Wenn nicht genügend Bestand verfügbar ist
+    """
+    return reserve_order([(product_id, quantity)], reference)[0]
+
+
+def _open_reservations(reference: str) -> Dict[UUID, int]:
+    """Summiert die noch offenen Reservierungen einer Referenz je Artikel."""
+    rows = StockMovement.objects.filter(
+        reference=reference,
+        movement_type__in=[
+            StockMovement.MovementType.RESERVATION,
+            StockMovement.MovementType.RELEASE,
+            StockMovement.MovementType.ISSUE,
+        ],
+    ).values('product_id').annotate(total=Sum('quantity'))
+    return {row['product_id']: row['total'] for row in rows if row['total'] > 0}
+
+
+@audit.atomic
+def release_reservation(reference: str, reason: str = '') -> List[StockMovement]:
+    """
+    Gibt alle offenen Reservierungen einer Referenz wieder frei (z.B. Auftragsstorno).
+
+    Args:
+        reference: Auftragsreferenz
+        reason: Begründung für das Bewegungsprotokoll
+
+    Returns:
+        List[StockMovement]: Freigabebewegungen je Artikel
+    """
+    _lock_reservations(reference)
+    quantities = _open_reservations(reference)
+    if not quantities:
+        return []
+    _lock_stock(quantities.keys())
+    amount = _case(quantities)
+    StockItem.objects.filter(product_id__in=quantities.keys()).update(
+        available=F('available') + amount,
+        reserved=F('reserved') - amount,
+    )
+    return _log_movements(quantities, StockMovement.MovementType.RELEASE, reference, reason, sign=-1)
+
+
+@audit.atomic
+def issue_reservation(reference: str) -> List[StockMovement]:
+    """
+    Bucht die offenen Reservierungen einer Referenz als Warenausgang (Lieferung).
+
+    Args:
+        reference: Auftragsreferenz
+
+    Returns:
+        List[StockMovement]: Warenausgangsbewegungen je Artikel
+    """
+    _lock_reservations(reference)
+    quantities = _open_reservations(reference)
+    if not quantities:
+        return []
+    _lock_stock(quantities.keys())
+    StockItem.objects.filter(product_id__in=quantities.keys()).update(
+        reserved=F('reserved') - _case(quantities),
+    )
+    stock_changed.send(
+        sender=StockItem,
+        changes={product_id: -quantity for product_id, quantity in quantities.items()},
+        created=[],
+    )
+    return _log_movements(quantities, StockMovement.MovementType.ISSUE, reference, sign=-1)
+
+
+@audit.atomic
+def adjust_stock(
+    product_id: UUID,
+    quantity: int,
+    reason: str,
+    movement_type: Optional[str] = None,
+) -> StockMovement:
+    """
+    Passt Lagerbestände an und erstellt einen Bewegungsdatensatz.
+
+    Args:
+        product_id: Artikel-ID
+        quantity: Zu- (positiv) oder Abgang (negativ) des verfügbaren Bestands
+        reason: Begründung (Pflicht für Inventurkorrekturen)
+        movement_type: Bewegungsart (Standard: Wareneingang bei Zugang, sonst Korrektur)
+
+    Returns:
+        StockMovement: Die Lagerbewegung
+
+    Raises:
+        InsufficientStockError: Wenn ein Abgang den verfügbaren Bestand übersteigt
+    """
+    if movement_type is None:
+        movement_type = (
+            StockMovement.MovementType.RECEIPT if quantity > 0 else StockMovement.MovementType.ADJUSTMENT
+        )
+
+    _, created = StockItem.objects.get_or_create(product_id=product_id)
+    updated = StockItem.objects.filter(
+        product_id=product_id, available__gte=max(0, -quantity),
+    ).update(available=F('available') + quantity)
+    if not updated:
+        available = StockItem.objects.filter(product_id=product_id).values_list('available', flat=True).first()
+        raise InsufficientStockError({product_id: (-quantity, available or 0)})
+    stock_changed.send(sender=StockItem, changes={product_id: quantity}, created=[product_id] if created else [])
+
+    return _log_movements({product_id: abs(quantity)}, movement_type, '', reason, sign=1 if quantity > 0 else -1)[0]
+
+
+@query_budget(1)
+def get_stock_levels(product_ids: Iterable[UUID]) -> Dict[UUID, Tuple[int, int]]:
+    """
+    Liest verfügbaren und reservierten Bestand mehrerer Artikel in einer Abfrage.
+
+    Args:
+        product_ids: Artikel-IDs
+
+    Returns:
+        Dict[UUID, Tuple[int, int]]: Je Artikel (verfügbar, reserviert)
+    """
+    return {
+        product_id: (available, reserved)
+        for product_id, available, reserved in StockItem.objects.filter(
+            product_id__in=list(product_ids)
+        ).values_list('product_id', 'available', 'reserved')
+    }
+
+
+@query_budget(1)
+def get_stock_summary() -> Tuple[int, int]:
+    """
+    Ermittelt den physischen Gesamtbestand und die Artikel unter Mindestbestand.
+
+    Returns:
+        Tuple[int, int]: (Stück auf Lager, Anzahl Artikel unter Mindestbestand)
+    """
+    on_hand = F('available') + F('reserved')
+    totals = StockItem.objects.aggregate(
+        units=Sum(on_hand),
+        below_min=Count('pk', filter=Q(product__min_stock__gt=on_hand)),
+    )
+    return totals['units'] or 0, totals['below_min']
+
+
+@retrieval_source('inventory.Product', prefix='product')
+@search_source('inventory.Product', entity_type='product')
+def product_search_text(product: Product) -> Tuple[str, str]:
+    """Titel und Text eines Artikels für den Retrieval-Index der AI Engine und die Volltextsuche."""
+    return str(product), f"Artikel {product.sku}: {product.name}, Preis {product.unit_price} EUR"
+
+
+class ProductImporter(Importer):
+    """Import des Artikelstamms aus CSV (Schlüssel: Artikelnummer)."""
+
+    model = Product
+    key_field = 'sku'
+    fields = ('sku', 'name', 'unit_price', 'min_stock')
+    columns = {
+        'sku': ('artikelnummer', 'artikelnr', 'artikelnr.', 'art.-nr.'),
+        'name': ('bezeichnung', 'artikelbezeichnung', 'artikel'),
+        'unit_price': ('preis', 'vk', 'verkaufspreis', 'einzelpreis', 'vk-preis'),
+        'min_stock': ('mindestbestand', 'meldebestand'),
+    }
+
+    def clean_sku(self, value: str, row: dict) -> str:
+        if not value:
+            raise ValueError("Artikelnummer fehlt.")
+        if len(value) > 64:
+            raise ValueError("Artikelnummer ist länger als 64 Zeichen.")
+        return value
+
+    def clean_name(self, value: str, row: dict) -> str:
+        if not value:
+            raise ValueError("Bezeichnung fehlt.")
+        return value[:255]
+
+    def clean_unit_price(self, value: str, row: dict) -> Decimal:
+        price = parse_decimal(value.replace('€', '')) if value else Decimal('0')
+        if price < 0:
+            raise ValueError(f"Negativer Preis: {value}")
+        # Wie in der Datenbank gespeichert (2 Nachkommastellen), damit unveränderte Zeilen erkannt werden
+        return price.quantize(Decimal('0.01'))
+
+    def clean_min_stock(self, value: str, row: dict) -> int:
+        if not value:
+            return 0
+        if not value.isdigit():
+            raise ValueError(f"Ungültiger Mindestbestand: {value}")
+        return int(value)
+
+
+def import_products(
+    path: Path,
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    error_file: Optional[Path] = None,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Importiert Artikel aus einer CSV-Datei (neu oder aktualisiert).
+
+    Args:
+        path: Importdatei
+        workers: Validierungs-Prozesse (Standard: Anzahl CPUs)
+        dry_run: Nur prüfen, nichts schreiben
+        error_file: Optional CSV-Datei mit allen fehlerhaften Zeilen
+        progress: Wird nach jedem Chunk mit dem Zwischenstand aufgerufen
 
-# Placeholder für zukünftige Service-Funktionen
-# Beispiel:
-# def adjust_stock(product_id: int, quantity: int, reason: str) -> StockMovement:
-#     """Passt Lagerbestände an und erstellt einen Bewegungsdatensatz."""
-#     pass
+    Returns:
+        ImportReport: Zähler und Fehler je Zeile
+    """
+    return import_file(
+        ProductImporter(), path, workers=workers, dry_run=dry_run, error_file=error_file, progress=progress,
+    )
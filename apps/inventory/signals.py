@@ -0,0 +1,17 @@
+"""
+Signale der Inventory App.
+
+Andere Apps (z.B. Dashboard-Kennzahlen) reagieren auf Bestandsänderungen,
+ohne dass die Inventory App sie kennen muss.
+"""
+
+from django.dispatch import Signal
+
+
+# Gesendet bei Änderungen des physischen Bestands (Wareneingang, Korrektur,
+# Warenausgang) innerhalb der Transaktion, nach dem UPDATE.
+# Reservierungen und Freigaben verschieben nur zwischen verfügbar und
+# reserviert und lösen das Signal nicht aus.
+# Argumente: changes (Dict[product_id, Veränderung des physischen Bestands]),
+#            created (List[product_id] der dabei neu angelegten Bestandszeilen)
+stock_changed = Signal()
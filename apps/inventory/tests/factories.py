@@ -0,0 +1,31 @@
+"""
+Testdaten-Factories der Inventory-App (factory_boy).
+"""
+
+from decimal import Decimal
+
+import factory
+
+from apps.inventory.models import Product, StockItem
+
+
+class ProductFactory(factory.django.DjangoModelFactory):
+    """Artikel ohne Bestandszeile."""
+
+    class Meta:
+        model = Product
+
+    sku = factory.Sequence(lambda n: f'ART-{n:05d}')
+    name = factory.Faker('word', locale='de_DE')
+    unit_price = Decimal('9.90')
+
+
+class StockItemFactory(factory.django.DjangoModelFactory):
+    """Bestandszeile mit eigenem Artikel."""
+
+    class Meta:
+        model = StockItem
+
+    product = factory.SubFactory(ProductFactory)
+    available = 10
+    reserved = 0
@@ -0,0 +1,154 @@
+"""
+Tests der Bestandsreservierung: kein Überverkauf, alles oder nichts.
+"""
+
+import threading
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.inventory import services
+from apps.inventory.models import StockItem, StockMovement
+from apps.inventory.services import (
+    InsufficientStockError,
+    adjust_stock,
+    issue_reservation,
+    release_reservation,
+    reserve_order,
+)
+from apps.inventory.tests.factories import StockItemFactory
+
+pytestmark = pytest.mark.django_db
+
+
+def levels(stock: StockItem):
+    stock.refresh_from_db()
+    return stock.available, stock.reserved
+
+
+def test_reserve_order_moves_stock_to_reserved():
+    screws, nuts = StockItemFactory(available=10), StockItemFactory(available=5)
+
+    movements = reserve_order([(screws.product_id, 4), (nuts.product_id, 2), (screws.product_id, 1)], 'AU-1')
+
+    assert levels(screws) == (5, 5)
+    assert levels(nuts) == (3, 2)
+    assert {(m.product_id, m.quantity) for m in movements} == {(screws.product_id, 5), (nuts.product_id, 2)}
+    assert all(m.movement_type == StockMovement.MovementType.RESERVATION for m in movements)
+
+
+def test_reserve_order_never_oversells():
+    stock = StockItemFactory(available=5)
+    reserve_order([(stock.product_id, 3)], 'AU-1')
+
+    with pytest.raises(InsufficientStockError) as error:
+        reserve_order([(stock.product_id, 3)], 'AU-2')
+
+    assert error.value.shortages == {stock.product_id: (3, 2)}
+    assert levels(stock) == (2, 3)
+    assert not StockMovement.objects.filter(reference='AU-2').exists()
+
+
+def test_reserve_order_is_all_or_nothing():
+    plenty, scarce = StockItemFactory(available=10), StockItemFactory(available=1)
+
+    with pytest.raises(InsufficientStockError) as error:
+        reserve_order([(plenty.product_id, 4), (scarce.product_id, 2)], 'AU-1')
+
+    assert set(error.value.shortages) == {scarce.product_id}
+    assert levels(plenty) == (10, 0)
+    assert levels(scarce) == (1, 0)
+    assert not StockMovement.objects.exists()
+
+
+def test_reserve_order_rejects_non_positive_quantities():
+    stock = StockItemFactory()
+
+    with pytest.raises(ValueError):
+        reserve_order([(stock.product_id, 0)], 'AU-1')
+    assert levels(stock) == (10, 0)
+
+
+def test_release_returns_open_reservations():
+    stock = StockItemFactory(available=10)
+    reserve_order([(stock.product_id, 6)], 'AU-1')
+
+    release_reservation('AU-1', reason='Storno')
+
+    assert levels(stock) == (10, 0)
+    # Nichts mehr offen: eine zweite Freigabe ändert nichts
+    assert release_reservation('AU-1') == []
+    assert levels(stock) == (10, 0)
+
+
+def test_issue_books_reserved_stock_out():
+    stock = StockItemFactory(available=10)
+    reserve_order([(stock.product_id, 6)], 'AU-1')
+
+    issue_reservation('AU-1')
+
+    assert levels(stock) == (4, 0)
+    assert release_reservation('AU-1') == []
+    assert levels(stock) == (4, 0)
+
+
+def test_adjust_stock_cannot_go_negative():
+    stock = StockItemFactory(available=3)
+    adjust_stock(stock.product_id, 2, reason='Wareneingang')
+
+    with pytest.raises(InsufficientStockError):
+        adjust_stock(stock.product_id, -6, reason='Inventur')
+    assert levels(stock) == (5, 0)
+
+
+def test_single_line_reservation_needs_no_lock_query():
+    stock = StockItemFactory(available=10)
+
+    with CaptureQueriesContext(connection) as captured:
+        reserve_order([(stock.product_id, 1)], 'AU-1')
+
+    # Nur das bedingte UPDATE greift auf die Bestandszeile zu
+    stock_queries = [query['sql'] for query in captured.captured_queries if 'inventory_stockitem' in query['sql']]
+    assert len(stock_queries) == 1 and stock_queries[0].startswith('UPDATE')
+    assert levels(stock) == (9, 1)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='Zeilensperren nur mit PostgreSQL prüfbar')
+@pytest.mark.parametrize('operation', [release_reservation, issue_reservation])
+def test_concurrent_release_or_issue_applies_once(operation, monkeypatch):
+    stock = StockItemFactory(available=10)
+    reserve_order([(stock.product_id, 6)], 'AU-1')
+    barrier = threading.Barrier(4)
+    open_reservations = services._open_reservations
+
+    def slow_open_reservations(reference):
+        # Zeitfenster zwischen Lesen der offenen Mengen und UPDATE vergrößern
+        quantities = open_reservations(reference)
+        time.sleep(0.2)
+        return quantities
+
+    monkeypatch.setattr(services, '_open_reservations', slow_open_reservations)
+
+    errors = []
+
+    def worker():
+        barrier.wait()
+        try:
+            operation('AU-1')
+        except Exception as exc:
+            errors.append(exc)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert levels(stock) == ((10, 0) if operation is release_reservation else (4, 0))
+    assert StockMovement.objects.filter(reference='AU-1').count() == 2
@@ -0,0 +1,12 @@
+"""
+URL-Konfiguration für die Inventory App.
+"""
+
+from django.urls import path
+from apps.inventory import views
+
+app_name = 'inventory'
+
+urlpatterns = [
+    path('', views.product_list, name='product_list'),
+]
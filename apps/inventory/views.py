@@ -0,0 +1,40 @@
+"""
+Views für die Inventory App.
+
+WICHTIG: Diese Views enthalten KEINE Geschäftslogik.
+Alle Logik muss in services.py implementiert werden.
+"""
+
+from django.contrib.auth.decorators import login_required, permission_required
+from django.views.decorators.http import require_GET
+
+from apps.inventory.models import Product
+from core.listing import Column, KeysetList
+
+
+PRODUCT_LIST = KeysetList(
+    title='Artikel',
+    subtitle='Produktkatalog mit Bestand, zuletzt angelegte zuerst',
+    queryset=Product.objects.all,
+    columns=(
+        Column('sku', 'Artikelnummer'),
+        Column('name', 'Bezeichnung'),
+        Column('unit_price', 'Preis', 'amount'),
+        Column('stock__available', 'Verfügbar', 'number'),
+        Column('stock__reserved', 'Reserviert', 'number'),
+        Column('min_stock', 'Mindestbestand', 'number'),
+    ),
+)
+
+
+@login_required
+@permission_required('inventory.view_product', raise_exception=True)
+@require_GET
+def product_list(request):
+    """
+    Artikelliste mit Keyset-Pagination (Infinite Scroll über HTMX).
+
+    Returns:
+        HttpResponse: Seite, Tabelle oder Folgezeilen (siehe `core.listing.KeysetList.render`)
+    """
+    return PRODUCT_LIST.render(request)
@@ -0,0 +1,217 @@
+"""
+PDF-Erzeugung für Rechnungen.
+
+- Das Rechnungs-Template wird je Prozess einmal kompiliert und der Renderer
+  (`core.adapters.pdf`) einmal erzeugt; je Rechnung bleiben Template-Render
+  und PDF-Satz.
+- Rechnungsläufe werden in Paketen parallel in einem Prozess-Pool gerendert,
+  der Fortschritt wird über einen Callback gemeldet.
+- Dateien liegen im Storage (`default_storage`), nicht in der Datenbank. Der
+  Dateiname ist der SHA-256 über Rechnungsdaten, Templates, Stylesheets und
+  Renderer: Unveränderte Rechnungen werden beim erneuten Lauf nicht neu
+  gerendert.
+"""
+
+import hashlib
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import as_completed
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.template import Template
+from django.template.loader import get_template
+from django.template.loader_tags import ExtendsNode, IncludeNode
+
+from core.adapters.pdf import get_pdf_renderer
+from core.utils.processes import process_pool
+
+
+INVOICE_TEMPLATE = 'sales/documents/invoice.html'
+
+# Ablageverzeichnis im Storage
+DOCUMENT_DIR = 'invoices'
+
+# Rechnungen je Auftrag an einen Worker-Prozess
+RENDER_CHUNK_SIZE = 25
+
+
+@dataclass(frozen=True)
+class RenderedDocument:
+    """
+    Ergebnis der PDF-Erzeugung einer Rechnung.
+
+    Attributes:
+        number: Rechnungsnummer
+        name: Dateiname im Storage (z.B. für ein `FileField`)
+        rendered: False, wenn die Datei bereits vorlag
+    """
+
+    number: str
+    name: str
+    rendered: bool
+
+
+def _template_sources(template, seen: Optional[Set[str]] = None) -> Iterator[str]:
+    """Quelltexte eines Templates und der per `{% extends %}`/`{% include %}` mit festem Namen geladenen."""
+    seen = set() if seen is None else seen
+    seen.add(template.origin.name)
+    yield template.source
+    for node in template.nodelist.get_nodes_by_type((ExtendsNode, IncludeNode)):
+        name = (node.parent_name if isinstance(node, ExtendsNode) else node.template).var
+        # Variable Namen stehen erst beim Rendern fest
+        if not isinstance(name, str):
+            continue
+        dependency = template.engine.get_template(name)
+        if dependency.origin.name not in seen:
+            yield from _template_sources(dependency, seen)
+
+
+@lru_cache(maxsize=1)
+def _invoice_template() -> Tuple[Template, str]:
+    """
+    Kompiliert das Rechnungs-Template einmal je Prozess; liefert es mit seinem Fingerabdruck.
+
+    Der Fingerabdruck umfasst das Template samt eingebundener Templates, die
+    Stylesheets aus `settings.PDF_RENDERER_OPTIONS` und die Renderer-Einstellungen.
+    """
+    template = get_template(INVOICE_TEMPLATE)
+    digest = hashlib.sha256(f"{settings.PDF_RENDERER}|{settings.PDF_RENDERER_OPTIONS}".encode())
+    for source in _template_sources(template.template):
+        digest.update(b'\0' + source.encode())
+    for path in settings.PDF_RENDERER_OPTIONS.get('stylesheets', ()):
+        digest.update(b'\0' + Path(path).read_bytes())
+    return template, digest.hexdigest()
+
+
+def document_name(invoice: dict) -> str:
+    """
+    Ermittelt den inhaltsadressierten Dateinamen einer Rechnung.
+
+    Args:
+        invoice: Berechnete Rechnung (`calculate_invoice_batch` bzw. `calculate_invoice_totals`)
+
+    Returns:
+        str: Dateiname im Storage, z.B. 'invoices/3f/3fa9….pdf'
+    """
+    _, fingerprint = _invoice_template()
+    payload = json.dumps(invoice, sort_keys=True, default=str, separators=(',', ':'))
+    digest = hashlib.sha256(f"{fingerprint}|{payload}".encode()).hexdigest()
+    return f"{DOCUMENT_DIR}/{digest[:2]}/{digest}.pdf"
+
+
+def _save_once(name: str, content: bytes) -> None:
+    """
+    Legt eine Datei im Storage an, sofern es sie noch nicht gibt.
+
+    Lokal wird in eine temporäre Datei geschrieben und per `os.link` unter dem
+    endgültigen Namen eingehängt: Das schlägt atomar fehl, wenn ein paralleler
+    Lauf schneller war, und niemand sieht eine halb geschriebene Datei
+    (`storage.save` würde stattdessen eine Kopie mit Zufallssuffix anlegen).
+    """
+    try:
+        path = Path(default_storage.path(name))
+    except NotImplementedError:
+        # Entfernte Storages: gleicher Name heißt gleicher Inhalt, Überschreiben ist unschädlich
+        if not default_storage.exists(name):
+            default_storage.save(name, ContentFile(content))
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix='.tmp', delete=False) as handle:
+        handle.write(content)
+    try:
+        os.chmod(handle.name, default_storage.file_permissions_mode or 0o644)
+        os.link(handle.name, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(handle.name)
+
+
+def _render_to_storage(name: str, invoice: dict) -> None:
+    template, _ = _invoice_template()
+    pdf = get_pdf_renderer().render(template.render({'invoice': invoice}))
+    # Parallele Läufe mit derselben Rechnung erzeugen dieselbe Datei
+    _save_once(name, pdf)
+
+
+def _render_chunk(jobs: List[Tuple[str, dict]]) -> int:
+    """Worker: rendert ein Paket Rechnungen in den Storage."""
+    for name, invoice in jobs:
+        _render_to_storage(name, invoice)
+    return len(jobs)
+
+
+def render_invoice_pdf(invoice: dict) -> RenderedDocument:
+    """
+    Erzeugt das PDF einer einzelnen Rechnung im aufrufenden Prozess.
+
+    Args:
+        invoice: Berechnete Rechnung (`calculate_invoice_batch` bzw. `calculate_invoice_totals`)
+
+    Returns:
+        RenderedDocument: Dateiname im Storage
+    """
+    name = document_name(invoice)
+    exists = default_storage.exists(name)
+    if not exists:
+        _render_to_storage(name, invoice)
+    return RenderedDocument(invoice['number'], name, not exists)
+
+
+def render_invoice_pdfs(
+    invoices: List[dict],
+    workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> List[RenderedDocument]:
+    """
+    Erzeugt die PDFs eines Rechnungslaufs parallel.
+
+    Vorhandene Dateien (gleicher Inhalt, gleiches Template) werden
+    übersprungen, identische Rechnungen nur einmal gerendert.
+
+    Args:
+        invoices: Berechnete Rechnungen (`calculate_invoice_batch`)
+        workers: Anzahl Worker-Prozesse (Standard: Anzahl CPUs; 1 = ohne Pool)
+        progress: Callback (fertig, gesamt) nach jedem Paket
+
+    Returns:
+        List[RenderedDocument]: Ergebnis je Rechnung in Eingabereihenfolge
+    """
+    names = [document_name(invoice) for invoice in invoices]
+    pending: Dict[str, dict] = {}
+    for name, invoice in zip(names, invoices):
+        if name not in pending and not default_storage.exists(name):
+            pending[name] = invoice
+
+    jobs = list(pending.items())
+    chunks = [jobs[start:start + RENDER_CHUNK_SIZE] for start in range(0, len(jobs), RENDER_CHUNK_SIZE)]
+    done = 0
+    if progress:
+        progress(done, len(jobs))
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            done += _render_chunk(chunk)
+            if progress:
+                progress(done, len(jobs))
+    else:
+        with process_pool(min(workers or multiprocessing.cpu_count(), len(chunks))) as pool:
+            for future in as_completed([pool.submit(_render_chunk, chunk) for chunk in chunks]):
+                done += future.result()
+                if progress:
+                    progress(done, len(jobs))
+
+    rendered = set(pending)
+    results = []
+    for name, invoice in zip(names, invoices):
+        results.append(RenderedDocument(invoice['number'], name, name in rendered))
+        rendered.discard(name)
+    return results
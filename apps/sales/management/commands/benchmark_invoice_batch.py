@@ -0,0 +1,79 @@
+"""
+Benchmark für die Batch-Rechnungsberechnung.
+
+Vergleicht die skalare Decimal-Referenz (`calculate_invoice_totals`) mit der
+Festkomma-Batch-Engine (`calculate_invoice_batch`), prüft die centgenaue
+Übereinstimmung und gibt den Durchsatz in Rechnungen pro Sekunde aus.
+
+Aufruf:
+    python manage.py benchmark_invoice_batch --invoices 50000 --lines 8
+"""
+
+import random
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.services import calculate_invoice_batch, calculate_invoice_totals
+
+
+class Command(BaseCommand):
+    help = 'Misst den Durchsatz der Batch-Rechnungsberechnung (Rechnungen/s).'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--invoices', type=int, default=20_000, help='Anzahl Entwürfe')
+        parser.add_argument('--lines', type=int, default=8, help='Max. Positionen je Entwurf')
+        parser.add_argument('--articles', type=int, default=2_000, help='Größe des Preiskatalogs')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        drafts = self._generate_drafts(
+            options['invoices'], options['lines'], options['articles'], options['seed']
+        )
+
+        started = time.perf_counter()
+        reference = [calculate_invoice_totals(draft) for draft in drafts]
+        decimal_seconds = time.perf_counter() - started
+
+        # Die Batch-Engine ergänzt die Entwürfe selbst: eigene Kopie, außerhalb der Messung
+        copies = [{**draft, 'items': [dict(item) for item in draft['items']]} for draft in drafts]
+        started = time.perf_counter()
+        batch = calculate_invoice_batch(copies)
+        batch_seconds = time.perf_counter() - started
+
+        for expected, actual in zip(reference, batch):
+            for key in ('items', 'subtotal', 'vat_amount', 'total', 'vat_groups'):
+                if expected[key] != actual[key]:
+                    raise CommandError(
+                        f"Abweichung bei Entwurf {expected['id']} ({key}): "
+                        f"{expected[key]} != {actual[key]}"
+                    )
+
+        count = len(drafts)
+        self.stdout.write(f"Entwürfe:        {count}")
+        self.stdout.write(f"Decimal-Pfad:    {count / decimal_seconds:,.0f} Rechnungen/s")
+        self.stdout.write(f"Batch-Engine:    {count / batch_seconds:,.0f} Rechnungen/s")
+        self.stdout.write(self.style.SUCCESS(
+            f"Centgenau identisch, Faktor {decimal_seconds / batch_seconds:.1f}x"
+        ))
+
+    def _generate_drafts(self, count: int, max_lines: int, articles: int, seed: int) -> list:
+        """Erzeugt reproduzierbare Entwürfe aus einem Artikelkatalog mit gemischten Steuersätzen."""
+        rng = random.Random(seed)
+        catalog = [Decimal(rng.randint(1, 500_000)).scaleb(-2) for _ in range(articles)]
+        quantities = [Decimal('1'), Decimal('2'), Decimal('0.5'), Decimal('1.25'), Decimal('12'), Decimal('-1')]
+        rates = [Decimal('19'), Decimal('7'), Decimal('0')]
+        drafts = []
+        for number in range(count):
+            items = [
+                {
+                    'description': f'Position {line}',
+                    'quantity': rng.choice(quantities),
+                    'unit_price': rng.choice(catalog),
+                    'vat_rate': rng.choice(rates),
+                }
+                for line in range(rng.randint(1, max_lines))
+            ]
+            drafts.append({'id': number, 'items': items, 'vat_rate': 19})
+        return drafts
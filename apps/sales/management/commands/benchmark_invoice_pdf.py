@@ -0,0 +1,80 @@
+"""
+Benchmark für die PDF-Erzeugung eines Rechnungslaufs.
+
+Erzeugt einen Rechnungslauf mit Steuerfindung und Batch-Berechnung, rendert
+alle PDFs über den Prozess-Pool (`apps.sales.documents`) und wiederholt den
+Lauf, um das Überspringen unveränderter Dokumente zu zeigen.
+
+Aufruf:
+    python manage.py benchmark_invoice_pdf --invoices 2000 --workers 8
+    PDF_RENDERER=core.adapters.pdf.TextPdfRenderer python manage.py benchmark_invoice_pdf
+"""
+
+import random
+import time
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.sales.documents import render_invoice_pdfs
+from apps.sales.services import apply_tax_determination, calculate_invoice_batch
+
+
+class Command(BaseCommand):
+    help = 'Misst den Durchsatz der PDF-Erzeugung eines Rechnungslaufs (Rechnungen/s).'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--invoices', type=int, default=1_000, help='Anzahl Rechnungen')
+        parser.add_argument('--lines', type=int, default=8, help='Max. Positionen je Rechnung')
+        parser.add_argument('--workers', type=int, help='Worker-Prozesse (Standard: Anzahl CPUs)')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        invoices = calculate_invoice_batch(apply_tax_determination(
+            self._generate_drafts(options['invoices'], options['lines'], options['seed'])
+        ))
+
+        started = time.perf_counter()
+        documents = render_invoice_pdfs(invoices, options['workers'], progress=self._progress)
+        seconds = time.perf_counter() - started
+        self.stdout.write('')
+        rendered = sum(document.rendered for document in documents)
+
+        started = time.perf_counter()
+        repeated = render_invoice_pdfs(invoices, options['workers'])
+        repeat_seconds = time.perf_counter() - started
+        if any(document.rendered for document in repeated):
+            raise CommandError("Unveränderte Rechnungen wurden erneut gerendert.")
+
+        self.stdout.write(f"Rechnungen:      {len(invoices)} ({rendered} gerendert)")
+        self.stdout.write(f"Erster Lauf:     {seconds:.2f} s, {rendered / seconds:,.0f} PDFs/s")
+        self.stdout.write(f"Wiederholung:    {repeat_seconds:.2f} s (alle übersprungen)")
+        self.stdout.write(self.style.SUCCESS(f"Ablage: {documents[0].name}"))
+
+    def _progress(self, done: int, total: int) -> None:
+        self.stdout.write(f"\rFortschritt:     {done}/{total}", ending='')
+        self.stdout.flush()
+
+    def _generate_drafts(self, count: int, max_lines: int, seed: int) -> list:
+        """Erzeugt reproduzierbare Rechnungsentwürfe an inländische Kunden."""
+        rng = random.Random(seed)
+        tax_classes = ['goods_standard', 'goods_reduced', 'service_standard']
+        return [
+            {
+                'id': number,
+                'number': f'RE-BENCH-{number:06d}',
+                'date': date(2026, 1, 31),
+                'recipient': {'name': f'Kunde {number}', 'country': 'DE', 'type': 'b2b'},
+                'items': [
+                    {
+                        'description': f'Position {line}',
+                        'quantity': Decimal(rng.randint(1, 20)),
+                        'unit_price': Decimal(rng.randint(100, 500_000)).scaleb(-2),
+                        'tax_class': rng.choice(tax_classes),
+                    }
+                    for line in range(rng.randint(1, max_lines))
+                ],
+            }
+            for number in range(count)
+        ]
@@ -0,0 +1,91 @@
+"""
+Nebenläufigkeits-Benchmark für die Nummernvergabe (Nummernkreise).
+
+Viele Threads vergeben gleichzeitig Nummern aus demselben Nummernkreis –
+einzeln (Rechnung für Rechnung) und in Blöcken (Rechnungslauf). Gemessen
+werden Nummern pro Sekunde; danach wird geprüft, dass keine Nummer doppelt
+vergeben wurde und die Folge lückenlos bei 1 beginnt.
+
+Legt je Lauf einen Benchmark-Nummernkreis (Serie 'B' + Lauf-ID) an und löscht
+ihn am Ende wieder. Aussagekräftig für parallele Worker nur gegen PostgreSQL
+(SQLite serialisiert alle Schreibzugriffe).
+
+Aufruf:
+    python manage.py benchmark_number_ranges --threads 16 --allocations 500 --block 100
+"""
+
+import threading
+import time
+import uuid
+from typing import List
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from apps.sales.models import NumberRange
+from apps.sales.services import reserve_numbers
+from core import audit
+
+
+class Command(BaseCommand):
+    help = 'Misst vergebene Nummern/s bei parallelen Workern und prüft auf Duplikate und Lücken.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--threads', type=int, default=8, help='Anzahl paralleler Worker')
+        parser.add_argument('--allocations', type=int, default=500, help='Vergaben je Worker')
+        parser.add_argument('--block', type=int, default=100, help='Nummern je Block im Rechnungslauf')
+
+    def handle(self, *args, **options) -> None:
+        failed = False
+        for label, block in (('Einzeln', 1), (f"Blöcke à {options['block']}", options['block'])):
+            series = f'B{uuid.uuid4().hex[:6].upper()}'
+            try:
+                numbers, seconds = self._run(series, options['threads'], options['allocations'], block)
+            finally:
+                NumberRange.objects.filter(series=series).delete()
+
+            expected = options['threads'] * options['allocations'] * block
+            duplicates = len(numbers) - len(set(numbers))
+            gapless = sorted(numbers) == list(range(1, expected + 1))
+            self.stdout.write(
+                f"{label:<16} {len(numbers):>9,} Nummern in {seconds:6.2f} s "
+                f"= {len(numbers) / seconds:>10,.0f} Nummern/s "
+                f"({options['threads'] * options['allocations'] / seconds:,.0f} Vergaben/s)"
+            )
+            if duplicates or not gapless:
+                failed = True
+                self.stderr.write(f"  {duplicates} Duplikate, lückenlos: {'ja' if gapless else 'nein'}")
+
+        if failed:
+            raise CommandError("Nummernvergabe fehlerhaft: Duplikate oder Lücken!")
+        self.stdout.write(self.style.SUCCESS("Keine Duplikate, Nummernfolgen lückenlos."))
+
+    def _run(self, series: str, threads: int, allocations: int, block: int):
+        """Vergibt parallel Nummern; liefert die laufenden Nummern aller Worker und die Dauer."""
+        results: List[List[int]] = [[] for _ in range(threads)]
+        errors: List[BaseException] = []
+
+        def worker(index: int) -> None:
+            try:
+                # Audit-Kontext wie im Request (AuditMiddleware)
+                with audit.audit_scope():
+                    for _ in range(allocations):
+                        reserved = reserve_numbers(series, block)
+                        results[index].extend(range(reserved.first, reserved.last + 1))
+            except Exception as exc:
+                errors.append(exc)
+            finally:
+                connection.close()
+
+        # Nummernkreis vorab anlegen: gemessen wird die Vergabe, nicht das erste Anlegen
+        NumberRange.objects.create(series=series, year=time.localtime().tm_year)
+        workers = [threading.Thread(target=worker, args=(index,)) for index in range(threads)]
+        started = time.perf_counter()
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        seconds = time.perf_counter() - started
+        if errors:
+            raise CommandError(f"{len(errors)} Worker abgebrochen: {errors[0]!r}")
+        return [number for numbers in results for number in numbers], seconds
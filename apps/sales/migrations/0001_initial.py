@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:41
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Customer',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('customer_number', models.CharField(help_text='Kundennummer, z.B. das DATEV-Debitorenkonto 10000.', max_length=20, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('customer_type', models.CharField(choices=[('b2b', 'Unternehmen'), ('b2c', 'Privatperson')], default='b2b', max_length=3)),
+                ('email', models.EmailField(blank=True, max_length=254)),
+                ('vat_id', models.CharField(blank=True, help_text='USt-IdNr. (normalisiert).', max_length=20)),
+                ('iban', models.CharField(blank=True, max_length=34)),
+                ('street', models.CharField(blank=True, max_length=255)),
+                ('postal_code', models.CharField(blank=True, max_length=10)),
+                ('city', models.CharField(blank=True, max_length=100)),
+                ('country', models.CharField(default='DE', help_text='ISO-3166-Ländercode.', max_length=2)),
+            ],
+            options={
+                'verbose_name': 'Kunde',
+                'verbose_name_plural': 'Kunden',
+                'ordering': ['customer_number'],
+            },
+        ),
+    ]
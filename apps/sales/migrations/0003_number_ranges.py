@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-17 11:02
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sales', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NumberRange',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('series', models.CharField(help_text="Kürzel der Serie, z.B. 'RE' (Rechnung) oder 'GS' (Gutschrift).", max_length=10)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('next_number', models.PositiveBigIntegerField(default=1, help_text='Nächste freie laufende Nummer.')),
+                ('width', models.PositiveSmallIntegerField(default=5, help_text='Stellen der laufenden Nummer (führende Nullen).')),
+            ],
+            options={
+                'verbose_name': 'Nummernkreis',
+                'verbose_name_plural': 'Nummernkreise',
+                'ordering': ['series', 'year'],
+                'constraints': [models.UniqueConstraint(fields=('series', 'year'), name='sales_numberrange_series_year')],
+            },
+        ),
+        migrations.CreateModel(
+            name='VoidedNumber',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('number', models.PositiveBigIntegerField(help_text='Laufende Nummer im Nummernkreis.')),
+                ('document_number', models.CharField(help_text="Formatierte Nummer, z.B. 'RE-2026-00042'.", max_length=40)),
+                ('reason', models.CharField(max_length=255)),
+                ('number_range', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='voided_numbers', to='sales.numberrange')),
+            ],
+            options={
+                'verbose_name': 'Entfallene Nummer',
+                'verbose_name_plural': 'Entfallene Nummern',
+                'ordering': ['number_range', 'number'],
+                'constraints': [models.UniqueConstraint(fields=('number_range', 'number'), name='sales_voidednumber_unique')],
+            },
+        ),
+    ]
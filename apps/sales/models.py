@@ -1,3 +1,99 @@
+"""
+Models für die Sales App.
+
+Kunden (Debitoren) werden einzeln über das Admin/die Services oder in
+großen Mengen über `apps.sales.services.import_customers` angelegt.
+Rechnungsnummern vergeben ausschließlich die Nummernkreis-Services
+(`apps.sales.services.reserve_numbers`).
+"""
+
 from django.db import models
 
-# Create your models here.
+from core.models import AppendOnlyModel, BaseModel
+
+
+class Customer(BaseModel):
+    """Kunde (Debitor) mit Stamm- und Bankdaten."""
+
+    class CustomerType(models.TextChoices):
+        B2B = 'b2b', 'Unternehmen'
+        B2C = 'b2c', 'Privatperson'
+
+    customer_number = models.CharField(
+        max_length=20, unique=True, help_text="Kundennummer, z.B. das DATEV-Debitorenkonto 10000.",
+    )
+    name = models.CharField(max_length=255)
+    customer_type = models.CharField(max_length=3, choices=CustomerType.choices, default=CustomerType.B2B)
+    email = models.EmailField(blank=True)
+    vat_id = models.CharField(max_length=20, blank=True, help_text="USt-IdNr. (normalisiert).")
+    iban = models.CharField(max_length=34, blank=True)
+    street = models.CharField(max_length=255, blank=True)
+    postal_code = models.CharField(max_length=10, blank=True)
+    city = models.CharField(max_length=100, blank=True)
+    country = models.CharField(max_length=2, default='DE', help_text="ISO-3166-Ländercode.")
+
+    class Meta:
+        verbose_name = "Kunde"
+        verbose_name_plural = "Kunden"
+        ordering = ['customer_number']
+        indexes = [
+            # Seitenweises Blättern der Kundenliste (core.listing)
+            models.Index(fields=['created_at', 'id'], name='sales_customer_keyset'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.customer_number} {self.name}"
+
+
+class NumberRange(BaseModel):
+    """
+    Nummernkreis je Serie und Jahr, z.B. Rechnungen 'RE-2026-00001' (§ 14 Abs. 4 Nr. 4 UStG).
+
+    `next_number` wird nur per atomarem UPDATE weitergezählt
+    (`apps.sales.services.reserve_numbers`), nie gelesen und zurückgeschrieben.
+    """
+
+    series = models.CharField(max_length=10, help_text="Kürzel der Serie, z.B. 'RE' (Rechnung) oder 'GS' (Gutschrift).")
+    year = models.PositiveSmallIntegerField()
+    next_number = models.PositiveBigIntegerField(default=1, help_text="Nächste freie laufende Nummer.")
+    width = models.PositiveSmallIntegerField(default=5, help_text="Stellen der laufenden Nummer (führende Nullen).")
+
+    class Meta:
+        verbose_name = "Nummernkreis"
+        verbose_name_plural = "Nummernkreise"
+        ordering = ['series', 'year']
+        constraints = [
+            models.UniqueConstraint(fields=['series', 'year'], name='sales_numberrange_series_year'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.series}-{self.year}"
+
+    def format(self, number: int) -> str:
+        """Formatiert eine laufende Nummer, z.B. 42 -> 'RE-2026-00042'."""
+        return f"{self.series}-{self.year}-{number:0{self.width}d}"
+
+
+class VoidedNumber(AppendOnlyModel):
+    """
+    Vergebene, aber nicht verwendete Nummer eines Nummernkreises.
+
+    Statt einer Lücke in der Nummernfolge wird dokumentiert, warum die Nummer
+    entfallen ist (z.B. abgebrochener Rechnungslauf). Unveränderbar (GoBD).
+    """
+
+    number_range = models.ForeignKey(NumberRange, on_delete=models.PROTECT, related_name='voided_numbers')
+    number = models.PositiveBigIntegerField(help_text="Laufende Nummer im Nummernkreis.")
+    document_number = models.CharField(max_length=40, help_text="Formatierte Nummer, z.B. 'RE-2026-00042'.")
+    reason = models.CharField(max_length=255)
+
+    class Meta:
+        verbose_name = "Entfallene Nummer"
+        verbose_name_plural = "Entfallene Nummern"
+        ordering = ['number_range', 'number']
+        constraints = [
+            models.UniqueConstraint(fields=['number_range', 'number'], name='sales_voidednumber_unique'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.document_number} (entfallen)"
@@ -0,0 +1,21 @@
+"""
+Testdaten-Factories der Sales-App (factory_boy).
+"""
+
+import factory
+
+from apps.sales.models import Customer
+
+
+class CustomerFactory(factory.django.DjangoModelFactory):
+    """Geschäftskunde im Inland."""
+
+    class Meta:
+        model = Customer
+
+    customer_number = factory.Sequence(lambda n: str(10000 + n))
+    name = factory.Faker('company', locale='de_DE')
+    customer_type = Customer.CustomerType.B2B
+    email = factory.Faker('company_email', locale='de_DE')
+    city = factory.Faker('city', locale='de_DE')
+    country = 'DE'
@@ -0,0 +1,133 @@
+"""
+Tests des Kundenimports: Spaltenzuordnung, DATEV, Abgleich mit dem Bestand, Fehler je Zeile.
+"""
+
+import pytest
+
+from apps.sales.models import Customer
+from apps.sales.services import CustomerImporter
+from apps.sales.tests.factories import CustomerFactory
+from core import imports
+from core.imports import import_file, read_rows, run_import
+from core.models import AuditLog
+
+pytestmark = pytest.mark.django_db
+
+
+def write_csv(path, lines, encoding='utf-8'):
+    path.write_text('\n'.join(lines) + '\n', encoding=encoding)
+    return path
+
+
+def errors(report):
+    return [(error.line, error.field) for error in report.errors]
+
+
+def test_header_maps_aliases_case_insensitive():
+    header = ['Kundennummer', ' Firma ', 'E-Mail', 'UST-IDNR', 'Bemerkung']
+
+    assert CustomerImporter().map_header(header) == ['customer_number', 'name', 'email', 'vat_id', None]
+
+
+def test_datev_file_skips_metadata_and_combines_name_and_vat_id(tmp_path):
+    path = write_csv(tmp_path / 'debitoren.csv', [
+        '"EXTF";700;16;"Debitoren/Kreditoren";5',
+        'Konto;Name (Adressattyp Unternehmen);Vorname (Adressattyp natürl. Person);'
+        'Name (Adressattyp natürl. Person);Adressattyp;EU-Land;EU-UStID;Ort',
+        '10001;;Jürgen;Weiß;1;;;Köln',
+        '10002;Rhein GmbH;;;2;DE;136695976;Düsseldorf',
+        '10003;;;;2;;;Bonn',
+    ], encoding='cp1252')
+
+    rows = list(read_rows(path, CustomerImporter()))
+    report = run_import(CustomerImporter(), rows, workers=1)
+
+    assert [line for line, _ in rows] == [3, 4, 5]
+    assert (report.created, report.failed) == (2, 1)
+    assert errors(report) == [(5, 'name')]
+    person, company = Customer.objects.order_by('customer_number')
+    assert (person.name, person.customer_type, person.city) == ('Jürgen Weiß', 'b2c', 'Köln')
+    assert (company.name, company.customer_type, company.vat_id) == ('Rhein GmbH', 'b2b', 'DE136695976')
+
+
+def test_existing_customers_are_updated_or_left_unchanged(tmp_path):
+    unchanged = CustomerFactory(customer_number='10001', name='Alt GmbH', city='Berlin', email='info@alt.de')
+    changed = CustomerFactory(customer_number='10002', name='Neu AG', city='Kiel', email='kontakt@neu.de')
+    path = write_csv(tmp_path / 'kunden.csv', [
+        'Kundennummer;Firma;Ort;E-Mail',
+        '10001;Alt GmbH;Berlin;info@alt.de',
+        '10002;Neu AG;Hamburg;kontakt@NEU.de',
+        '10003;Dritte KG;München;',
+    ])
+    updated_at = unchanged.updated_at
+
+    report = import_file(CustomerImporter(), path, workers=1)
+
+    assert (report.read, report.created, report.updated, report.unchanged, report.failed) == (3, 1, 1, 1, 0)
+    unchanged.refresh_from_db()
+    changed.refresh_from_db()
+    assert unchanged.updated_at == updated_at
+    assert (changed.city, changed.email) == ('Hamburg', 'kontakt@neu.de')
+    created = Customer.objects.get(customer_number='10003')
+    actions = AuditLog.objects.filter(model_name='sales.Customer', object_id__in=[str(changed.pk), str(created.pk)])
+    assert sorted(actions.values_list('action', flat=True)) == sorted([
+        AuditLog.Action.CREATE, AuditLog.Action.CREATE, AuditLog.Action.UPDATE,
+    ])
+
+
+def test_partial_file_only_updates_its_columns(tmp_path):
+    customer = CustomerFactory(customer_number='10001', name='Alt GmbH', city='Berlin', email='info@alt.de')
+    # Pflichtfelder (Name) gehören in jede Datei, E-Mail fehlt
+    path = write_csv(tmp_path / 'orte.csv', ['Kundennummer;Firma;Ort', '10001;Alt GmbH;Potsdam'])
+
+    report = import_file(CustomerImporter(), path, workers=1)
+
+    customer.refresh_from_db()
+    assert report.updated == 1
+    assert (customer.name, customer.city, customer.email) == ('Alt GmbH', 'Potsdam', 'info@alt.de')
+
+
+def test_invalid_rows_and_duplicate_keys_are_reported_per_line(tmp_path):
+    path = write_csv(tmp_path / 'kunden.csv', [
+        'Kundennummer;Firma;E-Mail;USt-IdNr',
+        '10001;Erste GmbH;;DE136695976',
+        '10001;Zweite GmbH;;',
+        ';Ohne Nummer;;',
+        '10003;Falsch GmbH;keine-mail;DE123',
+    ])
+    error_file = tmp_path / 'fehler.csv'
+
+    report = import_file(CustomerImporter(), path, workers=1, error_file=error_file)
+
+    assert (report.read, report.created, report.failed) == (4, 1, 3)
+    assert errors(report) == [(3, 'customer_number'), (4, 'customer_number'), (5, 'email'), (5, 'vat_id')]
+    assert Customer.objects.get().vat_id == 'DE136695976'
+    assert error_file.read_text(encoding='utf-8').splitlines()[1:] == [
+        '3;customer_number;Schlüssel ist in der Datei doppelt.',
+        '4;customer_number;Kundennummer fehlt.',
+        '5;email;Ungültige E-Mail-Adresse: keine-mail',
+        '5;vat_id;Ungültige USt-IdNr.: DE123',
+    ]
+
+
+def test_dry_run_counts_without_writing(tmp_path):
+    path = write_csv(tmp_path / 'kunden.csv', ['Kundennummer;Firma', '10001;Erste GmbH'])
+
+    report = import_file(CustomerImporter(), path, workers=1, dry_run=True)
+
+    assert (report.created, report.dry_run) == (1, True)
+    assert not Customer.objects.exists()
+
+
+def test_chunks_are_validated_in_worker_processes(tmp_path, monkeypatch):
+    monkeypatch.setattr(imports, 'CHUNK_SIZE', 2)
+    path = write_csv(tmp_path / 'kunden.csv', ['Kundennummer;Firma'] + [f'{10000 + n};Firma {n}' for n in range(5)])
+    progress = []
+
+    report = import_file(CustomerImporter(), path, workers=2, progress=lambda report: progress.append(report.read))
+
+    assert report.created == 5
+    assert progress == [2, 4, 5]
+    assert list(Customer.objects.order_by('customer_number').values_list('name', flat=True)) == [
+        f'Firma {n}' for n in range(5)
+    ]
@@ -0,0 +1,137 @@
+"""
+Tests der PDF-Erzeugung: Fingerabdruck, Überspringen unveränderter Rechnungen, Prozess-Pool.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.core.files.storage import default_storage
+
+from apps.sales import documents
+from apps.sales.documents import RENDER_CHUNK_SIZE, document_name, render_invoice_pdf, render_invoice_pdfs
+from apps.sales.services import calculate_invoice_batch
+from core.adapters.pdf import get_pdf_renderer
+
+TEXT_RENDERER = 'core.adapters.pdf.TextPdfRenderer'
+
+
+@pytest.fixture(autouse=True)
+def pdf_settings(settings, monkeypatch, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path / 'media')
+    settings.PDF_RENDERER = TEXT_RENDERER
+    settings.PDF_RENDERER_OPTIONS = {}
+    # Worker-Prozesse laden die Einstellungen neu aus der Umgebung
+    monkeypatch.setenv('MEDIA_ROOT', settings.MEDIA_ROOT)
+    monkeypatch.setenv('PDF_RENDERER', TEXT_RENDERER)
+    documents._invoice_template.cache_clear()
+    get_pdf_renderer.cache_clear()
+    yield
+    documents._invoice_template.cache_clear()
+    get_pdf_renderer.cache_clear()
+
+
+def invoices(count: int) -> list:
+    return calculate_invoice_batch([
+        {
+            'id': number,
+            'number': f'RE-{number:05d}',
+            'recipient': {'name': f'Kunde {number}'},
+            'items': [{'description': 'Beratung', 'quantity': Decimal('2'), 'unit_price': Decimal('95.00'),
+                       'vat_rate': Decimal('19')}],
+        }
+        for number in range(count)
+    ])
+
+
+def fingerprint() -> str:
+    documents._invoice_template.cache_clear()
+    return documents._invoice_template()[1]
+
+
+def use_templates(settings, directory, files: dict) -> None:
+    for name, source in files.items():
+        path = directory / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(source, encoding='utf-8')
+    settings.TEMPLATES = [{**settings.TEMPLATES[0], 'DIRS': [directory]}]
+
+
+def test_single_invoice_is_rendered_once():
+    invoice = invoices(1)[0]
+
+    first = render_invoice_pdf(invoice)
+    second = render_invoice_pdf(invoice)
+
+    assert (first.rendered, second.rendered) == (True, False)
+    assert first.name == second.name
+    with default_storage.open(first.name) as file:
+        assert file.read().startswith(b'%PDF-1.4')
+
+
+def test_run_skips_identical_and_existing_invoices():
+    batch = invoices(3)
+    render_invoice_pdf(batch[0])
+
+    results = render_invoice_pdfs(batch + [batch[1]], workers=1)
+
+    assert [result.rendered for result in results] == [False, True, True, False]
+    assert results[1].name == results[3].name
+    assert not any(result.rendered for result in render_invoice_pdfs(batch, workers=1))
+
+
+def test_changed_invoice_gets_new_name():
+    invoice = invoices(1)[0]
+    changed = {**invoice, 'total': invoice['total'] + 1}
+
+    assert document_name(changed) != document_name(invoice)
+
+
+def test_pool_renders_all_chunks_and_reports_progress():
+    batch = invoices(RENDER_CHUNK_SIZE + 5)
+    progress = []
+
+    results = render_invoice_pdfs(batch, workers=2, progress=lambda done, total: progress.append((done, total)))
+
+    assert all(result.rendered for result in results)
+    assert all(default_storage.exists(result.name) for result in results)
+    assert progress[0] == (0, len(batch))
+    assert progress[-1] == (len(batch), len(batch))
+    assert len(progress) == 3
+    assert not any(result.rendered for result in render_invoice_pdfs(batch, workers=2))
+
+
+def test_fingerprint_covers_extended_and_included_templates(settings, tmp_path):
+    invoice = '{% extends "pdf/base.html" %}{% block body %}{% include "pdf/footer.html" %}{% endblock %}'
+    use_templates(settings, tmp_path / 'a', {
+        'sales/documents/invoice.html': invoice,
+        'pdf/base.html': '<html>{% block body %}{% endblock %}</html>',
+        'pdf/footer.html': 'Bankverbindung A',
+    })
+    original = fingerprint()
+
+    use_templates(settings, tmp_path / 'b', {
+        'sales/documents/invoice.html': invoice,
+        'pdf/base.html': '<html>{% block body %}{% endblock %}</html>',
+        'pdf/footer.html': 'Bankverbindung B',
+    })
+    changed_include = fingerprint()
+
+    use_templates(settings, tmp_path / 'c', {
+        'sales/documents/invoice.html': invoice,
+        'pdf/base.html': '<html lang="de">{% block body %}{% endblock %}</html>',
+        'pdf/footer.html': 'Bankverbindung A',
+    })
+    changed_base = fingerprint()
+
+    assert len({original, changed_include, changed_base}) == 3
+
+
+def test_fingerprint_covers_stylesheet_contents(settings, tmp_path):
+    stylesheet = tmp_path / 'invoice.css'
+    stylesheet.write_text('body { font-size: 10pt; }')
+    settings.PDF_RENDERER_OPTIONS = {'stylesheets': [str(stylesheet)]}
+    original = fingerprint()
+
+    stylesheet.write_text('body { font-size: 11pt; }')
+
+    assert fingerprint() != original
@@ -0,0 +1,87 @@
+"""
+Tests der Rechnungsberechnung: Batch-Engine centgenau gleich der Decimal-Referenz.
+"""
+
+import copy
+import random
+from decimal import Decimal
+
+import pytest
+
+from apps.sales.services import calculate_invoice_batch, calculate_invoice_totals
+
+
+def item(quantity: str, unit_price: str, vat_rate: str = '19') -> dict:
+    return {'description': 'Position', 'quantity': Decimal(quantity), 'unit_price': Decimal(unit_price),
+            'vat_rate': Decimal(vat_rate)}
+
+
+def random_drafts(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    catalog = [Decimal(rng.randint(-5_000, 500_000)).scaleb(-2) for _ in range(50)]
+    quantities = ['1', '3', '0.5', '1.125', '0.333', '12', '-1', '-0.005']
+    drafts = []
+    for number in range(count):
+        items = [
+            {
+                'description': f'Position {line}',
+                'quantity': Decimal(rng.choice(quantities)),
+                'unit_price': rng.choice(catalog),
+                **({'vat_rate': Decimal(rng.choice(['19', '7', '0', '5.5']))} if rng.random() < 0.8 else {}),
+            }
+            for line in range(rng.randint(1, 12))
+        ]
+        drafts.append({'id': number, 'items': items, 'vat_rate': rng.choice([19, 7])})
+    return drafts
+
+
+def test_batch_matches_decimal_path_to_the_cent():
+    drafts = random_drafts(2_000)
+    expected = [calculate_invoice_totals(draft) for draft in drafts]
+
+    assert calculate_invoice_batch(copy.deepcopy(drafts)) == expected
+
+
+@pytest.mark.parametrize('items, subtotal, vat_amount', [
+    # Positionen kaufmännisch gerundet: 0,333 × 0,15 = 0,04995 -> 0,05
+    ([item('0.333', '0.15')], '0.05', '0.01'),
+    # USt je Steuersatz auf die Gruppensumme, nicht je Position: 3 × 0,02 × 19 % = 0,0114 -> 0,01
+    ([item('1', '0.02'), item('1', '0.02'), item('1', '0.02')], '0.06', '0.01'),
+    # Symmetrisch um 0 (Gutschriften): -0,005 -> -0,01
+    ([item('-0.005', '1.00')], '-0.01', '0.00'),
+    ([item('1', '10.00'), item('2', '5.00', '7')], '20.00', '2.60'),
+])
+def test_rounding(items, subtotal, vat_amount):
+    draft = {'id': 1, 'items': items}
+
+    result, = calculate_invoice_batch([copy.deepcopy(draft)])
+
+    assert result == calculate_invoice_totals(draft)
+    assert (result['subtotal'], result['vat_amount']) == (Decimal(subtotal), Decimal(vat_amount))
+
+
+def test_vat_groups_are_sorted_by_rate():
+    result, = calculate_invoice_batch([{'id': 1, 'items': [item('1', '10.00'), item('1', '1.00', '7')]}])
+
+    assert [(group['vat_rate'], group['net'], group['vat_amount']) for group in result['vat_groups']] == [
+        (Decimal('7'), Decimal('1.00'), Decimal('0.07')),
+        (Decimal('19'), Decimal('10.00'), Decimal('1.90')),
+    ]
+    assert result['total'] == Decimal('12.97')
+
+
+def test_batch_extends_drafts_in_place():
+    drafts = [{'id': 1, 'items': [item('2', '1.50')]}]
+
+    assert calculate_invoice_batch(drafts) is drafts
+    assert drafts[0]['items'][0]['total'] == Decimal('3.00')
+    assert drafts[0]['total'] == Decimal('3.57')
+
+
+@pytest.mark.parametrize('field, value', [('quantity', '0.0001'), ('unit_price', '0.001'), ('vat_rate', '19.001')])
+def test_values_beyond_fixed_point_precision_are_rejected(field, value):
+    line = item('1', '1.00')
+    line[field] = Decimal(value)
+
+    with pytest.raises(ValueError, match=field):
+        calculate_invoice_batch([{'id': 1, 'items': [line]}])
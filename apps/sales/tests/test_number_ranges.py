@@ -0,0 +1,137 @@
+"""
+Tests der Nummernkreise: eindeutige, lückenlos dokumentierte Belegnummern.
+"""
+
+import pytest
+from django.db import IntegrityError, transaction
+
+from apps.sales.models import NumberRange, VoidedNumber
+from apps.sales.services import (
+    ABANDONED_BLOCK_REASON,
+    next_invoice_number,
+    preview_number,
+    reserve_numbers,
+    void_numbers,
+)
+from core.models import AuditLog
+
+pytestmark = pytest.mark.django_db
+
+
+def test_blocks_are_consecutive_and_unique():
+    first = reserve_numbers('RE', 3, 2026)
+    second = reserve_numbers('RE', 2, 2026)
+    single = next_invoice_number(2026)
+
+    numbers = [*first, *second, single]
+    assert numbers == [f'RE-2026-{number:05d}' for number in range(1, 7)]
+    assert preview_number('RE', 2026) == 'RE-2026-00007'
+
+
+def test_series_and_years_are_independent():
+    assert next_invoice_number(2026) == 'RE-2026-00001'
+    assert next_invoice_number(2027) == 'RE-2027-00001'
+    assert list(reserve_numbers('GS', 1, 2026)) == ['GS-2026-00001']
+    assert NumberRange.objects.get(series='RE', year=2026).next_number == 2
+
+
+@pytest.mark.parametrize('series, count', [('re', 1), ('RE-1', 1), ('RE', 0)])
+def test_invalid_reservations_are_rejected(series, count):
+    with pytest.raises(ValueError):
+        reserve_numbers(series, count, 2026)
+    assert not NumberRange.objects.exists()
+
+
+def test_block_take_stops_at_end():
+    block = reserve_numbers('RE', 2, 2026)
+
+    assert [block.take(), block.take()] == ['RE-2026-00001', 'RE-2026-00002']
+    assert block.remaining() == []
+    with pytest.raises(ValueError, match='aufgebraucht'):
+        block.take()
+
+
+def test_void_numbers_documents_unused_numbers():
+    reserve_numbers('RE', 3, 2026)
+
+    voided = void_numbers(['RE-2026-00002', 'RE-2026-00003'], 'Rechnungslauf abgebrochen')
+
+    assert [item.document_number for item in voided] == ['RE-2026-00002', 'RE-2026-00003']
+    assert VoidedNumber.objects.filter(reason='Rechnungslauf abgebrochen').count() == 2
+
+
+@pytest.mark.parametrize('numbers, reason, message', [
+    (['RE-2026-00001'], '  ', 'Begründung'),
+    (['RE-2026-00004'], 'Test', 'Nicht vergebene'),
+    (['RE-2026-00001', 'RE-2025-00001'], 'Test', 'Nicht vergebene'),
+    (['RE/2026/00001'], 'Test', 'Ungültige'),
+])
+def test_void_numbers_rejects_invalid_input(numbers, reason, message):
+    reserve_numbers('RE', 3, 2026)
+
+    with pytest.raises(ValueError, match=message):
+        void_numbers(numbers, reason)
+    assert not VoidedNumber.objects.exists()
+
+
+def test_number_cannot_be_voided_twice():
+    reserve_numbers('RE', 2, 2026)
+    void_numbers(['RE-2026-00001'], 'Storniert')
+
+    with pytest.raises(ValueError, match='Bereits entfallen: RE-2026-00001'):
+        void_numbers(['RE-2026-00001', 'RE-2026-00002'], 'Storniert')
+    assert VoidedNumber.objects.count() == 1
+
+
+def test_block_context_voids_untaken_numbers():
+    with reserve_numbers('RE', 4, 2026) as block:
+        taken = [block.take(), block.take()]
+
+    assert taken == ['RE-2026-00001', 'RE-2026-00002']
+    assert list(VoidedNumber.objects.order_by('number').values_list('document_number', 'reason')) == [
+        ('RE-2026-00003', ABANDONED_BLOCK_REASON),
+        ('RE-2026-00004', ABANDONED_BLOCK_REASON),
+    ]
+
+
+def test_block_context_voids_rest_on_exception():
+    with pytest.raises(RuntimeError):
+        with reserve_numbers('RE', 3, 2026) as block:
+            block.take()
+            raise RuntimeError('Druck fehlgeschlagen')
+
+    reasons = set(VoidedNumber.objects.values_list('reason', flat=True))
+    assert reasons == {f'{ABANDONED_BLOCK_REASON} (Abbruch: RuntimeError)'}
+    assert VoidedNumber.objects.count() == 2
+
+
+def test_block_context_keeps_exception_of_broken_transaction():
+    with pytest.raises(IntegrityError):
+        with transaction.atomic():
+            with reserve_numbers('RE', 3, 2026) as block:
+                block.take()
+                NumberRange.objects.create(series='RE', year=2026)
+
+    # Reservierung und Entwertung fallen mit der Transaktion weg
+    assert not VoidedNumber.objects.exists()
+    assert not NumberRange.objects.exists()
+
+
+def test_fully_used_block_voids_nothing():
+    with reserve_numbers('RE', 2, 2026) as block:
+        list(block)
+
+    assert not VoidedNumber.objects.exists()
+
+
+def test_reservation_is_audited():
+    reserve_numbers('RE', 5, 2026)
+    reserve_numbers('RE', 2, 2026)
+
+    reservations = AuditLog.objects.filter(
+        model_name='sales.NumberRange', action=AuditLog.Action.UPDATE,
+    ).order_by('sequence')
+    assert [entry.changes['reserved'] for entry in reservations] == [
+        ['RE-2026-00001', 'RE-2026-00005'],
+        ['RE-2026-00006', 'RE-2026-00007'],
+    ]
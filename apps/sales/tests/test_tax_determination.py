@@ -0,0 +1,79 @@
+"""
+Tests der Steuerfindung für Rechnungsentwürfe (Kundenstatus aus der USt-IdNr.-Prüfung).
+"""
+
+from decimal import Decimal
+
+import pytest
+
+from apps.finance.services import invalidate_tax_table
+from apps.finance.tests.factories import VatIdCheckFactory
+from apps.sales.services import apply_tax_determination
+
+pytestmark = pytest.mark.django_db
+
+IGL_NOTE = 'Steuerfreie innergemeinschaftliche Lieferung (§ 4 Nr. 1b UStG)'
+
+
+@pytest.fixture(autouse=True)
+def fresh_tax_table():
+    invalidate_tax_table()
+
+
+def draft(country: str, buyer_type: str = 'b2b', vat_id: str = '') -> dict:
+    return {
+        'recipient': {'country': country, 'type': buyer_type, 'vat_id': vat_id},
+        'items': [{'tax_class': 'goods_standard'}],
+    }
+
+
+def test_valid_vat_id_gives_intra_community_supply():
+    VatIdCheckFactory(vat_id='FR40303265045', is_valid=True)
+
+    result, = apply_tax_determination([draft('FR', vat_id='FR 40 303 265 045')])
+
+    assert result['vat_id_status'] == 'valid'
+    assert result['items'][0]['vat_rate'] == Decimal('0.00')
+    assert result['tax_notes'] == [IGL_NOTE]
+
+
+def test_unverified_vat_id_is_billed_with_domestic_vat():
+    result, = apply_tax_determination([draft('FR', vat_id='FR40303265045')])
+
+    assert result['vat_id_status'] == 'unverified'
+    assert result['items'][0]['vat_rate'] == Decimal('19.00')
+    assert result['tax_notes'] == []
+
+
+@pytest.mark.parametrize('vat_id', ['', 'FR41303265045'])
+def test_missing_or_implausible_vat_id_is_invalid(vat_id):
+    result, = apply_tax_determination([draft('FR', vat_id=vat_id)])
+
+    assert result['vat_id_status'] == 'invalid'
+    assert result['items'][0]['vat_rate'] == Decimal('19.00')
+
+
+def test_rejected_vat_id_is_invalid():
+    VatIdCheckFactory(vat_id='FR40303265045', is_valid=False)
+
+    result, = apply_tax_determination([draft('FR', vat_id='FR40303265045')])
+
+    assert result['vat_id_status'] == 'invalid'
+    assert result['items'][0]['vat_rate'] == Decimal('19.00')
+
+
+@pytest.mark.parametrize('country, buyer_type', [('DE', 'b2b'), ('FR', 'b2c'), ('CH', 'b2b')])
+def test_vat_id_only_matters_for_eu_business_customers(country, buyer_type):
+    result, = apply_tax_determination([draft(country, buyer_type)])
+
+    assert 'vat_id_status' not in result
+
+
+def test_batch_stays_within_query_budget(django_assert_max_num_queries):
+    VatIdCheckFactory(vat_id='FR40303265045', is_valid=True)
+    drafts = [draft('FR', vat_id='FR40303265045'), draft('AT', vat_id='ATU13585627'), draft('DE')] * 200
+
+    with django_assert_max_num_queries(2):
+        apply_tax_determination(drafts)
+
+    assert {d['vat_id_status'] for d in drafts if d['recipient']['country'] != 'DE'} == {'valid', 'unverified'}
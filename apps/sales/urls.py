@@ -0,0 +1,12 @@
+"""
+URL-Konfiguration für die Sales App.
+"""
+
+from django.urls import path
+from apps.sales import views
+
+app_name = 'sales'
+
+urlpatterns = [
+    path('', views.customer_list, name='customer_list'),
+]
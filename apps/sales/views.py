@@ -5,9 +5,42 @@ WICHTIG: Diese Views enthalten KEINE Geschäftslogik.
 Alle Logik muss in services.py implementiert werden.
 """
 
+from django.contrib.auth.decorators import login_required, permission_required
 from django.shortcuts import render
 from django.utils import timezone
+from django.views.decorators.http import require_GET
+
+from apps.sales.models import Customer
 from apps.sales.services import simulate_invoice_draft
+from core.listing import Column, KeysetList
+
+
+CUSTOMER_LIST = KeysetList(
+    title='Kunden',
+    subtitle='Debitoren, zuletzt angelegte zuerst',
+    queryset=Customer.objects.all,
+    columns=(
+        Column('customer_number', 'Kundennummer'),
+        Column('name', 'Name'),
+        Column('postal_code', 'PLZ'),
+        Column('city', 'Ort'),
+        Column('vat_id', 'USt-IdNr.'),
+        Column('created_at', 'Angelegt', 'date'),
+    ),
+)
+
+
+@login_required
+@permission_required('sales.view_customer', raise_exception=True)
+@require_GET
+def customer_list(request):
+    """
+    Kundenliste mit Keyset-Pagination (Infinite Scroll über HTMX).
+
+    Returns:
+        HttpResponse: Seite, Tabelle oder Folgezeilen (siehe `core.listing.KeysetList.render`)
+    """
+    return CUSTOMER_LIST.render(request)
 
 
 def chat_invoice_preview(request):
@@ -15,7 +48,7 @@ def chat_invoice_preview(request):
     Erstellt eine Chat-Nachricht mit Invoice-Preview.
     
     Wird vom AI-Chat aufgerufen, wenn der User eine Rechnung erstellen möchte.
-    Nutzt InMemory-Dummy-Daten (kein DB-Zugriff).
+    Nutzt InMemory-Dummy-Daten (nur die Rechnungsnummer wird gelesen).
     
     Returns:
         HttpResponse: Gerendertes HTML-Partial für den Chat
@@ -4,3 +4,41 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.users'
+
+    def ready(self) -> None:
+        # Gecachte Berechtigungen bei Änderungen an Rollen und Rechten verwerfen
+        from django.contrib.auth import get_user_model
+        from django.contrib.auth.models import Group, Permission
+        from django.db import transaction
+        from django.db.models.signals import m2m_changed, post_delete
+
+        from apps.users.services import invalidate_permissions
+
+        User = get_user_model()
+
+        def user_relation_changed(instance, action, reverse, pk_set, **kwargs) -> None:
+            # Rollen oder Einzelrechte eines Benutzers (bzw. Benutzer einer Gruppe) geändert
+            if action not in ('post_add', 'post_remove', 'post_clear'):
+                return
+            if not reverse:
+                user_ids = [instance.pk]
+            elif action == 'post_clear':
+                user_ids = None  # Betroffene Benutzer sind nach dem Leeren nicht mehr bekannt
+            else:
+                user_ids = list(pk_set)
+            transaction.on_commit(lambda: invalidate_permissions(user_ids))
+
+        def group_permissions_changed(action, **kwargs) -> None:
+            if action in ('post_add', 'post_remove', 'post_clear'):
+                transaction.on_commit(invalidate_permissions)
+
+        def deleted(**kwargs) -> None:
+            transaction.on_commit(invalidate_permissions)
+
+        for through in (User.groups.through, User.user_permissions.through):
+            m2m_changed.connect(user_relation_changed, sender=through, weak=False,
+                                dispatch_uid=f'permission_cache_{through.__name__}')
+        m2m_changed.connect(group_permissions_changed, sender=Group.permissions.through, weak=False,
+                            dispatch_uid='permission_cache_group_permissions')
+        for model in (Group, Permission):
+            post_delete.connect(deleted, sender=model, weak=False, dispatch_uid=f'permission_cache_delete_{model.__name__}')
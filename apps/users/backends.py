@@ -0,0 +1,22 @@
+"""
+Authentifizierungs-Backends der Users App.
+
+`CachedPermissionBackend` ersetzt Djangos `ModelBackend`: Die Berechtigungen
+eines Benutzers werden nicht je Request aus den Auth-Tabellen geladen,
+sondern aus dem Cache (`apps.users.services.get_permission_set`).
+"""
+
+from django.contrib.auth.backends import ModelBackend
+
+from apps.users.services import get_permission_set
+
+
+class CachedPermissionBackend(ModelBackend):
+    """ModelBackend mit Berechtigungs-Cache über Requests hinweg (Anmeldung unverändert)."""
+
+    def get_all_permissions(self, user_obj, obj=None):
+        if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
+            return set()
+        if not hasattr(user_obj, '_perm_cache'):
+            user_obj._perm_cache = get_permission_set(user_obj)
+        return user_obj._perm_cache
@@ -5,16 +5,255 @@ Dieses Modul wird Business-Logik für Benutzerverwaltung,
 Authentifizierung und RBAC (Role-Based Access Control) enthalten.
 
 Alle Business-Logik muss hier implementiert werden, nicht in Views.
+
+- `provision_users`: legt viele Benutzer auf einmal an (Passwort-Hashing
+  parallel im Prozess-Pool, `bulk_create`, Rollen gesammelt zuweisen).
+- `get_permission_set`: Berechtigungen eines Benutzers aus dem Cache
+  (genutzt von `apps.users.backends.CachedPermissionBackend`), verworfen bei
+  Änderungen an Rollen und Gruppenrechten.
 """
 
-from typing import Optional
+import multiprocessing
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Sequence, Tuple
+
 from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db.models.functions import Lower
+
+from core import audit
+from core.models import AuditLog
+from core.utils.processes import process_pool
 
 User = get_user_model()
 
 
-# Placeholder für zukünftige Service-Funktionen
-# Beispiel:
-# def create_user_with_role(email: str, password: str, role: str) -> User:
-#     """Erstellt einen neuen Benutzer und weist ihm eine Rolle/Gruppe zu."""
-#     pass
+# Passwörter je Auftrag an einen Worker-Prozess
+HASH_CHUNK_SIZE = 50
+
+# Batchgröße für bulk_create
+BULK_BATCH_SIZE = 1000
+
+# Lebensdauer eines gecachten Berechtigungs-Sets (Sekunden)
+PERMISSION_CACHE_TIMEOUT = 60 * 60
+
+# Globale Version: erhöht bei Änderungen an Gruppenrechten (betrifft alle Benutzer)
+PERMISSIONS_VERSION_KEY = 'users:permissions:version'
+
+
+@dataclass(frozen=True)
+class UserSpec:
+    """
+    Daten eines anzulegenden Benutzers.
+
+    Ohne Passwort wird ein unbenutzbares Passwort gesetzt (kein Hashing);
+    der Benutzer vergibt es dann selbst über den Passwort-Reset.
+    """
+
+    email: str
+    password: Optional[str] = None
+    first_name: str = ''
+    last_name: str = ''
+    groups: Tuple[str, ...] = ()
+
+
+@dataclass
+class ProvisioningResult:
+    """
+    Ergebnis von `provision_users`.
+
+    Attributes:
+        created: Angelegte Benutzer
+        existing: E-Mail-Adressen, die bereits vergeben waren (übersprungen)
+        errors: Ungültige Einträge (E-Mail → Meldung)
+    """
+
+    created: List = field(default_factory=list)
+    existing: List[str] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def _hash_chunk(passwords: List[str]) -> List[str]:
+    """Hasht Passwörter (läuft im Worker-Prozess)."""
+    return [make_password(password) for password in passwords]
+
+
+def hash_passwords(passwords: Sequence[str], workers: Optional[int] = None) -> List[str]:
+    """
+    Hasht Passwörter parallel über einen Prozess-Pool.
+
+    Der konfigurierte Hasher (PBKDF2, Argon2, ...) ist bewusst teuer und
+    CPU-gebunden; Threads helfen wegen des GIL nicht, Prozesse skalieren mit
+    der Anzahl der Kerne.
+
+    Args:
+        passwords: Klartext-Passwörter
+        workers: Anzahl Prozesse (Standard: Anzahl CPUs; 1 = im aktuellen Prozess)
+
+    Returns:
+        List[str]: Hashes in Eingabereihenfolge
+    """
+    chunks = [list(passwords[start:start + HASH_CHUNK_SIZE]) for start in range(0, len(passwords), HASH_CHUNK_SIZE)]
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1 or len(chunks) <= 1:
+        return [hashed for chunk in chunks for hashed in _hash_chunk(chunk)]
+    with process_pool(min(workers, len(chunks))) as pool:
+        return [hashed for hashed_chunk in pool.map(_hash_chunk, chunks) for hashed in hashed_chunk]
+
+
+def provision_users(specs: Iterable[UserSpec], workers: Optional[int] = None) -> ProvisioningResult:
+    """
+    Legt viele Benutzer auf einmal an und weist ihnen ihre Rollen (Gruppen) zu.
+
+    Statt `create_user` je Benutzer (ein Hash und ein INSERT nacheinander)
+    werden alle Passwörter parallel gehasht, die Benutzer per `bulk_create`
+    und die Gruppenzuordnungen in einem weiteren `bulk_create` geschrieben.
+    Bereits vorhandene E-Mail-Adressen werden übersprungen.
+
+    Args:
+        specs: Anzulegende Benutzer
+        workers: Prozesse für das Passwort-Hashing (Standard: Anzahl CPUs)
+
+    Returns:
+        ProvisioningResult: Angelegte, übersprungene und ungültige Einträge
+
+    Raises:
+        ValueError: Wenn eine angegebene Rolle (Gruppe) nicht existiert
+    """
+    result = ProvisioningResult()
+    pending: Dict[str, UserSpec] = {}
+    for spec in specs:
+        email = User.objects.normalize_email(spec.email.strip())
+        try:
+            validate_email(email)
+        except ValidationError:
+            result.errors[spec.email] = "Ungültige E-Mail-Adresse."
+            continue
+        if email.lower() in pending:
+            result.errors[spec.email] = "E-Mail-Adresse ist doppelt angegeben."
+            continue
+        pending[email.lower()] = UserSpec(email, spec.password, spec.first_name, spec.last_name, tuple(spec.groups))
+
+    group_names = {name for spec in pending.values() for name in spec.groups}
+    groups = dict(Group.objects.filter(name__in=group_names).values_list('name', 'pk'))
+    missing = group_names - groups.keys()
+    if missing:
+        raise ValueError(f"Unbekannte Rollen: {', '.join(sorted(missing))}")
+
+    # Groß-/Kleinschreibung wie bei `pending` ignorieren: 'Max@Firma.de' gibt es schon als 'max@firma.de'
+    existing = set(
+        User.objects.annotate(email_lower=Lower('email'))
+        .filter(email_lower__in=list(pending))
+        .values_list('email_lower', flat=True)
+    )
+    for key in [key for key in pending if key in existing]:
+        result.existing.append(pending.pop(key).email)
+    if not pending:
+        return result
+
+    specs = list(pending.values())
+    with_password = [spec for spec in specs if spec.password]
+    hashes = dict(zip(
+        (spec.email for spec in with_password),
+        hash_passwords([spec.password for spec in with_password], workers),
+    ))
+    users = [
+        User(
+            email=spec.email,
+            first_name=spec.first_name,
+            last_name=spec.last_name,
+            password=hashes.get(spec.email) or make_password(None),
+        )
+        for spec in specs
+    ]
+
+    with audit.atomic():
+        User.objects.bulk_create(users, batch_size=BULK_BATCH_SIZE)
+        if any(user.pk is None for user in users):
+            # Datenbanken ohne RETURNING bei Masseneinfügungen
+            ids = dict(User.objects.filter(email__in=[user.email for user in users]).values_list('email', 'pk'))
+            for user in users:
+                user.pk = ids[user.email]
+        Membership = User.groups.through
+        Membership.objects.bulk_create(
+            [Membership(user_id=user.pk, group_id=groups[name]) for user, spec in zip(users, specs)
+             for name in spec.groups],
+            batch_size=BULK_BATCH_SIZE,
+        )
+        audit.record_many(users, AuditLog.Action.CREATE, changes=[
+            {'email': spec.email, 'first_name': spec.first_name, 'last_name': spec.last_name,
+             'groups': list(spec.groups)}
+            for spec in specs
+        ])
+
+    result.created = users
+    return result
+
+
+def _user_version_key(user_id) -> str:
+    return f'users:permissions:version:{user_id}'
+
+
+def get_permission_set(user) -> FrozenSet[str]:
+    """
+    Liefert alle Berechtigungen eines Benutzers ('app_label.codename'), gecacht über Requests hinweg.
+
+    Der Cache-Schlüssel enthält eine globale und eine benutzerbezogene Version;
+    `invalidate_permissions` erhöht sie, alte Einträge laufen ungenutzt ab.
+
+    Args:
+        user: Aktiver Benutzer
+
+    Returns:
+        FrozenSet[str]: Berechtigungen aus Benutzerrechten und Rollen
+    """
+    versions = cache.get_many([PERMISSIONS_VERSION_KEY, _user_version_key(user.pk)])
+    key = (
+        f'users:permissions:{user.pk}:{int(user.is_superuser)}:'
+        f'{versions.get(PERMISSIONS_VERSION_KEY, 0)}:{versions.get(_user_version_key(user.pk), 0)}'
+    )
+    permissions = cache.get(key)
+    if permissions is None:
+        permissions = frozenset(_load_permissions(user))
+        cache.set(key, permissions, PERMISSION_CACHE_TIMEOUT)
+    return permissions
+
+
+def _load_permissions(user) -> Iterable[str]:
+    """Lädt die Berechtigungen aus der Datenbank (eine Abfrage)."""
+    if user.is_superuser:
+        permissions = Permission.objects.all()
+    else:
+        permissions = Permission.objects.filter(group__user=user) | Permission.objects.filter(user=user)
+    return (
+        f'{app_label}.{codename}'
+        for app_label, codename in permissions.values_list('content_type__app_label', 'codename').distinct()
+    )
+
+
+def _bump(key: str) -> None:
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def invalidate_permissions(user_ids: Optional[Iterable] = None) -> None:
+    """
+    Verwirft gecachte Berechtigungen in allen Prozessen.
+
+    Wird nach dem Commit von Änderungen an Rollen, Gruppenrechten oder
+    Benutzerrechten aufgerufen (Signal-Empfänger in `apps.users.apps`).
+
+    Args:
+        user_ids: Betroffene Benutzer (None = alle, z.B. bei geänderten Gruppenrechten)
+    """
+    if user_ids is None:
+        _bump(PERMISSIONS_VERSION_KEY)
+        return
+    for user_id in set(user_ids):
+        _bump(_user_version_key(user_id))
@@ -0,0 +1,31 @@
+"""
+Testdaten-Factories der Users-App (factory_boy).
+"""
+
+import factory
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group
+
+from apps.users.models import User
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    """Aktiver Benutzer ohne Rollen (unbenutzbares Passwort, kein Hashing)."""
+
+    class Meta:
+        model = User
+
+    email = factory.Sequence(lambda n: f'benutzer{n}@example.de')
+    first_name = factory.Faker('first_name', locale='de_DE')
+    last_name = factory.Faker('last_name', locale='de_DE')
+    password = factory.LazyFunction(lambda: make_password(None))
+
+
+class GroupFactory(factory.django.DjangoModelFactory):
+    """Rolle (Django-Gruppe) ohne Rechte."""
+
+    class Meta:
+        model = Group
+        django_get_or_create = ('name',)
+
+    name = factory.Sequence(lambda n: f'Rolle {n}')
@@ -0,0 +1,104 @@
+"""
+Tests des Berechtigungs-Caches: Treffer ohne Abfrage, Verwerfen bei Änderungen an Rollen und Rechten.
+"""
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+
+from apps.users.models import User
+from apps.users.services import get_permission_set
+from apps.users.tests.factories import GroupFactory, UserFactory
+
+pytestmark = pytest.mark.django_db
+
+VIEW = 'sales.view_customer'
+CHANGE = 'sales.change_customer'
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    cache.clear()
+
+
+def permission(name: str) -> Permission:
+    app_label, codename = name.split('.')
+    return Permission.objects.get(content_type__app_label=app_label, codename=codename)
+
+
+def role(name: str, *permissions: str):
+    group = GroupFactory(name=name)
+    group.permissions.add(*map(permission, permissions))
+    return group
+
+
+def permissions_of(user) -> frozenset:
+    # Frisch geladen, wie im nächsten Request
+    return get_permission_set(User.objects.get(pk=user.pk))
+
+
+@pytest.fixture
+def member():
+    """Benutzer mit einer Rolle, die VIEW gewährt; Berechtigungen bereits gecacht."""
+    group = role('Vertrieb', VIEW)
+    user = UserFactory()
+    user.groups.add(group)
+    assert permissions_of(user) == {VIEW}
+    return user, group
+
+
+def test_cached_set_is_served_without_queries(member, django_assert_num_queries):
+    user, _ = member
+
+    with django_assert_num_queries(0):
+        assert get_permission_set(user) == {VIEW}
+
+
+@pytest.mark.parametrize('change, expected', [
+    (lambda user, group: user.groups.remove(group), set()),
+    (lambda user, group: user.groups.clear(), set()),
+    (lambda user, group: group.user_set.remove(user), set()),
+    (lambda user, group: group.user_set.clear(), set()),
+    (lambda user, group: user.groups.add(role('Leitung', CHANGE)), {VIEW, CHANGE}),
+    (lambda user, group: user.user_permissions.add(permission(CHANGE)), {VIEW, CHANGE}),
+    (lambda user, group: group.permissions.add(permission(CHANGE)), {VIEW, CHANGE}),
+    (lambda user, group: group.permissions.remove(permission(VIEW)), set()),
+    (lambda user, group: group.permissions.clear(), set()),
+    (lambda user, group: group.delete(), set()),
+], ids=[
+    'user-groups-remove', 'user-groups-clear', 'group-users-remove', 'group-users-clear', 'user-groups-add',
+    'user-permissions-add', 'group-permissions-add', 'group-permissions-remove', 'group-permissions-clear',
+    'group-delete',
+])
+def test_changes_invalidate_cached_permissions(member, change, expected, django_capture_on_commit_callbacks):
+    user, group = member
+
+    with django_capture_on_commit_callbacks(execute=True):
+        change(user, group)
+
+    assert permissions_of(user) == expected
+
+
+def test_invalidation_waits_for_commit(member, django_capture_on_commit_callbacks):
+    user, group = member
+
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        user.groups.remove(group)
+
+    # Vor dem Commit gilt noch der alte Stand
+    assert permissions_of(user) == {VIEW}
+    assert callbacks
+
+
+def test_other_users_keep_their_cache_entry(member, django_assert_num_queries, django_capture_on_commit_callbacks):
+    user, group = member
+    other = UserFactory()
+    other.groups.add(group)
+    other = User.objects.get(pk=other.pk)
+    get_permission_set(other)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        user.user_permissions.add(permission(CHANGE))
+
+    with django_assert_num_queries(0):
+        assert get_permission_set(other) == {VIEW}
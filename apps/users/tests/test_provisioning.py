@@ -0,0 +1,76 @@
+"""
+Tests der Massenanlage von Benutzern: Rollen, Audit-Einträge, Dubletten.
+"""
+
+import pytest
+from django.contrib.auth.hashers import check_password
+
+from apps.users.models import User
+from apps.users.services import UserSpec, provision_users
+from apps.users.tests.factories import GroupFactory, UserFactory
+from core.models import AuditLog
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def fast_hasher(settings):
+    settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+
+def test_users_are_created_with_roles_and_passwords():
+    sales, finance = GroupFactory(name='Vertrieb'), GroupFactory(name='Buchhaltung')
+
+    result = provision_users([
+        UserSpec('anna@example.de', 'geheim-1', 'Anna', 'Schmidt', groups=('Vertrieb', 'Buchhaltung')),
+        UserSpec('ben@example.de', groups=('Vertrieb',)),
+    ], workers=1)
+
+    anna, ben = User.objects.order_by('email')
+    assert [user.email for user in result.created] == ['anna@example.de', 'ben@example.de']
+    assert set(anna.groups.all()) == {sales, finance}
+    assert list(ben.groups.all()) == [sales]
+    assert check_password('geheim-1', anna.password)
+    assert not ben.has_usable_password()
+
+
+def test_audit_entries_are_written_per_user():
+    GroupFactory(name='Vertrieb')
+
+    result = provision_users([UserSpec('anna@example.de', first_name='Anna', groups=('Vertrieb',))], workers=1)
+
+    entry, = AuditLog.objects.filter(model_name='users.User')
+    assert (entry.object_id, entry.action) == (str(result.created[0].pk), AuditLog.Action.CREATE)
+    assert entry.changes == {'email': 'anna@example.de', 'first_name': 'Anna', 'last_name': '',
+                             'groups': ['Vertrieb']}
+
+
+def test_existing_emails_are_skipped_case_insensitive():
+    UserFactory(email='anna@example.de')
+
+    result = provision_users([UserSpec('Anna@Example.de'), UserSpec('ben@example.de')], workers=1)
+
+    assert result.existing == ['Anna@example.de']
+    assert [user.email for user in result.created] == ['ben@example.de']
+    assert User.objects.count() == 2
+
+
+def test_invalid_and_duplicate_entries_are_reported():
+    result = provision_users([
+        UserSpec('keine-mail'),
+        UserSpec('anna@example.de'),
+        UserSpec('ANNA@example.de'),
+    ], workers=1)
+
+    assert result.errors == {
+        'keine-mail': 'Ungültige E-Mail-Adresse.',
+        'ANNA@example.de': 'E-Mail-Adresse ist doppelt angegeben.',
+    }
+    assert [user.email for user in result.created] == ['anna@example.de']
+
+
+def test_unknown_role_creates_nobody():
+    with pytest.raises(ValueError, match='Unbekannte Rollen: Lager'):
+        provision_users([UserSpec('anna@example.de', groups=('Lager',))], workers=1)
+
+    assert not User.objects.exists()
@@ -0,0 +1,7 @@
+"""
+Adapter für externe Dienste (Facade-Pattern).
+
+Die Geschäftslogik ruft ausschließlich diese Adapter auf, nie die
+Client-Bibliotheken direkt; in Tests werden sie durch lokale Stubs ersetzt
+(siehe `.agent/rules/performance-and-io.md`).
+"""
@@ -0,0 +1,158 @@
+"""
+Adapter für die PDF-Erzeugung aus HTML.
+
+Welche Implementierung genutzt wird, bestimmt `settings.PDF_RENDERER`:
+- `WeasyPrintRenderer`: Produktiv-Renderer (HTML/CSS, benötigt WeasyPrint
+  aus `requirements-pdf.txt` inkl. Pango als Systembibliothek)
+- `TextPdfRenderer`: Ohne externe Abhängigkeiten; gibt nur den Textinhalt
+  aus (Tests und Entwicklung)
+
+Jeder Renderer wird je Prozess einmal erzeugt (`get_pdf_renderer`), so dass
+Stylesheets und Schriften nur einmal geladen werden.
+"""
+
+import re
+from functools import lru_cache
+from html.parser import HTMLParser
+from typing import List, Optional, Sequence
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+
+class WeasyPrintRenderer:
+    """Rendert HTML mit WeasyPrint (optionale Abhängigkeit)."""
+
+    def __init__(self, stylesheets: Sequence[str] = (), base_url: Optional[str] = None) -> None:
+        """
+        Args:
+            stylesheets: Zusätzliche CSS-Dateien (werden einmal geparst)
+            base_url: Basis für relative URLs (Bilder, Schriften)
+        """
+        try:
+            import weasyprint
+            from weasyprint.text.fonts import FontConfiguration
+        except (ImportError, OSError) as exc:
+            raise ImproperlyConfigured(
+                "WeasyPrint ist nicht installiert (requirements-pdf.txt) oder Pango fehlt "
+                "(alternativ PDF_RENDERER = 'core.adapters.pdf.TextPdfRenderer')."
+            ) from exc
+        self._weasyprint = weasyprint
+        self._fonts = FontConfiguration()
+        self._stylesheets = [weasyprint.CSS(filename=path, font_config=self._fonts) for path in stylesheets]
+        self.base_url = base_url
+
+    def render(self, html: str) -> bytes:
+        """
+        Rendert ein HTML-Dokument als PDF.
+
+        Args:
+            html: Vollständiges HTML-Dokument
+
+        Returns:
+            bytes: PDF-Datei
+        """
+        document = self._weasyprint.HTML(string=html, base_url=self.base_url)
+        return document.write_pdf(stylesheets=self._stylesheets, font_config=self._fonts)
+
+
+class _TextExtractor(HTMLParser):
+    """Zerlegt HTML in Textzeilen (Block-Elemente und Tabellenzeilen beenden eine Zeile)."""
+
+    BLOCKS = {'p', 'div', 'br', 'tr', 'h1', 'h2', 'h3', 'h4', 'li', 'table', 'section', 'header', 'footer'}
+    SKIP = {'style', 'script', 'head'}
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines: List[str] = []
+        self._current: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs) -> None:
+        if tag in self.SKIP:
+            self._skip += 1
+        elif tag in self.BLOCKS:
+            self._break()
+
+    def handle_endtag(self, tag) -> None:
+        if tag in self.SKIP:
+            self._skip -= 1
+        elif tag in self.BLOCKS:
+            self._break()
+
+    def handle_data(self, data) -> None:
+        if not self._skip and data.strip():
+            self._current.append(re.sub(r'\s+', ' ', data.strip()))
+
+    def _break(self) -> None:
+        if self._current:
+            self.lines.append('  '.join(self._current))
+            self._current = []
+
+    def close(self) -> None:
+        super().close()
+        self._break()
+
+
+class TextPdfRenderer:
+    """
+    Minimaler PDF-Renderer ohne externe Abhängigkeiten.
+
+    Übernimmt nur den Text des HTML-Dokuments (eine Zeile je Block-Element,
+    Helvetica 10 pt, A4). Für Tests und Entwicklungsumgebungen ohne WeasyPrint.
+    """
+
+    LINES_PER_PAGE = 64
+
+    def render(self, html: str) -> bytes:
+        extractor = _TextExtractor()
+        extractor.feed(html)
+        extractor.close()
+        lines = extractor.lines or ['']
+        pages = [lines[start:start + self.LINES_PER_PAGE] for start in range(0, len(lines), self.LINES_PER_PAGE)]
+
+        # Objekte: 1 Katalog, 2 Seitenbaum, 3 Schrift, danach je Seite (Seite, Inhalt)
+        page_ids = [4 + 2 * index for index in range(len(pages))]
+        objects = [
+            b'<< /Type /Catalog /Pages 2 0 R >>',
+            b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % pid for pid in page_ids)
+            + b'] /Count %d >>' % len(pages),
+            b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>',
+        ]
+        for page_id, page in zip(page_ids, pages):
+            text = b'\n'.join(b'(' + self._escape(line) + b') Tj T*' for line in page)
+            stream = b'BT /F1 10 Tf 12 TL 56 790 Td\n' + text + b'\nET'
+            objects.append(
+                b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] '
+                b'/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>' % (page_id + 1)
+            )
+            objects.append(b'<< /Length %d >>\nstream\n' % len(stream) + stream + b'\nendstream')
+
+        output = bytearray(b'%PDF-1.4\n')
+        offsets = []
+        for number, body in enumerate(objects, start=1):
+            offsets.append(len(output))
+            output += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+        xref = len(output)
+        output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+        output += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+        output += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+        return bytes(output)
+
+    @staticmethod
+    def _escape(line: str) -> bytes:
+        encoded = line.encode('cp1252', errors='replace')
+        return encoded.replace(b'\\', b'\\\\').replace(b'(', b'\\(').replace(b')', b'\\)')
+
+
+@lru_cache(maxsize=1)
+def get_pdf_renderer():
+    """
+    Gibt den konfigurierten PDF-Renderer dieses Prozesses zurück (`settings.PDF_RENDERER`).
+
+    In Tests kann `get_pdf_renderer.cache_clear()` nach einer Änderung der
+    Einstellung aufgerufen werden.
+    """
+    renderer_class = import_string(getattr(settings, 'PDF_RENDERER', 'core.adapters.pdf.WeasyPrintRenderer'))
+    return renderer_class(**getattr(settings, 'PDF_RENDERER_OPTIONS', {}))
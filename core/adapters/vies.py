@@ -0,0 +1,132 @@
+"""
+Adapter für die Prüfung von USt-IdNrn. über VIES (EU-Kommission).
+
+Kapselt den REST-Dienst `check-vat-number`. Welche Implementierung genutzt
+wird, bestimmt `settings.VIES_ADAPTER`; `StubViesAdapter` ersetzt den
+Netzwerkzugriff in Tests und in der Entwicklung.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Collection, Optional
+
+import httpx
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class ViesError(Exception):
+    """VIES ist nicht erreichbar oder der Mitgliedstaat antwortet nicht (später erneut prüfen)."""
+
+
+@dataclass(frozen=True)
+class ViesResult:
+    """
+    Antwort einer qualifizierten VIES-Abfrage.
+
+    Attributes:
+        valid: USt-IdNr. ist gültig
+        name: Registrierter Name (sofern vom Mitgliedstaat geliefert)
+        address: Registrierte Anschrift (sofern geliefert)
+        request_identifier: Abfragekennung als Nachweis (§ 6a UStG)
+    """
+
+    valid: bool
+    name: str = ''
+    address: str = ''
+    request_identifier: str = ''
+
+
+class ViesAdapter:
+    """Prüft USt-IdNrn. über die VIES-REST-Schnittstelle."""
+
+    DEFAULT_URL = 'https://ec.europa.eu/taxation_customs/vies/rest-api'
+
+    def __init__(
+        self,
+        base_url: str = DEFAULT_URL,
+        requester_vat_id: str = '',
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Args:
+            base_url: Basis-URL der REST-Schnittstelle
+            requester_vat_id: Eigene USt-IdNr. für qualifizierte Abfragen (mit Abfragekennung)
+            timeout: Timeout je Abfrage in Sekunden
+        """
+        self.base_url = base_url.rstrip('/')
+        self.requester_vat_id = requester_vat_id
+        self._client = httpx.Client(timeout=timeout)
+
+    def check(self, vat_id: str) -> ViesResult:
+        """
+        Prüft eine normalisierte USt-IdNr. (z.B. 'DE136695976').
+
+        Args:
+            vat_id: USt-IdNr. inkl. Länderpräfix
+
+        Returns:
+            ViesResult: Ergebnis der Abfrage
+
+        Raises:
+            ViesError: Wenn der Dienst nicht antwortet oder einen Fehler meldet
+        """
+        payload = {'countryCode': vat_id[:2], 'vatNumber': vat_id[2:]}
+        if self.requester_vat_id:
+            payload['requesterMemberStateCode'] = self.requester_vat_id[:2]
+            payload['requesterNumber'] = self.requester_vat_id[2:]
+        try:
+            response = self._client.post(f'{self.base_url}/check-vat-number', json=payload)
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as exc:
+            raise ViesError(f"VIES-Abfrage für {vat_id} fehlgeschlagen: {exc}") from exc
+
+        if data.get('actionSucceed') is False or 'valid' not in data:
+            errors = ', '.join(item.get('error', '?') for item in data.get('errorWrappers', []))
+            raise ViesError(f"VIES meldet Fehler für {vat_id}: {errors or 'unbekannt'}")
+        return ViesResult(
+            valid=bool(data['valid']),
+            name=(data.get('name') or '').strip('- '),
+            address=(data.get('address') or '').strip('- '),
+            request_identifier=data.get('requestIdentifier') or '',
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class StubViesAdapter:
+    """
+    Lokaler Ersatz ohne Netzwerkzugriff.
+
+    Gültig sind die in `valid_ids` genannten Nummern; ohne Angabe jede
+    angefragte Nummer (die Formatprüfung erfolgt vorher im Service).
+    """
+
+    def __init__(self, valid_ids: Optional[Collection[str]] = None, unavailable: Collection[str] = ()) -> None:
+        self.valid_ids = None if valid_ids is None else set(valid_ids)
+        self.unavailable = set(unavailable)
+        self.calls = 0
+
+    def check(self, vat_id: str) -> ViesResult:
+        self.calls += 1
+        if vat_id[:2] in self.unavailable:
+            raise ViesError(f"Mitgliedstaat {vat_id[:2]} nicht erreichbar (Stub).")
+        valid = self.valid_ids is None or vat_id in self.valid_ids
+        return ViesResult(valid=valid, request_identifier=f'STUB{self.calls:08d}' if valid else '')
+
+    def close(self) -> None:
+        pass
+
+
+@lru_cache(maxsize=1)
+def get_vies_adapter():
+    """
+    Gibt den konfigurierten VIES-Adapter zurück (`settings.VIES_ADAPTER`).
+
+    In Tests kann `get_vies_adapter.cache_clear()` nach einer Änderung der
+    Einstellung aufgerufen werden.
+    """
+    adapter_class = import_string(getattr(settings, 'VIES_ADAPTER', 'core.adapters.vies.ViesAdapter'))
+    return adapter_class(**getattr(settings, 'VIES_ADAPTER_OPTIONS', {}))
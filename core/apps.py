@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'core'
+
+    def ready(self) -> None:
+        # Änderungsprotokoll für alle Business-Models aktivieren
+        from core.audit import connect_signals
+        connect_signals()
+
+        # DB-, Template- und Cache-Messung für /metrics/
+        from core import metrics
+        metrics.install()
+
+        # N+1-Erkennung und Abfrage-Budgets
+        from core import queries
+        queries.install()
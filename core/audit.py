@@ -0,0 +1,406 @@
+"""
+Gepuffertes, hash-verkettetes Änderungsprotokoll (Infrastruktur).
+
+Audit-Einträge werden in derselben Transaktion wie die protokollierte
+Änderung geschrieben; zurückgerollte Änderungen erzeugen daher keine
+Einträge, festgeschriebene nie Einträge, die fehlen:
+1. Innerhalb von `atomic()` (Services) werden sie gesammelt und unmittelbar
+   vor dem Commit per `bulk_create` geschrieben; der Kettenkopf ist nur vom
+   Schreiben bis zum Commit gesperrt.
+2. Sonst (eigene `transaction.atomic`-Blöcke, Autocommit) sofort.
+
+`audit_scope()` (Middleware, Tasks, Commands) legt nur fest, wer handelt.
+
+Jeder Eintrag enthält den Hash seines Vorgängers. `verify_chain()` prüft die
+Kette streamend in Chunks mit konstantem Speicherbedarf.
+"""
+
+import hashlib
+import json
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, router, transaction
+from django.forms.models import model_to_dict
+from django.utils import timezone
+
+from core.models import AuditChainHead, AuditLog
+
+
+# Hash des (virtuellen) Vorgängers des ersten Eintrags
+GENESIS_HASH = '0' * 64
+
+# Maximale Puffergröße je Transaktion, danach wird schon vor dem Commit geschrieben
+MAX_BUFFER_SIZE = 5000
+
+# Chunk-Größe beim Schreiben und bei der Verifikation
+CHUNK_SIZE = 2000
+
+
+@dataclass
+class AuditContext:
+    """
+    Wer handelt gerade? Wird von der Middleware je Request gesetzt.
+
+    Der Benutzer wird über `user_resolver` erst beim ersten Audit-Eintrag
+    ermittelt, damit Requests ohne Änderungen keine Session-Abfrage auslösen.
+    """
+
+    user_id: Optional[int] = None
+    ip_address: Optional[str] = None
+    user_resolver: Optional[Callable[[], Optional[int]]] = None
+
+    def resolve_user(self) -> Optional[int]:
+        if self.user_resolver is not None:
+            self.user_id = self.user_resolver()
+            self.user_resolver = None
+        return self.user_id
+
+
+@dataclass
+class _PendingRecord:
+    timestamp: datetime
+    user_id: Optional[int]
+    ip_address: Optional[str]
+    model_name: str
+    object_id: str
+    action: str
+    changes: Optional[Dict[str, Any]]
+
+
+@dataclass
+class _Frame:
+    """Gepufferte Einträge eines `atomic()`-Blocks."""
+
+    alias: str
+    block: transaction.Atomic
+    pending: List[_PendingRecord] = field(default_factory=list)
+
+
+_context: ContextVar[AuditContext] = ContextVar('audit_context', default=AuditContext())
+_frames: ContextVar[Tuple[_Frame, ...]] = ContextVar('audit_frames', default=())
+
+
+def current_user_id() -> Optional[int]:
+    """Handelnder Benutzer des aktuellen Kontexts (Request bzw. `audit_scope`)."""
+    return _context.get().resolve_user()
+
+
+def _serialize(instance: models.Model) -> Dict[str, Any]:
+    """
+    Serialisiert die Feldwerte eines Objekts JSON-kompatibel (Decimal/Datum als String).
+
+    Felder aus `settings.AUDIT_REDACTED_FIELDS` (z.B. Passwort-Hashes) werden maskiert.
+    Many-to-many-Felder fehlen: Bei `post_save` stehen ihre neuen Werte noch
+    nicht fest, und jedes kostete eine weitere Abfrage.
+    """
+    data = model_to_dict(instance, exclude=[field.name for field in instance._meta.many_to_many])
+    for name in getattr(settings, 'AUDIT_REDACTED_FIELDS', ()):
+        if name in data:
+            data[name] = '***'
+    return json.loads(json.dumps(data, cls=DjangoJSONEncoder))
+
+
+def record(instance: models.Model, action: str, changes: Optional[Dict[str, Any]] = None) -> None:
+    """
+    Protokolliert eine Änderung an einem Objekt.
+
+    Der Eintrag wird in der laufenden Transaktion geschrieben (innerhalb von
+    `atomic()` gesammelt vor dem Commit).
+
+    Args:
+        instance: Geändertes Objekt
+        action: Eine der `AuditLog.Action`-Konstanten
+        changes: Geänderte Werte (Standard: alle Feldwerte des Objekts)
+    """
+    record_many([instance], action, None if changes is None else [changes])
+
+
+def record_many(
+    instances: Iterable[models.Model],
+    action: str,
+    changes: Optional[List[Dict[str, Any]]] = None,
+) -> None:
+    """
+    Protokolliert dieselbe Aktion für viele Objekte.
+
+    Für Massenoperationen (`bulk_create`, `bulk_update`), die keine Signale
+    auslösen und daher nicht automatisch protokolliert werden.
+
+    Args:
+        instances: Geänderte Objekte
+        action: Eine der `AuditLog.Action`-Konstanten
+        changes: Optional je Objekt die geänderten Werte
+    """
+    context = _context.get()
+    user_id = context.resolve_user()
+    now = timezone.now()
+    pending = [
+        _PendingRecord(
+            timestamp=now,
+            user_id=user_id,
+            ip_address=context.ip_address,
+            model_name=instance._meta.label,
+            object_id=str(instance.pk),
+            action=action,
+            changes=_serialize(instance) if changes is None else changes[index],
+        )
+        for index, instance in enumerate(instances)
+    ]
+    if not pending:
+        return
+    frame = _current_frame()
+    if frame is None:
+        # Kein eigener Puffer für den innersten Block: sofort, in der laufenden Transaktion
+        _write(pending)
+        return
+    frame.pending.extend(pending)
+    if len(frame.pending) >= MAX_BUFFER_SIZE:
+        _write(frame.pending)
+        frame.pending = []
+
+
+def _current_frame() -> Optional[_Frame]:
+    """Puffer des innersten Transaktionsblocks, sofern dieser ein `atomic()` ist."""
+    frames = _frames.get()
+    if not frames:
+        return None
+    connection = transaction.get_connection(router.db_for_write(AuditLog))
+    frame = frames[-1]
+    if frame.alias != connection.alias or not connection.atomic_blocks:
+        return None
+    return frame if connection.atomic_blocks[-1] is frame.block else None
+
+
+@contextmanager
+def _atomic_block(using: Optional[str]) -> Iterator[None]:
+    with transaction.atomic(using=using):
+        connection = transaction.get_connection(using)
+        frame = _Frame(connection.alias, connection.atomic_blocks[-1])
+        token = _frames.set((*_frames.get(), frame))
+        try:
+            yield
+        finally:
+            _frames.reset(token)
+        # Nur bei Erfolg (noch in der Transaktion): an den umgebenden Puffer
+        # übergeben oder vor dem Commit bzw. Savepoint-Release schreiben
+        frames = _frames.get()
+        blocks = connection.atomic_blocks
+        if frames and frames[-1].alias == connection.alias and len(blocks) > 1 and frames[-1].block is blocks[-2]:
+            frames[-1].pending.extend(frame.pending)
+        elif frame.pending:
+            _write(frame.pending)
+
+
+def atomic(using=None):
+    """
+    Wie `transaction.atomic`, schreibt die Audit-Einträge des Blocks gesammelt vor dem Commit.
+
+    Verwendbar als Decorator (`@audit.atomic`) oder Kontextmanager
+    (`with audit.atomic():`). Geschriebene Änderungen und ihre Einträge
+    werden gemeinsam festgeschrieben oder zurückgerollt.
+
+    Args:
+        using: Datenbank-Alias (Standard: 'default')
+    """
+    if callable(using):
+        return _atomic_block(None)(using)
+    return _atomic_block(using)
+
+
+def _open_scope(
+    user_id: Optional[int],
+    ip_address: Optional[str],
+    user_resolver: Optional[Callable[[], Optional[int]]],
+) -> Token:
+    return _context.set(AuditContext(user_id=user_id, ip_address=ip_address, user_resolver=user_resolver))
+
+
+def _close_scope(token: Token) -> None:
+    _context.reset(token)
+
+
+@contextmanager
+def audit_scope(
+    user_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    user_resolver: Optional[Callable[[], Optional[int]]] = None,
+) -> Iterator[None]:
+    """
+    Legt Benutzer und IP-Adresse aller Audit-Einträge innerhalb des Blocks fest.
+
+    Wird von der Middleware je Request genutzt; Management Commands und
+    Hintergrund-Tasks können es direkt verwenden.
+
+    Args:
+        user_id: Handelnder Benutzer
+        ip_address: IP-Adresse des Aufrufers
+        user_resolver: Alternativ: Funktion, die den Benutzer bei Bedarf ermittelt
+    """
+    token = _open_scope(user_id, ip_address, user_resolver)
+    try:
+        yield
+    finally:
+        _close_scope(token)
+
+
+@asynccontextmanager
+async def async_audit_scope(
+    user_id: Optional[int] = None,
+    ip_address: Optional[str] = None,
+    user_resolver: Optional[Callable[[], Optional[int]]] = None,
+) -> AsyncIterator[None]:
+    """
+    Wie `audit_scope`, für async Views (ASGI).
+
+    Synchrone Services, die per `sync_to_async` laufen, erben den Kontext.
+    """
+    token = _open_scope(user_id, ip_address, user_resolver)
+    try:
+        yield
+    finally:
+        _close_scope(token)
+
+
+def compute_hash(
+    previous_hash: str,
+    sequence: int,
+    timestamp: datetime,
+    user_id: Optional[int],
+    model_name: str,
+    object_id: str,
+    action: str,
+    changes: Optional[Dict[str, Any]],
+) -> str:
+    """
+    Berechnet den Hash eines Audit-Eintrags über seinen Inhalt und den Vorgänger-Hash.
+
+    Returns:
+        str: SHA-256 als Hex-String
+    """
+    payload = json.dumps(
+        [sequence, timestamp.isoformat(), user_id, model_name, object_id, action, changes],
+        sort_keys=True,
+        separators=(',', ':'),
+        cls=DjangoJSONEncoder,
+    )
+    return hashlib.sha256(f'{previous_hash}{payload}'.encode('utf-8')).hexdigest()
+
+
+def _write(pending: List[_PendingRecord]) -> None:
+    """Setzt die Hash-Kette fort und schreibt die Einträge per `bulk_create`."""
+    # Der gesperrte Kettenkopf serialisiert parallele Schreiber bis zum Commit
+    # (SQLite: Schreibtransaktionen beginnen mit BEGIN IMMEDIATE)
+    with transaction.atomic(using=router.db_for_write(AuditLog)):
+        AuditChainHead.objects.get_or_create(name='audit', defaults={'hash': GENESIS_HASH})
+        head = AuditChainHead.objects.select_for_update().get(name='audit')
+
+        sequence = head.sequence
+        previous_hash = head.hash
+        rows = []
+        for item in pending:
+            sequence += 1
+            current_hash = compute_hash(
+                previous_hash, sequence, item.timestamp, item.user_id,
+                item.model_name, item.object_id, item.action, item.changes,
+            )
+            rows.append(AuditLog(
+                sequence=sequence,
+                timestamp=item.timestamp,
+                user_id=item.user_id,
+                ip_address=item.ip_address,
+                model_name=item.model_name,
+                object_id=item.object_id,
+                action=item.action,
+                changes=item.changes,
+                previous_hash=previous_hash,
+                hash=current_hash,
+            ))
+            previous_hash = current_hash
+
+        AuditLog.objects.bulk_create(rows, batch_size=CHUNK_SIZE)
+        AuditChainHead.objects.filter(pk=head.pk).update(
+            sequence=sequence, hash=previous_hash, updated_at=timezone.now()
+        )
+
+
+@dataclass
+class ChainViolation:
+    """Gefundene Unstimmigkeit in der Audit-Kette."""
+
+    sequence: int
+    reason: str
+
+
+def verify_chain(chunk_size: int = CHUNK_SIZE) -> Iterator[ChainViolation]:
+    """
+    Prüft die gesamte Audit-Kette auf Manipulationen.
+
+    Liest die Einträge sortiert nach `sequence` über einen Iterator in Chunks,
+    so dass auch Millionen Einträge mit konstantem Speicher geprüft werden.
+
+    Args:
+        chunk_size: Anzahl Zeilen je Datenbank-Fetch
+
+    Yields:
+        ChainViolation: Jede gefundene Unstimmigkeit (Lücke, Verkettung, Inhalt)
+    """
+    expected_sequence = 1
+    previous_hash = GENESIS_HASH
+    rows = AuditLog.objects.order_by('sequence').values_list(
+        'sequence', 'timestamp', 'user_id', 'model_name', 'object_id',
+        'action', 'changes', 'previous_hash', 'hash',
+    ).iterator(chunk_size=chunk_size)
+
+    for (sequence, timestamp, user_id, model_name, object_id,
+         action, changes, stored_previous, stored_hash) in rows:
+        if sequence != expected_sequence:
+            yield ChainViolation(sequence, f"Lücke in der Kette: erwartet {expected_sequence}")
+        if stored_previous != previous_hash:
+            yield ChainViolation(sequence, "Vorgänger-Hash stimmt nicht überein")
+        actual = compute_hash(
+            stored_previous, sequence, timestamp, user_id, model_name, object_id, action, changes,
+        )
+        if actual != stored_hash:
+            yield ChainViolation(sequence, "Inhalt wurde verändert (Hash ungültig)")
+        expected_sequence = sequence + 1
+        previous_hash = stored_hash
+
+    # Abgeschnittenes Ende erkennen: der Kettenkopf muss auf den letzten Eintrag zeigen
+    head = AuditChainHead.objects.filter(name='audit').values_list('sequence', 'hash').first()
+    if head is not None and head != (expected_sequence - 1, previous_hash):
+        yield ChainViolation(head[0], "Kettenkopf passt nicht zum letzten Eintrag (Einträge entfernt?)")
+
+
+def _on_save(sender: type, instance: models.Model, created: bool, raw: bool = False, **kwargs: Any) -> None:
+    if not raw:
+        record(instance, AuditLog.Action.CREATE if created else AuditLog.Action.UPDATE)
+
+
+def _on_delete(sender: type, instance: models.Model, **kwargs: Any) -> None:
+    record(instance, AuditLog.Action.DELETE)
+
+
+def connect_signals() -> None:
+    """
+    Verbindet `post_save`/`post_delete` aller Business-Models mit dem Audit-Log.
+
+    Protokolliert werden Models der Apps unter `apps.*`, außer denen in
+    `settings.AUDIT_EXCLUDED_MODELS` (z.B. abgeleitete Snapshot-Tabellen).
+    `bulk_create` löst keine Signale aus; Services protokollieren solche
+    Massenoperationen selbst über `record_many`.
+    """
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    excluded = set(getattr(settings, 'AUDIT_EXCLUDED_MODELS', ()))
+    for model in apps.get_models():
+        if not model.__module__.startswith('apps.') or model._meta.label in excluded:
+            continue
+        post_save.connect(_on_save, sender=model, dispatch_uid=f'audit_save_{model._meta.label}')
+        post_delete.connect(_on_delete, sender=model, dispatch_uid=f'audit_delete_{model._meta.label}')
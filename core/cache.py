@@ -0,0 +1,263 @@
+"""
+Mehrstufiger Cache für lesende Services (Infrastruktur).
+
+`@cached_service(ttl, key=..., tags=...)` legt zwei Stufen vor einen Service:
+1. einen LRU-Cache im Prozess (kein Netzwerk, keine Deserialisierung),
+2. das gemeinsame Django-Cache-Backend (`settings.CACHES`: locmem/Datei in
+   Entwicklung und Tests, Redis im Betrieb).
+
+Invalidiert wird über Tags: Jeder Tag hat eine Version im gemeinsamen Cache,
+die in den Schlüssel eingeht. `invalidate_tags()` erhöht sie, alte Einträge
+laufen ungenutzt ab. Tags in Form eines Model-Labels ('finance.Account')
+werden bei `save`/`delete` des Models nach dem Commit automatisch
+invalidiert; Bulk-Operationen ohne Signale rufen `invalidate_tags` selbst auf.
+Die Tag-Versionen hält jeder Prozess `TAG_VERSION_TTL` Sekunden lokal vor, ein
+Treffer im LRU-Cache kommt so ohne Zugriff auf den gemeinsamen Cache aus. Eine
+Invalidierung wirkt im eigenen Prozess sofort, in anderen nach spätestens
+`TAG_VERSION_TTL` Sekunden.
+
+Abgelaufene Einträge bleiben noch `stale_ttl` Sekunden lesbar: Genau ein
+Prozess (Sperre per `cache.add`) berechnet den Wert neu, alle anderen
+erhalten so lange den alten Wert (Single-Flight statt Cache-Stampede).
+
+Beispiel:
+    @cached_service(ttl=300, tags=('finance.AccountBalance',))
+    def get_trial_balance(period=None): ...
+"""
+
+import functools
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Iterable, Optional, Set, Tuple
+
+from django.core.cache import cache
+from django.db import transaction
+
+from core.metrics import SERVICE_CACHE_REQUESTS
+
+
+# Einträge des prozesslokalen LRU-Caches (über alle Services)
+LOCAL_CACHE_SIZE = 1024
+
+# Maximale Dauer einer Neuberechnung, danach verfällt die Sperre (Sekunden)
+LOCK_TIMEOUT = 30
+
+# Beim ersten Aufruf: so lange auf die Berechnung eines anderen Prozesses warten (Sekunden)
+MISS_WAIT = 5.0
+POLL_INTERVAL = 0.05
+
+# So lange gilt eine lokal vorgehaltene Tag-Version ohne Abgleich (Sekunden)
+TAG_VERSION_TTL = 1.0
+
+KEY_PREFIX = 'service'
+TAG_PREFIX = 'service:tag'
+
+# Eintrag: (frisch bis Unix-Zeit, Wert)
+Entry = Tuple[float, Any]
+
+
+class LocalCache:
+    """Thread-sicherer LRU-Cache im Prozess."""
+
+    def __init__(self, size: int = LOCAL_CACHE_SIZE) -> None:
+        self.size = size
+        self._entries: 'OrderedDict[str, Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+local_cache = LocalCache()
+
+# Tag -> (gültig bis Unix-Zeit, Version)
+tag_versions = LocalCache()
+
+# Tags aller Services (Model-Labels lösen bei save/delete eine Invalidierung aus)
+_registered_tags: Set[str] = set()
+
+
+def _tag_key(tag: str) -> str:
+    return f'{TAG_PREFIX}:{tag}'
+
+
+def _tag_versions(tags: Tuple[str, ...]) -> Tuple[int, ...]:
+    now = time.time()
+    versions = {}
+    for tag in tags:
+        entry = tag_versions.get(tag)
+        if entry is not None and entry[0] > now:
+            versions[tag] = entry[1]
+    expired = {_tag_key(tag): tag for tag in tags if tag not in versions}
+    if expired:
+        shared = cache.get_many(list(expired))
+        missing = [key for key in expired if key not in shared]
+        if missing:
+            # Startwert zeitbasiert: nach Verdrängung des Keys keine alten Einträge wiederverwenden
+            start = time.time_ns()
+            for key in missing:
+                cache.add(key, start, timeout=None)
+            shared.update(cache.get_many(missing))
+        for key, tag in expired.items():
+            versions[tag] = shared.get(key, 0)
+            tag_versions.set(tag, (now + TAG_VERSION_TTL, versions[tag]))
+    return tuple(versions[tag] for tag in tags)
+
+
+def invalidate_tags(*tags: str) -> None:
+    """
+    Verwirft alle gecachten Ergebnisse mit einem der Tags (in allen Prozessen).
+
+    Nach Schreibzugriffen in einer Transaktion über `transaction.on_commit`
+    aufrufen, damit kein Prozess zwischendurch alte Daten neu cacht. Andere
+    Prozesse übernehmen die neue Version nach spätestens `TAG_VERSION_TTL` Sekunden.
+
+    Args:
+        tags: Tags, z.B. Model-Labels wie 'finance.AccountBalance'
+    """
+    for tag in tags:
+        try:
+            version = cache.incr(_tag_key(tag))
+        except ValueError:
+            version = time.time_ns()
+            cache.set(_tag_key(tag), version, timeout=None)
+        tag_versions.set(tag, (time.time() + TAG_VERSION_TTL, version))
+
+
+def _default_key(args: tuple, kwargs: dict) -> str:
+    raw = repr((args, sorted(kwargs.items())))
+    return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+
+def _store(cache_key: str, value: Any, ttl: int, stale_ttl: int) -> None:
+    entry = (time.time() + ttl, value)
+    cache.set(cache_key, entry, ttl + stale_ttl)
+    local_cache.set(cache_key, entry)
+
+
+def _get_or_compute(name: str, cache_key: str, compute: Callable[[], Any], ttl: int, stale_ttl: int) -> Any:
+    entry = local_cache.get(cache_key)
+    if entry is not None and entry[0] > time.time():
+        SERVICE_CACHE_REQUESTS.inc(name, 'local')
+        return entry[1]
+
+    lock_key = f'{cache_key}:lock'
+    entry = cache.get(cache_key)
+    if entry is not None:
+        if entry[0] > time.time():
+            local_cache.set(cache_key, entry)
+            SERVICE_CACHE_REQUESTS.inc(name, 'shared')
+            return entry[1]
+        # Abgelaufen: nur der Inhaber der Sperre rechnet, alle anderen erhalten den alten Wert
+        if not cache.add(lock_key, 1, LOCK_TIMEOUT):
+            SERVICE_CACHE_REQUESTS.inc(name, 'stale')
+            return entry[1]
+    elif not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        # Noch kein Wert vorhanden: kurz auf den rechnenden Prozess warten
+        deadline = time.time() + MISS_WAIT
+        while time.time() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                local_cache.set(cache_key, entry)
+                SERVICE_CACHE_REQUESTS.inc(name, 'shared')
+                return entry[1]
+        SERVICE_CACHE_REQUESTS.inc(name, 'miss')
+        value = compute()
+        _store(cache_key, value, ttl, stale_ttl)
+        return value
+
+    SERVICE_CACHE_REQUESTS.inc(name, 'miss')
+    try:
+        value = compute()
+        _store(cache_key, value, ttl, stale_ttl)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+def cached_service(
+    ttl: int,
+    key: Optional[Callable[..., str]] = None,
+    tags: Iterable[str] = (),
+    stale_ttl: Optional[int] = None,
+) -> Callable:
+    """
+    Cacht das Ergebnis eines lesenden Services im Prozess und im gemeinsamen Cache.
+
+    Innerhalb einer Transaktion wird der Cache umgangen: Der Aufrufer muss
+    seine eigenen, noch nicht committeten Schreibzugriffe sehen.
+
+    Args:
+        ttl: Sekunden, die ein Ergebnis als aktuell gilt
+        key: Bildet aus den Argumenten den Schlüsselteil (Standard: Hash der
+             `repr` aller Argumente; für Model-Instanzen o.ä. eigenen Schlüssel angeben)
+        tags: Tags für die Invalidierung, z.B. Model-Labels
+        stale_ttl: Sekunden, die ein abgelaufenes Ergebnis während der
+                   Neuberechnung noch ausgeliefert wird (Standard: `ttl`)
+
+    Returns:
+        Callable: Decorator; das Ergebnis muss picklebar sein
+    """
+    tags = tuple(tags)
+    stale_ttl = ttl if stale_ttl is None else stale_ttl
+    for tag in tags:
+        _register_tag(tag)
+
+    def decorate(function: Callable) -> Callable:
+        name = f'{function.__module__}.{function.__qualname__}'
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if transaction.get_connection().in_atomic_block:
+                SERVICE_CACHE_REQUESTS.inc(name, 'bypass')
+                return function(*args, **kwargs)
+            part = key(*args, **kwargs) if key else _default_key(args, kwargs)
+            versions = '.'.join(str(version) for version in _tag_versions(tags))
+            return _get_or_compute(
+                name, f'{KEY_PREFIX}:{name}:{part}:{versions}',
+                lambda: function(*args, **kwargs), ttl, stale_ttl,
+            )
+
+        return wrapper
+
+    return decorate
+
+
+def _on_model_change(sender, **kwargs) -> None:
+    label = sender._meta.label
+    transaction.on_commit(lambda: invalidate_tags(label))
+
+
+def _register_tag(tag: str) -> None:
+    """Verbindet `save`/`delete` des Models, falls der Tag ein Model-Label ist."""
+    from django.apps import apps
+    from django.db.models.signals import post_delete, post_save
+
+    if tag in _registered_tags:
+        return
+    _registered_tags.add(tag)
+    try:
+        model = apps.get_model(tag, require_ready=False)
+    except (LookupError, ValueError):
+        return  # Freier Tag: nur über invalidate_tags
+    # Je Model verbinden: ein Empfänger ohne Sender verhindert das schnelle Löschen aller Models
+    post_save.connect(_on_model_change, sender=model, dispatch_uid=f'service_cache_save_{tag}')
+    post_delete.connect(_on_model_change, sender=model, dispatch_uid=f'service_cache_delete_{tag}')
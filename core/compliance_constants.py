@@ -49,6 +49,18 @@ GOBD_NON_CASH_BOOKING_DAYS: int = 10
 GOBD_LOCKING_PERIOD_OFFSET_MONTHS: int = 1
 """Festschreibung bis Ende des Folgemonats (GoBD Rz. 111)."""
 
+# ============================================================================
+# UStG: Innergemeinschaftlicher Handel
+# ============================================================================
+EU_MEMBER_STATES: frozenset = frozenset({
+    'AT', 'BE', 'BG', 'CY', 'CZ', 'DE', 'DK', 'EE', 'ES', 'FI', 'FR', 'GR', 'HR', 'HU',
+    'IE', 'IT', 'LT', 'LU', 'LV', 'MT', 'NL', 'PL', 'PT', 'RO', 'SE', 'SI', 'SK',
+})
+"""EU-Mitgliedstaaten (ISO 3166-1 Alpha-2; Griechenland als 'GR', USt-ID-Präfix 'EL')."""
+
+OSS_DELIVERY_THRESHOLD: int = 10_000
+"""EU-weite Lieferschwelle für Fernverkäufe an Privatkunden (§ 3c Abs. 4 UStG) in EUR."""
+
 # ============================================================================
 # DSGVO: Datenschutz & Sperrfristen
 # ============================================================================
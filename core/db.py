@@ -0,0 +1,179 @@
+"""
+Datenbank-Konfiguration und Replica-Routing (Infrastruktur).
+
+`database_settings()` baut `DATABASES` aus Umgebungsvariablen: SQLite für die
+Entwicklung, PostgreSQL (psycopg 3) für den Betrieb, wahlweise mit
+Connection-Pool oder persistenten Verbindungen samt Health-Check, dazu
+beliebig viele Lese-Replicas ('replica1', 'replica2', ...).
+
+`PrimaryReplicaRouter` schickt grundsätzlich alles an den Primary. Nur
+Lesezugriffe innerhalb von `read_replica()` gehen an eine Replica – gedacht
+für Auswertungen, die Sekunden alte Daten vertragen (z.B. Dashboard-Kennzahlen).
+Buchungen und GoBD-relevante Lesezugriffe (Nummernvergabe, Festschreibung,
+Z3-Export) laufen nie in diesem Kontext und bleiben damit auf dem Primary.
+
+Migriert wird nur der Primary; Replicas erhalten Schema und Daten über die
+Replikation. Lokal lässt sich das mit zwei SQLite-Dateien nachstellen
+(Kopieren = Replizieren):
+    cp db.sqlite3 var/replica.sqlite3
+    DB_REPLICAS=var/replica.sqlite3 python manage.py runserver
+"""
+
+import os
+import random
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional
+
+
+# Alias des Primary (alle Schreibzugriffe)
+PRIMARY = 'default'
+
+# Präfix der Replica-Aliase: replica1, replica2, ...
+REPLICA_PREFIX = 'replica'
+
+_replica_scope: ContextVar[bool] = ContextVar('read_replica', default=False)
+
+
+def _flag(value: str) -> bool:
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def database_settings(base_dir: Path, environ: Optional[Mapping[str, str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Baut `settings.DATABASES` aus Umgebungsvariablen.
+
+    Variablen:
+        DB_ENGINE: 'sqlite' (Standard) oder 'postgresql'
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT: Zugangsdaten des Primary
+        DB_REPLICAS: Kommagetrennte Replicas; PostgreSQL 'host[:port]', SQLite Dateipfade
+        DB_POOL_MAX_SIZE: > 0 aktiviert den psycopg-Pool (nur PostgreSQL), sonst persistente Verbindungen
+        DB_POOL_MIN_SIZE: Offen gehaltene Verbindungen je Prozess (Standard 2)
+        DB_POOL_TIMEOUT: Wartezeit auf eine freie Verbindung in Sekunden (Standard 10)
+        DB_CONN_MAX_AGE: Lebensdauer persistenter Verbindungen in Sekunden (Standard 60)
+        DB_CONN_HEALTH_CHECKS: Verbindung vor Wiederverwendung prüfen (Standard true)
+
+    Args:
+        base_dir: Projektverzeichnis (relative SQLite-Pfade beziehen sich darauf)
+        environ: Umgebung (Standard: `os.environ`)
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Aliase 'default' und 'replica1'... mit Verbindungsdaten
+    """
+    env = os.environ if environ is None else environ
+    engine = env.get('DB_ENGINE', 'sqlite').strip().lower()
+    replicas = [replica.strip() for replica in env.get('DB_REPLICAS', '').split(',') if replica.strip()]
+
+    if engine in ('sqlite', 'sqlite3'):
+        def sqlite(name: str) -> Dict[str, Any]:
+            # IMMEDIATE: Transaktionen sperren sofort zum Schreiben (select_for_update gibt es nicht);
+            # parallele Schreiber warten dann statt mit 'database is locked' abzubrechen
+            return {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': base_dir / name,
+                'OPTIONS': {'transaction_mode': 'IMMEDIATE'},
+            }
+
+        primary = sqlite(env.get('DB_NAME', 'db.sqlite3'))
+        replica_configs = [sqlite(replica) for replica in replicas]
+    elif engine in ('postgresql', 'postgres'):
+        primary = {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': env.get('DB_NAME', 'ai_erp'),
+            'USER': env.get('DB_USER', 'postgres'),
+            'PASSWORD': env.get('DB_PASSWORD', ''),
+            'HOST': env.get('DB_HOST', 'localhost'),
+            'PORT': env.get('DB_PORT', '5432'),
+        }
+        pool_size = int(env.get('DB_POOL_MAX_SIZE', '0'))
+        if pool_size > 0:
+            # Pool und persistente Verbindungen schließen sich in Django aus
+            primary['OPTIONS'] = {'pool': {
+                'min_size': min(int(env.get('DB_POOL_MIN_SIZE', '2')), pool_size),
+                'max_size': pool_size,
+                'timeout': float(env.get('DB_POOL_TIMEOUT', '10')),
+            }}
+        replica_configs = []
+        for replica in replicas:
+            host, _, port = replica.partition(':')
+            replica_configs.append({**primary, 'HOST': host, 'PORT': port or primary['PORT']})
+    else:
+        raise ValueError(f"Unbekannte DB_ENGINE '{engine}' (erlaubt: sqlite, postgresql).")
+
+    pooled = 'pool' in primary.get('OPTIONS', {})
+    connection = {
+        'CONN_MAX_AGE': 0 if pooled else int(env.get('DB_CONN_MAX_AGE', '60')),
+        'CONN_HEALTH_CHECKS': _flag(env.get('DB_CONN_HEALTH_CHECKS', 'true')),
+    }
+    databases = {PRIMARY: {**primary, **connection}}
+    for number, config in enumerate(replica_configs, start=1):
+        # In Tests zeigen Replicas auf die Test-Datenbank des Primary
+        databases[f'{REPLICA_PREFIX}{number}'] = {**config, **connection, 'TEST': {'MIRROR': PRIMARY}}
+    return databases
+
+
+def replica_aliases() -> List[str]:
+    """Konfigurierte Replica-Aliase (leer ohne Replicas)."""
+    from django.conf import settings
+
+    return [alias for alias in settings.DATABASES if alias.startswith(REPLICA_PREFIX)]
+
+
+def using_replica() -> bool:
+    """True, wenn Lesezugriffe an dieser Stelle an eine Replica gehen."""
+    from django.db import connections
+
+    return (
+        _replica_scope.get()
+        and bool(replica_aliases())
+        # In einer Transaktion muss der Code seine eigenen Schreibzugriffe sehen
+        and not connections[PRIMARY].in_atomic_block
+    )
+
+
+class read_replica(ContextDecorator):
+    """
+    Leitet Lesezugriffe eines Blocks an eine Replica (Context Manager oder Decorator).
+
+    Nur für Auswertungen, die eine kurze Replikationsverzögerung vertragen.
+    Ohne Replicas und innerhalb von Transaktionen bleibt alles auf dem Primary.
+
+    Beispiel:
+        @read_replica()
+        def get_dashboard_kpis(...): ...
+    """
+
+    def _recreate_cm(self) -> 'read_replica':
+        # Als Decorator je Aufruf eine eigene Instanz (Token nicht zwischen Threads teilen)
+        return type(self)()
+
+    def __enter__(self) -> 'read_replica':
+        self._token = _replica_scope.set(True)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        _replica_scope.reset(self._token)
+
+
+class PrimaryReplicaRouter:
+    """
+    Datenbank-Router: Schreiben und Lesen auf dem Primary, Lesen in `read_replica()` auf einer Replica.
+
+    Eingetragen in `settings.DATABASE_ROUTERS`.
+    """
+
+    def db_for_read(self, model, **hints) -> str:
+        if using_replica():
+            return random.choice(replica_aliases())
+        return PRIMARY
+
+    def db_for_write(self, model, **hints) -> str:
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints) -> bool:
+        # Primary und Replicas enthalten dieselben Daten
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints) -> bool:
+        return db == PRIMARY
@@ -0,0 +1,407 @@
+"""
+Streaming-Import von Stammdaten (Infrastruktur).
+
+Liest CSV- und DATEV-Dateien zeilenweise und validiert die Zeilen in Chunks
+parallel (Prozess-Pool). Ein Index gehashter Schlüssel gleicht sie mit dem
+Bestand ab: neue Datensätze, geänderte und unveränderte. Geschrieben wird
+je Chunk mit `bulk_create`/`bulk_update`. Fehlerhafte Zeilen werden mit
+Zeilennummer gemeldet, ohne den Lauf abzubrechen.
+
+Die fachlichen Regeln (Spalten, Validierung, Schlüssel) liefert je Entität
+eine `Importer`-Unterklasse in der jeweiligen App, z.B.
+`apps.sales.services.CustomerImporter`.
+"""
+
+import csv
+import hashlib
+import json
+import multiprocessing
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from decimal import Decimal, InvalidOperation
+from itertools import chain, islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, models, transaction
+from django.utils import timezone
+
+from core import audit
+from core.cache import invalidate_tags
+from core.models import AuditLog
+from core.search import index_objects
+from core.utils.processes import process_pool
+
+
+# Zeilen je Validierungs- und Schreib-Chunk
+CHUNK_SIZE = 2_000
+
+# Batchgröße für bulk_create/bulk_update
+BULK_BATCH_SIZE = 1_000
+
+# Im Bericht gespeicherte Fehler (alle Fehler: `error_file`)
+MAX_REPORTED_ERRORS = 1_000
+
+# Kennung der ersten Zeile einer DATEV-Datei (Metadaten vor der Kopfzeile)
+DATEV_MARKERS = ('EXTF', 'DTVF')
+
+Row = Tuple[int, Dict[str, str]]
+
+
+class RowValidationError(ValueError):
+    """Eine Zeile ist ungültig (Fehlermeldung je Feld)."""
+
+    def __init__(self, errors: Dict[str, str]) -> None:
+        self.errors = errors
+        super().__init__('; '.join(f'{name}: {message}' for name, message in errors.items()))
+
+
+def parse_decimal(value: str) -> Decimal:
+    """
+    Liest eine Zahl im deutschen ('1.234,56') oder technischen Format ('1234.56').
+
+    Raises:
+        ValueError: Keine gültige Zahl
+    """
+    text = value.strip().replace(' ', '')
+    if ',' in text:
+        text = text.replace('.', '').replace(',', '.')
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        raise ValueError(f"Ungültige Zahl: {value}") from None
+
+
+class Importer:
+    """
+    Basisklasse für den Import einer Entität.
+
+    Unterklassen setzen `model`, `key_field`, `fields` und `columns` und
+    validieren einzelne Felder mit `clean_<feld>(value, row)`. Die Methode
+    liefert den Wert im Typ des Model-Felds oder wirft `ValueError`. Felder
+    ohne eigene Methode werden als getrimmter Text übernommen.
+
+    Instanzen werden an die Worker-Prozesse übergeben und dürfen daher
+    keinen Zustand halten.
+    """
+
+    model: type = models.Model
+    # Natürlicher Schlüssel für den Abgleich mit dem Bestand (z.B. Artikelnummer)
+    key_field: str = ''
+    # Geschriebene Model-Felder
+    fields: Tuple[str, ...] = ()
+    # Feld (oder Hilfsspalte) → akzeptierte Spaltennamen (klein geschrieben)
+    columns: Dict[str, Tuple[str, ...]] = {}
+    # Felder, die auch aus Hilfsspalten gebildet werden (z.B. Name aus Vor- und Nachname)
+    sources: Dict[str, Tuple[str, ...]] = {}
+
+    def provided_fields(self, row: Dict[str, str]) -> Tuple[str, ...]:
+        """Felder, für die die Datei Spalten enthält; nur diese werden bei bestehenden Datensätzen geändert."""
+        return tuple(
+            name for name in self.fields
+            if name in row or any(source in row for source in self.sources.get(name, ()))
+        )
+
+    def map_header(self, header: List[str]) -> List[Optional[str]]:
+        """Ordnet den Spalten der Datei die Felder zu (unbekannte Spalten: None)."""
+        aliases = {alias: name for name, names in self.columns.items() for alias in (name, *names)}
+        return [aliases.get(column.strip().lower()) for column in header]
+
+    def clean(self, row: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Validiert eine Zeile.
+
+        Args:
+            row: Werte je Feld bzw. Hilfsspalte
+
+        Returns:
+            Dict[str, Any]: Bereinigte Werte aller `fields`
+
+        Raises:
+            RowValidationError: Mindestens ein Feld ist ungültig
+        """
+        cleaned: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        for name in self.fields:
+            value = (row.get(name) or '').strip()
+            cleaner = getattr(self, f'clean_{name}', None)
+            try:
+                cleaned[name] = cleaner(value, row) if cleaner else value
+            except ValueError as exc:
+                errors[name] = str(exc)
+        if errors:
+            raise RowValidationError(errors)
+        return cleaned
+
+
+@dataclass(frozen=True)
+class ImportRowError:
+    """Fehler einer Zeile der Importdatei."""
+
+    line: int
+    field: str
+    message: str
+
+
+@dataclass
+class ImportReport:
+    """
+    Ergebnis eines Imports.
+
+    Attributes:
+        read: Gelesene Zeilen
+        created: Neu angelegte Datensätze
+        updated: Geänderte Datensätze
+        unchanged: Datensätze ohne Änderung (nicht geschrieben)
+        failed: Fehlerhafte Zeilen
+        errors: Die ersten `MAX_REPORTED_ERRORS` Fehler
+        seconds: Laufzeit
+    """
+
+    read: int = 0
+    created: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    failed: int = 0
+    errors: List[ImportRowError] = field(default_factory=list)
+    seconds: float = 0.0
+    dry_run: bool = False
+    _error_writer: Any = field(default=None, repr=False)
+
+    def add_errors(self, line: int, errors: Dict[str, str]) -> None:
+        self.failed += 1
+        for name, message in errors.items():
+            error = ImportRowError(line, name, message)
+            if len(self.errors) < MAX_REPORTED_ERRORS:
+                self.errors.append(error)
+            if self._error_writer is not None:
+                self._error_writer.writerow([error.line, error.field, error.message])
+
+    def summary(self) -> str:
+        prefix = 'Probelauf: ' if self.dry_run else ''
+        return (
+            f"{prefix}{self.read} Zeilen in {self.seconds:.1f} s: {self.created} neu, {self.updated} geändert, "
+            f"{self.unchanged} unverändert, {self.failed} fehlerhaft"
+        )
+
+
+class _Semicolon(csv.excel):
+    delimiter = ';'
+
+
+def _sniff(path: Path) -> Tuple[str, csv.Dialect]:
+    """Ermittelt Zeichensatz (UTF-8, sonst Windows-1252 wie bei DATEV) und Trennzeichen."""
+    with open(path, 'rb') as file:
+        sample = file.read(64 * 1024)
+    sample = sample[:sample.rfind(b'\n') + 1] or sample
+    try:
+        text = sample.decode('utf-8-sig')
+        encoding = 'utf-8-sig'
+    except UnicodeDecodeError:
+        text = sample.decode('cp1252')
+        encoding = 'cp1252'
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=';,\t')
+    except csv.Error:
+        dialect = _Semicolon
+    return encoding, dialect
+
+
+def read_rows(path: Path, importer: Importer) -> Iterator[Row]:
+    """
+    Liest eine CSV- oder DATEV-Datei zeilenweise (ohne sie vollständig zu laden).
+
+    Bei DATEV-Dateien ('EXTF' in der ersten Zeile) wird die Metadatenzeile
+    übersprungen; die Spalten werden über `importer.columns` zugeordnet.
+
+    Args:
+        path: Importdatei
+        importer: Importer der Entität
+
+    Returns:
+        Iterator[Row]: (Zeilennummer, Werte je Feld)
+    """
+    encoding, dialect = _sniff(Path(path))
+    with open(path, newline='', encoding=encoding) as file:
+        reader = csv.reader(file, dialect)
+        header = next(reader, [])
+        if header and header[0].strip('"') in DATEV_MARKERS:
+            header = next(reader, [])
+        names = importer.map_header(header)
+        for values in reader:
+            if not any(values):
+                continue
+            yield reader.line_num, {name: value for name, value in zip(names, values) if name}
+
+
+def _validate_chunk(importer: Importer, rows: List[Row]) -> List[Tuple[int, Optional[dict], Optional[dict]]]:
+    """Validiert einen Chunk (läuft im Worker-Prozess)."""
+    results = []
+    for line, row in rows:
+        try:
+            results.append((line, importer.clean(row), None))
+        except RowValidationError as exc:
+            results.append((line, None, exc.errors))
+    return results
+
+
+def _validated(importer: Importer, rows: Iterable[Row], workers: Optional[int]) -> Iterator[list]:
+    """Validiert Chunks parallel; liefert sie in Dateireihenfolge (höchstens 2 Chunks je Worker im Speicher)."""
+    chunks = iter(lambda: list(islice(rows, CHUNK_SIZE)), [])
+    workers = workers or multiprocessing.cpu_count()
+    if workers == 1:
+        for chunk in chunks:
+            yield _validate_chunk(importer, chunk)
+        return
+    with process_pool(workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(_validate_chunk, importer, chunk))
+            if len(pending) >= workers * 2:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _digest(value: Any) -> int:
+    """64-Bit-Hash eines Schlüssels oder Inhalts (kompakter als die Werte selbst)."""
+    return int.from_bytes(hashlib.blake2b(repr(value).encode(), digest_size=8).digest(), 'big')
+
+
+def _content(values: Iterable[Any]) -> int:
+    return _digest(tuple(str(value) for value in values))
+
+
+def _existing_index(importer: Importer, fields: Tuple[str, ...]) -> Dict[int, Tuple[Any, int]]:
+    """Index des Bestands: Hash des Schlüssels → (Primärschlüssel, Hash der Werte von `fields`)."""
+    queryset = importer.model._default_manager.values_list('pk', importer.key_field, *fields).order_by()
+    return {
+        _digest(values[1]): (values[0], _content(values[2:]))
+        for values in queryset.iterator(chunk_size=5_000)
+    }
+
+
+def _write(importer: Importer, creates: List[Tuple[int, models.Model]],
+           updates: List[Tuple[int, models.Model]], update_fields: Tuple[str, ...], report: ImportReport) -> None:
+    """Schreibt einen Chunk in einer Transaktion; bei Datenbankfehlern gelten seine Zeilen als fehlerhaft."""
+    try:
+        with audit.atomic():
+            created = [instance for _, instance in creates]
+            importer.model._default_manager.bulk_create(created, batch_size=BULK_BATCH_SIZE)
+            now = timezone.now()
+            updated = [instance for _, instance in updates]
+            for instance in updated:
+                instance.updated_at = now
+            importer.model._default_manager.bulk_update(
+                updated, [*update_fields, 'updated_at'], batch_size=BULK_BATCH_SIZE,
+            )
+            audit.record_many(created, AuditLog.Action.CREATE)
+            audit.record_many(updated, AuditLog.Action.UPDATE, changes=[
+                json.loads(json.dumps({name: getattr(instance, name) for name in update_fields}, cls=DjangoJSONEncoder))
+                for instance in updated
+            ])
+            if created or updated:
+                label = importer.model._meta.label
+                transaction.on_commit(lambda: invalidate_tags(label))
+                # Suchdokumente fortschreiben (bulk_create/bulk_update lösen keine Signale aus)
+                transaction.on_commit(lambda: index_objects(created + updated))
+    except DatabaseError as exc:
+        for line, _ in creates + updates:
+            report.add_errors(line, {importer.key_field: f"Datenbankfehler: {exc}"})
+        return
+    report.created += len(creates)
+    report.updated += len(updates)
+
+
+def run_import(
+    importer: Importer,
+    rows: Iterable[Row],
+    workers: Optional[int] = None,
+    dry_run: bool = False,
+    error_file: Optional[Path] = None,
+    progress: Optional[Callable[[ImportReport], None]] = None,
+) -> ImportReport:
+    """
+    Importiert Zeilen: validieren, mit dem Bestand abgleichen, in Batches schreiben.
+
+    Jeder Chunk wird in einer eigenen Transaktion geschrieben; ein Fehler
+    betrifft nur die Zeilen dieses Chunks. Doppelte Schlüssel innerhalb der
+    Datei werden als Fehler gemeldet (der erste Eintrag gilt). Bestehende
+    Datensätze werden nur in den Feldern geändert, für die die Datei Spalten
+    enthält (bestimmt an der ersten Zeile; alle Zeilen haben dieselben Spalten).
+
+    Args:
+        importer: Importer der Entität
+        rows: (Zeilennummer, Werte je Feld), z.B. aus `read_rows`
+        workers: Validierungs-Prozesse (Standard: Anzahl CPUs; 1 = im aktuellen Prozess)
+        dry_run: Nur validieren und abgleichen, nichts schreiben
+        error_file: Optional CSV-Datei für alle Fehler (Zeile;Feld;Meldung)
+        progress: Wird nach jedem Chunk mit dem Zwischenstand aufgerufen
+
+    Returns:
+        ImportReport: Zähler und Fehler
+    """
+    started = time.perf_counter()
+    report = ImportReport(dry_run=dry_run)
+    error_handle = open(error_file, 'w', newline='', encoding='utf-8') if error_file else None
+    if error_handle:
+        report._error_writer = csv.writer(error_handle, delimiter=';')
+        report._error_writer.writerow(['Zeile', 'Feld', 'Meldung'])
+
+    try:
+        rows = iter(rows)
+        first = next(rows, None)
+        update_fields = importer.provided_fields(first[1]) if first else importer.fields
+        existing = _existing_index(importer, update_fields)
+        seen = set()
+        for results in _validated(importer, chain([first] if first else [], rows), workers):
+            creates, updates = [], []
+            for line, cleaned, errors in results:
+                report.read += 1
+                if errors:
+                    report.add_errors(line, errors)
+                    continue
+                key = _digest(cleaned[importer.key_field])
+                if key in seen:
+                    report.add_errors(line, {importer.key_field: "Schlüssel ist in der Datei doppelt."})
+                    continue
+                seen.add(key)
+                match = existing.get(key)
+                if match is None:
+                    creates.append((line, importer.model(**cleaned)))
+                elif match[1] == _content(cleaned[name] for name in update_fields):
+                    report.unchanged += 1
+                else:
+                    updates.append((line, importer.model(pk=match[0], **{
+                        name: cleaned[name] for name in update_fields
+                    })))
+            if dry_run:
+                report.created += len(creates)
+                report.updated += len(updates)
+            elif creates or updates:
+                _write(importer, creates, updates, update_fields, report)
+            if progress:
+                progress(report)
+    finally:
+        if error_handle:
+            error_handle.close()
+        report._error_writer = None
+
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def import_file(importer: Importer, path: Path, **options) -> ImportReport:
+    """
+    Importiert eine CSV- oder DATEV-Datei (Optionen wie `run_import`).
+
+    Args:
+        importer: Importer der Entität
+        path: Importdatei
+
+    Returns:
+        ImportReport: Zähler und Fehler
+    """
+    return run_import(importer, read_rows(Path(path), importer), **options)
@@ -0,0 +1,210 @@
+"""
+Listenansichten mit Keyset-Pagination (Infrastruktur).
+
+Große Tabellen (Buchungszeilen, Artikel, Kunden) werden nicht per OFFSET
+geblättert: Jede Seite setzt hinter dem letzten Eintrag der vorigen Seite
+auf (`WHERE (created_at, id) < (…) ORDER BY created_at DESC, id DESC`) und
+liest über den Index `(created_at, id)` nur die nächsten Zeilen – Seite
+10.000 kostet so viel wie Seite 1. Gelesen werden nur die angezeigten Spalten
+(`values()`), keine Model-Instanzen.
+
+`KeysetList.render()` liefert die ganze Seite, beim Wechsel über die
+Seitenleiste (HTMX) nur die Tabelle und beim Scrollen (`?cursor=…`) nur die
+nächsten Zeilen; die letzte Zeile lädt beim Sichtbarwerden die Folgeseite
+nach (`hx-trigger="revealed"`).
+
+Die Gesamtzahl wird aus der Tabellenstatistik geschätzt (`estimate_count`),
+nicht per `COUNT(*)` gezählt.
+"""
+
+import base64
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from django.db import connections, models, router
+from django.db.models import Q
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
+from django.shortcuts import render
+
+from core.cache import cached_service
+
+
+# Zeilen je nachgeladener Seite
+PAGE_SIZE = 50
+
+
+@dataclass(frozen=True)
+class Column:
+    """
+    Angezeigte Spalte einer Liste.
+
+    Attributes:
+        field: Feld oder Lookup für `values()`, z.B. 'account__number'
+        label: Spaltenüberschrift
+        kind: Darstellung: 'text', 'amount' (2 Nachkommastellen), 'number' oder 'date'
+    """
+
+    field: str
+    label: str
+    kind: str = 'text'
+
+
+@dataclass
+class Page:
+    """
+    Eine Seite einer Liste.
+
+    Attributes:
+        rows: Je Zeile die Werte in Spaltenreihenfolge
+        next_cursor: Cursor der Folgeseite (None auf der letzten Seite)
+    """
+
+    rows: List[List[Any]]
+    next_cursor: Optional[str]
+
+
+def encode_cursor(created_at: datetime, pk: Any) -> str:
+    """Kodiert die Position hinter einer Zeile als URL-tauglichen Cursor."""
+    raw = f'{created_at.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """
+    Liest einen Cursor von `encode_cursor`.
+
+    Raises:
+        ValueError: Bei manipulierten oder unvollständigen Cursorn
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, pk = raw.split('|')
+        return datetime.fromisoformat(created_at), uuid.UUID(pk)
+    except (TypeError, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError(f"Ungültiger Cursor: {cursor!r}") from exc
+
+
+def keyset_page(
+    queryset: models.QuerySet,
+    fields: Sequence[str],
+    cursor: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+) -> Page:
+    """
+    Liest eine Seite, neueste Einträge zuerst.
+
+    Args:
+        queryset: Gefilterte Zeilen eines Models mit `created_at` und UUID-`id`
+        fields: Auszugebende Felder/Lookups
+        cursor: Position hinter der vorigen Seite (None = erste Seite)
+        page_size: Zeilen je Seite
+
+    Returns:
+        Page: Zeilen und Cursor der Folgeseite
+
+    Raises:
+        ValueError: Bei ungültigem Cursor
+    """
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        # `created_at <= …` gibt dem Planer eine Bereichsgrenze im Index, die Oder-Bedingung den Gleichstand
+        queryset = queryset.filter(created_at__lte=created_at).filter(
+            Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        )
+    # Eine Zeile mehr lesen, um zu wissen, ob es eine Folgeseite gibt
+    rows = list(
+        queryset.order_by('-created_at', '-id').values_list(*fields, 'created_at', 'id')[:page_size + 1]
+    )
+    next_cursor = None
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = encode_cursor(*rows[-1][-2:])
+    return Page([list(row[:-2]) for row in rows], next_cursor)
+
+
+@cached_service(ttl=60, key=lambda model: model._meta.label)
+def estimate_count(model: type) -> Optional[int]:
+    """
+    Schätzt die Zeilenzahl einer Tabelle aus der Statistik der Datenbank.
+
+    PostgreSQL: `pg_class.reltuples` (von VACUUM/ANALYZE gepflegt).
+    SQLite: `sqlite_stat1` nach ANALYZE, sonst die höchste `rowid`.
+    Beides kostet unabhängig von der Tabellengröße eine Indexabfrage.
+
+    Args:
+        model: Model-Klasse
+
+    Returns:
+        Optional[int]: Geschätzte Zeilenzahl (None, wenn die Datenbank keine Statistik liefert)
+    """
+    connection = connections[router.db_for_read(model)]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass', [table])
+            row = cursor.fetchone()
+            # -1: Tabelle wurde noch nie analysiert
+            return row[0] if row and row[0] >= 0 else None
+        if connection.vendor == 'sqlite':
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'")
+            if cursor.fetchone():
+                cursor.execute('SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1', [table])
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+            cursor.execute(f'SELECT MAX(rowid) FROM {connection.ops.quote_name(table)}')
+            return cursor.fetchone()[0] or 0
+    return None
+
+
+@dataclass(frozen=True)
+class KeysetList:
+    """
+    Deklaration einer Listenansicht.
+
+    Attributes:
+        title: Seitenüberschrift
+        subtitle: Untertitel
+        queryset: Liefert die anzuzeigenden Zeilen (z.B. gefiltert)
+        columns: Angezeigte Spalten
+        page_size: Zeilen je nachgeladener Seite
+    """
+
+    title: str
+    subtitle: str
+    queryset: Callable[[], models.QuerySet]
+    columns: Tuple[Column, ...]
+    page_size: int = PAGE_SIZE
+
+    def render(self, request: HttpRequest) -> HttpResponse:
+        """
+        Rendert die Liste passend zum Request.
+
+        Args:
+            request: GET-Request; `?cursor=` lädt die Folgeseite
+
+        Returns:
+            HttpResponse: Ganze Seite, nur die Tabelle (HTMX-Navigation)
+                          oder nur die Folgezeilen (HTMX, mit Cursor)
+        """
+        queryset = self.queryset()
+        cursor = request.GET.get('cursor')
+        try:
+            page = keyset_page(queryset, [column.field for column in self.columns], cursor, self.page_size)
+        except ValueError as exc:
+            return HttpResponseBadRequest(str(exc))
+
+        context = {
+            'list': self,
+            'rows': [list(zip(self.columns, row)) for row in page.rows],
+            'next_cursor': page.next_cursor,
+            'path': request.path,
+        }
+        if cursor:
+            return render(request, 'partials/list_rows.html', context)
+        context['estimated_total'] = estimate_count(queryset.model)
+        if request.headers.get('HX-Request'):
+            return render(request, 'partials/list_table.html', context)
+        return render(request, 'list.html', context)
@@ -0,0 +1,88 @@
+"""
+Benchmark für die Volltextsuche (`core.search`).
+
+Legt synthetische Suchdokumente (Zipf-verteiltes Vokabular) in einer
+Transaktion an, misst die Antwortzeit von `search()` für ganze Wörter und
+Präfixe und rollt anschließend alles zurück. Benötigt eine migrierte
+Datenbank; gemessen wird das konfigurierte Backend (PostgreSQL oder SQLite).
+
+Aufruf:
+    python manage.py benchmark_search --documents 200000 --queries 500
+"""
+
+import random
+import statistics
+import time
+from itertools import accumulate
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core import search
+from core.models import SearchDocument
+
+
+class Command(BaseCommand):
+    help = 'Misst die Suchzeit der Volltextsuche (p50/p95) für viele Dokumente.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--documents', type=int, default=200_000, help='Anzahl Suchdokumente')
+        parser.add_argument('--words', type=int, default=12, help='Wörter je Dokument')
+        parser.add_argument('--vocabulary', type=int, default=50_000, help='Größe des Vokabulars')
+        parser.add_argument('--queries', type=int, default=500, help='Anzahl Suchanfragen')
+        parser.add_argument('--seed', type=int, default=42, help='Zufalls-Seed')
+
+    def handle(self, *args, **options) -> None:
+        rng = random.Random(options['seed'])
+        # Gleich lange Wörter: ein abgeschnittenes Wort ist Präfix weniger anderer (wie bei echter Eingabe)
+        width = len(str(options['vocabulary']))
+        vocabulary = [f'begriff{number:0{width}d}' for number in range(options['vocabulary'])]
+        weights = list(accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+        def words(count: int) -> list:
+            return rng.choices(vocabulary, cum_weights=weights, k=count)
+
+        queries = []
+        for _ in range(options['queries']):
+            terms = words(rng.randint(1, 3))
+            # Jede zweite Anfrage mit abgeschnittenem letzten Wort (Eingabe während des Tippens)
+            if rng.random() < 0.5:
+                terms[-1] = terms[-1][:-1]
+            queries.append(' '.join(terms))
+
+        with transaction.atomic():
+            started = time.perf_counter()
+            for offset in range(0, options['documents'], search.BATCH_SIZE):
+                count = min(search.BATCH_SIZE, options['documents'] - offset)
+                search._insert('benchmark', [
+                    SearchDocument(
+                        entity_type='benchmark',
+                        object_id=str(offset + number),
+                        title=' '.join(words(3)),
+                        body=' '.join(words(options['words'])),
+                    )
+                    for number in range(count)
+                ])
+            # Zustand wie im Betrieb nach autovacuum: Statistiken für den Planer und (PostgreSQL)
+            # GIN-Pending-List in den Index übernommen, sonst wird sie bei jeder Suche linear gelesen
+            with connection.cursor() as cursor:
+                cursor.execute(f'ANALYZE {SearchDocument._meta.db_table}')
+                if connection.vendor == 'postgresql':
+                    cursor.execute("SELECT gin_clean_pending_list('core_searchdocument_vector')")
+            build_seconds = time.perf_counter() - started
+
+            durations = []
+            hits = 0
+            for query in queries:
+                started = time.perf_counter()
+                hits += bool(search.search(query))
+                durations.append((time.perf_counter() - started) * 1000)
+            transaction.set_rollback(True)
+
+        durations.sort()
+        self.stdout.write(f"Dokumente:       {options['documents']:,}")
+        self.stdout.write(f"Aufbau:          {build_seconds:.1f} s")
+        self.stdout.write(f"Anfragen:        {len(queries)} ({hits} mit Treffern)")
+        self.stdout.write(f"Suche p50:       {statistics.median(durations):.2f} ms")
+        self.stdout.write(f"Suche p95:       {durations[int(len(durations) * 0.95) - 1]:.2f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Suche max:       {durations[-1]:.2f} ms"))
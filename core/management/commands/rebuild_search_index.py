@@ -0,0 +1,27 @@
+"""
+Baut die Suchdokumente der Volltextsuche (`core.search`) neu auf.
+
+Nötig nach der Ersteinrichtung, nach Änderungen an den Texten einer Quelle
+(`@search_source`) oder nach Massenänderungen per `QuerySet.update`.
+
+Aufruf:
+    python manage.py rebuild_search_index
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = 'Baut den Volltextindex für Kunden, Artikel usw. neu auf.'
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        counts = rebuild_index()
+        seconds = time.perf_counter() - started
+        for entity_type, count in sorted(counts.items()):
+            self.stdout.write(f"{entity_type:<12} {count:>10,}")
+        self.stdout.write(self.style.SUCCESS(f"{sum(counts.values()):,} Suchdokumente in {seconds:.1f} s indiziert."))
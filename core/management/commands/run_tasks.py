@@ -0,0 +1,38 @@
+"""
+Startet einen Worker der lokalen Task-Queue (`core.tasks`).
+
+Für mehr Parallelität mehrere Worker-Prozesse starten; Aufträge werden per
+bedingtem UPDATE übernommen und nie doppelt ausgeführt.
+
+Aufruf:
+    python manage.py run_tasks
+    python manage.py run_tasks --burst   # beenden, wenn nichts mehr fällig ist
+"""
+
+from django.core.management.base import BaseCommand
+
+from core.models import TaskRecord
+from core.tasks import run_worker
+
+
+class Command(BaseCommand):
+    help = 'Arbeitet Hintergrund-Tasks der lokalen Task-Queue ab.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--burst', action='store_true', help='Beenden, wenn keine Aufträge fällig sind')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Wartezeit ohne Aufträge (s)')
+        parser.add_argument('--name', help='Name des Workers (Standard: Host:PID)')
+
+    def handle(self, *args, **options) -> None:
+        processed = run_worker(
+            worker=options['name'],
+            burst=options['burst'],
+            poll_interval=options['poll_interval'],
+            on_task=self._report,
+        )
+        self.stdout.write(self.style.SUCCESS(f"{processed} Aufträge ausgeführt."))
+
+    def _report(self, record: TaskRecord) -> None:
+        line = f"{record.name} [{record.get_status_display()}] {record.duration_ms} ms (Versuch {record.attempts})"
+        style = self.style.ERROR if record.status == TaskRecord.Status.FAILED else self.style.SUCCESS
+        self.stdout.write(style(line) if record.status != TaskRecord.Status.QUEUED else line)
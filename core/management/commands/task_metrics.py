@@ -0,0 +1,34 @@
+"""
+Zeigt Laufzeit-Kennzahlen der Hintergrund-Tasks je Task.
+
+Aufruf:
+    python manage.py task_metrics
+    python manage.py task_metrics --hours 24
+"""
+
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.tasks import get_task_metrics
+
+
+class Command(BaseCommand):
+    help = 'Zeigt Anzahl, Status und Laufzeiten der Hintergrund-Tasks.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--hours', type=int, help='Nur Aufträge der letzten N Stunden')
+
+    def handle(self, *args, **options) -> None:
+        since = timezone.now() - timedelta(hours=options['hours']) if options['hours'] else None
+        self.stdout.write(
+            f"{'Task':<50} {'Gesamt':>7} {'Wart.':>6} {'OK':>6} {'Fehler':>6} "
+            f"{'Versuche':>8} {'Ø ms':>8} {'max ms':>8} {'Ø Warten ms':>12}"
+        )
+        for row in get_task_metrics(since):
+            self.stdout.write(
+                f"{row['name']:<50} {row['total']:>7} {row['queued']:>6} {row['succeeded']:>6} "
+                f"{row['failed']:>6} {row['attempts']:>8} {row['avg_ms'] or 0:>8.0f} "
+                f"{row['max_ms'] or 0:>8} {row['avg_wait_ms'] or 0:>12.0f}"
+            )
@@ -0,0 +1,37 @@
+"""
+Prüft die Hash-Kette des Änderungsprotokolls (GoBD Unveränderbarkeit).
+
+Streamt alle Einträge in Chunks (konstanter Speicher) und meldet Lücken,
+gebrochene Verkettungen und veränderte Inhalte.
+
+Aufruf:
+    python manage.py verify_audit_chain --chunk-size 5000
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.audit import CHUNK_SIZE, verify_chain
+
+
+class Command(BaseCommand):
+    help = 'Prüft die Hash-Kette des Änderungsprotokolls auf Manipulationen.'
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='Zeilen je Fetch')
+        parser.add_argument('--max-errors', type=int, default=100, help='Abbruch nach N Fehlern')
+
+    def handle(self, *args, **options) -> None:
+        started = time.perf_counter()
+        errors = 0
+        for violation in verify_chain(chunk_size=options['chunk_size']):
+            errors += 1
+            self.stderr.write(f"Eintrag {violation.sequence}: {violation.reason}")
+            if errors >= options['max_errors']:
+                break
+
+        seconds = time.perf_counter() - started
+        if errors:
+            raise CommandError(f"Audit-Kette ungültig: {errors} Fehler gefunden ({seconds:.1f} s).")
+        self.stdout.write(self.style.SUCCESS(f"Audit-Kette vollständig und unverändert ({seconds:.1f} s)."))
@@ -0,0 +1,304 @@
+"""
+Laufzeit-Metriken im Prozess (Infrastruktur).
+
+Erfasst je View Latenz, Anzahl und Dauer der DB-Abfragen sowie die
+Template-Renderzeit (`core.middleware.MetricsMiddleware`), dazu Cache-
+Treffer (auch von `@cached_service`) und eigene Messpunkte von Services
+(`@timed`). Die Werte werden im Prozess in Histogrammen/Zählern aggregiert
+(ein Lock und ein `bisect` je Messung) und unter `/metrics/` im
+Prometheus-Textformat ausgegeben.
+
+Hinweis: Bei mehreren Worker-Prozessen (z.B. Gunicorn) liefert jeder Prozess
+seine eigenen Werte.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Histogramm-Grenzen in Sekunden (Latenzen)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Histogramm-Grenzen für die Anzahl DB-Abfragen je Request
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class Counter:
+    """Monoton steigender Zähler je Label-Kombination."""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield self.name, tuple(zip(self.labelnames, labels)), value
+
+
+class Histogram:
+    """Histogramm mit festen Grenzen je Label-Kombination."""
+
+    kind = 'histogram'
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # Je Label-Kombination: [Anzahl je Bucket (+Inf zuletzt)], Summe
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(labels) or self._values.setdefault(
+                labels, ([0] * (len(self.buckets) + 1), [0.0]),
+            )
+            counts[index] += 1
+            total[0] += value
+
+    def samples(self) -> Iterable[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            values = [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+        for labels, counts, total in values:
+            label_pairs = tuple(zip(self.labelnames, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = '+Inf' if bound == float('inf') else repr(float(bound))
+                yield self.name + '_bucket', label_pairs + (('le', le),), cumulative
+            yield self.name + '_sum', label_pairs, total
+            yield self.name + '_count', label_pairs, cumulative
+
+
+_registry: List = []
+
+
+def _register(metric):
+    _registry.append(metric)
+    return metric
+
+
+REQUEST_LATENCY = _register(Histogram(
+    'http_request_duration_seconds', 'Antwortzeit je View.', ('view', 'method'),
+))
+REQUESTS = _register(Counter(
+    'http_requests_total', 'Requests je View und Statusklasse.', ('view', 'method', 'status'),
+))
+REQUEST_QUERIES = _register(Histogram(
+    'http_request_db_queries', 'DB-Abfragen je Request.', ('view',), QUERY_COUNT_BUCKETS,
+))
+REQUEST_DB_TIME = _register(Histogram(
+    'http_request_db_duration_seconds', 'DB-Zeit je Request.', ('view',),
+))
+REQUEST_TEMPLATE_TIME = _register(Histogram(
+    'http_request_template_duration_seconds', 'Template-Renderzeit je Request.', ('view',),
+))
+CACHE_REQUESTS = _register(Counter(
+    'cache_requests_total', 'Cache-Zugriffe nach Ergebnis (hit/miss).', ('backend', 'result'),
+))
+SERVICE_CACHE_REQUESTS = _register(Counter(
+    'service_cache_requests_total', 'Aufrufe von @cached_service nach Ergebnis (local/shared/stale/miss).',
+    ('service', 'result'),
+))
+SPAN_LATENCY = _register(Histogram(
+    'span_duration_seconds', 'Laufzeit instrumentierter Funktionen (@timed).', ('span',),
+))
+
+
+@dataclass
+class RequestStats:
+    """Während eines Requests gesammelte Werte (über `ContextVar`, auch in async Views)."""
+
+    queries: int = 0
+    db_seconds: float = 0.0
+    template_seconds: float = 0.0
+    template_depth: int = 0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar('metrics_request_stats', default=None)
+
+
+def start_request() -> object:
+    """Beginnt die Erfassung eines Requests; liefert das Token für `end_request`."""
+    return _request_stats.set(RequestStats())
+
+
+def end_request(token: object) -> RequestStats:
+    """Beendet die Erfassung eines Requests und liefert die gesammelten Werte."""
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    return stats
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    """DB-Execute-Wrapper: zählt Abfragen und Zeit des laufenden Requests."""
+    stats = _request_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.queries += 1
+        stats.db_seconds += time.perf_counter() - started
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+def _instrument_templates() -> None:
+    """Misst die Renderzeit der Django-Templates (nur äußerste Ebene, ohne Includes doppelt zu zählen)."""
+    from django.template.backends.django import Template
+
+    original = Template.render
+    if getattr(original, '_metrics_wrapped', False):
+        return
+
+    @functools.wraps(original)
+    def render(self, context=None, request=None):
+        stats = _request_stats.get()
+        if stats is None:
+            return original(self, context, request)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(self, context, request)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_seconds += time.perf_counter() - started
+
+    render._metrics_wrapped = True
+    Template.render = render
+
+
+_MISSING = object()
+
+
+def _instrument_caches() -> None:
+    """Zählt Treffer und Fehlschläge von `get` der konfigurierten Cache-Backends."""
+    from django.core.cache import caches
+
+    for alias in caches.settings:
+        backend_class = type(caches[alias])
+        original = backend_class.get
+        if getattr(original, '_metrics_wrapped', False):
+            continue
+        label = backend_class.__name__
+
+        def get(self, key, default=None, version=None, _original=original, _label=label):
+            value = _original(self, key, _MISSING, version)
+            if value is _MISSING:
+                CACHE_REQUESTS.inc(_label, 'miss')
+                return default
+            CACHE_REQUESTS.inc(_label, 'hit')
+            return value
+
+        get._metrics_wrapped = True
+        backend_class.get = get
+
+
+def install() -> None:
+    """Aktiviert DB-, Template- und Cache-Messung (einmalig in `CoreConfig.ready`)."""
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_on_connection_created, dispatch_uid='core_metrics_queries')
+    _instrument_templates()
+    _instrument_caches()
+
+
+def record_request(view: str, method: str, status: int, seconds: float, stats: RequestStats) -> None:
+    """Übernimmt die Messwerte eines abgeschlossenen Requests in die Histogramme."""
+    REQUEST_LATENCY.observe(seconds, view, method)
+    REQUESTS.inc(view, method, f'{status // 100}xx')
+    REQUEST_QUERIES.observe(stats.queries, view)
+    REQUEST_DB_TIME.observe(stats.db_seconds, view)
+    REQUEST_TEMPLATE_TIME.observe(stats.template_seconds, view)
+
+
+def timed(func: Optional[Callable] = None, *, name: Optional[str] = None):
+    """
+    Decorator: misst die Laufzeit einer Funktion als Span (`span_duration_seconds`).
+
+    Beispiel:
+        @timed
+        def simulate_invoice_draft() -> dict: ...
+
+        @timed(name='sales.bulk_render')
+        async def render(...): ...
+    """
+    def decorate(function: Callable) -> Callable:
+        span = name or f'{function.__module__}.{function.__qualname__}'
+
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def async_wrapper(*args, **kwargs):
+                started = time.perf_counter()
+                try:
+                    return await function(*args, **kwargs)
+                finally:
+                    SPAN_LATENCY.observe(time.perf_counter() - started, span)
+            return async_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                SPAN_LATENCY.observe(time.perf_counter() - started, span)
+        return wrapper
+
+    return decorate(func) if func is not None else decorate
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics() -> str:
+    """
+    Gibt alle Metriken im Prometheus-Textformat (Version 0.0.4) aus.
+
+    Returns:
+        str: Inhalt für `/metrics/`
+    """
+    lines = []
+    for metric in _registry:
+        lines.append(f'# HELP {metric.name} {metric.documentation}')
+        lines.append(f'# TYPE {metric.name} {metric.kind}')
+        for sample, labels, value in metric.samples():
+            label_text = ','.join(f'{key}="{_escape(str(val))}"' for key, val in labels)
+            lines.append(f'{sample}{{{label_text}}} {_format(value)}' if label_text else f'{sample} {_format(value)}')
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,136 @@
+"""
+Globale Middleware des Core-Moduls.
+
+Enthält nur Infrastruktur (Audit-Kontext, Metriken, Abfrage-Prüfung), keine Geschäftslogik.
+
+Alle Klassen sind synchron und asynchron nutzbar: Unter ASGI laufen die
+async Chat-Views (`apps.ai_engine.views`) so ohne `async_to_sync`-Umweg über
+einen Worker-Thread je Request.
+"""
+
+import time
+from typing import Awaitable, Callable, Union
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from core import metrics
+from core.audit import async_audit_scope, audit_scope
+from core.queries import report, track_queries
+
+
+class HybridMiddleware:
+    """
+    Basis für Middleware, die synchron (WSGI) und asynchron (ASGI) läuft.
+
+    Unterklassen implementieren `handle` und `ahandle`; `__call__` wählt
+    passend zur Kette (Django prüft `async_capable`/`sync_capable`).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        if iscoroutinefunction(self):
+            return self.ahandle(request)
+        return self.handle(request)
+
+    def handle(self, request: HttpRequest) -> HttpResponse:
+        raise NotImplementedError
+
+    async def ahandle(self, request: HttpRequest) -> HttpResponse:
+        raise NotImplementedError
+
+
+class AuditMiddleware(HybridMiddleware):
+    """
+    Setzt den Audit-Kontext (Benutzer, IP) je Request; die Einträge selbst
+    schreiben die Services in ihrer Transaktion (`core.audit.atomic`).
+
+    Muss nach `AuthenticationMiddleware` stehen.
+    """
+
+    def _scope_kwargs(self, request: HttpRequest) -> dict:
+        return {
+            'ip_address': request.META.get('REMOTE_ADDR'),
+            'user_resolver': lambda: getattr(getattr(request, 'user', None), 'pk', None),
+        }
+
+    def handle(self, request: HttpRequest) -> HttpResponse:
+        with audit_scope(**self._scope_kwargs(request)):
+            return self.get_response(request)
+
+    async def ahandle(self, request: HttpRequest) -> HttpResponse:
+        async with async_audit_scope(**self._scope_kwargs(request)):
+            return await self.get_response(request)
+
+
+class MetricsMiddleware(HybridMiddleware):
+    """
+    Erfasst je View Antwortzeit, DB-Abfragen, DB-Zeit und Template-Renderzeit
+    (`core.metrics`, ausgegeben unter `/metrics/`).
+
+    Steht als erste Middleware, damit die gesamte Verarbeitung gemessen wird.
+    Bei Streaming-Antworten (z.B. Chat-SSE) endet die Messung mit dem Start
+    des Streams.
+    """
+
+    def handle(self, request: HttpRequest) -> HttpResponse:
+        token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            stats = metrics.end_request(token)
+        self._record(request, response, started, stats)
+        return response
+
+    async def ahandle(self, request: HttpRequest) -> HttpResponse:
+        token = metrics.start_request()
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            stats = metrics.end_request(token)
+        self._record(request, response, started, stats)
+        return response
+
+    def _record(self, request: HttpRequest, response: HttpResponse, started: float, stats) -> None:
+        # Label aus dem URL-Namen, nie aus dem Pfad (begrenzte Anzahl Zeitreihen)
+        match = getattr(request, 'resolver_match', None)
+        view = (match.view_name or match.route) if match else '<unresolved>'
+        metrics.record_request(view, request.method, response.status_code, time.perf_counter() - started, stats)
+
+
+class QueryInspectionMiddleware(HybridMiddleware):
+    """
+    Prüft jeden Request auf wiederholte Abfrageformen (N+1) und optional auf
+    das Abfrage-Budget `settings.REQUEST_QUERY_BUDGET` (`core.queries`).
+    """
+
+    def __init__(self, get_response: Callable) -> None:
+        super().__init__(get_response)
+        self.budget = getattr(settings, 'REQUEST_QUERY_BUDGET', None)
+
+    def handle(self, request: HttpRequest) -> HttpResponse:
+        with track_queries() as log:
+            response = self.get_response(request)
+        self._report(request, log)
+        return response
+
+    async def ahandle(self, request: HttpRequest) -> HttpResponse:
+        # Abfragen aus `sync_to_async` erben den Kontext und landen im selben Log
+        with track_queries() as log:
+            response = await self.get_response(request)
+        self._report(request, log)
+        return response
+
+    def _report(self, request: HttpRequest, log) -> None:
+        match = getattr(request, 'resolver_match', None)
+        report(f"{request.method} {match.view_name if match else request.path}", log, self.budget)
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:03
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuditChainHead',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(default='audit', max_length=50, unique=True)),
+                ('sequence', models.PositiveBigIntegerField(default=0)),
+                ('hash', models.CharField(max_length=64)),
+            ],
+            options={
+                'verbose_name': 'Audit-Kettenkopf',
+                'verbose_name_plural': 'Audit-Kettenköpfe',
+            },
+        ),
+        migrations.CreateModel(
+            name='AuditLog',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('sequence', models.PositiveBigIntegerField(help_text='Position in der Hash-Kette.', unique=True)),
+                ('timestamp', models.DateTimeField(db_index=True)),
+                ('ip_address', models.GenericIPAddressField(blank=True, null=True)),
+                ('model_name', models.CharField(max_length=100)),
+                ('object_id', models.CharField(max_length=64)),
+                ('action', models.CharField(choices=[('create', 'Angelegt'), ('update', 'Geändert'), ('delete', 'Gelöscht'), ('view', 'Angesehen'), ('export', 'Exportiert')], max_length=20)),
+                ('changes', models.JSONField(blank=True, null=True)),
+                ('previous_hash', models.CharField(max_length=64)),
+                ('hash', models.CharField(max_length=64)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Änderungsprotokoll',
+                'verbose_name_plural': 'Änderungsprotokolle',
+                'ordering': ['sequence'],
+                'indexes': [models.Index(fields=['model_name', 'object_id'], name='core_auditl_model_n_3fb686_idx')],
+            },
+        ),
+    ]
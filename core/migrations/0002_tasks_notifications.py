@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:24
+
+import django.core.serializers.json
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('level', models.CharField(choices=[('info', 'Information'), ('success', 'Erfolg'), ('error', 'Fehler')], default='info', max_length=10)),
+                ('title', models.CharField(max_length=200)),
+                ('message', models.TextField(blank=True)),
+                ('link', models.CharField(blank=True, max_length=500)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Benachrichtigung',
+                'verbose_name_plural': 'Benachrichtigungen',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['user', 'read_at', '-created_at'], name='core_notification_inbox')],
+            },
+        ),
+        migrations.CreateModel(
+            name='TaskRecord',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(help_text='Registrierter Task-Name (Modulpfad).', max_length=200)),
+                ('args', models.JSONField(default=list, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('kwargs', models.JSONField(default=dict, encoder=django.core.serializers.json.DjangoJSONEncoder)),
+                ('priority', models.SmallIntegerField(default=0, help_text='Höhere Werte werden zuerst ausgeführt.')),
+                ('status', models.CharField(choices=[('queued', 'Wartend'), ('running', 'Läuft'), ('succeeded', 'Erfolgreich'), ('failed', 'Fehlgeschlagen')], default='queued', max_length=20)),
+                ('run_after', models.DateTimeField(help_text='Frühester Start (Verzögerung, Retry-Backoff).')),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('max_retries', models.PositiveSmallIntegerField(default=0)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('wait_ms', models.PositiveIntegerField(blank=True, help_text='Wartezeit bis zum letzten Start.', null=True)),
+                ('duration_ms', models.PositiveIntegerField(blank=True, help_text='Laufzeit des letzten Versuchs.', null=True)),
+                ('result', models.JSONField(blank=True, encoder=django.core.serializers.json.DjangoJSONEncoder, null=True)),
+                ('error', models.TextField(blank=True)),
+                ('user', models.ForeignKey(blank=True, help_text='Auslösender Benutzer (wird bei Abschluss benachrichtigt).', null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Hintergrund-Task',
+                'verbose_name_plural': 'Hintergrund-Tasks',
+                'indexes': [models.Index(fields=['status', '-priority', 'run_after'], name='core_task_claim'), models.Index(fields=['name', 'finished_at'], name='core_task_metrics')],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:54
+
+import uuid
+from django.db import migrations, models
+
+
+# Volltextindex je Datenbank (core.search): PostgreSQL tsvector + GIN, SQLite FTS5
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE core_searchdocument ADD COLUMN search_vector tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('german', coalesce(title, '')), 'A')
+        || setweight(to_tsvector('german', coalesce(body, '')), 'B')
+    ) STORED
+    """,
+    'CREATE INDEX core_searchdocument_vector ON core_searchdocument USING gin (search_vector)',
+]
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS core_searchdocument_vector',
+    'ALTER TABLE core_searchdocument DROP COLUMN IF EXISTS search_vector',
+]
+SQLITE_FORWARD = [
+    # Enthält die in Python gestemmten Texte; rowid = rowid von core_searchdocument,
+    # entity_type (nicht indiziert) filtert Typen ohne Join auf die Dokumente
+    """
+    CREATE VIRTUAL TABLE core_searchdocument_fts USING fts5(
+        title, body, entity_type UNINDEXED, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3'
+    )
+    """,
+]
+SQLITE_BACKWARD = ['DROP TABLE IF EXISTS core_searchdocument_fts']
+
+
+def _execute(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_tasks_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('entity_type', models.CharField(help_text="Typ des Datensatzes, z.B. 'customer'.", max_length=30)),
+                ('object_id', models.CharField(max_length=64)),
+                ('title', models.CharField(max_length=255)),
+                ('body', models.TextField(blank=True)),
+            ],
+            options={
+                'verbose_name': 'Suchdokument',
+                'verbose_name_plural': 'Suchdokumente',
+                'constraints': [models.UniqueConstraint(fields=('entity_type', 'object_id'), name='core_searchdocument_object')],
+            },
+        ),
+        migrations.RunPython(
+            _execute({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            _execute({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
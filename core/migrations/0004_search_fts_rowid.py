@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 12:07
+
+from django.db import migrations, models
+
+
+# SQLite: FTS-Zeilen werden über die explizite Spalte fts_rowid zugeordnet statt über die implizite
+# rowid von core_searchdocument, die VACUUM und jede Tabellenkopie (auch AddField unten) neu vergeben.
+# Die bisherige Zuordnung wird vor dem Umkopieren in einer Hilfstabelle gesichert.
+MAPPING_TABLE = 'core_searchdocument_fts_mapping'
+
+
+def _sqlite(function):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor == 'sqlite':
+            with schema_editor.connection.cursor() as cursor:
+                function(cursor)
+    return run
+
+
+def save_rowids(cursor):
+    cursor.execute(f'CREATE TABLE {MAPPING_TABLE} (id char(32) PRIMARY KEY, fts_rowid integer NOT NULL)')
+    cursor.execute(f'INSERT INTO {MAPPING_TABLE} (id, fts_rowid) SELECT id, rowid FROM core_searchdocument')
+
+
+def apply_rowids(cursor):
+    cursor.execute(
+        f'UPDATE core_searchdocument SET fts_rowid = '
+        f'(SELECT fts_rowid FROM {MAPPING_TABLE} WHERE {MAPPING_TABLE}.id = core_searchdocument.id)'
+    )
+    cursor.execute(f'DROP TABLE {MAPPING_TABLE}')
+
+
+def save_fts_rowids(cursor):
+    cursor.execute(f'CREATE TABLE {MAPPING_TABLE} (id char(32) PRIMARY KEY, fts_rowid integer NOT NULL)')
+    cursor.execute(
+        f'INSERT INTO {MAPPING_TABLE} (id, fts_rowid) '
+        f'SELECT id, fts_rowid FROM core_searchdocument WHERE fts_rowid IS NOT NULL'
+    )
+
+
+def restore_implicit_rowids(cursor):
+    # Rückweg: FTS-Zeilen wieder auf die (neu vergebene) rowid der Dokumenttabelle schlüsseln
+    cursor.execute(
+        f'CREATE TABLE {MAPPING_TABLE}_rows AS '
+        f'SELECT document.rowid AS document_rowid, fts.title, fts.body, fts.entity_type '
+        f'FROM core_searchdocument_fts AS fts '
+        f'JOIN {MAPPING_TABLE} AS mapping ON mapping.fts_rowid = fts.rowid '
+        f'JOIN core_searchdocument AS document ON document.id = mapping.id'
+    )
+    cursor.execute('DELETE FROM core_searchdocument_fts')
+    cursor.execute(
+        f'INSERT INTO core_searchdocument_fts (rowid, title, body, entity_type) '
+        f'SELECT document_rowid, title, body, entity_type FROM {MAPPING_TABLE}_rows'
+    )
+    cursor.execute(f'DROP TABLE {MAPPING_TABLE}_rows')
+    cursor.execute(f'DROP TABLE {MAPPING_TABLE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_search_documents'),
+    ]
+
+    operations = [
+        migrations.RunPython(_sqlite(save_rowids), _sqlite(restore_implicit_rowids)),
+        migrations.AddField(
+            model_name='searchdocument',
+            name='fts_rowid',
+            field=models.BigIntegerField(editable=False, help_text='Nur SQLite: rowid der Zeile in der FTS5-Tabelle.', null=True, unique=True),
+        ),
+        migrations.RunPython(_sqlite(apply_rowids), _sqlite(save_fts_rowids)),
+    ]
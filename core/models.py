@@ -1,3 +1,223 @@
+"""
+Abstrakte Basis-Modelle und Infrastruktur-Modelle für alle Apps.
+
+Enthält ausschließlich Infrastruktur (UUID-Primärschlüssel, Zeitstempel,
+Änderungsprotokoll, Task-Queue, Benachrichtigungen), keine Geschäftslogik.
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 
-# Create your models here.
+
+class BaseModel(models.Model):
+    """
+    Abstraktes Basis-Modell mit UUID-Primärschlüssel und Zeitstempeln.
+
+    Alle fachlichen Modelle erben von dieser Klasse
+    (siehe `.agent/rules/database-architecture.md`).
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        abstract = True
+
+
+class AppendOnlyQuerySet(models.QuerySet):
+    """QuerySet, das Massen-Updates und -Löschungen verbietet (GoBD Unveränderbarkeit)."""
+
+    def update(self, **kwargs):
+        raise ValidationError("Festgeschriebene Datensätze dürfen nicht geändert werden.")
+
+    def delete(self):
+        raise ValidationError("Festgeschriebene Datensätze dürfen nicht gelöscht werden.")
+
+
+class AppendOnlyModel(BaseModel):
+    """Abstraktes Modell, dessen Datensätze nach dem Anlegen unveränderbar sind."""
+
+    objects = AppendOnlyQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValidationError("Festgeschriebene Datensätze dürfen nicht geändert werden.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValidationError("Festgeschriebene Datensätze dürfen nicht gelöscht werden.")
+
+
+class AuditLog(AppendOnlyModel):
+    """
+    Zentrales Änderungsprotokoll (§ 146 Abs. 1 AO / GoBD Rz. 31).
+
+    Jeder Eintrag speichert den Hash seines Vorgängers (`previous_hash`), so dass
+    nachträgliche Manipulationen bei der Prüfung (`verify_audit_chain`) auffallen.
+    Wird ausschließlich über `core.audit` geschrieben.
+    """
+
+    class Action(models.TextChoices):
+        CREATE = 'create', 'Angelegt'
+        UPDATE = 'update', 'Geändert'
+        DELETE = 'delete', 'Gelöscht'
+        VIEW = 'view', 'Angesehen'
+        EXPORT = 'export', 'Exportiert'
+
+    sequence = models.PositiveBigIntegerField(unique=True, help_text="Position in der Hash-Kette.")
+    timestamp = models.DateTimeField(db_index=True)
+
+    # Wer hat was gemacht?
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.PROTECT, null=True, blank=True)
+    ip_address = models.GenericIPAddressField(null=True, blank=True)
+
+    # Welches Objekt?
+    model_name = models.CharField(max_length=100)
+    object_id = models.CharField(max_length=64)
+    action = models.CharField(max_length=20, choices=Action.choices)
+
+    # Was wurde geändert?
+    changes = models.JSONField(null=True, blank=True)
+
+    # Hash-Verkettung für Manipulationssicherheit
+    previous_hash = models.CharField(max_length=64)
+    hash = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Änderungsprotokoll"
+        verbose_name_plural = "Änderungsprotokolle"
+        ordering = ['sequence']
+        indexes = [
+            models.Index(fields=['model_name', 'object_id']),
+        ]
+
+
+class AuditChainHead(BaseModel):
+    """
+    Kopf der Audit-Hash-Kette (genau eine Zeile).
+
+    Wird beim Schreiben gesperrt (`select_for_update`), damit parallele Worker
+    die Kette nacheinander fortsetzen.
+    """
+
+    name = models.CharField(max_length=50, unique=True, default='audit')
+    sequence = models.PositiveBigIntegerField(default=0)
+    hash = models.CharField(max_length=64)
+
+    class Meta:
+        verbose_name = "Audit-Kettenkopf"
+        verbose_name_plural = "Audit-Kettenköpfe"
+
+
+class TaskRecord(BaseModel):
+    """
+    Auftrag der lokalen Task-Queue (`core.tasks`).
+
+    Die Tabelle ist zugleich Broker und Ergebnisspeicher: Worker übernehmen
+    Aufträge per bedingtem UPDATE, schreiben Ergebnis bzw. Fehler und die
+    Laufzeit zurück. Wird ausschließlich über `core.tasks` geschrieben.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = 'queued', 'Wartend'
+        RUNNING = 'running', 'Läuft'
+        SUCCEEDED = 'succeeded', 'Erfolgreich'
+        FAILED = 'failed', 'Fehlgeschlagen'
+
+    name = models.CharField(max_length=200, help_text="Registrierter Task-Name (Modulpfad).")
+    args = models.JSONField(default=list, encoder=DjangoJSONEncoder)
+    kwargs = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    priority = models.SmallIntegerField(default=0, help_text="Höhere Werte werden zuerst ausgeführt.")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    run_after = models.DateTimeField(help_text="Frühester Start (Verzögerung, Retry-Backoff).")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_retries = models.PositiveSmallIntegerField(default=0)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        help_text="Auslösender Benutzer (wird bei Abschluss benachrichtigt).",
+    )
+    worker = models.CharField(max_length=100, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    wait_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Wartezeit bis zum letzten Start.")
+    duration_ms = models.PositiveIntegerField(null=True, blank=True, help_text="Laufzeit des letzten Versuchs.")
+    result = models.JSONField(null=True, blank=True, encoder=DjangoJSONEncoder)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        verbose_name = "Hintergrund-Task"
+        verbose_name_plural = "Hintergrund-Tasks"
+        indexes = [
+            models.Index(fields=['status', '-priority', 'run_after'], name='core_task_claim'),
+            models.Index(fields=['name', 'finished_at'], name='core_task_metrics'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.get_status_display()})"
+
+
+class Notification(BaseModel):
+    """Benachrichtigung eines Benutzers (Notification Center, geschrieben über `core.notifications`)."""
+
+    class Level(models.TextChoices):
+        INFO = 'info', 'Information'
+        SUCCESS = 'success', 'Erfolg'
+        ERROR = 'error', 'Fehler'
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
+    level = models.CharField(max_length=10, choices=Level.choices, default=Level.INFO)
+    title = models.CharField(max_length=200)
+    message = models.TextField(blank=True)
+    link = models.CharField(max_length=500, blank=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        verbose_name = "Benachrichtigung"
+        verbose_name_plural = "Benachrichtigungen"
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['user', 'read_at', '-created_at'], name='core_notification_inbox'),
+        ]
+
+    def __str__(self) -> str:
+        return self.title
+
+
+class SearchDocument(BaseModel):
+    """
+    Denormalisiertes Suchdokument je Datensatz (Volltextsuche, `core.search`).
+
+    Der Suchindex selbst hängt an der Datenbank: PostgreSQL pflegt eine
+    generierte `tsvector`-Spalte mit GIN-Index, SQLite eine FTS5-Tabelle
+    (angelegt in der Migration), deren Zeilen über `fts_rowid` zugeordnet sind.
+    Wird ausschließlich über `core.search` geschrieben.
+    """
+
+    entity_type = models.CharField(max_length=30, help_text="Typ des Datensatzes, z.B. 'customer'.")
+    object_id = models.CharField(max_length=64)
+    title = models.CharField(max_length=255)
+    body = models.TextField(blank=True)
+    fts_rowid = models.BigIntegerField(
+        null=True, unique=True, editable=False, help_text="Nur SQLite: rowid der Zeile in der FTS5-Tabelle.",
+    )
+
+    class Meta:
+        verbose_name = "Suchdokument"
+        verbose_name_plural = "Suchdokumente"
+        constraints = [
+            models.UniqueConstraint(fields=['entity_type', 'object_id'], name='core_searchdocument_object'),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.entity_type}: {self.title}"
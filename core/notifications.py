@@ -0,0 +1,74 @@
+"""
+Notification Center (Infrastruktur).
+
+Informiert Benutzer über abgeschlossene Hintergrund-Tasks und andere
+Ereignisse. Die Benachrichtigungen werden im Header per HTMX nachgeladen
+(`core.views.notifications_view`).
+"""
+
+from typing import Iterable, List, Optional
+
+from django.utils import timezone
+
+from core.models import Notification
+
+
+def notify(
+    user_id: int,
+    title: str,
+    message: str = '',
+    level: str = Notification.Level.INFO,
+    link: str = '',
+) -> Notification:
+    """
+    Legt eine Benachrichtigung für einen Benutzer an.
+
+    Args:
+        user_id: Empfänger
+        title: Kurztext (z.B. 'Export abgeschlossen')
+        message: Details
+        level: Eine der `Notification.Level`-Konstanten
+        link: Optionaler Link zum Ergebnis
+
+    Returns:
+        Notification: Die angelegte Benachrichtigung
+    """
+    return Notification.objects.create(
+        user_id=user_id, title=title[:200], message=message, level=level, link=link,
+    )
+
+
+def get_unread(user_id: int, limit: int = 10) -> List[Notification]:
+    """
+    Liest die neuesten ungelesenen Benachrichtigungen eines Benutzers.
+
+    Args:
+        user_id: Benutzer
+        limit: Maximale Anzahl
+
+    Returns:
+        List[Notification]: Neueste zuerst
+    """
+    return list(Notification.objects.filter(user_id=user_id, read_at__isnull=True)[:limit])
+
+
+def count_unread(user_id: int) -> int:
+    """Anzahl ungelesener Benachrichtigungen eines Benutzers."""
+    return Notification.objects.filter(user_id=user_id, read_at__isnull=True).count()
+
+
+def mark_read(user_id: int, notification_ids: Optional[Iterable] = None) -> int:
+    """
+    Markiert Benachrichtigungen als gelesen.
+
+    Args:
+        user_id: Benutzer (es werden nur eigene Benachrichtigungen geändert)
+        notification_ids: IDs; ohne Angabe alle ungelesenen
+
+    Returns:
+        int: Anzahl geänderter Benachrichtigungen
+    """
+    queryset = Notification.objects.filter(user_id=user_id, read_at__isnull=True)
+    if notification_ids is not None:
+        queryset = queryset.filter(pk__in=list(notification_ids))
+    return queryset.update(read_at=timezone.now())
@@ -0,0 +1,230 @@
+"""
+Erkennung von N+1-Abfragen und Abfrage-Budgets (Infrastruktur).
+
+`track_queries()` zählt alle SQL-Statements eines Blocks und fasst sie nach
+Fingerabdruck (Statement ohne Parameter, IN-Listen zusammengefasst)
+zusammen. Wiederholt sich ein Fingerabdruck häufig, ist das typischerweise
+eine Schleife mit einer Abfrage je Objekt (N+1).
+
+`@query_budget(5)` begrenzt die Anzahl Abfragen eines Services oder Tests:
+In Tests (`settings.QUERY_BUDGET_STRICT`) schlägt eine Überschreitung fehl,
+im Betrieb wird eine Warnung geloggt. `QueryInspectionMiddleware` prüft
+jeden Request auf wiederholte Abfragen.
+"""
+
+import logging
+import re
+import time
+from collections import Counter
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Ab so vielen gleichen Abfragen in einem Block gilt ein Muster als N+1
+DEFAULT_REPEAT_THRESHOLD = 5
+
+_IN_LIST = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Ein Block hat mehr Abfragen ausgeführt als sein Budget erlaubt."""
+
+
+def fingerprint(sql: str) -> str:
+    """
+    Normalisiert ein SQL-Statement zu seiner Form (ohne Werte).
+
+    Args:
+        sql: SQL mit Platzhaltern, z.B. 'SELECT ... WHERE id IN (%s, %s)'
+
+    Returns:
+        str: Fingerabdruck, z.B. 'SELECT ... WHERE id IN (...)'
+    """
+    sql = _IN_LIST.sub('(...)', sql)
+    sql = _LITERAL.sub('?', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+@dataclass(frozen=True)
+class RepeatedQuery:
+    """Mehrfach ausgeführte Abfrageform (N+1-Kandidat)."""
+
+    fingerprint: str
+    count: int
+    seconds: float
+
+
+@dataclass
+class QueryLog:
+    """
+    Gesammelte Abfragen eines Blocks.
+
+    Attributes:
+        count: Anzahl Statements
+        seconds: Gesamtdauer
+        shapes: Anzahl je Fingerabdruck
+        durations: Dauer je Fingerabdruck
+    """
+
+    count: int = 0
+    seconds: float = 0.0
+    shapes: Counter = field(default_factory=Counter)
+    durations: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, sql: str, seconds: float) -> None:
+        shape = fingerprint(sql)
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[shape] += 1
+        self.durations[shape] = self.durations.get(shape, 0.0) + seconds
+
+    def repeated(self, threshold: Optional[int] = None) -> List[RepeatedQuery]:
+        """
+        Liefert die Abfrageformen, die mindestens `threshold`-mal ausgeführt wurden.
+
+        Args:
+            threshold: Schwelle (Standard: `settings.QUERY_REPEAT_THRESHOLD`)
+
+        Returns:
+            List[RepeatedQuery]: Häufigste zuerst
+        """
+        if threshold is None:
+            threshold = getattr(settings, 'QUERY_REPEAT_THRESHOLD', DEFAULT_REPEAT_THRESHOLD)
+        return [
+            RepeatedQuery(shape, count, self.durations[shape])
+            for shape, count in self.shapes.most_common()
+            if count >= threshold
+        ]
+
+    def describe(self, threshold: Optional[int] = None) -> str:
+        lines = [f"{self.count} Abfragen in {self.seconds * 1000:.1f} ms"]
+        for query in self.repeated(threshold):
+            lines.append(f"  {query.count}x ({query.seconds * 1000:.1f} ms): {query.fingerprint[:300]}")
+        return '\n'.join(lines)
+
+
+# Alle aktiven Blöcke (verschachtelt: jede Abfrage zählt für alle)
+_active: ContextVar[Tuple[QueryLog, ...]] = ContextVar('query_logs', default=())
+
+
+def _query_wrapper(execute, sql, params, many, context):
+    logs = _active.get()
+    if not logs:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        seconds = time.perf_counter() - started
+        for log in logs:
+            log.add(sql, seconds)
+
+
+def _on_connection_created(sender, connection, **kwargs) -> None:
+    if _query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_query_wrapper)
+
+
+def install() -> None:
+    """Installiert den Execute-Wrapper auf allen DB-Verbindungen (einmalig in `CoreConfig.ready`)."""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_on_connection_created, dispatch_uid='core_queries_tracking')
+    # Bereits geöffnete Verbindungen (z.B. aus Migrationen im selben Prozess)
+    for connection in connections.all(initialized_only=True):
+        _on_connection_created(None, connection)
+
+
+class track_queries(ContextDecorator):
+    """
+    Zeichnet alle Abfragen eines Blocks auf (Context Manager oder Decorator).
+
+    Beispiel:
+        with track_queries() as log:
+            invoices = list_invoices()
+        assert not log.repeated()
+    """
+
+    def __enter__(self) -> QueryLog:
+        self.log = QueryLog()
+        self._token = _active.set(_active.get() + (self.log,))
+        return self.log
+
+    def __exit__(self, *exc_info) -> None:
+        _active.reset(self._token)
+
+
+def _strict() -> bool:
+    return getattr(settings, 'QUERY_BUDGET_STRICT', False)
+
+
+def report(label: str, log: QueryLog, budget: Optional[int] = None, strict: Optional[bool] = None) -> None:
+    """
+    Meldet Budget-Überschreitungen und N+1-Muster eines Blocks.
+
+    Args:
+        label: Bezeichnung (Service-Name oder URL)
+        log: Aufgezeichnete Abfragen
+        budget: Erlaubte Anzahl Abfragen (None = unbegrenzt)
+        strict: Überschreitung als Fehler (Standard: `settings.QUERY_BUDGET_STRICT`)
+
+    Raises:
+        QueryBudgetExceeded: Im strikten Modus bei Überschreitung des Budgets
+    """
+    if budget is not None and log.count > budget:
+        message = f"{label}: Abfrage-Budget {budget} überschritten ({log.describe()})"
+        if _strict() if strict is None else strict:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+    elif log.repeated():
+        logger.warning("%s: wiederholte Abfragen (N+1?) – %s", label, log.describe())
+
+
+class query_budget(ContextDecorator):
+    """
+    Begrenzt die Anzahl der Abfragen eines Services, Views oder Tests.
+
+    Als Decorator oder Context Manager nutzbar. Überschreitungen schlagen in
+    Tests fehl und werden im Betrieb als Warnung geloggt; wiederholte
+    Abfrageformen innerhalb des Budgets werden ebenfalls geloggt.
+
+    Beispiel:
+        @query_budget(5)
+        def get_invoice_overview(...): ...
+
+        with query_budget(2, strict=True):
+            get_dashboard_kpis()
+    """
+
+    def __init__(self, limit: int, label: Optional[str] = None, strict: Optional[bool] = None) -> None:
+        self.limit = limit
+        self.label = label
+        self.strict = strict
+
+    def __call__(self, func):
+        if self.label is None:
+            self.label = f'{func.__module__}.{func.__qualname__}'
+        return super().__call__(func)
+
+    def _recreate_cm(self):
+        # Eigene Instanz je Aufruf (thread- und rekursionssicher)
+        return type(self)(self.limit, self.label, self.strict)
+
+    def __enter__(self) -> QueryLog:
+        self._tracker = track_queries()
+        return self._tracker.__enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        log = self._tracker.log
+        self._tracker.__exit__(exc_type, exc_value, traceback)
+        if exc_type is None:
+            report(self.label or 'query_budget', log, self.limit, self.strict)
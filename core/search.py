@@ -0,0 +1,373 @@
+"""
+Volltextsuche über ERP-Datensätze (Infrastruktur).
+
+Apps melden Models mit `@search_source` an; je Datensatz entsteht ein
+denormalisiertes `SearchDocument` (Titel, Text), das Signale nach dem Commit
+fortschreiben. Bulk-Importe indizieren ihre Zeilen selbst
+(`core.imports`), `manage.py rebuild_search_index` baut alles neu auf.
+
+Der Index liegt in der Datenbank:
+- PostgreSQL: generierte `tsvector`-Spalte (Konfiguration 'german', Titel
+  höher gewichtet) mit GIN-Index, Präfixsuche über `to_tsquery('…:*')`.
+- SQLite (Entwicklung): FTS5-Tabelle mit in Python gestemmten Texten
+  (CISTEM-Stemmer, `stem`), Präfixsuche über `"…"*`, Ranking per bm25. Die
+  rowid einer FTS-Zeile steht in `SearchDocument.fts_rowid` (fortlaufend
+  vergeben, nicht die implizite rowid der Dokumenttabelle, die VACUUM oder
+  eine Tabellenkopie bei Schemaänderungen neu vergeben).
+
+Beispiel (in `apps/sales/services.py`):
+    @search_source('sales.Customer', entity_type='customer')
+    def customer_search_text(customer: Customer) -> Tuple[str, str]:
+        return str(customer), f"{customer.city} {customer.vat_id}"
+"""
+
+import functools
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connections, models, router, transaction
+from django.db.models import Max
+
+from core.metrics import timed
+from core.models import SearchDocument
+
+
+# Datensätze je Schreibvorgang (bulk_create, IN-Listen)
+BATCH_SIZE = 500
+
+# Standardanzahl Treffer
+DEFAULT_LIMIT = 20
+
+# Suchbegriffe je Anfrage (weitere werden ignoriert)
+MAX_QUERY_TERMS = 8
+
+# Höchstens so viele Treffer werden gerankt: Häufige Wörter ('kunde', 'gmbh')
+# treffen sonst einen Großteil aller Dokumente und das Ranking kostet Hunderte ms
+RANK_CANDIDATES = 1000
+
+# SQLite: FTS5-Tabelle aus der Migration und Gewichtung Titel : Text (wie setweight A/B)
+FTS_TABLE = 'core_searchdocument_fts'
+TITLE_WEIGHT = 10.0
+
+# Gestemmte Wörter im Speicher (Wortschatz ist Zipf-verteilt, wenige Wörter decken fast alles ab)
+STEM_CACHE_SIZE = 65536
+
+_WORD = re.compile(r'\w+')
+_PREFIX_GE = re.compile(r'^ge(.{4,})')
+_DOUBLE = re.compile(r'(.)\1')
+_DOUBLE_MARK = re.compile(r'(.)\*')
+_SUFFIX_LONG = re.compile(r'(e[mr]|nd)$')
+_SUFFIX_SHORT = re.compile(r'[esnt]$')
+
+
+@dataclass(frozen=True)
+class SearchSource:
+    """Angemeldetes Model: Typname und Funktion für (Titel, Text) eines Datensatzes."""
+
+    model_label: str
+    entity_type: str
+    function: Callable[[models.Model], Tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """
+    Treffer der Volltextsuche.
+
+    Attributes:
+        entity_type: Typ, z.B. 'customer'
+        object_id: Primärschlüssel des Datensatzes
+        title: Titel des Suchdokuments
+        body: Text des Suchdokuments
+        score: Relevanz (höher = besser; nur innerhalb einer Anfrage vergleichbar)
+    """
+
+    entity_type: str
+    object_id: str
+    title: str
+    body: str
+    score: float
+
+
+_sources: Dict[str, SearchSource] = {}
+
+
+def search_source(model_label: str, entity_type: str) -> Callable:
+    """
+    Decorator: meldet ein Model für die Volltextsuche an.
+
+    Die dekorierte Funktion liefert (Titel, Text) eines Datensatzes. Speichern
+    und Löschen über das ORM aktualisieren das Suchdokument nach dem Commit.
+    """
+    def decorator(func: Callable) -> Callable:
+        from django.db.models.signals import post_delete, post_save
+
+        _sources[model_label] = SearchSource(model_label, entity_type, func)
+        # Je Model verbinden (Label wird aufgelöst, sobald das Model geladen ist)
+        post_save.connect(_on_save, sender=model_label, dispatch_uid=f'search_document_save_{model_label}')
+        post_delete.connect(_on_delete, sender=model_label, dispatch_uid=f'search_document_delete_{model_label}')
+        return func
+    return decorator
+
+
+def get_search_types() -> List[str]:
+    """Typnamen aller angemeldeten Models."""
+    return sorted(source.entity_type for source in _sources.values())
+
+
+@functools.lru_cache(maxsize=STEM_CACHE_SIZE)
+def stem(word: str) -> str:
+    """
+    Reduziert ein deutsches Wort auf seinen Stamm (CISTEM, Weißweiler & Fraser 2017).
+
+    Nur für den SQLite-Index; PostgreSQL stemmt selbst ('german').
+
+    Args:
+        word: Wort in Kleinbuchstaben
+
+    Returns:
+        str: Stamm, z.B. 'rechnungen' -> 'rechnung'
+    """
+    word = word.replace('ü', 'u').replace('ö', 'o').replace('ä', 'a').replace('ß', 'ss')
+    word = _PREFIX_GE.sub(r'\1', word)
+    word = word.replace('sch', '$').replace('ei', '%').replace('ie', '&')
+    word = _DOUBLE.sub(r'\1*', word)
+    while len(word) > 3:
+        if len(word) > 5:
+            word, count = _SUFFIX_LONG.subn('', word)
+            if count:
+                continue
+        word, count = _SUFFIX_SHORT.subn('', word)
+        if not count:
+            break
+    word = _DOUBLE_MARK.sub(r'\1\1', word)
+    return word.replace('$', 'sch').replace('%', 'ei').replace('&', 'ie')
+
+
+def _stemmed(text: str) -> str:
+    return ' '.join(stem(word) for word in _WORD.findall(text.lower()))
+
+
+def _batches(iterable: Iterable, size: int = BATCH_SIZE) -> Iterable[list]:
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _connection():
+    return connections[router.db_for_write(SearchDocument)]
+
+
+def _placeholders(values: Sequence) -> str:
+    return ', '.join(['%s'] * len(values))
+
+
+def _delete(entity_type: str, object_ids: Optional[List[str]] = None) -> None:
+    """Löscht Suchdokumente (eines Typs oder einzelne) samt FTS-Zeilen."""
+    documents = SearchDocument.objects.filter(entity_type=entity_type)
+    condition, params = 'entity_type = %s', [entity_type]
+    if object_ids is not None:
+        documents = documents.filter(object_id__in=object_ids)
+        condition += f' AND object_id IN ({_placeholders(object_ids)})'
+        params += object_ids
+    connection = _connection()
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {FTS_TABLE} WHERE rowid IN (SELECT fts_rowid FROM core_searchdocument WHERE {condition})',
+                params,
+            )
+    documents.delete()
+
+
+def _insert(entity_type: str, documents: List[SearchDocument]) -> None:
+    connection = _connection()
+    if connection.vendor != 'sqlite':
+        SearchDocument.objects.bulk_create(documents)
+        return  # PostgreSQL: tsvector-Spalte wird von der Datenbank berechnet
+    # Fortlaufende rowids: FTS5 speichert Abstände zwischen rowids, kleine Abstände halten den Index kompakt.
+    # Schreibende SQLite-Transaktionen laufen nacheinander (IMMEDIATE), der Höchststand ist damit stabil.
+    last = SearchDocument.objects.aggregate(last=Max('fts_rowid'))['last'] or 0
+    for fts_rowid, document in enumerate(documents, start=last + 1):
+        document.fts_rowid = fts_rowid
+    SearchDocument.objects.bulk_create(documents)
+    rows = [
+        (document.fts_rowid, _stemmed(document.title), _stemmed(document.body), entity_type)
+        for document in documents
+    ]
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'INSERT INTO {FTS_TABLE} (rowid, title, body, entity_type) VALUES (%s, %s, %s, %s)', rows,
+        )
+
+
+def _document(source: SearchSource, instance: models.Model) -> SearchDocument:
+    title, body = source.function(instance)
+    return SearchDocument(entity_type=source.entity_type, object_id=str(instance.pk), title=title[:255], body=body)
+
+
+def index_objects(instances: Iterable[models.Model], replace: bool = True) -> int:
+    """
+    Schreibt die Suchdokumente vieler Datensätze (nicht angemeldete Models werden übersprungen).
+
+    Args:
+        instances: Gespeicherte Model-Instanzen
+        replace: Vorhandene Dokumente ersetzen (False nur nach `_delete` des ganzen Typs)
+
+    Returns:
+        int: Anzahl geschriebener Dokumente
+    """
+    by_source: Dict[str, List[models.Model]] = defaultdict(list)
+    for instance in instances:
+        if instance._meta.label in _sources:
+            by_source[instance._meta.label].append(instance)
+
+    written = 0
+    for label, objects in by_source.items():
+        source = _sources[label]
+        for batch in _batches(objects):
+            documents = [_document(source, instance) for instance in batch]
+            with transaction.atomic(using=_connection().alias):
+                if replace:
+                    _delete(source.entity_type, [document.object_id for document in documents])
+                _insert(source.entity_type, documents)
+            written += len(documents)
+    return written
+
+
+def remove_objects(entity_type: str, object_ids: Iterable) -> None:
+    """
+    Entfernt die Suchdokumente gelöschter Datensätze.
+
+    Args:
+        entity_type: Typ, z.B. 'customer'
+        object_ids: Primärschlüssel
+    """
+    for batch in _batches(str(object_id) for object_id in object_ids):
+        with transaction.atomic(using=_connection().alias):
+            _delete(entity_type, batch)
+
+
+def rebuild_index() -> Dict[str, int]:
+    """
+    Baut die Suchdokumente aller angemeldeten Models neu auf.
+
+    Returns:
+        Dict[str, int]: Anzahl Dokumente je Typ
+    """
+    from django.apps import apps
+
+    counts = {}
+    for source in _sources.values():
+        model = apps.get_model(source.model_label)
+        _delete(source.entity_type)
+        counts[source.entity_type] = index_objects(
+            model._default_manager.iterator(chunk_size=BATCH_SIZE), replace=False,
+        )
+    return counts
+
+
+def _terms(query: str) -> List[str]:
+    return _WORD.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def _search_postgresql(cursor, terms: List[str], types: List[str], limit: int) -> List[tuple]:
+    # Alle Begriffe müssen vorkommen, nur der letzte als Präfix: Präfixe liest GIN als
+    # vollständige Bitmap je passendem Wort, exakte Begriffe überspringen Einträge
+    tsquery = ' & '.join([*terms[:-1], f'{terms[-1]}:*'])
+    type_filter = 'AND entity_type = ANY(%s)' if types else ''
+    cursor.execute(
+        f"""
+        SELECT entity_type, object_id, title, body, ts_rank_cd(search_vector, query) AS score
+        FROM (
+            SELECT entity_type, object_id, title, body, search_vector
+            FROM core_searchdocument
+            WHERE search_vector @@ to_tsquery('german', %s) {type_filter}
+            LIMIT %s
+        ) AS candidate, to_tsquery('german', %s) AS query
+        ORDER BY score DESC
+        LIMIT %s
+        """,
+        [tsquery, *([types] if types else []), RANK_CANDIDATES, tsquery, limit],
+    )
+    return cursor.fetchall()
+
+
+def _search_sqlite(cursor, terms: List[str], types: List[str], limit: int) -> List[tuple]:
+    match = ' '.join([*(f'"{stem(term)}"' for term in terms[:-1]), f'"{stem(terms[-1])}"*'])
+    type_filter = f'AND entity_type IN ({_placeholders(types)})' if types else ''
+    # FTS5 liefert Treffer in rowid-Reihenfolge: bm25 nur für die neuesten Kandidaten,
+    # danach nur die besten Treffer mit den Dokumenten verbinden
+    cursor.execute(
+        f"""
+        SELECT document.entity_type, document.object_id, document.title, document.body, hit.score
+        FROM (
+            SELECT rowid, -bm25({FTS_TABLE}, %s, 1.0) AS score
+            FROM {FTS_TABLE}
+            WHERE {FTS_TABLE} MATCH %s {type_filter}
+            ORDER BY rowid DESC
+            LIMIT %s
+        ) AS hit
+        JOIN core_searchdocument AS document ON document.fts_rowid = hit.rowid
+        ORDER BY hit.score DESC
+        LIMIT %s
+        """,
+        [TITLE_WEIGHT, match, *types, RANK_CANDIDATES, limit],
+    )
+    return cursor.fetchall()
+
+
+@timed
+def search(query: str, types: Optional[Iterable[str]] = None, limit: int = DEFAULT_LIMIT) -> List[SearchHit]:
+    """
+    Durchsucht Kunden, Artikel usw. (alle angemeldeten Models) nach Wortanfängen.
+
+    Alle Begriffe müssen vorkommen; Flexionsformen werden gefunden
+    ('Rechnungen' findet 'Rechnung'). Der letzte Begriff gilt als Präfix
+    (Eingabe während des Tippens: 'Müller Ber' findet 'Müller Berlin').
+    Gerankt werden höchstens `RANK_CANDIDATES` Treffer, damit sehr allgemeine
+    Anfragen die Antwortzeit nicht sprengen; genauere Begriffe grenzen ein.
+
+    Args:
+        query: Suchbegriffe, z.B. 'Müller Berlin'
+        types: Nur diese Typen, z.B. ['customer'] (Standard: alle)
+        limit: Maximale Anzahl Treffer
+
+    Returns:
+        List[SearchHit]: Treffer, relevanteste zuerst
+
+    Raises:
+        ValueError: Bei unbekannten Typen
+        ImproperlyConfigured: Wenn die Datenbank weder PostgreSQL noch SQLite ist
+    """
+    types = sorted(set(types or ()))
+    unknown = set(types) - set(get_search_types())
+    if unknown:
+        raise ValueError(f"Unbekannte Suchtypen: {', '.join(sorted(unknown))}")
+    terms = _terms(query)
+    if not terms:
+        return []
+
+    connection = connections[router.db_for_read(SearchDocument)]
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            rows = _search_postgresql(cursor, terms, types, limit)
+        elif connection.vendor == 'sqlite':
+            rows = _search_sqlite(cursor, terms, types, limit)
+        else:
+            raise ImproperlyConfigured(f"Volltextsuche für {connection.vendor} nicht verfügbar.")
+    return [SearchHit(*row) for row in rows]
+
+
+def _on_save(sender, instance, **kwargs) -> None:
+    transaction.on_commit(lambda: index_objects([instance]))
+
+
+def _on_delete(sender, instance, **kwargs) -> None:
+    entity_type = _sources[sender._meta.label].entity_type
+    object_id = str(instance.pk)
+    transaction.on_commit(lambda: remove_objects(entity_type, [object_id]))
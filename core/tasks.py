@@ -0,0 +1,433 @@
+"""
+Lokale Task-Queue für Hintergrund-Aufgaben (Infrastruktur).
+
+Aufgaben, die länger als ca. 1 Sekunde dauern, laufen nicht im Request,
+sondern in einem Worker (`manage.py run_tasks`). Die API folgt Celery, so
+dass ein späterer Wechsel nur den Decorator betrifft:
+
+    # apps/finance/tasks.py
+    @task(title='Z3-Export', max_retries=2)
+    def export_gdpdu_task(directory: str) -> dict: ...
+
+    # apps/finance/services.py
+    export_gdpdu_task.delay('/exports/2025')
+
+Broker und Ergebnisspeicher ist die Tabelle `TaskRecord`; es wird weder
+Redis noch ein weiterer Dienst benötigt. Worker übernehmen Aufträge per
+bedingtem UPDATE (`status = 'queued'`), daher können beliebig viele Worker
+parallel laufen. Da Aufträge in der Transaktion des Aufrufers angelegt
+werden, sieht ein Worker sie erst nach dem Commit.
+
+Während der Ausführung erneuert ein Heartbeat-Thread `updated_at`. Bleibt
+er länger als `settings.TASKS_STALE_AFTER` aus (Worker abgestürzt), wird
+der Auftrag neu vergeben; das Ergebnis speichert nur der Worker, dem der
+Auftrag noch gehört.
+
+Mit `settings.TASKS_ALWAYS_EAGER` werden Tasks sofort im aufrufenden
+Prozess ausgeführt (Tests, Entwicklung).
+"""
+
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, close_old_connections, connections
+from django.db.models import Avg, Count, F, Max, Q, Sum
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from core import audit
+from core.models import Notification, TaskRecord
+from core.notifications import notify
+
+logger = logging.getLogger(__name__)
+
+# Anzahl Kandidaten, die ein Worker je Runde zu übernehmen versucht
+CLAIM_CANDIDATES = 10
+
+_registry: Dict[str, 'Task'] = {}
+
+
+class TaskFailedError(Exception):
+    """Ein Task ist endgültig fehlgeschlagen (alle Wiederholungen verbraucht)."""
+
+
+@dataclass(frozen=True)
+class Task:
+    """
+    Registrierte Hintergrund-Aufgabe.
+
+    Attributes:
+        func: Auszuführende Funktion (Argumente und Ergebnis JSON-serialisierbar)
+        name: Eindeutiger Name (Standard: Modulpfad der Funktion)
+        title: Bezeichnung für Benachrichtigungen
+        priority: Standard-Priorität (höher = früher)
+        max_retries: Wiederholungen nach einem Fehler
+        retry_delay: Wartezeit vor der ersten Wiederholung in Sekunden (verdoppelt sich je Versuch)
+    """
+
+    func: Callable[..., Any]
+    name: str
+    title: str
+    priority: int = 0
+    max_retries: int = 0
+    retry_delay: int = 60
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs) -> TaskRecord:
+        """Reiht den Task mit Standard-Optionen ein (wie Celery `delay`)."""
+        return self.apply_async(args, kwargs)
+
+    def apply_async(
+        self,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        priority: Optional[int] = None,
+        countdown: float = 0,
+        user_id: Optional[int] = None,
+    ) -> TaskRecord:
+        """
+        Reiht den Task ein.
+
+        Args:
+            args: Positionsargumente (JSON-serialisierbar, z.B. IDs statt Objekte)
+            kwargs: Schlüsselwortargumente
+            priority: Priorität (Standard: die des Tasks)
+            countdown: Frühester Start in Sekunden
+            user_id: Zu benachrichtigender Benutzer (Standard: handelnder Benutzer des Requests)
+
+        Returns:
+            TaskRecord: Der Auftrag (`id` für `get_result`)
+        """
+        if user_id is None:
+            user_id = audit.current_user_id()
+        record = TaskRecord.objects.create(
+            name=self.name,
+            args=list(args),
+            kwargs=kwargs or {},
+            priority=self.priority if priority is None else priority,
+            run_after=timezone.now() + timedelta(seconds=countdown),
+            max_retries=self.max_retries,
+            user_id=user_id,
+        )
+        if getattr(settings, 'TASKS_ALWAYS_EAGER', False):
+            # Wiederholungen sofort, ohne Backoff
+            while _claim(record.pk, 'eager'):
+                record = execute(TaskRecord.objects.get(pk=record.pk))
+                if record.status != TaskRecord.Status.QUEUED:
+                    break
+        return record
+
+
+def task(
+    func: Optional[Callable] = None,
+    *,
+    name: Optional[str] = None,
+    title: Optional[str] = None,
+    priority: int = 0,
+    max_retries: int = 0,
+    retry_delay: int = 60,
+):
+    """
+    Decorator: registriert eine Funktion als Hintergrund-Task.
+
+    Tasks werden in `apps/{app}/tasks.py` definiert und aus `services.py`
+    mit `.delay()` ausgelöst.
+    """
+    def register(function: Callable) -> Task:
+        task_name = name or f'{function.__module__}.{function.__qualname__}'
+        registered = Task(
+            func=function,
+            name=task_name,
+            title=title or function.__name__,
+            priority=priority,
+            max_retries=max_retries,
+            retry_delay=retry_delay,
+        )
+        _registry[task_name] = registered
+        return registered
+
+    return register(func) if func is not None else register
+
+
+def _claim(pk, worker: str) -> bool:
+    """Übernimmt einen wartenden Auftrag (bedingtes UPDATE, gewinnt genau ein Worker)."""
+    now = timezone.now()
+    return bool(TaskRecord.objects.filter(pk=pk, status=TaskRecord.Status.QUEUED).update(
+        status=TaskRecord.Status.RUNNING,
+        worker=worker,
+        started_at=now,
+        attempts=F('attempts') + 1,
+        updated_at=now,
+    ))
+
+
+def claim_next(worker: str) -> Optional[TaskRecord]:
+    """
+    Übernimmt den nächsten fälligen Auftrag (höchste Priorität, dann ältester Starttermin).
+
+    Args:
+        worker: Name des Workers
+
+    Returns:
+        Optional[TaskRecord]: Übernommener Auftrag oder None, wenn nichts fällig ist
+    """
+    candidates = TaskRecord.objects.filter(
+        status=TaskRecord.Status.QUEUED, run_after__lte=timezone.now(),
+    ).order_by('-priority', 'run_after').values_list('pk', flat=True)[:CLAIM_CANDIDATES]
+    for pk in candidates:
+        if _claim(pk, worker):
+            return TaskRecord.objects.get(pk=pk)
+    return None
+
+
+def _elapsed_ms(start: datetime, end: datetime) -> int:
+    return max(0, int((end - start).total_seconds() * 1000))
+
+
+def execute(record: TaskRecord) -> TaskRecord:
+    """
+    Führt einen übernommenen Auftrag aus und speichert Ergebnis, Fehler und Laufzeit.
+
+    Schlägt der Task fehl und sind Wiederholungen übrig, wird er mit
+    exponentiellem Backoff erneut eingereiht. Bei Abschluss wird der
+    auslösende Benutzer benachrichtigt.
+
+    Args:
+        record: Auftrag im Status 'running'
+
+    Returns:
+        TaskRecord: Der aktualisierte Auftrag
+    """
+    registered = _registry.get(record.name)
+    record.wait_ms = _elapsed_ms(record.run_after, record.started_at)
+    started = time.perf_counter()
+    try:
+        if registered is None:
+            raise LookupError(f"Unbekannter Task '{record.name}' (tasks.py nicht geladen?).")
+        with audit.audit_scope(user_id=record.user_id):
+            result = registered.func(*record.args, **record.kwargs)
+        # Ergebnis muss speicherbar sein; sonst gilt der Task als fehlgeschlagen
+        record.result = json.loads(json.dumps(result, cls=DjangoJSONEncoder))
+        record.status = TaskRecord.Status.SUCCEEDED
+        record.error = ''
+    except Exception:
+        record.error = traceback.format_exc()
+        record.status = TaskRecord.Status.FAILED
+        if record.attempts <= record.max_retries:
+            delay = (registered.retry_delay if registered else 60) * 2 ** (record.attempts - 1)
+            record.status = TaskRecord.Status.QUEUED
+            record.run_after = timezone.now() + timedelta(seconds=delay)
+
+    record.duration_ms = int((time.perf_counter() - started) * 1000)
+    record.finished_at = timezone.now() if record.status != TaskRecord.Status.QUEUED else None
+    # Nur speichern, solange der Auftrag noch diesem Lauf gehört (sonst neu vergeben)
+    owned = _owned(record).update(
+        status=record.status,
+        result=record.result,
+        error=record.error,
+        run_after=record.run_after,
+        duration_ms=record.duration_ms,
+        wait_ms=record.wait_ms,
+        finished_at=record.finished_at,
+        updated_at=timezone.now(),
+    )
+    if not owned:
+        logger.warning(
+            "Task %s (%s) wurde neu vergeben; Ergebnis von %s verworfen.", record.pk, record.name, record.worker,
+        )
+        record.refresh_from_db()
+        return record
+
+    if record.user_id and record.finished_at:
+        _notify_finished(record, registered.title if registered else record.name)
+    return record
+
+
+def _owned(record: TaskRecord):
+    """Der Auftrag, solange er noch diesem Lauf gehört (Worker und Versuch unverändert)."""
+    return TaskRecord.objects.filter(
+        pk=record.pk, status=TaskRecord.Status.RUNNING, worker=record.worker, attempts=record.attempts,
+    )
+
+
+@contextmanager
+def heartbeat(record: TaskRecord, interval: Optional[float] = None) -> Iterator[None]:
+    """
+    Erneuert `updated_at` eines laufenden Auftrags, solange der Block läuft.
+
+    Der Thread schreibt über eine eigene Datenbankverbindung und endet von
+    selbst, wenn der Auftrag nicht mehr diesem Lauf gehört.
+
+    Args:
+        record: Übernommener Auftrag
+        interval: Abstand in Sekunden (Standard: `settings.TASKS_HEARTBEAT_INTERVAL`)
+    """
+    if interval is None:
+        interval = settings.TASKS_HEARTBEAT_INTERVAL
+    stopped = threading.Event()
+
+    def beat() -> None:
+        try:
+            while not stopped.wait(interval):
+                try:
+                    if not _owned(record).update(updated_at=timezone.now()):
+                        return
+                except DatabaseError:
+                    logger.warning("Heartbeat für Task %s fehlgeschlagen.", record.pk, exc_info=True)
+        finally:
+            connections.close_all()
+
+    thread = threading.Thread(target=beat, name=f'task-heartbeat-{record.pk}', daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def _notify_finished(record: TaskRecord, title: str) -> None:
+    if record.status == TaskRecord.Status.SUCCEEDED:
+        notify(record.user_id, f"{title} abgeschlossen", level=Notification.Level.SUCCESS)
+    else:
+        last_line = record.error.strip().splitlines()[-1] if record.error.strip() else ''
+        notify(record.user_id, f"{title} fehlgeschlagen", last_line, level=Notification.Level.ERROR)
+
+
+def requeue_stale(older_than: Optional[timedelta] = None) -> int:
+    """
+    Reiht Aufträge abgestürzter Worker erneut ein (Status 'running', Heartbeat ausgeblieben).
+
+    Der abgebrochene Lauf zählt als Versuch; sind keine Wiederholungen übrig,
+    wird der Auftrag als fehlgeschlagen markiert. Lang laufende Aufträge
+    lebender Worker bleiben unberührt, ihr Heartbeat hält `updated_at` aktuell.
+
+    Args:
+        older_than: Maximales Alter des letzten Heartbeats (Standard: `settings.TASKS_STALE_AFTER` Sekunden)
+
+    Returns:
+        int: Anzahl betroffener Aufträge
+    """
+    if older_than is None:
+        older_than = timedelta(seconds=settings.TASKS_STALE_AFTER)
+    now = timezone.now()
+    stale = TaskRecord.objects.filter(status=TaskRecord.Status.RUNNING, updated_at__lt=now - older_than)
+    message = "Worker während der Ausführung beendet."
+    return (
+        stale.filter(attempts__lte=F('max_retries')).update(
+            status=TaskRecord.Status.QUEUED, run_after=now, error=message, updated_at=now,
+        )
+        + stale.filter(attempts__gt=F('max_retries')).update(
+            status=TaskRecord.Status.FAILED, finished_at=now, error=message, updated_at=now,
+        )
+    )
+
+
+def run_worker(
+    worker: Optional[str] = None,
+    burst: bool = False,
+    poll_interval: float = 1.0,
+    on_task: Optional[Callable[[TaskRecord], None]] = None,
+) -> int:
+    """
+    Arbeitet Aufträge ab (Endlosschleife, für `manage.py run_tasks`).
+
+    Args:
+        worker: Name des Workers (Standard: Hostname und Prozess-ID)
+        burst: Beenden, sobald keine fälligen Aufträge mehr vorliegen
+        poll_interval: Wartezeit in Sekunden, wenn nichts fällig ist
+        on_task: Callback nach jedem ausgeführten Auftrag
+
+    Returns:
+        int: Anzahl ausgeführter Aufträge
+    """
+    autodiscover_modules('tasks')
+    worker = worker or f'{socket.gethostname()}:{os.getpid()}'
+    processed = 0
+    next_stale_check = 0.0
+    while True:
+        close_old_connections()
+        if time.monotonic() >= next_stale_check:
+            requeue_stale()
+            next_stale_check = time.monotonic() + 60
+        record = claim_next(worker)
+        if record is None:
+            if burst:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        with heartbeat(record):
+            record = execute(record)
+        processed += 1
+        if on_task:
+            on_task(record)
+
+
+def get_result(task_id, timeout: Optional[float] = None, interval: float = 0.5) -> Any:
+    """
+    Wartet auf das Ergebnis eines Auftrags (wie Celery `AsyncResult.get`).
+
+    Args:
+        task_id: ID des Auftrags
+        timeout: Maximale Wartezeit in Sekunden (None = unbegrenzt)
+        interval: Abfrageintervall in Sekunden
+
+    Returns:
+        Any: Gespeichertes Ergebnis
+
+    Raises:
+        TaskFailedError: Wenn der Task endgültig fehlgeschlagen ist
+        TimeoutError: Wenn der Task nicht rechtzeitig fertig wird
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    while True:
+        status, result, error = TaskRecord.objects.values_list('status', 'result', 'error').get(pk=task_id)
+        if status == TaskRecord.Status.SUCCEEDED:
+            return result
+        if status == TaskRecord.Status.FAILED:
+            raise TaskFailedError(error)
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Task {task_id} nach {timeout} s nicht abgeschlossen.")
+        time.sleep(interval)
+
+
+def get_task_metrics(since: Optional[datetime] = None) -> List[dict]:
+    """
+    Kennzahlen je Task: Anzahl, Status, Versuche, Lauf- und Wartezeiten.
+
+    Args:
+        since: Nur Aufträge ab diesem Zeitpunkt (Standard: alle)
+
+    Returns:
+        List[dict]: Je Task 'name', 'total', 'queued', 'running', 'succeeded', 'failed',
+                    'attempts', 'avg_ms', 'max_ms', 'avg_wait_ms'
+    """
+    queryset = TaskRecord.objects.all()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    return list(
+        queryset.values('name').annotate(
+            total=Count('pk'),
+            **{
+                status: Count('pk', filter=Q(status=status))
+                for status in TaskRecord.Status.values
+            },
+            attempts=Sum('attempts'),
+            avg_ms=Avg('duration_ms'),
+            max_ms=Max('duration_ms'),
+            avg_wait_ms=Avg('wait_ms'),
+        ).order_by('name')
+    )
@@ -0,0 +1,133 @@
+"""
+Tests des AI-Clients gegen den lokalen Stub-Server: Retries, Rate Limit, Coalescing.
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from core.utils.ai_client import AIClient, AIClientError, ProviderConfig, TokenBucket
+from core.utils.ai_stub import StubAIServer
+
+
+def failing(*statuses: int):
+    """Handler: antwortet nacheinander mit den Statuscodes, danach mit 200."""
+    remaining = list(statuses)
+
+    def handler(payload):
+        if remaining:
+            return remaining.pop(0), {'error': 'Stub'}
+        return 200, {'echo': payload}
+
+    return handler
+
+
+def client_for(server: StubAIServer, **options) -> AIClient:
+    options.setdefault('backoff_base', 0.001)
+    return AIClient(ProviderConfig(name='stub', base_url=server.url, **options))
+
+
+def test_retries_transient_errors_with_backoff():
+    with StubAIServer(failing(503, 429)) as server:
+        client = client_for(server)
+
+        assert client.complete({'prompt': 'Hallo'}) == {'echo': {'prompt': 'Hallo'}}
+
+    assert server.request_count == 3
+    assert client.metrics.snapshot()['retries'] == 2
+
+
+def test_gives_up_after_max_retries():
+    with StubAIServer(failing(503, 503, 503)) as server:
+        client = client_for(server, max_retries=2)
+
+        with pytest.raises(AIClientError, match='nach 3 Versuchen'):
+            client.complete({'prompt': 'Hallo'})
+
+    assert server.request_count == 3
+    assert client.metrics.snapshot()['failures'] == 1
+
+
+@pytest.mark.parametrize('status', [400, 409])
+def test_client_errors_are_not_retried(status):
+    with StubAIServer(failing(status)) as server:
+        client = client_for(server)
+
+        with pytest.raises(AIClientError, match=f'HTTP {status}'):
+            client.complete({'prompt': 'Hallo'})
+
+    assert server.request_count == 1
+
+
+def test_backoff_is_capped_and_honours_retry_after():
+    client = AIClient(ProviderConfig(name='stub', base_url='http://stub', backoff_base=1.0, backoff_cap=4.0))
+
+    assert all(0 <= client._backoff(attempt, None) <= 4.0 for attempt in range(10))
+    assert client._backoff(0, '2') == 2.0
+    assert client._backoff(0, '60') == 4.0
+
+
+def test_token_bucket_allows_burst_then_paces():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    delays = [bucket.reserve() for _ in range(4)]
+
+    assert delays[:2] == [0.0, 0.0]
+    assert delays[2] == pytest.approx(0.1, abs=0.01)
+    assert delays[3] == pytest.approx(0.2, abs=0.01)
+
+
+def test_rate_limit_spaces_upstream_calls():
+    with StubAIServer() as server:
+        client = client_for(server, rate_per_second=20, burst=1)
+
+        started = time.monotonic()
+        for number in range(5):
+            client.complete({'prompt': number})
+
+    # Erster Aufruf sofort, danach je 50 ms
+    assert time.monotonic() - started >= 0.19
+
+
+def test_identical_concurrent_prompts_are_coalesced():
+    with StubAIServer(delay=0.2) as server:
+        client = client_for(server)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(client.complete({'prompt': 'Hallo'})))
+            for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert results == [{'echo': {'prompt': 'Hallo'}}] * 5
+    assert server.request_count == 1
+    assert client.metrics.snapshot()['coalesced'] == 4
+
+
+def test_async_prompts_are_coalesced_per_loop():
+    with StubAIServer(delay=0.1) as server:
+        client = client_for(server)
+
+        async def run():
+            return await asyncio.gather(*(client.acomplete({'prompt': 'Hallo'}) for _ in range(5)))
+
+        assert asyncio.run(run()) == [{'echo': {'prompt': 'Hallo'}}] * 5
+
+    assert server.request_count == 1
+
+
+def test_async_client_is_not_shared_between_event_loops():
+    with StubAIServer() as server:
+        client = client_for(server)
+
+        # Jeder asyncio.run-Aufruf hat einen eigenen Loop; Keep-Alive-Verbindungen des alten sind unbrauchbar
+        first = asyncio.run(client.acomplete({'prompt': 1}))
+        second = asyncio.run(client.acomplete({'prompt': 2}))
+
+    assert (first, second) == ({'echo': {'prompt': 1}}, {'echo': {'prompt': 2}})
+    assert len(client._async_clients) == 1
@@ -0,0 +1,117 @@
+"""
+Tests des Änderungsprotokolls: Schreiben in der Transaktion, Hash-Kette, Manipulationserkennung.
+"""
+
+import pytest
+from django.db import transaction
+from django.db.models import QuerySet
+
+from apps.inventory.tests.factories import ProductFactory
+from apps.users.tests.factories import GroupFactory, UserFactory
+from core import audit
+from core.models import AuditLog
+
+pytestmark = pytest.mark.django_db
+
+
+def product_entries():
+    return AuditLog.objects.filter(model_name='inventory.Product').order_by('sequence')
+
+
+def test_entries_are_written_before_commit():
+    with audit.atomic():
+        product = ProductFactory()
+        # Gesammelt, noch nicht geschrieben
+        assert not AuditLog.objects.exists()
+
+    # Die Testtransaktion wird nie festgeschrieben: geschrieben wurde vor dem Commit, in ihr
+    entry, = product_entries()
+    assert (entry.object_id, entry.action) == (str(product.pk), AuditLog.Action.CREATE)
+
+
+def test_rollback_discards_entries():
+    with pytest.raises(RuntimeError):
+        with audit.atomic():
+            ProductFactory()
+            raise RuntimeError('Abbruch')
+
+    assert not AuditLog.objects.exists()
+
+
+def test_rolled_back_savepoint_discards_its_entries():
+    with audit.atomic():
+        kept = ProductFactory()
+        with pytest.raises(RuntimeError):
+            with transaction.atomic():
+                ProductFactory()
+                raise RuntimeError('Abbruch')
+
+    assert [entry.object_id for entry in product_entries()] == [str(kept.pk)]
+
+
+def test_nested_blocks_write_once_with_the_outermost():
+    with audit.atomic():
+        with audit.atomic():
+            ProductFactory()
+        ProductFactory()
+        assert not AuditLog.objects.exists()
+
+    assert product_entries().count() == 2
+
+
+def test_scope_sets_ip_address():
+    with audit.audit_scope(ip_address='10.0.0.7'), audit.atomic():
+        ProductFactory()
+
+    assert product_entries().get().ip_address == '10.0.0.7'
+
+
+def test_chain_is_continuous_across_transactions():
+    for _ in range(3):
+        with audit.atomic():
+            ProductFactory.create_batch(2)
+    ProductFactory()  # ohne atomic(): sofort geschrieben
+
+    entries = list(AuditLog.objects.order_by('sequence'))
+    assert [entry.sequence for entry in entries] == list(range(1, 8))
+    assert entries[0].previous_hash == audit.GENESIS_HASH
+    assert all(entry.previous_hash == previous.hash for previous, entry in zip(entries, entries[1:]))
+    assert list(audit.verify_chain(chunk_size=2)) == []
+
+
+def test_verify_chain_detects_tampered_row():
+    with audit.atomic():
+        ProductFactory.create_batch(3)
+    # Der Manager verbietet Änderungen: Manipulation an ihm vorbei
+    QuerySet(AuditLog).filter(sequence=2).update(object_id='manipuliert')
+
+    violations = list(audit.verify_chain())
+
+    assert [(violation.sequence, violation.reason) for violation in violations] == [
+        (2, 'Inhalt wurde verändert (Hash ungültig)'),
+    ]
+
+
+def test_verify_chain_detects_removed_entries():
+    with audit.atomic():
+        ProductFactory.create_batch(3)
+    QuerySet(AuditLog).filter(sequence__gte=2).delete()
+
+    violations = list(audit.verify_chain())
+
+    assert [violation.sequence for violation in violations] == [3]
+    assert 'Kettenkopf' in violations[0].reason
+
+
+def test_saving_object_with_many_to_many_values_is_recorded():
+    user = UserFactory()
+    user.groups.add(GroupFactory())
+
+    with audit.atomic():
+        user.first_name = 'Anna'
+        user.save()
+
+    entry = AuditLog.objects.filter(model_name='users.User', action=AuditLog.Action.UPDATE).get()
+    assert entry.changes['first_name'] == 'Anna'
+    assert 'groups' not in entry.changes
+    assert entry.changes['password'] == '***'
@@ -0,0 +1,82 @@
+"""
+Tests des mehrstufigen Service-Caches: Tag-Versionen im Prozess, Invalidierung.
+"""
+
+import time
+
+import pytest
+from django.core.cache import cache
+
+from core import cache as service_cache
+from core.cache import cached_service, invalidate_tags
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    cache.clear()
+    service_cache.local_cache.clear()
+    service_cache.tag_versions.clear()
+    yield
+    service_cache.local_cache.clear()
+    service_cache.tag_versions.clear()
+
+
+@pytest.fixture
+def counted_service():
+    calls = []
+
+    @cached_service(ttl=60, tags=('test.Kennzahl',))
+    def service(value):
+        calls.append(value)
+        return value * 2
+
+    return service, calls
+
+
+@pytest.fixture
+def shared_reads(monkeypatch):
+    reads = []
+    get_many = cache.get_many
+
+    def counting_get_many(keys, *args, **kwargs):
+        reads.append(list(keys))
+        return get_many(keys, *args, **kwargs)
+
+    monkeypatch.setattr(service_cache.cache, 'get_many', counting_get_many)
+    return reads
+
+
+def test_local_hit_does_not_read_shared_tag_versions(counted_service, shared_reads):
+    service, calls = counted_service
+    service(2)
+    shared_reads.clear()
+
+    assert [service(2), service(2)] == [4, 4]
+
+    assert calls == [2]
+    assert shared_reads == []
+
+
+def test_invalidation_applies_at_once_in_own_process(counted_service):
+    service, calls = counted_service
+    service(2)
+
+    invalidate_tags('test.Kennzahl')
+    service(2)
+
+    assert calls == [2, 2]
+
+
+def test_invalidation_of_other_process_applies_after_tag_ttl(counted_service, monkeypatch):
+    monkeypatch.setattr(service_cache, 'TAG_VERSION_TTL', 0.05)
+    service, calls = counted_service
+    service(2)
+
+    # Anderer Prozess: erhöht nur die Version im gemeinsamen Cache
+    cache.incr('service:tag:test.Kennzahl')
+    service(2)
+    assert calls == [2]
+
+    time.sleep(0.1)
+    service(2)
+    assert calls == [2, 2]
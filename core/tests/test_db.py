@@ -0,0 +1,75 @@
+"""
+Tests des Replica-Routings: Lesen in `read_replica()` auf einer Replica, sonst alles auf dem Primary.
+"""
+
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.db import transaction
+
+from apps.finance.models import Account
+from core.db import PRIMARY, PrimaryReplicaRouter, database_settings, read_replica, using_replica
+
+router = PrimaryReplicaRouter()
+
+
+@pytest.fixture
+def replicas(monkeypatch):
+    """Zwei SQLite-Replicas neben dem Primary (das Routing fragt nur die Aliase ab)."""
+    configured = database_settings(Path('/srv/erp'), {'DB_REPLICAS': 'var/replica1.sqlite3, var/replica2.sqlite3'})
+    aliases = ['replica1', 'replica2']
+    for alias in aliases:
+        monkeypatch.setitem(settings.DATABASES, alias, configured[alias])
+    return aliases
+
+
+def test_database_settings_with_two_sqlite_replicas():
+    databases = database_settings(Path('/srv/erp'), {'DB_REPLICAS': 'var/replica1.sqlite3,var/replica2.sqlite3'})
+
+    assert list(databases) == [PRIMARY, 'replica1', 'replica2']
+    assert databases['replica2']['NAME'] == Path('/srv/erp/var/replica2.sqlite3')
+    assert databases['replica1']['OPTIONS'] == {'transaction_mode': 'IMMEDIATE'}
+    # Tests lesen über die Replica-Aliase dieselbe Test-Datenbank
+    assert databases['replica1']['TEST'] == {'MIRROR': PRIMARY}
+    assert 'TEST' not in databases[PRIMARY]
+
+
+def test_reads_stay_on_primary_outside_read_replica(replicas):
+    assert router.db_for_read(Account) == PRIMARY
+    assert router.db_for_write(Account) == PRIMARY
+
+
+def test_reads_in_read_replica_go_to_a_replica(replicas):
+    with read_replica():
+        chosen = {router.db_for_read(Account) for _ in range(50)}
+        assert router.db_for_write(Account) == PRIMARY
+
+    assert chosen == set(replicas)
+    assert router.db_for_read(Account) == PRIMARY
+
+
+def test_read_replica_as_decorator(replicas):
+    @read_replica()
+    def report():
+        return router.db_for_read(Account)
+
+    assert report() in replicas
+    assert report() in replicas
+    assert not using_replica()
+
+
+def test_read_replica_without_replicas_stays_on_primary():
+    with read_replica():
+        assert router.db_for_read(Account) == PRIMARY
+
+
+@pytest.mark.django_db
+def test_transaction_reads_its_own_writes_on_primary(replicas):
+    with read_replica(), transaction.atomic():
+        assert router.db_for_read(Account) == PRIMARY
+
+
+def test_only_primary_is_migrated(replicas):
+    assert router.allow_migrate(PRIMARY, 'finance')
+    assert not router.allow_migrate('replica1', 'finance')
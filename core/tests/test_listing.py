@@ -0,0 +1,123 @@
+"""
+Tests der Keyset-Pagination: Cursor, Gleichstand bei created_at, letzte Seite, Fehler, Schätzung der Zeilenzahl.
+"""
+
+import uuid
+from datetime import datetime, timezone as dt_timezone
+
+import pytest
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.sales.models import Customer
+from apps.sales.tests.factories import CustomerFactory
+from apps.users.tests.factories import UserFactory
+from core.listing import decode_cursor, encode_cursor, estimate_count, keyset_page
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def rag_index_dir(settings, tmp_path):
+    """Speichern schreibt auch das Änderungsprotokoll des Retrieval-Index."""
+    settings.RAG_INDEX_DIR = str(tmp_path)
+
+
+def customers(count: int, same_created_at: int = 0) -> list:
+    """Legt Kunden an; die letzten `same_created_at` teilen sich einen Zeitstempel."""
+    created = CustomerFactory.create_batch(count)
+    tied = [customer.pk for customer in created[count - same_created_at:]]
+    Customer.objects.filter(pk__in=tied).update(created_at=timezone.now())
+    return list(Customer.objects.order_by('-created_at', '-id').values_list('customer_number', flat=True))
+
+
+def all_pages(page_size: int):
+    pages, cursor = [], None
+    while True:
+        page = keyset_page(Customer.objects.all(), ['customer_number'], cursor, page_size)
+        pages.append([row[0] for row in page.rows])
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc)
+    pk = uuid.uuid4()
+
+    cursor = encode_cursor(created_at, pk)
+
+    assert '=' not in cursor
+    assert decode_cursor(cursor) == (created_at, pk)
+
+
+@pytest.mark.parametrize('cursor', ['', 'nicht-base64!', 'MjAyNi0wMy0wMQ', encode_cursor(timezone.now(), 'keine-uuid')])
+def test_invalid_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match='Ungültiger Cursor'):
+        decode_cursor(cursor)
+
+
+def test_pages_cover_all_rows_once_with_ties_broken_by_id():
+    expected = customers(8, same_created_at=5)
+
+    pages = all_pages(page_size=3)
+
+    assert [len(page) for page in pages] == [3, 3, 2]
+    assert [number for page in pages for number in page] == expected
+
+
+def test_last_full_page_has_no_next_cursor():
+    expected = customers(6)
+
+    pages = all_pages(page_size=3)
+
+    assert pages == [expected[:3], expected[3:]]
+
+
+def test_empty_queryset_gives_empty_last_page():
+    page = keyset_page(Customer.objects.all(), ['customer_number'])
+
+    assert (page.rows, page.next_cursor) == ([], None)
+
+
+def test_estimate_count_uses_table_statistics():
+    cache.clear()
+    customers(3)
+    with connection.cursor() as cursor:
+        cursor.execute(f'ANALYZE {Customer._meta.db_table}')
+
+    assert estimate_count(Customer) == 3
+
+
+@pytest.fixture
+def client_with_permission(client):
+    user = UserFactory()
+    user.user_permissions.add(Permission.objects.get(content_type__app_label='sales', codename='view_customer'))
+    client.force_login(user)
+    return client
+
+
+def test_list_view_loads_next_rows_with_cursor(client_with_permission):
+    newest, *older = customers(3)
+    cursor = keyset_page(Customer.objects.all(), ['customer_number'], page_size=1).next_cursor
+
+    first = client_with_permission.get(reverse('sales:customer_list'))
+    rows = client_with_permission.get(reverse('sales:customer_list'), {'cursor': cursor})
+
+    assert first.status_code == 200
+    assert 'list.html' in [template.name for template in first.templates]
+    assert rows.status_code == 200
+    assert [template.name for template in rows.templates][0] == 'partials/list_rows.html'
+    content = rows.content.decode()
+    assert newest not in content
+    assert all(number in content for number in older)
+
+
+def test_list_view_rejects_tampered_cursor(client_with_permission):
+    response = client_with_permission.get(reverse('sales:customer_list'), {'cursor': 'kaputt'})
+
+    assert response.status_code == 400
+    assert "Ungültiger Cursor: 'kaputt'" in response.content.decode()
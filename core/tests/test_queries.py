@@ -0,0 +1,82 @@
+"""
+Tests der Abfrage-Budgets: strikt in Tests, im Betrieb nur Warnung; N+1-Erkennung.
+"""
+
+import logging
+
+import pytest
+
+from apps.finance.models import Account
+from apps.finance.tests.factories import AccountFactory
+from core.queries import QueryBudgetExceeded, fingerprint, query_budget, track_queries
+
+pytestmark = pytest.mark.django_db
+
+
+def load_accounts(count: int) -> None:
+    for _ in range(count):
+        list(Account.objects.all()[:1])
+
+
+def test_test_settings_are_strict(settings):
+    assert settings.QUERY_BUDGET_STRICT is True
+
+
+def test_strict_budget_fails_when_exceeded():
+    with pytest.raises(QueryBudgetExceeded, match='Abfrage-Budget 1 überschritten'):
+        with query_budget(1, label='Kontenliste'):
+            load_accounts(2)
+
+
+def test_lenient_budget_only_warns(settings, caplog):
+    settings.QUERY_BUDGET_STRICT = False
+
+    with caplog.at_level(logging.WARNING, logger='core.queries'):
+        with query_budget(1, label='Kontenliste'):
+            load_accounts(2)
+
+    assert 'Kontenliste: Abfrage-Budget 1 überschritten (2 Abfragen' in caplog.text
+
+
+def test_explicit_strict_overrides_settings(settings):
+    settings.QUERY_BUDGET_STRICT = False
+
+    with pytest.raises(QueryBudgetExceeded):
+        with query_budget(0, strict=True):
+            load_accounts(1)
+
+
+def test_decorator_uses_function_name_and_counts_per_call():
+    @query_budget(1)
+    def first_account():
+        return Account.objects.first()
+
+    account = AccountFactory()
+
+    assert first_account() == account
+    assert first_account() == account
+
+
+def test_repeated_queries_within_budget_are_logged(caplog):
+    with caplog.at_level(logging.WARNING, logger='core.queries'):
+        with query_budget(10, label='Schleife') as log:
+            load_accounts(5)
+
+    assert log.count == 5
+    assert [query.count for query in log.repeated()] == [5]
+    assert 'Schleife: wiederholte Abfragen (N+1?)' in caplog.text
+
+
+def test_nested_tracking_counts_for_all_blocks():
+    with track_queries() as outer:
+        load_accounts(1)
+        with track_queries() as inner:
+            load_accounts(2)
+
+    assert (outer.count, inner.count) == (3, 2)
+
+
+def test_fingerprint_ignores_values():
+    assert fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21") == (
+        'SELECT * FROM t WHERE id IN (...) AND name = ? LIMIT ?'
+    )
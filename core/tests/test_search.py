@@ -0,0 +1,105 @@
+"""
+Tests der Volltextsuche: Stemming, Suche, Fortschreibung über Signale.
+"""
+
+import pytest
+from django.db import connection
+
+from apps.inventory.tests.factories import ProductFactory
+from apps.sales.tests.factories import CustomerFactory
+from core.models import SearchDocument
+from core.search import index_objects, remove_objects, search, stem
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def rag_index_dir(settings, tmp_path):
+    """Speichern schreibt auch das Änderungsprotokoll des Retrieval-Index."""
+    settings.RAG_INDEX_DIR = str(tmp_path)
+
+
+def titles(hits):
+    return [hit.title for hit in hits]
+
+
+@pytest.mark.parametrize('word, expected', [
+    ('rechnungen', 'rechnung'),
+    ('rechnung', 'rechnung'),
+    ('gelieferte', 'liefer'),
+    ('kunden', 'kund'),
+    ('schrauben', 'schraub'),
+    ('müller', 'mull'),
+])
+def test_stem(word, expected):
+    assert stem(word) == expected
+
+
+def test_search_finds_inflected_words_and_prefix_of_last_term(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        mueller = CustomerFactory(name='Müller Schrauben GmbH', city='Berlin')
+        CustomerFactory(name='Müller Werkzeuge AG', city='Hamburg')
+
+    assert titles(search('Schraube Ber')) == [str(mueller)]
+    assert titles(search('müller berlin')) == [str(mueller)]
+    # Alle Begriffe müssen vorkommen
+    assert search('Schrauben Hamburg') == []
+
+
+def test_title_ranks_before_body():
+    in_body = CustomerFactory(name='Nordhandel', city='Bremen')
+    in_title = CustomerFactory(name='Bremen Logistik', city='Kiel')
+    index_objects([in_body, in_title])
+
+    assert titles(search('bremen')) == [str(in_title), str(in_body)]
+
+
+def test_search_filters_types():
+    customer = CustomerFactory(name='Anker Vertrieb')
+    product = ProductFactory(name='Anker', sku='ANK-1')
+    index_objects([customer, product])
+
+    hits = search('anker', types=['product'])
+
+    assert [(hit.entity_type, hit.object_id) for hit in hits] == [('product', str(product.pk))]
+    with pytest.raises(ValueError, match='Unbekannte Suchtypen: invoice'):
+        search('anker', types=['invoice'])
+
+
+def test_empty_query_returns_nothing():
+    assert search(' ,; ') == []
+
+
+def test_signals_update_and_remove_documents(django_capture_on_commit_callbacks):
+    with django_capture_on_commit_callbacks(execute=True):
+        customer = CustomerFactory(name='Alpha Bau')
+    with django_capture_on_commit_callbacks(execute=True):
+        customer.name = 'Beta Bau'
+        customer.save()
+
+    assert search('alpha') == []
+    assert titles(search('beta')) == [str(customer)]
+    assert SearchDocument.objects.filter(object_id=str(customer.pk)).count() == 1
+
+    with django_capture_on_commit_callbacks(execute=True):
+        customer.delete()
+
+    assert search('beta') == []
+    assert not SearchDocument.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.skipif(connection.vendor != 'sqlite', reason='FTS5-Tabelle nur unter SQLite')
+def test_hits_survive_renumbered_document_rows():
+    customers = [CustomerFactory(name=f'Firma {name}') for name in ('Erste', 'Zweite', 'Dritte')]
+    index_objects(customers)
+    remove_objects('customer', [customers[0].pk])
+
+    # Schemaänderungen unter SQLite kopieren die Tabelle um, die implizite rowid wird neu vergeben
+    with connection.schema_editor() as editor:
+        editor._remake_table(SearchDocument)
+
+    assert titles(search('dritte')) == [str(customers[2])]
+    assert titles(search('zweite')) == [str(customers[1])]
+    # Die FTS-Tabelle ist kein Model und wird nach dem Test nicht geleert
+    remove_objects('customer', [customer.pk for customer in customers[1:]])
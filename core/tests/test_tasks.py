@@ -0,0 +1,188 @@
+"""
+Tests der Task-Queue: Eager-Modus, Übernahme, Heartbeat, Neuvergabe und Besitzprüfung beim Abschluss.
+"""
+
+import logging
+import time
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.users.tests.factories import UserFactory
+from core.models import Notification, TaskRecord
+from core.tasks import (
+    TaskFailedError, claim_next, execute, get_result, heartbeat, requeue_stale, run_worker, task,
+)
+
+pytestmark = pytest.mark.django_db
+
+calls = []
+
+
+@task(name='tests.add', title='Addition')
+def add(a, b):
+    calls.append((a, b))
+    return a + b
+
+
+@task(name='tests.flaky', max_retries=1)
+def flaky():
+    calls.append('flaky')
+    if len(calls) == 1:
+        raise RuntimeError('Erster Versuch scheitert')
+    return 'ok'
+
+
+@task(name='tests.broken', title='Kaputt')
+def broken():
+    raise RuntimeError('Immer kaputt')
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    calls.clear()
+
+
+@pytest.fixture
+def eager(settings):
+    settings.TASKS_ALWAYS_EAGER = True
+
+
+def age(record: TaskRecord, seconds: int) -> None:
+    """Setzt den letzten Heartbeat zurück (update() umgeht auto_now)."""
+    TaskRecord.objects.filter(pk=record.pk).update(updated_at=timezone.now() - timedelta(seconds=seconds))
+
+
+def test_eager_task_runs_immediately_and_notifies(eager):
+    user = UserFactory()
+
+    record = add.apply_async((2, 3), user_id=user.pk)
+
+    assert (record.status, record.result, record.attempts, record.worker) == (
+        TaskRecord.Status.SUCCEEDED, 5, 1, 'eager',
+    )
+    assert get_result(record.pk) == 5
+    notification, = Notification.objects.filter(user=user)
+    assert (notification.title, notification.level) == ('Addition abgeschlossen', Notification.Level.SUCCESS)
+
+
+def test_eager_retries_without_backoff(eager):
+    record = flaky.delay()
+
+    assert (record.status, record.result, record.attempts) == (TaskRecord.Status.SUCCEEDED, 'ok', 2)
+    assert calls == ['flaky', 'flaky']
+
+
+def test_final_failure_is_stored_and_reported(eager):
+    user = UserFactory()
+
+    record = broken.apply_async(user_id=user.pk)
+
+    assert record.status == TaskRecord.Status.FAILED
+    with pytest.raises(TaskFailedError, match='Immer kaputt'):
+        get_result(record.pk)
+    notification, = Notification.objects.filter(user=user)
+    assert (notification.title, notification.message) == ('Kaputt fehlgeschlagen', 'RuntimeError: Immer kaputt')
+
+
+def test_claim_takes_due_tasks_by_priority_exactly_once():
+    low = add.apply_async((1, 1))
+    high = add.apply_async((2, 2), priority=5)
+    add.apply_async((3, 3), priority=9, countdown=3600)
+
+    assert claim_next('worker-a').pk == high.pk
+    assert claim_next('worker-b').pk == low.pk
+    # Nicht fällig: bleibt wartend
+    assert claim_next('worker-a') is None
+
+    claimed = TaskRecord.objects.get(pk=high.pk)
+    assert (claimed.status, claimed.worker, claimed.attempts) == (TaskRecord.Status.RUNNING, 'worker-a', 1)
+
+
+def test_failed_attempt_is_requeued_with_backoff():
+    record = flaky.delay()
+    started = timezone.now()
+
+    execute(claim_next('worker-a'))
+
+    record.refresh_from_db()
+    assert (record.status, record.attempts, record.finished_at) == (TaskRecord.Status.QUEUED, 1, None)
+    assert record.run_after >= started + timedelta(seconds=60)
+    assert 'Erster Versuch scheitert' in record.error
+
+
+def test_stale_tasks_are_requeued_or_failed():
+    retry = flaky.delay()
+    last = add.delay(1, 2)
+    fresh = add.delay(3, 4)
+    for worker in ('worker-a', 'worker-b', 'worker-c'):
+        claim_next(worker)
+    age(retry, 600)
+    age(last, 600)
+
+    assert requeue_stale(timedelta(seconds=300)) == 2
+
+    statuses = dict(TaskRecord.objects.values_list('pk', 'status'))
+    assert statuses == {
+        retry.pk: TaskRecord.Status.QUEUED,
+        last.pk: TaskRecord.Status.FAILED,
+        fresh.pk: TaskRecord.Status.RUNNING,
+    }
+
+
+def test_result_of_reassigned_run_is_discarded(caplog):
+    add.delay(2, 3)
+    first_run = claim_next('worker-a')
+    # Mit Wiederholung übrig wird der Auftrag neu eingereiht statt als fehlgeschlagen markiert
+    TaskRecord.objects.filter(pk=first_run.pk).update(max_retries=1)
+    age(first_run, 600)
+    requeue_stale(timedelta(seconds=300))
+    second_run = claim_next('worker-b')
+
+    with caplog.at_level(logging.WARNING, logger='core.tasks'):
+        discarded = execute(first_run)
+
+    assert (discarded.status, discarded.worker, discarded.result) == (TaskRecord.Status.RUNNING, 'worker-b', None)
+    assert 'wurde neu vergeben; Ergebnis von worker-a verworfen' in caplog.text
+
+    stored = execute(second_run)
+    assert (stored.status, stored.result, stored.attempts) == (TaskRecord.Status.SUCCEEDED, 5, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_heartbeat_keeps_long_running_task_alive():
+    add.delay(1, 1)
+    record = claim_next('worker-a')
+    age(record, 600)
+
+    # Der Heartbeat schreibt über eine eigene Verbindung (anderer Thread)
+    with heartbeat(record, interval=0.05):
+        time.sleep(0.3)
+
+    assert requeue_stale(timedelta(seconds=300)) == 0
+    assert TaskRecord.objects.get(pk=record.pk).status == TaskRecord.Status.RUNNING
+
+
+@pytest.mark.django_db(transaction=True)
+def test_heartbeat_stops_once_task_is_reassigned():
+    add.delay(1, 1)
+    record = claim_next('worker-a')
+    TaskRecord.objects.filter(pk=record.pk).update(worker='worker-b')
+    age(record, 600)
+
+    with heartbeat(record, interval=0.05):
+        time.sleep(0.2)
+
+    assert TaskRecord.objects.get(pk=record.pk).updated_at < timezone.now() - timedelta(seconds=300)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_burst_worker_processes_due_tasks():
+    records = [add.delay(n, n) for n in range(3)]
+    done = []
+
+    assert run_worker('worker-a', burst=True, on_task=done.append) == 3
+
+    assert sorted(record.result for record in done) == [0, 2, 4]
+    assert all(get_result(record.pk) == record.args[0] * 2 for record in records)
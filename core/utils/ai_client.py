@@ -0,0 +1,485 @@
+"""
+Provider-agnostischer AI-Client-Connector (Schicht A, siehe `.agent/rules/ai-architecture-layers.md`).
+
+Reine Infrastruktur: API Keys, gepoolte Keep-Alive-Verbindungen, Rate Limits,
+Retries und Metriken. KEINE ERP-Geschäftslogik und keine Importe aus `apps.*`.
+
+Funktionen:
+- Sync (`AIClient.complete`) und Async (`AIClient.acomplete`) Schnittstelle
+- Connection Pooling mit Keep-Alive (je Provider ein httpx-Client, async je Event Loop)
+- Token-Bucket Rate Limiting je Provider
+- Retries mit exponentiellem Backoff und Full Jitter (429, 5xx, Netzwerkfehler)
+- Request Coalescing: identische, gleichzeitig laufende Prompts lösen nur
+  einen Upstream-Aufruf aus
+- Metriken je Provider (Latenz, Queue-Tiefe, Fehler, Retries)
+
+Konfiguration über `settings.AI_PROVIDERS`; für Tests kann `base_url` auf einen
+lokalen Stub-Server (`core.utils.ai_stub.StubAIServer`) zeigen.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+
+# HTTP-Statuscodes, bei denen ein erneuter Versuch sinnvoll ist (409 Conflict ist endgültig)
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+
+# Anzahl Latenzwerte, aus denen Perzentile berechnet werden
+LATENCY_WINDOW = 1024
+
+
+class AIClientError(Exception):
+    """Fehler bei der Kommunikation mit einem AI-Provider."""
+
+
+@dataclass(frozen=True)
+class ProviderConfig:
+    """
+    Verbindungs- und Limit-Konfiguration eines AI-Providers.
+
+    Attributes:
+        name: Provider-Name (z.B. 'openai'), dient als Metrik-Label
+        base_url: Basis-URL der API
+        endpoint: Pfad des Completion-Endpoints
+        api_key: API Key (wird als Bearer-Token gesendet)
+        rate_per_second: Nachhaltige Anfragerate des Token Buckets
+        burst: Maximale Anzahl Anfragen im Burst
+        max_retries: Maximale Anzahl Wiederholungen je Anfrage
+        backoff_base: Basis-Wartezeit für den Backoff in Sekunden
+        backoff_cap: Maximale Wartezeit zwischen zwei Versuchen in Sekunden
+        timeout: Timeout je Anfrage in Sekunden
+        max_connections: Größe des Verbindungspools
+        max_keepalive: Anzahl offen gehaltener Keep-Alive-Verbindungen
+    """
+
+    name: str
+    base_url: str
+    endpoint: str = '/v1/chat/completions'
+    api_key: str = ''
+    rate_per_second: float = 10.0
+    burst: int = 20
+    max_retries: int = 3
+    backoff_base: float = 0.25
+    backoff_cap: float = 8.0
+    timeout: float = 30.0
+    max_connections: int = 20
+    max_keepalive: int = 10
+
+    @classmethod
+    def from_settings(cls, name: str, options: Dict[str, Any]) -> 'ProviderConfig':
+        """Erzeugt die Konfiguration aus einem Eintrag von `settings.AI_PROVIDERS`."""
+        return cls(name=name, **options)
+
+
+class TokenBucket:
+    """
+    Thread-sicherer Token Bucket für Rate Limiting.
+
+    Tokens werden kontinuierlich mit `rate` pro Sekunde bis `capacity` aufgefüllt.
+    `reserve()` bucht ein Token sofort und gibt die nötige Wartezeit zurück, so
+    dass Sync- und Async-Aufrufer dieselbe Warteschlange teilen.
+    """
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Reserviert ein Token.
+
+        Returns:
+            float: Wartezeit in Sekunden, bis das Token verfügbar ist (0 = sofort)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+@dataclass
+class ProviderMetrics:
+    """Laufzeitmetriken eines Providers (prozesslokal)."""
+
+    requests: int = 0
+    upstream_calls: int = 0
+    failures: int = 0
+    retries: int = 0
+    coalesced: int = 0
+    in_flight: int = 0
+    queue_depth: int = 0
+    latencies: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def add(self, **deltas: int) -> None:
+        """Erhöht Zähler atomar (negative Werte verringern z.B. `in_flight`)."""
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def observe_latency(self, seconds: float) -> None:
+        """Erfasst die Latenz eines erfolgreichen Upstream-Aufrufs."""
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def snapshot(self) -> Dict[str, float]:
+        """
+        Gibt eine Momentaufnahme der Metriken zurück.
+
+        Returns:
+            Dict[str, float]: Zähler sowie Latenz-Perzentile (p50/p95/p99) in Sekunden
+        """
+        with self._lock:
+            ordered = sorted(self.latencies)
+            data = {
+                'requests': self.requests,
+                'upstream_calls': self.upstream_calls,
+                'failures': self.failures,
+                'retries': self.retries,
+                'coalesced': self.coalesced,
+                'in_flight': self.in_flight,
+                'queue_depth': self.queue_depth,
+            }
+        for label, quantile in (('p50', 0.50), ('p95', 0.95), ('p99', 0.99)):
+            data[f'latency_{label}'] = (
+                ordered[min(len(ordered) - 1, int(quantile * len(ordered)))] if ordered else 0.0
+            )
+        return data
+
+
+def _coalesce_key(payload: Dict[str, Any]) -> str:
+    """Stabiler Schlüssel für identische Prompts (unabhängig von der Key-Reihenfolge)."""
+    return hashlib.sha256(
+        json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    ).hexdigest()
+
+
+class AIClient:
+    """
+    Client für genau einen AI-Provider.
+
+    Die Payload wird unverändert als JSON gesendet und die JSON-Antwort
+    unverändert zurückgegeben; das provider-spezifische Format (Messages,
+    Model-Name, ...) ist Sache der AI Engine.
+
+    Ein Client sollte pro Prozess wiederverwendet werden (siehe `get_client`),
+    da er die Verbindungspools hält.
+    """
+
+    def __init__(
+        self,
+        config: ProviderConfig,
+        transport: Optional[httpx.BaseTransport] = None,
+        async_transport: Optional[httpx.AsyncBaseTransport] = None,
+    ) -> None:
+        self.config = config
+        self.metrics = ProviderMetrics()
+        self._bucket = TokenBucket(config.rate_per_second, config.burst)
+        self._limits = httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive,
+        )
+        self._headers = {'Content-Type': 'application/json'}
+        if config.api_key:
+            self._headers['Authorization'] = f'Bearer {config.api_key}'
+        self._transport = transport
+        self._async_transport = async_transport
+        self._sync_client: Optional[httpx.Client] = None
+        # Verbindungen eines AsyncClient gehören zu dem Loop, in dem sie geöffnet wurden
+        self._async_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+        self._client_lock = threading.Lock()
+
+        # Laufende Anfragen je Prompt-Schlüssel (Request Coalescing)
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        self._async_inflight: Dict[Tuple[asyncio.AbstractEventLoop, str], asyncio.Future] = {}
+
+    # ------------------------------------------------------------------
+    # Sync-Schnittstelle
+    # ------------------------------------------------------------------
+
+    def complete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sendet einen Prompt synchron an den Provider.
+
+        Identische, bereits laufende Anfragen werden zusammengeführt: nur der
+        erste Aufrufer spricht mit dem Provider, alle anderen erhalten dasselbe
+        Ergebnis.
+
+        Args:
+            payload: JSON-serialisierbare Anfrage im Format des Providers
+
+        Returns:
+            Dict[str, Any]: JSON-Antwort des Providers
+
+        Raises:
+            AIClientError: Wenn alle Versuche fehlschlagen
+        """
+        self.metrics.add(requests=1)
+        key = _coalesce_key(payload)
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            self.metrics.add(coalesced=1)
+            return future.result()
+
+        try:
+            result = self._send_with_retry(payload)
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _get_sync_client(self) -> httpx.Client:
+        with self._client_lock:
+            if self._sync_client is None:
+                self._sync_client = httpx.Client(
+                    base_url=self.config.base_url,
+                    headers=self._headers,
+                    limits=self._limits,
+                    timeout=self.config.timeout,
+                    transport=self._transport,
+                )
+            return self._sync_client
+
+    def _send_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        client = self._get_sync_client()
+        for attempt in range(self.config.max_retries + 1):
+            self._wait_for_token()
+            self.metrics.add(upstream_calls=1, in_flight=1)
+            started = time.perf_counter()
+            try:
+                response = client.post(self.config.endpoint, json=payload)
+            except httpx.TransportError as exc:
+                error, retry_after = exc, None
+            else:
+                if response.status_code < 400:
+                    self.metrics.observe_latency(time.perf_counter() - started)
+                    return response.json()
+                error, retry_after = self._status_error(response), response.headers.get('Retry-After')
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.metrics.add(failures=1)
+                    raise error
+            finally:
+                self.metrics.add(in_flight=-1)
+
+            if attempt == self.config.max_retries:
+                break
+            self.metrics.add(retries=1)
+            time.sleep(self._backoff(attempt, retry_after))
+
+        self.metrics.add(failures=1)
+        raise AIClientError(
+            f"Provider '{self.config.name}' nach {self.config.max_retries + 1} Versuchen nicht erreichbar: {error}"
+        ) from error
+
+    def _wait_for_token(self) -> None:
+        delay = self._bucket.reserve()
+        if delay:
+            self.metrics.add(queue_depth=1)
+            try:
+                time.sleep(delay)
+            finally:
+                self.metrics.add(queue_depth=-1)
+
+    # ------------------------------------------------------------------
+    # Async-Schnittstelle
+    # ------------------------------------------------------------------
+
+    async def acomplete(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sendet einen Prompt asynchron an den Provider.
+
+        Verhält sich wie `complete`, blockiert aber keinen Thread. Coalescing
+        und Verbindungspool gelten je Event Loop.
+
+        Args:
+            payload: JSON-serialisierbare Anfrage im Format des Providers
+
+        Returns:
+            Dict[str, Any]: JSON-Antwort des Providers
+
+        Raises:
+            AIClientError: Wenn alle Versuche fehlschlagen
+        """
+        self.metrics.add(requests=1)
+        key = _coalesce_key(payload)
+
+        loop = asyncio.get_running_loop()
+        future = self._async_inflight.get((loop, key))
+        if future is not None:
+            self.metrics.add(coalesced=1)
+            return await asyncio.shield(future)
+
+        future = self._async_inflight[loop, key] = loop.create_future()
+        try:
+            result = await self._asend_with_retry(payload)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # als abgerufen markieren, falls niemand wartet
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self._async_inflight.pop((loop, key), None)
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._client_lock:
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                # Pool eines beendeten Loops (z.B. asyncio.run) ist nicht mehr nutzbar
+                del self._async_clients[closed]
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = httpx.AsyncClient(
+                    base_url=self.config.base_url,
+                    headers=self._headers,
+                    limits=self._limits,
+                    timeout=self.config.timeout,
+                    transport=self._async_transport,
+                )
+            return client
+
+    async def _asend_with_retry(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        client = self._get_async_client()
+        for attempt in range(self.config.max_retries + 1):
+            await self._await_token()
+            self.metrics.add(upstream_calls=1, in_flight=1)
+            started = time.perf_counter()
+            try:
+                response = await client.post(self.config.endpoint, json=payload)
+            except httpx.TransportError as exc:
+                error, retry_after = exc, None
+            else:
+                if response.status_code < 400:
+                    self.metrics.observe_latency(time.perf_counter() - started)
+                    return response.json()
+                error, retry_after = self._status_error(response), response.headers.get('Retry-After')
+                if response.status_code not in RETRYABLE_STATUS_CODES:
+                    self.metrics.add(failures=1)
+                    raise error
+            finally:
+                self.metrics.add(in_flight=-1)
+
+            if attempt == self.config.max_retries:
+                break
+            self.metrics.add(retries=1)
+            await asyncio.sleep(self._backoff(attempt, retry_after))
+
+        self.metrics.add(failures=1)
+        raise AIClientError(
+            f"Provider '{self.config.name}' nach {self.config.max_retries + 1} Versuchen nicht erreichbar: {error}"
+        ) from error
+
+    async def _await_token(self) -> None:
+        delay = self._bucket.reserve()
+        if delay:
+            self.metrics.add(queue_depth=1)
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self.metrics.add(queue_depth=-1)
+
+    # ------------------------------------------------------------------
+    # Gemeinsame Helfer
+    # ------------------------------------------------------------------
+
+    def _backoff(self, attempt: int, retry_after: Optional[str]) -> float:
+        """Exponentieller Backoff mit Full Jitter; `Retry-After` hat Vorrang."""
+        if retry_after:
+            try:
+                return min(self.config.backoff_cap, float(retry_after))
+            except ValueError:
+                pass
+        return random.uniform(0, min(self.config.backoff_cap, self.config.backoff_base * 2 ** attempt))
+
+    def _status_error(self, response: httpx.Response) -> AIClientError:
+        return AIClientError(
+            f"Provider '{self.config.name}' antwortete mit HTTP {response.status_code}: {response.text[:200]}"
+        )
+
+    def close(self) -> None:
+        """Schließt den synchronen Verbindungspool."""
+        with self._client_lock:
+            if self._sync_client is not None:
+                self._sync_client.close()
+                self._sync_client = None
+
+    async def aclose(self) -> None:
+        """Schließt den asynchronen Verbindungspool des laufenden Event Loops."""
+        with self._client_lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+
+_clients: Dict[str, AIClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(provider: str) -> AIClient:
+    """
+    Gibt den prozessweit geteilten Client für einen Provider zurück.
+
+    Args:
+        provider: Schlüssel in `settings.AI_PROVIDERS`
+
+    Returns:
+        AIClient: Wiederverwendbarer Client mit eigenem Verbindungspool
+
+    Raises:
+        AIClientError: Wenn der Provider nicht konfiguriert ist
+    """
+    from django.conf import settings
+
+    with _clients_lock:
+        client = _clients.get(provider)
+        if client is None:
+            options = getattr(settings, 'AI_PROVIDERS', {}).get(provider)
+            if options is None:
+                raise AIClientError(f"AI-Provider '{provider}' ist nicht konfiguriert.")
+            client = _clients[provider] = AIClient(ProviderConfig.from_settings(provider, options))
+        return client
+
+
+def get_metrics() -> Dict[str, Dict[str, float]]:
+    """
+    Gibt die Metriken aller bisher genutzten Provider zurück.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Metriken je Provider-Name
+    """
+    with _clients_lock:
+        clients = dict(_clients)
+    return {name: client.metrics.snapshot() for name, client in clients.items()}
@@ -0,0 +1,97 @@
+"""
+Lokaler Stub-Server für AI-Provider.
+
+Ermöglicht Tests und Benchmarks des `core.utils.ai_client` ohne Netzwerkzugriff
+und ohne API Keys. Der Server spricht HTTP/1.1 mit Keep-Alive und beantwortet
+POST-Anfragen mit einer konfigurierbaren Funktion.
+
+Beispiel:
+
+    with StubAIServer(delay=0.05) as server:
+        client = AIClient(ProviderConfig(name='stub', base_url=server.url))
+        client.complete({'prompt': 'Hallo'})
+        assert server.request_count == 1
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+def echo_handler(payload: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+    """Standard-Antwort: gibt die Anfrage unter 'echo' zurück."""
+    return 200, {'echo': payload}
+
+
+class StubAIServer:
+    """
+    Thread-basierter HTTP-Stub auf 127.0.0.1 mit zufälligem Port.
+
+    Args:
+        handler: Funktion Payload -> (HTTP-Status, JSON-Antwort)
+        delay: Künstliche Antwortverzögerung in Sekunden (simuliert Modell-Latenz)
+    """
+
+    def __init__(
+        self,
+        handler: Optional[Callable[[Dict[str, Any]], Tuple[int, Dict[str, Any]]]] = None,
+        delay: float = 0.0,
+    ) -> None:
+        self.handler = handler or echo_handler
+        self.delay = delay
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Basis-URL des laufenden Servers."""
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'StubAIServer':
+        """Startet den Server in einem Hintergrund-Thread."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # Keep-Alive
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get('Content-Length', 0))
+                payload = json.loads(self.rfile.read(length) or b'{}')
+                with stub._lock:
+                    stub.request_count += 1
+                if stub.delay:
+                    time.sleep(stub.delay)
+                status, body = stub.handler(payload)
+                data = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stoppt den Server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'StubAIServer':
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
@@ -0,0 +1,34 @@
+"""
+Prozess-Pools für CPU-gebundene Arbeit (Infrastruktur).
+
+Alle Pools starten ihre Worker mit `spawn`: Kindprozesse erben weder offene
+Datenbankverbindungen noch Threads oder Sperren des Elternprozesses (mit
+`fork` könnten sie z.B. eine gerade gehaltene Sperre des Loggings erben).
+Jeder Worker initialisiert Django selbst und liest die Einstellungen dafür
+aus der Umgebung (`DJANGO_SETTINGS_MODULE`).
+"""
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+import django
+
+
+def process_pool(max_workers: Optional[int] = None, setup_django: bool = True) -> ProcessPoolExecutor:
+    """
+    Erzeugt einen Prozess-Pool mit `spawn`-Workern.
+
+    Args:
+        max_workers: Anzahl Worker-Prozesse (Standard: Anzahl CPUs)
+        setup_django: Worker führen `django.setup()` aus (nötig für Models,
+            Templates und Storage; entfällt für reine Python-Funktionen)
+
+    Returns:
+        ProcessPoolExecutor: Als Kontextmanager zu verwenden
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=django.setup if setup_django else None,
+    )
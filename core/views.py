@@ -5,10 +5,20 @@ Dieses Modul enthält nur Infrastruktur-Views (z.B. Dashboard, Login).
 KEINE Geschäftslogik hier - diese gehört in die jeweiligen Apps.
 """
 
+import hmac
+
+from django.conf import settings
+from django.contrib.auth.decorators import login_required
 from django.shortcuts import render
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, HttpResponseForbidden
+from django.views.decorators.http import require_GET, require_POST
+
+from apps.dashboard.services import get_dashboard_kpis
+from core.metrics import render_metrics
+from core.notifications import count_unread, get_unread, mark_read
 
 
+@login_required
 def dashboard_view(request: HttpRequest) -> HttpResponse:
     """
     Dashboard-Ansicht - Zentrale Übersicht für authentifizierte Benutzer.
@@ -19,11 +29,66 @@ def dashboard_view(request: HttpRequest) -> HttpResponse:
     Returns:
         HttpResponse mit gerendertem Dashboard-Template
     """
-    # In Zukunft: Daten aus verschiedenen Services aggregieren
-    # Beispiel: sales_stats = sales_service.get_monthly_stats(user=request.user)
-    
+    # Materialisierte Kennzahlen (gecacht, höchstens eine indizierte Abfrage)
     context = {
-        # Placeholder-Daten - werden später durch echte Service-Calls ersetzt
+        'kpis': get_dashboard_kpis(),
     }
     
     return render(request, 'dashboard.html', context)
+
+
+@login_required
+@require_GET
+def notifications_view(request: HttpRequest) -> HttpResponse:
+    """
+    Notification Center im Header (HTMX-Partial, wird periodisch nachgeladen).
+
+    Args:
+        request: HTTP-Request-Objekt
+
+    Returns:
+        HttpResponse mit ungelesenen Benachrichtigungen
+    """
+    context = {
+        'notifications': get_unread(request.user.pk),
+        'unread_count': count_unread(request.user.pk),
+    }
+    return render(request, 'partials/notifications.html', context)
+
+
+@login_required
+@require_POST
+def notifications_read_view(request: HttpRequest) -> HttpResponse:
+    """
+    Markiert alle ungelesenen Benachrichtigungen des Benutzers als gelesen.
+
+    Args:
+        request: HTTP-Request-Objekt
+
+    Returns:
+        HttpResponse mit dem aktualisierten Partial
+    """
+    mark_read(request.user.pk)
+    return render(request, 'partials/notifications.html', {'notifications': [], 'unread_count': 0})
+
+
+@require_GET
+def metrics_view(request: HttpRequest) -> HttpResponse:
+    """
+    Laufzeit-Metriken im Prometheus-Textformat.
+
+    Zugriff mit `Authorization: Bearer <METRICS_TOKEN>` (Scraper) oder als
+    Staff-Benutzer.
+
+    Args:
+        request: HTTP-Request-Objekt
+
+    Returns:
+        HttpResponse mit allen Metriken dieses Prozesses
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    authorization = request.headers.get('Authorization', '')
+    authorized = bool(token) and hmac.compare_digest(authorization, f'Bearer {token}')
+    if not authorized and not request.user.is_staff:
+        return HttpResponseForbidden()
+    return HttpResponse(render_metrics(), content_type='text/plain; version=0.0.4; charset=utf-8')